@@ -0,0 +1,44 @@
+# Generated by Django 4.2.16 on 2026-10-18 14:22
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+# 기존 팔로워/팔로잉 수로 채움
+def count_follows(apps, schema_editor):
+    CustomUser = apps.get_model('accounts', 'CustomUser')
+    through = CustomUser.followings.through
+
+    def count(column):
+        follows = (
+            through.objects.filter(**{column: OuterRef('pk')}).order_by()
+            .values(column).annotate(count=Count('*')).values('count')
+        )
+        return Coalesce(Subquery(follows), 0)
+
+    CustomUser.objects.update(
+        followers_count=count('to_customuser_id'),
+        followings_count=count('from_customuser_id'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_alter_customuser_profile_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='followings_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_follows, migrations.RunPython.noop),
+    ]
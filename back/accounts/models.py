@@ -65,6 +65,10 @@ class CustomUser(AbstractUser):
         blank=True
     )
 
+    # 팔로워 수, 팔로잉 수 (followings 행 수를 비정규화, blookin.counters.toggle이 F()로 갱신)
+    followers_count = models.PositiveIntegerField(default=0, editable=False)
+    followings_count = models.PositiveIntegerField(default=0, editable=False)
+
     # 관리자 페이지 등에서 사용자 객체를 문자열로 표현할 때 username을 반환
     def __str__(self):
         return self.username
@@ -0,0 +1,7 @@
+# accounts/queries.py
+
+
+# UserSimpleSerializer가 출력할 관심 장르를 미리 조회하는 쿼리 계획
+# (팔로워/팔로잉 수는 비정규화한 followers_count, followings_count 컬럼)
+def plan_users(users):
+    return users.prefetch_related('interested_genres')
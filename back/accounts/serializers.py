@@ -89,9 +89,9 @@ class UserSimpleSerializer(serializers.ModelSerializer):
         read_only=True,
         slug_field='name'
     )
-    # 팔로워 수, 팔로잉 수
-    followers_count = serializers.SerializerMethodField()
-    followings_count = serializers.SerializerMethodField()
+    # 팔로워 수, 팔로잉 수 (비정규화 컬럼)
+    followers_count = serializers.IntegerField(read_only=True)
+    followings_count = serializers.IntegerField(read_only=True)
     # 현재 로그인한 사용자가 해당 사용자를 팔로우 중인지 여부
     is_following = serializers.SerializerMethodField()
 
@@ -121,20 +121,19 @@ class UserSimpleSerializer(serializers.ModelSerializer):
             return f"{obj.last_name}{obj.first_name}".strip()
         return obj.username
 
-    # 팔로워 수 반환
-    def get_followers_count(self, obj):
-        return obj.followers.count()
-
-    # 팔로잉 수 반환
-    def get_followings_count(self, obj):
-        return obj.followings.count()
-
     # 로그인한 사용자가 해당 사용자를 팔로우 중인지 여부 반환
     def get_is_following(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return obj in request.user.followings.all()
-        return False
+        return obj.pk in self.following_ids()
+
+    # 로그인한 사용자의 팔로잉 ID 집합을 요청당 한 번만 조회해 context에 보관
+    def following_ids(self):
+        if 'following_ids' not in self.context:
+            request = self.context.get('request')
+            if request and request.user.is_authenticated:
+                self.context['following_ids'] = set(request.user.followings.values_list('pk', flat=True))
+            else:
+                self.context['following_ids'] = set()
+        return self.context['following_ids']
 
     # 사용자 이름 중복 검증
     def validate_username(self, value):
@@ -7,10 +7,13 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from django.contrib.auth import get_user_model
 from rest_framework.generics import get_object_or_404
 
+from blookin import counters
 from threads.models import Thread
 from threads.serializers import ThreadSerializer
+from threads.queries import plan_threads
 from books.serializers import BookSerializer
 from books.models import Category
+from books.queries import plan_books
 from dj_rest_auth.views import UserDetailsView
 from accounts.serializers import UserSimpleSerializer
 
@@ -24,11 +27,11 @@ def user_profile(request, user_login_id):
     user = get_object_or_404(User, username=user_login_id)
 
     # 사용자가 작성한 스레드 목록
-    threads = Thread.objects.filter(user=user)
-    thread_serializer = ThreadSerializer(threads, many=True)
+    threads = plan_threads(Thread.objects.filter(user=user))
+    thread_serializer = ThreadSerializer(threads, many=True, context={'request': request})
 
     # 사용자가 좋아요를 누른 도서 목록
-    liked_books = user.liked_books.all()
+    liked_books = plan_books(user.liked_books.all())
     liked_books_serializer = BookSerializer(liked_books, many=True, context={'request': request})
 
     # 사용자 기본 정보 시리얼라이징
@@ -82,18 +85,19 @@ def toggle_follow(request, user_login_id):
     if me == target_user:
         return Response({'error': '자기 자신은 팔로우할 수 없습니다.'}, status=400)
 
-    # 팔로우 상태에 따라 추가 또는 제거
-    if target_user in me.followings.all():
-        me.followings.remove(target_user)
-        followed = False
-    else:
-        me.followings.add(target_user)
-        followed = True
+    # 팔로우 관계 행 하나만 조건부로 추가 또는 제거하고, 상대의 팔로워 수와 내 팔로잉 수를 같은 트랜잭션에서 증감
+    followed = counters.toggle(me, 'followings', target_user.pk, [
+        (User, target_user.pk, 'followers_count'),
+        (User, me.pk, 'followings_count'),
+    ])
 
+    followers_count, followings_count = (
+        User.objects.values_list('followers_count', 'followings_count').get(pk=target_user.pk)
+    )
     return Response({
         'followed': followed,
-        'followers_count': target_user.followers.count(),
-        'followings_count': target_user.followings.count(),
+        'followers_count': followers_count,
+        'followings_count': followings_count,
         'is_following': followed
     })
 
@@ -0,0 +1,81 @@
+# blookin/counters.py
+
+from django.apps import apps
+from django.db import IntegrityError, router, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.signals import m2m_changed
+
+# 비정규화한 관계 수 컬럼: (모델, 카운터 필드, M2M 필드를 가진 모델, M2M 필드, 카운터 모델을 가리키는 관계 테이블 컬럼)
+COUNTERS = [
+    ('books.Book', 'likes_count', 'books.Book', 'liked_users', 'book'),
+    ('threads.Thread', 'likes_count', 'threads.Thread', 'likes', 'thread'),
+    ('accounts.CustomUser', 'followers_count', 'accounts.CustomUser', 'followings', 'to_customuser'),
+    ('accounts.CustomUser', 'followings_count', 'accounts.CustomUser', 'followings', 'from_customuser'),
+]
+
+
+# M2M 관계 행 하나를 토글 (좋아요, 팔로우)
+# 조건부 DELETE로 지운 행이 있으면 취소, 없으면 INSERT (동시에 같은 요청이 먼저 추가했다면 이미 추가된 것으로 처리)
+# 관계가 바뀐 경우에만 같은 트랜잭션에서 counters([(모델, pk, 카운터 필드)])를 F()로 1씩 증감하고,
+# m2m_changed(post_add/post_remove)를 보내 기존 수신자(추천 캐시 무효화 등)가 그대로 동작하게 함
+# 반환값: 토글 후 관계가 있는지 여부
+def toggle(instance, field_name, target_id, counters):
+    field = instance._meta.get_field(field_name)
+    through = field.remote_field.through
+    row = {f'{field.m2m_field_name()}_id': instance.pk, f'{field.m2m_reverse_field_name()}_id': target_id}
+    using = router.db_for_write(through, instance=instance)
+
+    with transaction.atomic(using=using):
+        if through.objects.using(using).filter(**row).delete()[0]:
+            added, delta = False, -1
+        else:
+            try:
+                with transaction.atomic(using=using):
+                    through.objects.using(using).create(**row)
+            except IntegrityError:
+                return True
+            added, delta = True, 1
+
+        for model, pk, counter in counters:
+            rows = model.objects.using(using).filter(pk=pk)
+            if delta < 0:
+                # 어긋난 카운터가 음수가 되지 않도록 (reconcile로 바로잡음)
+                rows = rows.filter(**{f'{counter}__gt': 0})
+            rows.update(**{counter: F(counter) + delta})
+
+        m2m_changed.send(
+            sender=through, action='post_add' if added else 'post_remove', instance=instance,
+            reverse=False, model=field.related_model, pk_set={target_id}, using=using,
+        )
+    return added
+
+
+# 관계 테이블에서 실제로 센 행 수 (카운터 모델 기준 상관 서브쿼리)
+def actual_count(owner, field_name, column):
+    through = apps.get_model(owner)._meta.get_field(field_name).remote_field.through
+    rows = (
+        through.objects
+        .filter(**{column: OuterRef('pk')})
+        .order_by()
+        .values(column)
+        .annotate(count=Count('*'))
+        .values('count')
+    )
+    return Coalesce(Subquery(rows), 0)
+
+
+# 카운터가 관계 테이블의 실제 행 수와 다른 행을 찾아 바로잡음 (dry_run이면 찾기만 함)
+# 반환값: {'모델.카운터 필드': 어긋난 행 수}
+def reconcile(dry_run=False):
+    drift = {}
+    for label, counter, owner, field_name, column in COUNTERS:
+        model = apps.get_model(label)
+        actual = actual_count(owner, field_name, column)
+        drifted = model.objects.annotate(actual=actual).exclude(**{counter: F('actual')}).values('pk')
+        with transaction.atomic():
+            pks = list(drifted.values_list('pk', flat=True))
+            if pks and not dry_run:
+                model.objects.filter(pk__in=pks).update(**{counter: actual})
+        drift[f'{label}.{counter}'] = len(pks)
+    return drift
@@ -0,0 +1,342 @@
+# blookin/like_buffer.py
+
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from functools import reduce
+from operator import or_
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+from django.db.models.signals import m2m_changed
+
+from . import counters
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+# 쓰기 지연(write-behind) 대상: 모델 → (M2M 필드, 비정규화 카운터 필드)
+FIELDS = {
+    'books.Book': ('liked_users', 'likes_count'),
+    'threads.Thread': ('likes', 'likes_count'),
+}
+
+
+# 좋아요/취소를 프로세스 메모리에 모아 두었다가 주기적으로 한 트랜잭션에서 DB에 반영하는 버퍼
+# 인기 도서·감상글에 좋아요가 몰려도 요청마다 SQLite 쓰기 잠금을 잡지 않음
+# - pending: {(모델, 객체 ID, 사용자 ID): [DB 상태, 원하는 상태]}, 같은 사용자가 되돌리면 항목 제거
+# - deltas: {(모델, 객체 ID): 아직 반영되지 않은 좋아요 수 변화}, 조회 시 DB 카운터에 더해 바로 보여 줌
+# 반영 중인 항목(flushing)도 커밋 전까지는 조회에 포함해 read-your-writes 유지
+# 버퍼는 프로세스 메모리에 있으므로 버퍼를 쓰는 프로세스는 하나뿐이어야 함 (claim_process 참고)
+class LikeBuffer:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.pending = {}
+        self.deltas = Counter()
+        self.flushing = {}
+        self.flushing_deltas = Counter()
+        self.flusher = None
+        self.metrics = {
+            'toggles': 0,
+            'flushes': 0,
+            'failures': 0,
+            'rows_written': 0,
+            'last_backlog': 0,
+            'last_flush_ms': 0.0,
+            'max_flush_ms': 0.0,
+            'total_flush_ms': 0.0,
+        }
+
+    # 버퍼에 기록된(또는 반영 중인) 좋아요 상태, 없으면 None
+    def _state(self, key):
+        entry = self.pending.get(key) or self.flushing.get(key)
+        return None if entry is None else entry[1]
+
+    # 좋아요 토글, 반환값: (토글 후 좋아요 여부, 버퍼를 포함한 좋아요 수)
+    # 버퍼를 끄면(LIKE_BUFFER_ENABLED=False) 바로 DB에 반영 (blookin.counters.toggle)
+    def toggle(self, instance, user_id):
+        model = type(instance)
+        label = model._meta.label
+        field_name, counter = FIELDS[label]
+        if not settings.LIKE_BUFFER_ENABLED:
+            liked = counters.toggle(instance, field_name, user_id, [(model, instance.pk, counter)])
+            return liked, model.objects.values_list(counter, flat=True).get(pk=instance.pk)
+
+        claim_process(settings.LIKE_BUFFER_LOCK_PATH)
+        key = (label, instance.pk, user_id)
+        with self.lock:
+            state = self._state(key)
+        if state is None:
+            # 버퍼에 없으면 DB의 현재 상태를 읽음 (읽기는 SQLite 쓰기 잠금과 무관)
+            field = model._meta.get_field(field_name)
+            state = field.remote_field.through.objects.filter(**{
+                f'{field.m2m_field_name()}_id': instance.pk,
+                f'{field.m2m_reverse_field_name()}_id': user_id,
+            }).exists()
+
+        with self.lock:
+            entry = self.pending.get(key)
+            if entry is None:
+                # 반영 중인 항목이 있으면 그 상태가 곧 DB 상태
+                current = self._state(key)
+                entry = [state if current is None else current, None]
+                entry[1] = entry[0]
+            liked = not entry[1]
+            entry[1] = liked
+            if entry[0] == entry[1]:
+                self.pending.pop(key, None)
+            else:
+                self.pending[key] = entry
+            self.deltas[(label, instance.pk)] += 1 if liked else -1
+            self.metrics['toggles'] += 1
+            backlog = len(self.pending)
+            delta = self.deltas[(label, instance.pk)] + self.flushing_deltas[(label, instance.pk)]
+            count = getattr(instance, counter) + delta
+
+        self._start_flusher()
+        if backlog >= settings.LIKE_BUFFER_MAX_PENDING:
+            # 대기 건수가 많으면 주기를 기다리지 않고 반영 (실패해도 변경은 버퍼에 남아 있으므로 응답은 그대로)
+            try:
+                self.flush()
+            except Exception:
+                logger.warning("[좋아요 버퍼] 대기 %d건 즉시 반영 실패, 다음 반영 때 다시 시도", backlog)
+        return liked, max(count, 0)
+
+    # 아직 DB에 반영되지 않은 좋아요 수 변화 (직렬화 시 DB 카운터에 더함)
+    def pending_delta(self, instance):
+        key = (type(instance)._meta.label, instance.pk)
+        with self.lock:
+            return self.deltas[key] + self.flushing_deltas[key]
+
+    # DB에서 읽은 사용자의 좋아요 객체 ID 집합에 버퍼의 변경을 덮어씀
+    def apply_pending(self, model, user_id, ids):
+        label = model._meta.label
+        ids = set(ids)
+        with self.lock:
+            for entries in (self.flushing, self.pending):
+                for (entry_label, obj_id, entry_user), (_, liked) in entries.items():
+                    if entry_label == label and entry_user == user_id:
+                        (ids.add if liked else ids.discard)(obj_id)
+        return ids
+
+    # 모인 변경을 한 트랜잭션에서 반영하고 반영한 관계 행 수를 반환
+    # 실패하면 변경을 버퍼로 되돌려 다음 flush에서 다시 시도
+    def flush(self):
+        with self.flush_lock:
+            with self.lock:
+                if not self.pending and not self.deltas:
+                    return 0
+                self.flushing, self.pending = self.pending, {}
+                self.flushing_deltas, self.deltas = self.deltas, Counter()
+                backlog = len(self.flushing)
+
+            started = time.perf_counter()
+            try:
+                written = self._write(self.flushing)
+            except Exception:
+                logger.exception("[좋아요 버퍼] 반영 실패, 대기 %d건을 다음에 다시 시도", backlog)
+                with self.lock:
+                    self._restore()
+                    self.metrics['failures'] += 1
+                raise
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+            with self.lock:
+                self.flushing = {}
+                self.flushing_deltas = Counter()
+                metrics = self.metrics
+                metrics['flushes'] += 1
+                metrics['rows_written'] += written
+                metrics['last_backlog'] = backlog
+                metrics['last_flush_ms'] = elapsed_ms
+                metrics['max_flush_ms'] = max(metrics['max_flush_ms'], elapsed_ms)
+                metrics['total_flush_ms'] += elapsed_ms
+                remaining = len(self.pending)
+            logger.info(
+                "[좋아요 버퍼] %d건 반영 (관계 행 %d개), %.1fms, 남은 대기 %d건",
+                backlog, written, elapsed_ms, remaining,
+            )
+            return written
+
+    # 반영에 실패한 항목을 버퍼로 되돌림 (그 사이 들어온 변경이 더 최신이므로 DB 상태만 이전 값으로 맞춤)
+    def _restore(self):
+        for key, (db_state, liked) in self.flushing.items():
+            newer = self.pending.get(key)
+            if newer is not None:
+                newer[0] = db_state
+                if newer[0] == newer[1]:
+                    del self.pending[key]
+            else:
+                self.pending[key] = [db_state, liked]
+        self.deltas.update(self.flushing_deltas)
+        self.flushing = {}
+        self.flushing_deltas = Counter()
+
+    # 모델별로 실제 관계 행을 조회해 추가/삭제할 행을 정하고, 객체별 변화량만큼 카운터를 한 번에 증감
+    def _write(self, entries):
+        by_label = defaultdict(dict)
+        for (label, obj_id, user_id), (_, liked) in entries.items():
+            by_label[label][(obj_id, user_id)] = liked
+
+        written = 0
+        with transaction.atomic():
+            for label, wanted in by_label.items():
+                written += self._write_model(apps.get_model(label), wanted)
+        return written
+
+    def _write_model(self, model, wanted):
+        field_name, counter = FIELDS[model._meta.label]
+        field = model._meta.get_field(field_name)
+        through = field.remote_field.through
+        source, target = f'{field.m2m_field_name()}_id', f'{field.m2m_reverse_field_name()}_id'
+
+        existing = set(through.objects.filter(**{
+            f'{source}__in': {obj_id for obj_id, _ in wanted},
+            f'{target}__in': {user_id for _, user_id in wanted},
+        }).values_list(source, target))
+        added = [pair for pair, liked in wanted.items() if liked and pair not in existing]
+        removed = [pair for pair, liked in wanted.items() if not liked and pair in existing]
+
+        through.objects.bulk_create(
+            [through(**{source: obj_id, target: user_id}) for obj_id, user_id in added],
+            batch_size=500, ignore_conflicts=True,
+        )
+        for start in range(0, len(removed), 300):
+            chunk = removed[start:start + 300]
+            through.objects.filter(reduce(or_, (Q(**{source: o, target: u}) for o, u in chunk))).delete()
+
+        # 변화량이 같은 객체끼리 묶어 UPDATE 한 번 (F() 증감, 어긋난 카운터가 음수가 되지 않도록)
+        deltas = Counter()
+        for obj_id, _ in added:
+            deltas[obj_id] += 1
+        for obj_id, _ in removed:
+            deltas[obj_id] -= 1
+        by_delta = defaultdict(list)
+        for obj_id, delta in deltas.items():
+            if delta:
+                by_delta[delta].append(obj_id)
+        for delta, obj_ids in by_delta.items():
+            model.objects.filter(pk__in=obj_ids).update(**{counter: Greatest(F(counter) + delta, 0)})
+
+        # 기존 m2m_changed 수신자(추천 캐시 무효화 등)에 반영된 변경을 알림
+        changes = defaultdict(lambda: {'post_add': set(), 'post_remove': set()})
+        for obj_id, user_id in added:
+            changes[obj_id]['post_add'].add(user_id)
+        for obj_id, user_id in removed:
+            changes[obj_id]['post_remove'].add(user_id)
+        instances = model.objects.only('pk').in_bulk(list(changes))
+        for obj_id, actions in changes.items():
+            for action, user_ids in actions.items():
+                if user_ids and obj_id in instances:
+                    m2m_changed.send(
+                        sender=through, action=action, instance=instances[obj_id], reverse=False,
+                        model=field.related_model, pk_set=user_ids, using=connection.alias,
+                    )
+        return len(added) + len(removed)
+
+    # LIKE_BUFFER_FLUSH_INTERVAL초마다 반영하는 백그라운드 스레드 시작 (프로세스당 한 번, 종료 시 남은 변경 반영)
+    def _start_flusher(self):
+        interval = settings.LIKE_BUFFER_FLUSH_INTERVAL
+        if not interval or self.flusher is not None:
+            return
+        with self.lock:
+            if self.flusher is not None:
+                return
+            self.flusher = threading.Thread(target=self._flush_loop, args=(interval,), name='like-buffer', daemon=True)
+            self.flusher.start()
+        atexit.register(self.flush)
+
+    def _flush_loop(self, interval):
+        while True:
+            time.sleep(interval)
+            try:
+                self.flush()
+            except Exception:
+                logger.warning("[좋아요 버퍼] 주기 반영 실패, 다음 주기에 다시 시도")
+            finally:
+                # 백그라운드 스레드가 연 DB 연결 정리
+                connection.close()
+
+    # 버퍼 상태와 반영 지표 (대기 건수, 반영 횟수·지연 시간)
+    def stats(self):
+        with self.lock:
+            metrics = dict(self.metrics)
+            metrics['pending'] = len(self.pending) + len(self.flushing)
+            metrics['pending_objects'] = len({
+                key for deltas in (self.deltas, self.flushing_deltas) for key, delta in deltas.items() if delta
+            })
+        flushes = metrics['flushes']
+        metrics['avg_flush_ms'] = round(metrics.pop('total_flush_ms') / flushes, 2) if flushes else 0.0
+        metrics['last_flush_ms'] = round(metrics['last_flush_ms'], 2)
+        metrics['max_flush_ms'] = round(metrics['max_flush_ms'], 2)
+        metrics['enabled'] = settings.LIKE_BUFFER_ENABLED
+        metrics['flush_interval'] = settings.LIKE_BUFFER_FLUSH_INTERVAL
+        return metrics
+
+
+# 버퍼를 사용하는 프로세스의 잠금 파일 (경로 → 열린 파일, 프로세스가 끝날 때까지 잠금 유지)
+_process_locks = {}
+_process_locks_lock = threading.Lock()
+
+
+def _lock(lock_file):
+    if fcntl is not None:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    else:
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+
+
+# 워커 프로세스가 여럿이면 다른 프로세스는 아직 반영되지 않은 좋아요를 모른 채 DB의 이전 상태로 토글해
+# 사용자가 방금 한 좋아요/취소를 되돌릴 수 있으므로, 잠금 파일을 잡은 프로세스 하나에서만 버퍼를 사용
+# (다른 프로세스가 잡고 있으면 ImproperlyConfigured, 여러 워커로 배포할 때는 LIKE_BUFFER_ENABLED = False)
+def claim_process(path):
+    path = str(path)
+    with _process_locks_lock:
+        if path in _process_locks:
+            return
+        lock_file = open(path, 'a+b')
+        try:
+            _lock(lock_file)
+        except OSError:
+            lock_file.close()
+            raise ImproperlyConfigured(
+                f"다른 프로세스가 좋아요 버퍼를 사용 중입니다 ({path}). "
+                "워커 프로세스가 여러 개라면 LIKE_BUFFER_ENABLED = False로 설정하세요."
+            )
+        _process_locks[path] = lock_file
+
+
+buffer = LikeBuffer()
+
+
+def toggle(instance, user_id):
+    return buffer.toggle(instance, user_id)
+
+
+def pending_delta(instance):
+    return buffer.pending_delta(instance)
+
+
+def apply_pending(model, user_id, ids):
+    return buffer.apply_pending(model, user_id, ids)
+
+
+def flush():
+    return buffer.flush()
+
+
+def stats():
+    return buffer.stats()
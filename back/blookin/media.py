@@ -0,0 +1,135 @@
+# blookin/media.py
+
+import mimetypes
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+# 내용이 바뀌면 이름도 바뀌는 파일 (TTS 해시, imagekit 축소본 해시, 커버 이미지 UUID)
+# 브라우저가 재검증 없이 1년간 캐시해도 됨
+HASHED_NAME = re.compile(
+    r'(?:^|/)(?:[0-9a-f]{32}|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})\.\w+$'
+)
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+# 그 밖의 파일(프로필 이미지 등)은 매번 ETag/Last-Modified로 재검증 (바뀌지 않았으면 304)
+REVALIDATE_CACHE_CONTROL = 'public, max-age=0, must-revalidate'
+
+RANGE_HEADER = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+# 파일의 일부(start부터 length바이트)만 읽는 래퍼
+# fileno()/tell()을 그대로 노출하므로 sendfile을 지원하는 WSGI 서버는 Content-Length만큼 커널에서 바로 전송
+class FileRange:
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        size = self.remaining if size is None or size < 0 else min(size, self.remaining)
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def tell(self):
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+# Range 헤더를 (시작, 끝) 바이트 위치로 변환 (끝 포함)
+# 헤더가 없거나 여러 구간이면 None(전체 전송), 범위를 벗어나면 ValueError
+def parse_range(header, size):
+    match = RANGE_HEADER.match(header.strip()) if header else None
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # 마지막 N바이트 (bytes=-500)
+        length = int(last)
+        if length == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+# If-Range가 현재 ETag 또는 Last-Modified와 일치할 때만 부분 전송 (파일이 바뀌었으면 전체 전송)
+def _if_range_matches(request, etag, mtime):
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        return if_range == etag
+    since = parse_http_date_safe(if_range)
+    return since is not None and int(mtime) <= since
+
+
+# MEDIA_ROOT 파일 제공: Range(206/416), ETag·Last-Modified 조건부 요청(304), 해시 파일명은 immutable 캐시
+@require_safe
+def serve(request, path):
+    # MEDIA_ROOT 밖을 가리키면 safe_join이 SuspiciousFileOperation(400)을 발생시킴
+    full_path = Path(safe_join(settings.MEDIA_ROOT, path))
+    try:
+        stat = full_path.stat()
+    except OSError:
+        raise Http404("파일이 없습니다.")
+    if not full_path.is_file():
+        raise Http404("파일이 없습니다.")
+
+    size = stat.st_size
+    etag = f'"{stat.st_mtime_ns:x}-{size:x}"'
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(stat.st_mtime),
+        'Accept-Ranges': 'bytes',
+        'Cache-Control': IMMUTABLE_CACHE_CONTROL if HASHED_NAME.search(path) else REVALIDATE_CACHE_CONTROL,
+    }
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if not_modified is not None:
+        for name, value in headers.items():
+            not_modified.headers.setdefault(name, value)
+        return not_modified
+
+    try:
+        byte_range = parse_range(request.META.get('HTTP_RANGE'), size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    content_type, encoding = mimetypes.guess_type(full_path.name)
+    content_type = content_type or 'application/octet-stream'
+    file = open(full_path, 'rb')
+    if byte_range is None or not _if_range_matches(request, etag, stat.st_mtime):
+        response = FileResponse(file, content_type=content_type)
+    else:
+        start, end = byte_range
+        response = FileResponse(FileRange(file, start, end - start + 1), status=206, content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+
+    for name, value in headers.items():
+        response[name] = value
+    if encoding:
+        response['Content-Encoding'] = encoding
+    return response
+
@@ -37,6 +37,11 @@ INSTALLED_APPS = [
     'accounts',
     'books',
     'threads',
+    'search',
+    'jobs',
+    'llm',
+    'trending',
+    'imagekit',
     'rest_framework',
     'rest_framework.authtoken',
     'dj_rest_auth',
@@ -117,6 +122,27 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # 개인화 추천 결과 캐시 (로컬 메모리, 가장 오래 사용되지 않은 항목부터 1%씩 제거)
+    # 워커 프로세스가 여러 개라면 무효화가 공유되도록 Redis/Memcached 백엔드로 교체
+    'recommendations': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'recommendations',
+        'TIMEOUT': 60 * 60 * 24,
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+            'CULL_FREQUENCY': 100,
+        },
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -171,9 +197,131 @@ ACCOUNT_EMAIL_REQUIRED = False
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# Django가 /media/를 직접 제공할지 여부 (기본값: 개발 환경(DEBUG)에서만)
+# 운영 환경에서는 웹 서버(nginx 등)가 MEDIA_ROOT를 제공하고, 꼭 필요할 때만 True로 설정
+SERVE_MEDIA = DEBUG
 
 REST_AUTH_REGISTER_SERIALIZERS = {
     'REGISTER_SERIALIZER': 'accounts.serializers.CustomRegisterSerializer'
 }
 
 ACCOUNT_ADAPTER = 'accounts.adapters.CustomAccountAdapter'
+
+# 도서 추천용 TF-IDF 인덱스 저장 위치 (manage.py build_recommender_index로 생성)
+RECOMMENDER_INDEX_DIR = BASE_DIR / 'recommender_index'
+
+# 인덱스 생성 이후 어휘 밖 토큰 비율이 이 값을 넘으면 전체 재학습
+RECOMMENDER_REFIT_DRIFT = 0.05
+
+# 도서/감상글 검색 백엔드: 'auto'(SQLite FTS5 사용 가능 시 FTS5), 'fts5', 'table'(이식형 토큰 테이블)
+SEARCH_BACKEND = 'auto'
+
+# 검색 결과 최대 개수 (필터·정렬 전 BM25 상위 결과)
+SEARCH_MAX_RESULTS = 1000
+
+# 추천 유사도 검색 방식: 'exact'(전체 채점 + argpartition) 또는 'ivf'(군집 기반 근사 검색)
+RECOMMENDER_SIMILARITY_BACKEND = 'exact'
+# IVF 군집 수 (None이면 √도서 수)와 질의마다 탐색할 군집 수
+RECOMMENDER_IVF_LISTS = None
+RECOMMENDER_IVF_PROBES = 16
+
+# DB 작업 큐 (manage.py run_jobs) 워커 수와 풀 종류('thread' 또는 'process')
+JOBS_WORKERS = 4
+JOBS_POOL = 'thread'
+# 대기 작업이 없을 때 확인 간격(초)
+JOBS_POLL_INTERVAL = 1.0
+# 최대 시도 횟수와 재시도 대기 시간(초, 시도마다 2배)
+JOBS_MAX_ATTEMPTS = 3
+JOBS_RETRY_BACKOFF = 30
+# 이 시간(초) 넘게 실행 중인 작업은 워커가 종료된 것으로 보고 다시 대기 상태로
+JOBS_STALE_AFTER = 600
+# 최종 실패한 작업을 다시 등록하기까지 기다리는 시간(초)
+JOBS_RETRY_COOLDOWN = 60 * 60
+# 작업 이름별 최대 동시 실행 수 (한도에 도달하면 다른 작업을 먼저 처리)
+JOBS_CONCURRENCY = {
+    'threads.generate_cover': 2,
+    'books.render_tts': 2,
+}
+
+# 작가 정보 수집에 사용하는 위키백과 주소 (벤치마크·테스트에서는 로컬 스텁 서버로 교체)
+WIKIPEDIA_API_URL = 'https://ko.wikipedia.org/w/api.php'
+WIKIPEDIA_PAGE_URL = 'https://ko.wikipedia.org/wiki/'
+# 요청별 타임아웃(초)과 동시 요청 수
+AUTHOR_FETCH_TIMEOUT = 5
+AUTHOR_FETCH_CONCURRENCY = 8
+
+# 작가 캐시(books.Author) 유효 기간(초), 지나면 위키백과/GPT를 다시 조회
+AUTHOR_CACHE_TTL = 30 * 24 * 60 * 60
+# GPT가 '정보 없음'으로 답한 작가의 유효 기간(초), 일시적인 실패가 한 달 동안 남지 않도록 짧게 유지
+AUTHOR_CACHE_NEGATIVE_TTL = 60 * 60
+
+# GPT 응답 캐시(llm.cache) 사용 여부와 저장할 응답 본문의 최대 총 크기(바이트)
+LLM_CACHE_ENABLED = True
+LLM_CACHE_MAX_BYTES = 20 * 1024 * 1024
+
+# 도서 일괄 보완(manage.py enrich_catalog)의 외부 서비스별 초당 요청 수와 체크포인트 파일
+ENRICH_RATE_LIMITS = {
+    'wikipedia': 10,
+    'openai': 3,
+    'gtts': 2,
+}
+ENRICH_CHECKPOINT_PATH = BASE_DIR / 'enrich_catalog_checkpoint.json'
+
+# 감상글 AI 커버 생성: OpenAI 요청과 이미지 다운로드 타임아웃(초), 다운로드 최대 크기(바이트)
+THREAD_COVER_TIMEOUT = 60
+THREAD_COVER_MAX_BYTES = 10 * 1024 * 1024
+
+# 도서 소개 음성(TTS) 합성 백엔드와 언어, 조각 길이(글자 수), 조각 동시 합성 수
+# 테스트·오프라인 개발에서는 'books.tts.StubBackend' 사용
+TTS_BACKEND = 'books.tts.GTTSBackend'
+TTS_LANG = 'ko'
+TTS_CHUNK_CHARS = 200
+TTS_CONCURRENCY = 4
+
+# 알라딘 상품 리스트 API (manage.py ingest_bestsellers), 테스트에서는 로컬 스텁 서버로 교체
+ALADIN_API_URL = 'http://www.aladin.co.kr/ttb/api/ItemList.aspx'
+ALADIN_TTB_KEY = os.getenv("ALADIN_TTB_KEY")
+# 요청별 타임아웃(초)과 동시 요청 수, 수집 진행 상황 체크포인트 파일
+ALADIN_FETCH_TIMEOUT = 10
+ALADIN_FETCH_CONCURRENCY = 4
+INGEST_CHECKPOINT_PATH = BASE_DIR / 'ingest_bestsellers_checkpoint.json'
+
+# 좋아요 쓰기 지연 버퍼(blookin.like_buffer): 사용 여부, 반영 주기(초, None이면 백그라운드 반영 안 함),
+# 대기 건수가 이 값을 넘으면 주기를 기다리지 않고 바로 반영
+# 버퍼는 프로세스 메모리에 있으므로 한 프로세스(runserver 등)에서만 사용 가능, 잠금 파일로 두 번째 프로세스를 막음
+# (gunicorn 등으로 워커 프로세스를 여러 개 띄우면 LIKE_BUFFER_ENABLED = False)
+LIKE_BUFFER_ENABLED = True
+LIKE_BUFFER_FLUSH_INTERVAL = 1.0
+LIKE_BUFFER_MAX_PENDING = 5000
+LIKE_BUFFER_LOCK_PATH = BASE_DIR / 'like_buffer.lock'
+
+# 팔로잉 피드(threads.feed): 팔로워가 이 수 이상인 작성자의 글은 피드에 기록하지 않고 읽을 때 조회,
+# 팔로워 피드에 기록할 때 한 번에 INSERT하는 행 수, 새로 팔로우할 때 채우는 최근 감상글 수
+FEED_CELEBRITY_FOLLOWERS = 1000
+FEED_FANOUT_BATCH_SIZE = 1000
+FEED_BACKFILL_LIMIT = 100
+
+# 인기 도서·감상글(trending.engine): 점수 반감기(초), 이벤트별 가중치,
+# 이 값 아래로 감쇠한 점수는 삭제, 순위에 두는 최대 개수, 순위 스냅숏 갱신 주기(초)와 백그라운드 갱신 여부
+TRENDING_HALF_LIFE = 24 * 60 * 60
+TRENDING_WEIGHTS = {
+    'like': 1.0,
+    'thread': 3.0,
+    'comment': 2.0,
+}
+TRENDING_MIN_SCORE = 0.05
+TRENDING_SIZE = 100
+TRENDING_REFRESH_INTERVAL = 60
+TRENDING_REFRESH_IN_BACKGROUND = True
+
+# 협업 필터링 추천(books.cf_model, manage.py train_cf_model): 모델 저장 디렉터리,
+# 상호작용 종류별 값(신뢰도 1 + alpha·값), 요인 수, ALS 반복 횟수, 정규화 계수
+CF_MODEL_DIR = BASE_DIR / 'recommender_cf'
+CF_INTERACTION_WEIGHTS = {
+    'likes': 1.0,
+    'threads': 2.0,
+}
+CF_ALPHA = 20.0
+CF_FACTORS = 32
+CF_ITERATIONS = 10
+CF_REGULARIZATION = 0.1
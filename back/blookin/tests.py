@@ -0,0 +1,339 @@
+import datetime
+import importlib
+import tempfile
+import threading
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.db.models import QuerySet
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import clear_url_caches
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+
+from books.models import Book, Category
+from threads.models import Thread
+from . import counters, like_buffer, urls
+from .media import parse_range
+
+AUDIO = bytes(range(256)) * 40
+
+
+# /media/ 파일 제공: Range, 조건부 요청, 캐시 헤더
+class MediaServeTestCase(TestCase):
+    def setUp(self):
+        self.media_root = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.enterContext(self.settings(MEDIA_ROOT=self.media_root))
+        (self.media_root / 'tts').mkdir()
+        (self.media_root / 'profile_image').mkdir()
+        self.audio_url = '/media/tts/0123456789abcdef0123456789abcdef.mp3'
+        (self.media_root / 'tts' / '0123456789abcdef0123456789abcdef.mp3').write_bytes(AUDIO)
+        (self.media_root / 'profile_image' / 'me.jpg').write_bytes(b'jpeg')
+
+    def get(self, url, **headers):
+        response = self.client.get(url, **headers)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, body
+
+    def test_full_file(self):
+        response, body = self.get(self.audio_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, AUDIO)
+        self.assertEqual(response['Content-Type'], 'audio/mpeg')
+        self.assertEqual(response['Content-Length'], str(len(AUDIO)))
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        # 해시 파일명은 재검증 없이 캐시
+        self.assertIn('immutable', response['Cache-Control'])
+
+    def test_range_requests(self):
+        response, body = self.get(self.audio_url, HTTP_RANGE='bytes=100-199')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(body, AUDIO[100:200])
+        self.assertEqual(response['Content-Range'], f'bytes 100-199/{len(AUDIO)}')
+        self.assertEqual(response['Content-Length'], '100')
+
+        response, body = self.get(self.audio_url, HTTP_RANGE='bytes=10000-')
+        self.assertEqual(body, AUDIO[10000:])
+        response, body = self.get(self.audio_url, HTTP_RANGE='bytes=-16')
+        self.assertEqual(body, AUDIO[-16:])
+
+        response, _ = self.get(self.audio_url, HTTP_RANGE=f'bytes={len(AUDIO)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(AUDIO)}')
+
+    def test_if_range_mismatch_sends_full_file(self):
+        response, body = self.get(self.audio_url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, AUDIO)
+
+        etag = self.get(self.audio_url)[0]['ETag']
+        response, body = self.get(self.audio_url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=etag)
+        self.assertEqual((response.status_code, body), (206, AUDIO[:10]))
+
+    def test_conditional_requests(self):
+        first, _ = self.get('/media/profile_image/me.jpg')
+        self.assertIn('must-revalidate', first['Cache-Control'])
+
+        response, body = self.get('/media/profile_image/me.jpg', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual((response.status_code, body), (304, b''))
+        self.assertEqual(response['ETag'], first['ETag'])
+
+        response, _ = self.get('/media/profile_image/me.jpg', HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+        response, _ = self.get('/media/profile_image/me.jpg', HTTP_IF_MODIFIED_SINCE=http_date(0))
+        self.assertEqual(response.status_code, 200)
+
+    def test_missing_and_outside_paths(self):
+        self.assertEqual(self.client.get('/media/tts/none.mp3').status_code, 404)
+        self.assertEqual(self.client.get('/media/../manage.py').status_code, 400)
+        self.assertEqual(self.client.get('/media/tts/').status_code, 404)
+        self.assertEqual(self.client.post(self.audio_url).status_code, 405)
+
+    # SERVE_MEDIA가 꺼져 있으면 (운영 환경 기본값) /media/ 경로를 등록하지 않음
+    def test_not_served_when_disabled(self):
+        def reload_urls():
+            importlib.reload(urls)
+            clear_url_caches()
+
+        self.addCleanup(reload_urls)
+        with self.settings(SERVE_MEDIA=False):
+            reload_urls()
+            self.assertEqual(self.client.get(self.audio_url).status_code, 404)
+        reload_urls()
+        self.assertEqual(self.client.get(self.audio_url).status_code, 200)
+
+    def test_parse_range(self):
+        self.assertIsNone(parse_range(None, 100))
+        self.assertIsNone(parse_range('bytes=0-1,5-6', 100))
+        self.assertEqual(parse_range('bytes=90-200', 100), (90, 99))
+        self.assertEqual(parse_range('bytes=-200', 100), (0, 99))
+        with self.assertRaises(ValueError):
+            parse_range('bytes=5-1', 100)
+
+
+# 좋아요·팔로우 토글: 조건부 INSERT/DELETE와 비정규화 카운터 (좋아요 버퍼 없이 바로 반영)
+@override_settings(LIKE_BUFFER_ENABLED=False)
+class CounterToggleTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.me = User.objects.create_user(username='me', password='pw')
+        cls.other = User.objects.create_user(username='other', password='pw')
+        cls.book = Book.objects.create(
+            category=Category.objects.create(name='문학'), title='도서', description='설명', isbn='1',
+            cover='https://example.com/c.jpg', publisher='출판사', pub_date=datetime.date(2024, 1, 1),
+            author='저자', author_info='소개', customer_review_rank=0, subTitle='',
+        )
+        cls.thread = Thread.objects.create(title='감상', content='내용', book=cls.book, user=cls.other)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.me)
+
+    def post(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(url)
+        # 관계 테이블을 세지 않고 카운터 컬럼만 읽음
+        self.assertFalse([q['sql'] for q in queries if 'COUNT(' in q['sql'].upper()])
+        return response
+
+    def test_book_like(self):
+        with mock.patch('books.recommendation_cache.invalidate') as invalidate:
+            self.assertEqual(self.post(f'/api/books/{self.book.pk}/like/').json(), {'liked': True, 'likes_count': 1})
+        # m2m_changed 수신자(추천 캐시 무효화)도 그대로 호출됨
+        invalidate.assert_called_once_with(self.me.pk, ['likes', 'cf'])
+        self.assertTrue(self.book.liked_users.filter(pk=self.me.pk).exists())
+
+        self.assertEqual(self.post(f'/api/books/{self.book.pk}/like/').json(), {'liked': False, 'likes_count': 0})
+        self.assertFalse(self.book.liked_users.exists())
+
+    def test_thread_like(self):
+        self.assertEqual(self.post(f'/api/threads/{self.thread.pk}/like/').json(), {'liked': True, 'likes_count': 1})
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.post(f'/api/threads/{self.thread.pk}/like/').json(), {'liked': True, 'likes_count': 2})
+        data = self.client.get(f'/api/threads/{self.thread.pk}/').json()
+        self.assertEqual(data['likes_count'], 2)
+
+    def test_follow(self):
+        data = self.post('/api/accounts/other/follow/').json()
+        self.assertEqual((data['followed'], data['followers_count'], data['followings_count']), (True, 1, 0))
+        User = get_user_model()
+        self.assertEqual(User.objects.get(pk=self.me.pk).followings_count, 1)
+
+        data = self.post('/api/accounts/other/follow/').json()
+        self.assertEqual((data['followed'], data['followers_count']), (False, 0))
+        self.assertEqual(User.objects.get(pk=self.me.pk).followings_count, 0)
+        self.assertEqual(self.client.post('/api/accounts/me/follow/').status_code, 400)
+
+    def test_concurrent_insert_is_not_counted_twice(self):
+        # 조건부 DELETE와 INSERT 사이에 다른 요청이 먼저 추가한 경우
+        with mock.patch.object(QuerySet, 'create', side_effect=IntegrityError):
+            liked = counters.toggle(self.book, 'liked_users', self.me.pk, [(Book, self.book.pk, 'likes_count')])
+        self.assertTrue(liked)
+        self.assertEqual(Book.objects.get(pk=self.book.pk).likes_count, 0)
+
+    def test_counter_never_goes_negative(self):
+        self.book.liked_users.add(self.me)
+        liked = counters.toggle(self.book, 'liked_users', self.me.pk, [(Book, self.book.pk, 'likes_count')])
+        self.assertFalse(liked)
+        self.assertEqual(Book.objects.get(pk=self.book.pk).likes_count, 0)
+
+    def test_reconcile(self):
+        # 관계를 직접 바꾸면 카운터가 어긋남
+        self.book.liked_users.add(self.me, self.other)
+        self.thread.likes.add(self.me)
+        self.me.followings.add(self.other)
+        Book.objects.filter(pk=self.book.pk).update(likes_count=7)
+
+        out = StringIO()
+        call_command('reconcile_counters', dry_run=True, stdout=out)
+        self.assertIn('books.Book.likes_count: 1건 어긋남', out.getvalue())
+        self.assertEqual(Book.objects.get(pk=self.book.pk).likes_count, 7)
+
+        self.assertEqual(counters.reconcile(), {
+            'books.Book.likes_count': 1,
+            'threads.Thread.likes_count': 1,
+            'accounts.CustomUser.followers_count': 1,
+            'accounts.CustomUser.followings_count': 1,
+        })
+        self.assertEqual(Book.objects.get(pk=self.book.pk).likes_count, 2)
+        self.assertEqual(Thread.objects.get(pk=self.thread.pk).likes_count, 1)
+        other = get_user_model().objects.get(pk=self.other.pk)
+        self.assertEqual((other.followers_count, other.followings_count), (1, 0))
+        self.assertEqual(sum(counters.reconcile().values()), 0)
+
+
+# 좋아요 쓰기 지연 버퍼: 즉시 응답(read-your-writes)하고 flush 때 한 트랜잭션으로 반영
+@override_settings(LIKE_BUFFER_ENABLED=True, LIKE_BUFFER_FLUSH_INTERVAL=None)
+class LikeBufferTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.users = User.objects.bulk_create([User(username=f'user{i}') for i in range(20)])
+        cls.book = Book.objects.create(
+            category=Category.objects.create(name='문학'), title='도서', description='설명', isbn='1',
+            cover='https://example.com/c.jpg', publisher='출판사', pub_date=datetime.date(2024, 1, 1),
+            author='저자', author_info='소개', customer_review_rank=0, subTitle='',
+        )
+        cls.thread = Thread.objects.create(title='감상', content='내용', book=cls.book, user=cls.users[0])
+
+    def setUp(self):
+        self.buffer = like_buffer.LikeBuffer()
+        self.enterContext(mock.patch.object(like_buffer, 'buffer', self.buffer))
+        self.lock_path = Path(self.enterContext(tempfile.TemporaryDirectory())) / 'like_buffer.lock'
+        self.enterContext(self.settings(LIKE_BUFFER_LOCK_PATH=self.lock_path))
+
+    def like(self, user, url):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client.post(url).json()
+
+    def test_read_your_writes_before_flush(self):
+        me = self.users[1]
+        self.assertEqual(self.like(me, f'/api/books/{self.book.pk}/like/'), {'liked': True, 'likes_count': 1})
+        # 아직 DB에는 반영되지 않음
+        self.assertFalse(self.book.liked_users.exists())
+        self.assertEqual(Book.objects.get(pk=self.book.pk).likes_count, 0)
+
+        client = APIClient()
+        client.force_authenticate(me)
+        data = client.get(f'/api/books/{self.book.pk}/').json()
+        self.assertEqual((data['likes_count'], data['is_liked']), (1, True))
+
+        with mock.patch('books.recommendation_cache.invalidate') as invalidate:
+            self.assertEqual(self.buffer.flush(), 1)
+        invalidate.assert_called_once_with(me.pk, ['likes', 'cf'])
+        self.assertTrue(self.book.liked_users.filter(pk=me.pk).exists())
+        self.assertEqual(Book.objects.get(pk=self.book.pk).likes_count, 1)
+
+        stats = self.buffer.stats()
+        self.assertEqual((stats['toggles'], stats['flushes'], stats['rows_written'], stats['pending']), (1, 1, 1, 0))
+        self.assertEqual(stats['last_backlog'], 1)
+
+        # 반영 후 취소도 버퍼를 거침
+        self.assertEqual(self.like(me, f'/api/books/{self.book.pk}/like/'), {'liked': False, 'likes_count': 0})
+        self.buffer.flush()
+        self.assertFalse(self.book.liked_users.exists())
+
+    def test_reverted_toggles_are_not_written(self):
+        for _ in range(4):
+            self.buffer.toggle(self.thread, self.users[1].pk)
+        self.assertEqual(self.buffer.stats()['pending'], 0)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.buffer.flush(), 0)
+        self.assertFalse([q for q in queries if 'INSERT' in q['sql'] or 'DELETE' in q['sql']])
+
+    def test_flush_queries_do_not_grow_with_likes(self):
+        query_counts = []
+        for users in (self.users[:5], self.users[5:]):
+            for user in users:
+                self.buffer.toggle(Thread.objects.get(pk=self.thread.pk), user.pk)
+            with CaptureQueriesContext(connection) as queries:
+                self.buffer.flush()
+            query_counts.append(len(queries))
+        self.assertEqual(query_counts[0], query_counts[1])
+        thread = Thread.objects.get(pk=self.thread.pk)
+        self.assertEqual((thread.likes_count, thread.likes.count()), (20, 20))
+
+    def test_failed_flush_is_retried(self):
+        self.buffer.toggle(self.book, self.users[1].pk)
+        with mock.patch.object(self.buffer, '_write_model', side_effect=RuntimeError('disk full')):
+            with self.assertLogs('blookin.like_buffer', 'ERROR'), self.assertRaises(RuntimeError):
+                self.buffer.flush()
+        self.assertEqual(self.buffer.stats()['failures'], 1)
+        self.assertEqual(self.buffer.pending_delta(self.book), 1)
+
+        self.buffer.flush()
+        self.assertEqual(Book.objects.get(pk=self.book.pk).likes_count, 1)
+        self.assertEqual(self.buffer.pending_delta(self.book), 0)
+
+    @override_settings(LIKE_BUFFER_MAX_PENDING=3)
+    def test_flushes_when_backlog_is_full(self):
+        for user in self.users[:3]:
+            self.buffer.toggle(self.book, user.pk)
+        self.assertEqual(self.buffer.stats()['flushes'], 1)
+        self.assertEqual(self.book.liked_users.count(), 3)
+
+    # 즉시 반영이 실패해도 토글은 버퍼에 남고 경고를 남김
+    @override_settings(LIKE_BUFFER_MAX_PENDING=1)
+    def test_failed_backlog_flush_is_logged(self):
+        with mock.patch.object(self.buffer, '_write_model', side_effect=RuntimeError('disk full')):
+            with self.assertLogs('blookin.like_buffer', 'WARNING') as logs:
+                self.assertEqual(self.buffer.toggle(self.book, self.users[1].pk), (True, 1))
+        self.assertTrue(any('즉시 반영 실패' in line for line in logs.output))
+        self.assertEqual(self.buffer.pending_delta(self.book), 1)
+
+    # 다른 프로세스가 잠금 파일을 잡고 있으면 버퍼를 쓰지 않고 설정 오류
+    def test_second_process_is_refused(self):
+        with open(self.lock_path, 'a+b') as other_process:
+            like_buffer._lock(other_process)
+            with self.assertRaises(ImproperlyConfigured):
+                self.buffer.toggle(self.book, self.users[1].pk)
+        self.assertEqual(self.buffer.stats()['pending'], 0)
+
+    def test_concurrent_toggle_storm(self):
+        # 사용자 20명이 동시에 좋아요를 누르고, 짝수 번호 사용자는 바로 취소
+        def storm(user):
+            try:
+                self.buffer.toggle(self.book, user.pk)
+                if user.username[-1] in '02468':
+                    self.buffer.toggle(self.book, user.pk)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=storm, args=(user,)) for user in self.users]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.buffer.pending_delta(self.book), 10)
+        self.buffer.flush()
+        book = Book.objects.get(pk=self.book.pk)
+        self.assertEqual((book.likes_count, book.liked_users.count()), (10, 10))
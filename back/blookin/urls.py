@@ -1,9 +1,9 @@
 # blookin/urls.py
 
 from django.contrib import admin
-from django.urls import path, include
-from django.conf.urls.static import static
+from django.urls import path, re_path, include
 from django.conf import settings
+from . import media
 
 urlpatterns = [
     # Django 관리자 페이지 URL
@@ -25,5 +25,9 @@ urlpatterns = [
     path("api/threads/", include("threads.urls")),
 ]
 
-# 미디어 파일 URL 설정 (프로필 이미지 등 정적 파일 제공)
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# 미디어 파일 (프로필 이미지, 감상글 커버, TTS 음성) 제공, Range·조건부 요청 지원
+# SERVE_MEDIA가 켜진 경우(기본값: DEBUG)에만 등록, 운영 환경에서는 웹 서버가 제공
+if settings.SERVE_MEDIA:
+    urlpatterns.append(
+        re_path(rf"^{settings.MEDIA_URL.lstrip('/')}(?P<path>.+)$", media.serve),
+    )
@@ -0,0 +1,105 @@
+# books/aladin.py
+
+from datetime import date, datetime
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# 알라딘 카테고리 이름에 포함된 키워드 → Category ID (books/fixtures/categories.json)
+CATEGORY_MAPPING = {
+    "소설": 1,
+    "시": 1,
+    "희곡": 1,
+    "경제": 2,
+    "경영": 2,
+    "자기계발": 3,
+    "자기 계발": 3,
+    "인문": 4,
+    "교양": 4,
+    "취미": 5,
+    "실용": 5,
+    "어린이": 6,
+    "청소년": 6,
+    "과학": 7,
+}
+
+# 알라딘 상품 리스트 API 한 번 요청의 최대 결과 수
+PAGE_SIZE = 50
+
+# 알라딘에서 가져오는 도서 필드 (다시 수집할 때 이 필드만 갱신하고 작가 정보·TTS 음성은 유지)
+CATALOG_FIELDS = [
+    'category', 'title', 'description', 'cover', 'publisher',
+    'pub_date', 'author', 'customer_review_rank', 'subTitle',
+]
+
+
+def map_category(category_name):
+    for keyword, pk in CATEGORY_MAPPING.items():
+        if keyword in category_name:
+            return pk
+    return None
+
+
+# 알라딘 상품 항목 하나를 Book 필드로 변환 (카테고리를 알 수 없거나 ISBN이 없으면 None)
+def to_book_fields(item):
+    category_id = map_category(item.get("categoryName", ""))
+    isbn = (item.get("isbn13") or "").strip()
+    if not category_id or not isbn:
+        return None
+
+    try:
+        pub_date = datetime.strptime(item.get("pubDate", ""), "%Y-%m-%d").date()
+    except ValueError:
+        pub_date = date(2000, 1, 1)
+
+    return {
+        "category_id": category_id,
+        "title": item.get("title", "")[:200],
+        "description": item.get("description", "")[:1000],
+        "isbn": isbn,
+        "cover": item.get("cover", ""),
+        "publisher": item.get("publisher", "")[:100],
+        "pub_date": pub_date,
+        "author": item.get("author", "")[:100],
+        "customer_review_rank": float(item.get("customerReviewRank") or 0),
+        "subTitle": item.get("subTitle", "")[:100],
+    }
+
+
+# 알라딘 상품 리스트 API 클라이언트
+# 하나의 requests.Session(keep-alive 연결 풀)을 여러 스레드가 공유하며 페이지를 동시에 요청
+class AladinClient:
+    def __init__(self, api_url=None, ttb_key=None, timeout=None, max_workers=None):
+        self.api_url = api_url or settings.ALADIN_API_URL
+        self.ttb_key = ttb_key or settings.ALADIN_TTB_KEY
+        self.timeout = timeout or settings.ALADIN_FETCH_TIMEOUT
+        max_workers = max_workers or settings.ALADIN_FETCH_CONCURRENCY
+
+        self.session = requests.Session()
+        # 일시적인 오류(429, 5xx)는 짧은 백오프로 재시도, 연결은 동시 요청 수만큼 유지
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=max_workers,
+            max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def close(self):
+        self.session.close()
+
+    # 목록(query_type)의 page번째 페이지 상품 항목들 (start는 1부터 시작하는 페이지 번호)
+    def items(self, page, query_type='Bestseller'):
+        res = self.session.get(self.api_url, params={
+            "ttbkey": self.ttb_key,
+            "QueryType": query_type,
+            "MaxResults": PAGE_SIZE,
+            "start": page,
+            "SearchTarget": "Book",
+            "output": "js",
+            "Version": "20131101",
+        }, timeout=self.timeout)
+        res.raise_for_status()
+        return res.json().get("item", [])
@@ -5,3 +5,19 @@ from django.apps import AppConfig
 class BooksConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'books'
+
+    def ready(self):
+        from django.db.models.signals import post_save, post_delete, m2m_changed
+        from threads.models import Thread
+        from .models import Book
+        from . import recommender_index, recommendation_cache
+        from . import signals  # noqa: F401  새 도서 작가 정보 보완 작업 등록 (enrich_book_data)
+
+        # 도서 추가/수정/삭제 시 추천 인덱스를 한 권 단위로 갱신
+        post_save.connect(recommender_index.on_book_saved, sender=Book, dispatch_uid='recommender_index_saved')
+        post_delete.connect(recommender_index.on_book_deleted, sender=Book, dispatch_uid='recommender_index_deleted')
+
+        # 좋아요 토글, 감상글 작성/삭제 시 해당 사용자의 추천 캐시 무효화
+        m2m_changed.connect(recommendation_cache.on_likes_changed, sender=Book.liked_users.through, dispatch_uid='recommendation_cache_likes')
+        post_save.connect(recommendation_cache.on_thread_changed, sender=Thread, dispatch_uid='recommendation_cache_thread_saved')
+        post_delete.connect(recommendation_cache.on_thread_changed, sender=Thread, dispatch_uid='recommendation_cache_thread_deleted')
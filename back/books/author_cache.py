@@ -0,0 +1,171 @@
+# books/author_cache.py
+
+import logging
+import re
+import unicodedata
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import utils
+from .author_fetcher import get_fetcher
+from .models import Author
+
+logger = logging.getLogger(__name__)
+
+# 알라딘 등의 저자 표기에 붙는 역할 표시 ("한강 (지은이)", "홍길동 옮김")
+ROLE_MARKERS = re.compile(r'\s*\((?:지은이|옮긴이|엮은이|그림|글|감수|편|저|역)\)|\s+(?:지음|옮김|엮음)$')
+
+# 위키백과 조회 한 번에 보내는 요청 수 (문서 요약, 이미지, HTML)
+WIKI_CALLS = 3
+
+# GPT가 작가를 찾지 못했거나 응답을 해석하지 못했을 때의 작가 소개
+PLACEHOLDER = '정보 없음'
+
+
+# 캐시 조회 키: 유니코드 정규화, 역할 표시 제거, 공백·쉼표 정리, 대소문자 무시
+def normalize_name(name):
+    name = unicodedata.normalize('NFKC', name or '')
+    name = ROLE_MARKERS.sub('', name)
+    name = re.sub(r'\s*,\s*', ', ', name)
+    return ' '.join(name.split()).casefold()
+
+
+def _is_placeholder(author):
+    return author.author_info.strip() == PLACEHOLDER
+
+
+# 작가 소개가 '정보 없음'이면 짧은 유효 기간(AUTHOR_CACHE_NEGATIVE_TTL) 뒤에 다시 조회
+def _is_fresh(author):
+    if author.fetched_at is None:
+        return False
+    ttl = settings.AUTHOR_CACHE_NEGATIVE_TTL if _is_placeholder(author) else settings.AUTHOR_CACHE_TTL
+    return author.fetched_at >= timezone.now() - timedelta(seconds=ttl)
+
+
+def _get_or_create(name):
+    key = normalize_name(name)
+    author = Author.objects.filter(normalized_name=key).first()
+    if author is None:
+        try:
+            with transaction.atomic():
+                author = Author.objects.create(name=name, normalized_name=key)
+        except IntegrityError:
+            # 같은 작가를 동시에 처음 조회한 경우
+            author = Author.objects.get(normalized_name=key)
+    return author
+
+
+def _record_hit(author):
+    Author.objects.filter(pk=author.pk).update(hits=F('hits') + 1)
+
+
+def _record_fetch(author, calls):
+    Author.objects.filter(pk=author.pk).update(fetches=F('fetches') + 1, external_calls=F('external_calls') + calls)
+
+
+# limits(books.rate_limit.RateLimits)가 주어지면 외부 호출 전에 서비스별 토큰을 획득
+def _throttle(limits, upstream, calls=1):
+    if limits is not None:
+        limits.acquire(upstream, calls)
+
+
+# 위키백과에서 요약·이미지·대표작을 다시 가져와 저장 (GPT 정리 결과는 비움)
+# 네트워크 오류는 그대로 전달 (저장된 캐시는 바뀌지 않음)
+# 반환값: 외부 호출 횟수
+def _fetch_wiki(author, limits=None):
+    _throttle(limits, 'wikipedia', WIKI_CALLS)
+    summary, photo_url, major_works = get_fetcher().fetch(author.name)
+    author.summary = summary or ''
+    author.photo_url = photo_url
+    author.major_works = major_works
+    author.author_info = ''
+    author.author_works = ''
+    author.fetched_at = timezone.now()
+    author.save(update_fields=[
+        'summary', 'photo_url', 'major_works', 'author_info', 'author_works', 'fetched_at',
+    ])
+    return WIKI_CALLS
+
+
+# 캐시를 거치는 위키백과 조회: (요약, 이미지 URL, 대표작 목록), GPT는 호출하지 않음
+# 위키백과 문서가 없는 작가는 보완 작업이 GPT로 만든 소개와 대표작이 있으면 반환 (없으면 빈 값)
+# 위키백과 요청이 실패하면 만료된 캐시라도 있는 그대로 반환
+def author_data(name):
+    author = _get_or_create(name)
+    if _is_fresh(author):
+        _record_hit(author)
+    else:
+        try:
+            _record_fetch(author, _fetch_wiki(author))
+        except requests.RequestException as e:
+            logger.warning("[작가 위키백과 조회 오류] %s: %s", name, e)
+
+    if author.summary:
+        return author.summary, author.photo_url, author.major_works
+    works = [work for work in author.author_works.split(", ") if work]
+    return author.author_info, None, works
+
+
+# 도서 화면에 보여 줄 작가 소개·대표작(GPT 정리 결과)까지 채운 Author 반환
+# 캐시가 유효하면 외부 호출 없이, 아니면 위키백과 조회 후 GPT로 정리 (문서가 없으면 GPT로 작가 소개 생성)
+# 지난 결과가 '정보 없음'이었으면 LLM 캐시를 건너뛰고 GPT에 다시 요청
+def author_profile(name, book_title, limits=None):
+    author = _get_or_create(name)
+    if _is_fresh(author) and author.author_info:
+        _record_hit(author)
+        return author
+
+    refresh = _is_placeholder(author)
+    calls = 0
+    if not _is_fresh(author):
+        calls += _fetch_wiki(author, limits)
+    if not author.author_info:
+        _throttle(limits, 'openai')
+        if author.summary:
+            gpt_result = utils.call_openai(
+                book_title, author.name, author.summary, author.major_works, refresh=refresh,
+            )
+        else:
+            gpt_result = utils.get_ai_summary_fallback(author.name, refresh=refresh)
+        calls += 1
+        author.author_info = gpt_result.get("author_info") or ''
+        author.author_works = gpt_result.get("author_works") or ''
+        author.save(update_fields=['author_info', 'author_works'])
+    _record_fetch(author, calls)
+    return author
+
+
+# 외부 호출 없이 캐시에 있는 작가 소개만 조회 (없거나 만료되었으면 None)
+def cached_profile(name):
+    author = Author.objects.filter(normalized_name=normalize_name(name)).first()
+    if author is None or not _is_fresh(author) or not author.author_info:
+        return None
+    _record_hit(author)
+    return author
+
+
+# 캐시 적중률과 절약한 외부 호출 수 (작가별 평균 호출 수 × 적중 횟수의 합)
+def stats():
+    hits = fetches = calls = 0
+    saved = 0.0
+    rows = Author.objects.values_list('hits', 'fetches', 'external_calls')
+    for author_hits, author_fetches, author_calls in rows:
+        hits += author_hits
+        fetches += author_fetches
+        calls += author_calls
+        if author_fetches:
+            saved += author_hits * author_calls / author_fetches
+    total = hits + fetches
+    return {
+        'authors': len(rows),
+        'hits': hits,
+        'misses': fetches,
+        'hit_ratio': round(hits / total, 4) if total else 0.0,
+        'external_calls': calls,
+        'external_calls_saved': round(saved),
+    }
@@ -0,0 +1,137 @@
+# books/author_fetcher.py
+
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+import requests
+from bs4 import BeautifulSoup
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+
+# 위키백과에서 작가 요약, 대표 이미지, 대표작을 동시에 가져오는 수집기
+# 하나의 requests.Session(keep-alive 연결 풀)을 스레드 풀 워커들이 공유하며,
+# 동시 요청 수는 스레드 풀 크기(max_workers)로 제한
+class AuthorFetcher:
+    def __init__(self, api_url=None, page_url=None, timeout=None, max_workers=None, user_agent='BookAI/1.0'):
+        self.api_url = api_url or settings.WIKIPEDIA_API_URL
+        self.page_url = page_url or settings.WIKIPEDIA_PAGE_URL
+        self.timeout = timeout or settings.AUTHOR_FETCH_TIMEOUT
+        self.max_workers = max_workers or settings.AUTHOR_FETCH_CONCURRENCY
+
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = user_agent
+        # 일시적인 오류(429, 5xx)는 짧은 백오프로 재시도, 연결은 워커 수만큼 유지
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=self.max_workers,
+            max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504]),
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='author-fetch')
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.session.close()
+
+    # 위키백과 문서 도입부 요약 (문서가 없으면 None, 네트워크 오류는 그대로 전달)
+    def summary(self, author):
+        res = self.session.get(self.api_url, params={
+            "action": "query",
+            "titles": author,
+            "prop": "extracts",
+            "exintro": 1,
+            "explaintext": 1,
+            "redirects": 1,
+            "format": "json",
+        }, timeout=self.timeout)
+        res.raise_for_status()
+        for page in res.json().get("query", {}).get("pages", {}).values():
+            if "missing" in page:
+                return None
+            return (page.get("extract") or "").strip() or None
+        return None
+
+    # 위키백과 API로 작가의 대표 이미지 URL 조회
+    def image(self, author):
+        try:
+            res = self.session.get(self.api_url, params={
+                "action": "query",
+                "titles": author,
+                "prop": "pageimages",
+                "format": "json",
+                "piprop": "original",
+            }, timeout=self.timeout)
+            if res.ok:
+                for page in res.json().get("query", {}).get("pages", {}).values():
+                    return page.get("original", {}).get("source")
+        except (requests.RequestException, ValueError) as e:
+            logger.warning("[작가 이미지 조회 오류] %s: %s", author, e)
+        return None
+
+    # 위키백과 HTML에서 대표작(《작품명》 형태)을 정규식으로 추출
+    def major_works(self, author):
+        try:
+            res = self.session.get(f"{self.page_url}{quote(author)}", timeout=self.timeout)
+            if not res.ok:
+                return []
+            soup = BeautifulSoup(res.text, "html.parser")
+            target_area = soup.select_one(".infobox, .infobox-full-data") or soup
+            return list(set(re.findall(r'《(.*?)》', target_area.get_text())))
+        except requests.RequestException as e:
+            logger.warning("[대표작 추출 오류] %s: %s", author, e)
+            return []
+
+    def _submit(self, author):
+        return (
+            self.executor.submit(self.summary, author),
+            self.executor.submit(self.image, author),
+            self.executor.submit(self.major_works, author),
+        )
+
+    @staticmethod
+    def _collect(futures):
+        summary_future, image_future, works_future = futures
+        summary = summary_future.result()
+        if not summary:
+            # 문서가 없으면 함께 요청한 이미지/대표작 결과는 버림
+            image_future.cancel()
+            works_future.cancel()
+            return None, None, []
+        return summary, image_future.result(), works_future.result()
+
+    # 작가 한 명의 (요약, 이미지 URL, 대표작 목록)을 세 요청 동시 실행으로 조회
+    def fetch(self, author):
+        return self._collect(self._submit(author))
+
+    # 여러 작가를 한 번에 조회 {작가: (요약, 이미지 URL, 대표작 목록) 또는 예외}
+    # 모든 요청이 같은 스레드 풀에 들어가므로 동시 요청 수는 max_workers를 넘지 않음
+    def fetch_many(self, authors):
+        pending = {author: self._submit(author) for author in dict.fromkeys(authors)}
+        results = {}
+        for author, futures in pending.items():
+            try:
+                results[author] = self._collect(futures)
+            except Exception as e:
+                results[author] = e
+        return results
+
+
+_fetcher = None
+_fetcher_lock = threading.Lock()
+
+
+# 프로세스 전체에서 공유하는 수집기 (연결 풀과 스레드 풀 재사용)
+def get_fetcher():
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None:
+            _fetcher = AuthorFetcher()
+        return _fetcher
@@ -0,0 +1,240 @@
+# books/cf_model.py
+
+import bisect
+import json
+import shutil
+import threading
+import uuid
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from scipy import sparse
+
+# 모델 디렉터리 안에서 현재 사용 중인 버전을 가리키는 포인터 파일
+CURRENT_FILE = "CURRENT"
+
+# ALS 한 단계에서 한 번에 푸는 최대 행 수와, 행 묶음의 상대편 요인을 모아 두는 배열(행 × 상호작용 × f)의 메모리 상한
+CHUNK_ROWS = 2048
+CHUNK_BYTES = 32 * 1024 * 1024
+
+
+# 좋아요·감상글 (사용자, 도서) 상호작용을 사용자 × 도서 희소 행렬로 구성
+# 값은 상호작용 종류별 가중치의 합 (settings.CF_INTERACTION_WEIGHTS)
+# 반환값: (CSR 행렬, 행 순서의 사용자 ID 배열, 열 순서의 도서 ID 배열)
+def interaction_matrix():
+    from threads.models import Thread
+    from .models import Book
+
+    weights = settings.CF_INTERACTION_WEIGHTS
+    sources = [
+        (Book.liked_users.through.objects.values_list('customuser_id', 'book_id'), weights['likes']),
+        (Thread.objects.values_list('user_id', 'book_id'), weights['threads']),
+    ]
+    pairs, values = [], []
+    for rows, weight in sources:
+        rows = np.array(list(rows), dtype=np.int64).reshape(-1, 2)
+        pairs.append(rows)
+        values.append(np.full(len(rows), weight, dtype=np.float32))
+    pairs = np.concatenate(pairs)
+    values = np.concatenate(values)
+
+    user_ids, user_rows = np.unique(pairs[:, 0], return_inverse=True)
+    book_ids, book_cols = np.unique(pairs[:, 1], return_inverse=True)
+    matrix = sparse.csr_matrix((values, (user_rows, book_cols)), shape=(len(user_ids), len(book_ids)))
+    matrix.sum_duplicates()
+    return matrix, user_ids, book_ids
+
+
+# 상호작용 수 순으로 정렬한 행을 묶음으로 나눔 (묶음 행 수 × 묶음에서 가장 많은 상호작용 수 ≤ max_cells, 단 최소 한 행)
+def row_chunks(sorted_counts, max_rows, max_cells):
+    n_rows = len(sorted_counts)
+    start = 0
+    while start < n_rows:
+        end = bisect.bisect_right(
+            range(start + 1, min(start + max_rows, n_rows) + 1), max_cells,
+            key=lambda end: (end - start) * sorted_counts[end - 1],
+        ) + start
+        end = max(end, start + 1)
+        yield start, end
+        start = end
+
+
+# 암묵적 피드백 ALS의 한쪽 단계: 상대편 요인(fixed)을 고정하고 matrix의 각 행 요인을 최소제곱으로 계산
+# 행 u의 신뢰도 c = 1 + alpha·r, 선호도 p = 1 (상호작용이 있는 칸만)
+#   (YᵀY + Yᵤᵀ(Cᵤ - I)Yᵤ + λI) x = Yᵤᵀ Cᵤ pᵤ
+# YᵀY는 한 번만 계산하고, 행별 보정 Yᵤᵀ(Cᵤ - I)Yᵤ는 그 행의 상호작용에 해당하는 요인만 모아 계산
+# 상호작용 수가 비슷한 행끼리 묶어 (행, 상호작용, f) 배열로 채우고 묶음마다 행렬곱·np.linalg.solve를 한 번에 실행
+# (메모리는 묶음 크기 CHUNK_BYTES로 제한, 도서 수 × f × f 배열은 만들지 않음)
+def solve_rows(matrix, fixed, regularization, alpha):
+    n_rows, n_factors = matrix.shape[0], fixed.shape[1]
+    gram = fixed.T @ fixed + regularization * np.eye(n_factors)
+    weights = matrix.data.astype(np.float64) * alpha
+    confidence = sparse.csr_matrix((weights + 1, matrix.indices, matrix.indptr), shape=matrix.shape)
+    rhs = confidence @ fixed
+
+    counts = np.diff(matrix.indptr)
+    order = np.argsort(counts, kind='stable')
+    sorted_counts = counts[order]
+    max_cells = max(CHUNK_BYTES // (n_factors * 8), 1)
+    result = np.empty((n_rows, n_factors))
+    for start, end in row_chunks(sorted_counts, CHUNK_ROWS, max_cells):
+        rows = order[start:end]
+        row_counts = sorted_counts[start:end]
+        total = int(row_counts.sum())
+        # 묶음 안의 상호작용마다 (묶음 내 행 번호, 행 안에서의 위치, CSR 데이터 위치)
+        row_of = np.repeat(np.arange(end - start), row_counts)
+        position = np.arange(total) - np.repeat(np.cumsum(row_counts) - row_counts, row_counts)
+        source = np.repeat(matrix.indptr[rows], row_counts) + position
+
+        width = int(row_counts[-1])
+        factors = np.zeros((end - start, width, n_factors))
+        factors[row_of, position] = fixed[matrix.indices[source]]
+        row_weights = np.zeros((end - start, width))
+        row_weights[row_of, position] = weights[source]
+
+        lhs = np.matmul(factors.transpose(0, 2, 1) * row_weights[:, None, :], factors) + gram
+        result[rows] = np.linalg.solve(lhs, rhs[rows, :, None])[..., 0]
+    return result
+
+
+# 좋아요·감상글 행렬로 학습한 협업 필터링(암묵적 피드백 ALS) 모델
+# 도서 요인만 저장하고, 사용자 요인은 요청 시 현재 상호작용으로 계산(fold-in)하므로
+# 학습 이후에 생긴 좋아요·감상글과 새 사용자도 재학습 없이 반영됨
+class CFModel:
+    def __init__(self, item_factors, book_ids, version, regularization, alpha, directory=None):
+        self.item_factors = item_factors
+        self.book_ids = np.asarray(book_ids, dtype=np.int64)
+        self.row_of = {int(book_id): row for row, book_id in enumerate(self.book_ids)}
+        self.version = version
+        self.regularization = regularization
+        self.alpha = alpha
+        self.directory = Path(directory) if directory else None
+        factors = np.asarray(item_factors, dtype=np.float64)
+        self._base = factors.T @ factors + regularization * np.eye(factors.shape[1])
+
+    def __len__(self):
+        return len(self.book_ids)
+
+    # 사용자 × 도서 상호작용 행렬로 ALS 학습 (사용자 단계와 도서 단계를 번갈아 iterations번)
+    @classmethod
+    def fit(cls, matrix, book_ids, factors=32, iterations=10, regularization=0.1, alpha=20.0, seed=0):
+        rng = np.random.default_rng(seed)
+        matrix = matrix.tocsr()
+        transposed = matrix.T.tocsr()
+        item_factors = rng.normal(0, 0.01, size=(matrix.shape[1], factors))
+        for _ in range(iterations):
+            user_factors = solve_rows(matrix, item_factors, regularization, alpha)
+            item_factors = solve_rows(transposed, user_factors, regularization, alpha)
+        return cls(item_factors.astype(np.float32), book_ids, uuid.uuid4().hex, regularization, alpha)
+
+    # 사용자의 (도서 ID, 상호작용 값) 목록으로 사용자 요인 계산, 모델에 있는 도서가 없으면 None
+    def fold_in(self, interactions):
+        rows, values = [], []
+        for book_id, value in interactions.items():
+            row = self.row_of.get(int(book_id))
+            if row is not None:
+                rows.append(row)
+                values.append(value)
+        if not rows:
+            return None
+        factors = np.asarray(self.item_factors[rows], dtype=np.float64)
+        confidence = 1 + self.alpha * np.asarray(values, dtype=np.float64)
+        lhs = self._base + (factors * (confidence - 1)[:, None]).T @ factors
+        return np.linalg.solve(lhs, factors.T @ confidence)
+
+    # 사용자 요인과 전체 도서 요인의 내적 상위 k권 (exclude_ids 제외)
+    def top_k(self, user_vector, exclude_ids=(), k=10):
+        scores = self.item_factors @ user_vector.astype(self.item_factors.dtype)
+        excluded = [self.row_of[book_id] for book_id in exclude_ids if book_id in self.row_of]
+        scores[excluded] = -np.inf
+        k = min(k, len(scores) - len(excluded))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [int(book_id) for book_id in self.book_ids[top]]
+
+    # 사용자의 현재 상호작용으로 추천 도서 ID 목록 (모델에 있는 도서와의 상호작용이 없으면 None)
+    def recommend(self, interactions, k=10):
+        user_vector = self.fold_in(interactions)
+        if user_vector is None:
+            return None
+        return self.top_k(user_vector, exclude_ids=interactions.keys(), k=k)
+
+    # 버전별 하위 디렉터리에 저장한 뒤 CURRENT 포인터를 원자적으로 교체 (직전 버전 하나만 남김)
+    def save(self, directory, **manifest):
+        directory = Path(directory)
+        target = directory / self.version
+        target.mkdir(parents=True, exist_ok=True)
+        np.save(target / "item_factors.npy", np.asarray(self.item_factors, dtype=np.float32))
+        np.save(target / "book_ids.npy", self.book_ids)
+        (target / "manifest.json").write_text(json.dumps({
+            "version": self.version,
+            "factors": int(self.item_factors.shape[1]),
+            "regularization": self.regularization,
+            "alpha": self.alpha,
+            **manifest,
+        }))
+        self.directory = target
+
+        pointer = directory / f"{CURRENT_FILE}.{self.version}"
+        pointer.write_text(self.version)
+        pointer.replace(directory / CURRENT_FILE)
+
+        versions = sorted((p for p in directory.iterdir() if p.is_dir()), key=lambda p: p.stat().st_mtime)
+        for old in versions[:-2]:
+            shutil.rmtree(old, ignore_errors=True)
+
+    # CURRENT가 가리키는 버전을 로드 (도서 요인은 메모리 매핑)
+    @classmethod
+    def load(cls, directory, mmap=True):
+        directory = Path(directory)
+        pointer = directory / CURRENT_FILE
+        if not pointer.exists():
+            return None
+        source = directory / pointer.read_text().strip()
+        manifest = json.loads((source / "manifest.json").read_text())
+        return cls(
+            np.load(source / "item_factors.npy", mmap_mode='r' if mmap else None),
+            np.load(source / "book_ids.npy"),
+            manifest["version"], manifest["regularization"], manifest["alpha"], directory=source,
+        )
+
+
+_model = None
+_model_lock = threading.Lock()
+_current = None
+
+
+def _pointer_mtime(directory):
+    try:
+        return (Path(directory) / CURRENT_FILE).stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+# 워커 프로세스당 한 번 로드하고 이후에는 새 버전이 저장됐는지만 확인
+# 학습은 배치 작업(manage.py train_cf_model)에서만 하므로 저장된 모델이 없으면 None
+def get_model():
+    global _model, _current
+    directory = settings.CF_MODEL_DIR
+    current = (str(directory), _pointer_mtime(directory))
+    if current == _current:
+        return _model
+
+    with _model_lock:
+        if current != _current:
+            _model = CFModel.load(directory)
+            _current = current
+    return _model
+
+
+# 전체 상호작용으로 다시 학습해 저장하고 다음 요청부터 새 모델 사용
+def train_model(**options):
+    matrix, user_ids, book_ids = interaction_matrix()
+    if not matrix.nnz:
+        return None
+    model = CFModel.fit(matrix, book_ids, **options)
+    model.save(settings.CF_MODEL_DIR, users=len(user_ids), interactions=int(matrix.nnz))
+    return model
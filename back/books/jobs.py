@@ -0,0 +1,108 @@
+# books/jobs.py
+
+from django.conf import settings
+from django.utils import timezone
+
+from jobs.queue import enqueue, enqueue_many, recently_failed
+from jobs.registry import task
+from . import author_cache, tts
+from .models import Book
+
+ENRICH_AUTHOR = 'books.enrich_author'
+RENDER_TTS = 'books.render_tts'
+
+
+# 작가 정보가 비어 있는 도서의 작가 소개·대표작을 위키백과와 GPT로 보완
+# 같은 작가의 다른 도서가 이미 조회했다면 작가 캐시(Author)만 사용
+@task(ENRICH_AUTHOR)
+def enrich_author(payload):
+    book = Book.objects.filter(pk=payload['book_id']).first()
+    if book is None or (book.author_info and book.author_works):
+        return
+
+    apply_author_profile(book, author_cache.author_profile(book.author, book.title))
+
+
+# 캐시된 작가 정보를 도서에 복사 (작가 사진은 비어 있을 때만)
+def apply_author_profile(book, author):
+    book.author_info = author.author_info
+    book.author_works = author.author_works
+    book.author_enriched_at = timezone.now()
+    update_fields = ['author_info', 'author_works', 'author_enriched_at']
+    if not book.author_photo and author.photo_url:
+        book.author_photo = author.photo_url
+        update_fields.append('author_photo')
+    book.save(update_fields=update_fields)
+
+
+# 작가 캐시에 정보가 있으면 외부 호출 없이 바로 채우고 True 반환
+def fill_author_from_cache(book):
+    author = author_cache.cached_profile(book.author)
+    if author is None:
+        return False
+    apply_author_profile(book, author)
+    return True
+
+
+# 작가 정보 보완 작업을 등록하고 상태 반환 ('enriching' 또는 최근 실패 시 'failed')
+# 같은 도서에 대한 요청이 동시에 와도 작업은 하나만 등록됨
+def enqueue_author_enrichment(book):
+    key = f'book:{book.pk}'
+    if recently_failed(ENRICH_AUTHOR, key, settings.JOBS_RETRY_COOLDOWN):
+        return 'failed'
+    enqueue(ENRICH_AUTHOR, key=key, payload={'book_id': book.pk})
+    return 'enriching'
+
+
+# 여러 도서의 작가 정보를 한 번에 보완 (일괄 수집 후 사용, 도서마다 시그널로 처리하지 않음)
+# 작가 캐시에 있는 작가는 바로 채워 bulk_update로 저장하고, 나머지는 보완 작업을 한꺼번에 등록
+# 반환값: (캐시로 채운 도서 수, 새로 등록한 작업 수)
+def enrich_books(books):
+    profiles = {}
+    filled, missing = [], []
+    for book in books:
+        if book.author_info and book.author_works:
+            continue
+        key = author_cache.normalize_name(book.author)
+        if key not in profiles:
+            profiles[key] = author_cache.cached_profile(book.author)
+        author = profiles[key]
+        if author is None:
+            missing.append(book)
+            continue
+        book.author_info = author.author_info
+        book.author_works = author.author_works
+        book.author_enriched_at = timezone.now()
+        if not book.author_photo and author.photo_url:
+            book.author_photo = author.photo_url
+        filled.append(book)
+
+    if filled:
+        Book.objects.bulk_update(
+            filled, ['author_info', 'author_works', 'author_photo', 'author_enriched_at'], batch_size=500,
+        )
+    enqueued = enqueue_many(ENRICH_AUTHOR, [(f'book:{book.pk}', {'book_id': book.pk}) for book in missing])
+    return len(filled), enqueued
+
+
+# 도서 소개 음성 합성 (같은 텍스트의 음성 파일이 있으면 합성하지 않고 연결만 함)
+@task(RENDER_TTS)
+def render_tts(payload):
+    book = Book.objects.filter(pk=payload['book_id']).first()
+    if book is None:
+        return
+    name = tts.render(tts.book_text(book))
+    Book.objects.filter(pk=book.pk).update(tts_audio=name)
+
+
+# 현재 도서 정보에 맞는 음성이 있으면 'ready', 없으면 합성 작업을 등록하고 'rendering'
+# 같은 텍스트의 음성 파일이 이미 있으면(다른 요청에서 합성한 경우 등) 바로 연결
+def request_tts(book):
+    name = tts.audio_name(tts.book_text(book))
+    if tts.exists(name):
+        if book.tts_audio.name != name:
+            book.tts_audio.name = name
+            Book.objects.filter(pk=book.pk).update(tts_audio=name)
+        return 'ready'
+    enqueue(RENDER_TTS, key=f'book:{book.pk}', payload={'book_id': book.pk})
+    return 'rendering'
@@ -0,0 +1,90 @@
+# books/management/commands/_stub_aladin.py
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlsplit
+
+from ._stub_wiki import StubServer
+
+CATEGORY_NAMES = ['국내도서>소설/시/희곡', '국내도서>경제경영', '국내도서>인문학', '국내도서>과학', '국내도서>만화']
+
+
+# 알라딘 상품 리스트 API(ItemList.aspx)를 흉내 내는 로컬 HTTP 서버 (벤치마크·테스트용)
+# 전체 total개의 상품을 페이지 단위로 응답하며, 10번째 상품마다 바로 앞 상품과 같은 ISBN(중복),
+# '만화' 카테고리는 매핑되지 않는 상품. fail_pages에 든 페이지는 500 응답
+class StubAladinHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+        time.sleep(server.latency)
+
+        url = urlsplit(self.path)
+        if url.path != '/ttb/api/ItemList.aspx':
+            self.respond(404, 'not found', 'text/plain')
+            return
+        params = parse_qs(url.query)
+        page = int(params['start'][0])
+        size = int(params['MaxResults'][0])
+        if page in server.fail_pages:
+            self.respond(500, 'error', 'text/plain')
+            return
+
+        first = (page - 1) * size
+        items = [stub_item(i) for i in range(first, min(first + size, server.total))]
+        self.respond(200, json.dumps({"totalResults": server.total, "item": items}, ensure_ascii=False), 'application/json')
+
+    def respond(self, status, body, content_type):
+        data = body.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# i번째 가짜 상품
+def stub_item(i):
+    number = i - 1 if i % 10 == 9 else i
+    return {
+        "title": f"베스트셀러 {number}",
+        "author": f"작가{number % 37}",
+        "pubDate": "2024-05-01",
+        "description": f"베스트셀러 {number}의 소개",
+        "isbn13": f"979{number:010d}",
+        "cover": f"https://image.example/{number}.jpg",
+        "categoryName": CATEGORY_NAMES[number % len(CATEGORY_NAMES)],
+        "publisher": "스텁출판",
+        "customerReviewRank": number % 11,
+        "subTitle": "",
+    }
+
+
+# 스텁 서버를 백그라운드 스레드로 띄우고 (서버 객체) 반환, 종료 시 정리
+# server.api_url을 settings.ALADIN_API_URL 또는 AladinClient에 넘겨 사용
+@contextmanager
+def stub_aladin_server(total=200, latency=0.05, fail_pages=()):
+    server = StubServer(('127.0.0.1', 0), StubAladinHandler)
+    server.total = total
+    server.latency = latency
+    server.fail_pages = set(fail_pages)
+    server.lock = threading.Lock()
+    server.requests = 0
+    host, port = server.server_address
+    server.api_url = f'http://{host}:{port}/ttb/api/ItemList.aspx'
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
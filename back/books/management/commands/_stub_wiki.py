@@ -0,0 +1,106 @@
+# books/management/commands/_stub_wiki.py
+
+import json
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+
+# 위키백과 API/문서를 흉내 내는 로컬 HTTP 서버 (벤치마크·테스트용)
+# '없는'으로 시작하는 제목은 존재하지 않는 문서로 응답하고, 모든 요청은 latency초 지연
+# barrier가 있으면 그 수만큼의 요청이 동시에 도착해야 응답 (모이지 않으면 503)
+class StubWikiHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    # 핸들러 인스턴스 하나가 TCP 연결 하나에 대응 (keep-alive 재사용 여부 확인용)
+    # 헤더와 본문을 나눠 보내므로 Nagle 알고리즘으로 인한 지연이 없도록 TCP_NODELAY 설정
+    def setup(self):
+        super().setup()
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests += 1
+            self.server.active += 1
+            self.server.max_active = max(self.server.max_active, self.server.active)
+        try:
+            if self.server.barrier is not None:
+                self.server.barrier.wait()
+            time.sleep(self.server.latency)
+        except threading.BrokenBarrierError:
+            self.respond(503, 'requests did not arrive together', 'text/plain')
+            return
+        finally:
+            with self.server.lock:
+                self.server.active -= 1
+
+        url = urlsplit(self.path)
+        if url.path == '/w/api.php':
+            params = parse_qs(url.query)
+            title = params['titles'][0]
+            if title.startswith('없는'):
+                page = {"missing": ""}
+            elif params.get('prop') == ['pageimages']:
+                page = {"original": {"source": f"https://upload.example/{title}.jpg"}}
+            else:
+                page = {"extract": f"{title}은(는) 대한민국의 작가이다."}
+            self.respond(200, json.dumps({"query": {"pages": {"1": page}}}), 'application/json')
+        elif url.path.startswith('/wiki/'):
+            title = unquote(url.path[len('/wiki/'):])
+            if title.startswith('없는'):
+                self.respond(404, 'not found', 'text/plain')
+            else:
+                body = f'<table class="infobox"><tr><td>주요 작품 《{title}의 첫 책》 《{title}의 둘째 책》</td></tr></table>'
+                self.respond(200, body, 'text/html; charset=utf-8')
+        else:
+            self.respond(404, 'not found', 'text/plain')
+
+    def respond(self, status, body, content_type):
+        data = body.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# 클라이언트가 타임아웃으로 먼저 연결을 끊는 경우의 오류 출력은 생략
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass
+
+
+# 스텁 서버를 백그라운드 스레드로 띄우고 (서버 객체) 반환, 종료 시 정리
+# server.api_url / server.page_url을 AuthorFetcher에 넘겨 사용
+# server.max_active는 동시에 처리 중이던 요청 수의 최댓값
+@contextmanager
+def stub_wiki_server(latency=0.05, barrier=None):
+    server = StubServer(('127.0.0.1', 0), StubWikiHandler)
+    server.latency = latency
+    server.barrier = barrier
+    server.lock = threading.Lock()
+    server.connections = 0
+    server.requests = 0
+    server.active = 0
+    server.max_active = 0
+    host, port = server.server_address
+    server.api_url = f'http://{host}:{port}/w/api.php'
+    server.page_url = f'http://{host}:{port}/wiki/'
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,87 @@
+# books/management/commands/_synthetic.py
+
+from contextlib import contextmanager
+
+import numpy as np
+
+
+# 벤치마크용 가상 도서 설명 생성
+# 각 도서는 주제(topic) 하나에 속하며, 단어의 절반은 주제별 분포, 나머지는 공통 분포(Zipf)에서 추출
+def synthetic_descriptions(n_books, vocab_size=5000, words_per_book=80, n_topics=50, seed=42):
+    rng = np.random.default_rng(seed)
+    vocab = np.array([f"w{i:05d}" for i in range(vocab_size)])
+
+    ranks = np.arange(1, vocab_size + 1)
+    probs = 1.0 / ranks
+    probs /= probs.sum()
+
+    topics = rng.integers(0, n_topics, size=n_books)
+    permutations = np.stack([rng.permutation(vocab_size) for _ in range(n_topics)])
+
+    topic_words = words_per_book // 2
+    sampled = rng.choice(vocab_size, size=(n_books, words_per_book), p=probs)
+    sampled[:, :topic_words] = permutations[topics[:, None], sampled[:, :topic_words]]
+    return [" ".join(vocab[row]) for row in sampled]
+
+
+# 반복 측정 결과(초)를 p50/p95 밀리초로 요약
+def summarize(samples):
+    samples_ms = np.asarray(samples) * 1000
+    return float(np.percentile(samples_ms, 50)), float(np.percentile(samples_ms, 95))
+
+
+# 한글 음절을 조합한 가상 단어로 문장 생성 (검색 벤치마크용)
+def synthetic_korean_texts(n, words_per_text=60, vocab_size=3000, seed=7):
+    rng = np.random.default_rng(seed)
+    syllables = np.array([chr(code) for code in range(0xAC00, 0xAC00 + 2000)])
+    vocab = np.array([
+        "".join(rng.choice(syllables, size=rng.integers(2, 5)))
+        for _ in range(vocab_size)
+    ])
+    ranks = np.arange(1, vocab_size + 1)
+    probs = 1.0 / ranks
+    probs /= probs.sum()
+    words = rng.choice(vocab_size, size=(n, words_per_text), p=probs)
+    return vocab, [" ".join(vocab[row]) for row in words]
+
+
+# 협업 필터링 평가용 가상 상호작용 (사용자, 도서) 목록
+# 도서는 취향 군집 하나에 속하고 군집 안에서 인기도가 Zipf 분포, 사용자는 선호 군집 하나에서 대부분(taste 비율)을 고르고
+# 나머지는 전체 인기 도서에서 고름
+def synthetic_interactions(n_users, n_books, per_user=20, n_clusters=20, taste=0.8, seed=5):
+    rng = np.random.default_rng(seed)
+    clusters = rng.integers(0, n_clusters, size=n_books)
+    popularity = 1.0 / rng.permutation(np.arange(1, n_books + 1))
+    members = [np.flatnonzero(clusters == c) for c in range(n_clusters)]
+    member_probs = [popularity[m] / popularity[m].sum() for m in members]
+    global_probs = popularity / popularity.sum()
+
+    pairs = []
+    for user in range(n_users):
+        cluster = rng.integers(0, n_clusters)
+        n_taste = min(rng.binomial(per_user, taste), len(members[cluster]))
+        books = set(rng.choice(members[cluster], size=n_taste, replace=False, p=member_probs[cluster]).tolist())
+        while len(books) < per_user:
+            books.update(rng.choice(n_books, size=per_user - len(books), p=global_probs).tolist())
+        pairs.extend((user, book) for book in books)
+    return np.array(pairs, dtype=np.int64)
+
+
+# 벤치마크가 실제 DB를 건드리지 않도록 테스트용 DB를 만들어 사용 후 삭제
+# name을 주면 메모리 DB 대신 해당 파일로 생성 (여러 스레드가 동시에 쓰는 벤치마크용)
+@contextmanager
+def temporary_database(name=None):
+    from django.db import connection
+
+    test_settings = connection.settings_dict.setdefault('TEST', {})
+    old_test_name = test_settings.get('NAME')
+    if name:
+        test_settings['NAME'] = str(name)
+    try:
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            yield connection
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+    finally:
+        test_settings['NAME'] = old_test_name
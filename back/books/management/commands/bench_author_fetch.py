@@ -0,0 +1,83 @@
+# books/management/commands/bench_author_fetch.py
+
+import re
+import time
+from urllib.parse import quote
+
+import requests
+from bs4 import BeautifulSoup
+from django.core.management.base import BaseCommand
+
+from books.author_fetcher import AuthorFetcher
+from ._stub_wiki import stub_wiki_server
+from ._synthetic import summarize
+
+
+# 기존 방식: 작가마다 문서·이미지·HTML을 순서대로, 매번 새 연결로 요청
+def fetch_sequential(server, author):
+    res = requests.get(server.api_url, params={
+        "action": "query", "titles": author, "prop": "extracts",
+        "exintro": 1, "explaintext": 1, "format": "json",
+    }, timeout=5)
+    pages = res.json()["query"]["pages"].values()
+    if any("missing" in page for page in pages):
+        return None, None, []
+    summary = next(iter(pages)).get("extract")
+    res = requests.get(server.api_url, params={
+        "action": "query", "titles": author, "prop": "pageimages", "format": "json", "piprop": "original",
+    })
+    img_url = next(iter(res.json()["query"]["pages"].values())).get("original", {}).get("source")
+    res = requests.get(f"{server.page_url}{quote(author)}", timeout=5)
+    works = list(set(re.findall(r'《(.*?)》', BeautifulSoup(res.text, "html.parser").get_text())))
+    return summary, img_url, works
+
+
+# 로컬 스텁 위키 서버를 상대로 작가 정보 수집 방식별 지연 시간 비교
+class Command(BaseCommand):
+    help = "로컬 스텁 서버로 작가 정보 수집(순차/동시/일괄)의 지연 시간을 비교합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--authors', type=int, default=40)
+        parser.add_argument('--latency', type=float, default=0.05, help="스텁 서버 응답 지연(초)")
+        parser.add_argument('--concurrency', type=int, default=8)
+
+    def handle(self, *args, **options):
+        authors = [f"작가{i}" for i in range(options['authors'])]
+
+        with stub_wiki_server(latency=options['latency']) as server:
+            self.stdout.write(f"작가 {len(authors)}명, 응답 지연 {options['latency'] * 1000:.0f}ms")
+            self.stdout.write(f"{'mode':>12} | {'total':>8} | {'author p50':>10} {'p95':>8} | {'conns':>5}")
+
+            def report(name, total, samples, connections):
+                p50, p95 = summarize(samples) if samples else (0.0, 0.0)
+                self.stdout.write(f"{name:>12} | {total:>7.2f}s | {p50:>8.1f}ms {p95:>6.1f}ms | {connections:>5}")
+
+            server.connections = 0
+            samples = []
+            started = time.perf_counter()
+            for author in authors:
+                t = time.perf_counter()
+                fetch_sequential(server, author)
+                samples.append(time.perf_counter() - t)
+            report("sequential", time.perf_counter() - started, samples, server.connections)
+
+            fetcher = AuthorFetcher(server.api_url, server.page_url, max_workers=options['concurrency'])
+            try:
+                server.connections = 0
+                samples = []
+                started = time.perf_counter()
+                for author in authors:
+                    t = time.perf_counter()
+                    fetcher.fetch(author)
+                    samples.append(time.perf_counter() - t)
+                report("concurrent", time.perf_counter() - started, samples, server.connections)
+
+                server.connections = 0
+                started = time.perf_counter()
+                results = fetcher.fetch_many(authors)
+                report("batch", time.perf_counter() - started, [], server.connections)
+                failed = [author for author, result in results.items() if isinstance(result, Exception)]
+                if failed:
+                    self.stdout.write(self.style.WARNING(f"실패 {len(failed)}명"))
+            finally:
+                fetcher.close()
@@ -0,0 +1,64 @@
+# books/management/commands/bench_book_list.py
+
+import datetime
+import time
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from books.models import Book, Category
+from ._synthetic import synthetic_descriptions, summarize, temporary_database
+
+
+# 도서 목록 API의 전체 직렬화와 카드 필드 + cursor 페이지 응답 비교 (임시 DB 사용)
+class Command(BaseCommand):
+    help = "가상 도서 데이터로 도서 목록 API의 응답 크기와 지연 시간을 비교합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--books', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=10)
+        parser.add_argument('--page-size', type=int, default=20)
+
+    def handle(self, *args, **options):
+        n_books = options['books']
+        rng = np.random.default_rng(3)
+
+        with temporary_database():
+            category = Category.objects.create(name="벤치마크")
+            user = get_user_model().objects.create_user(username="bench", password="bench")
+            Book.objects.bulk_create([
+                Book(
+                    category=category, title=f"도서 {i}", description=description,
+                    isbn=str(i), cover="https://example.com/cover.jpg", publisher="출판사",
+                    pub_date=datetime.date(2000, 1, 1) + datetime.timedelta(days=int(rng.integers(0, 9000))),
+                    author="저자", author_info=description[:400], customer_review_rank=float(rng.integers(0, 11)),
+                    subTitle="",
+                )
+                for i, description in enumerate(synthetic_descriptions(n_books))
+            ], batch_size=2000)
+            user.liked_books.add(*Book.objects.order_by('?').values_list('id', flat=True)[:200])
+
+            client = APIClient()
+            client.force_authenticate(user)
+            cases = {
+                "full list": {'ordering': '-pub_date', 'expand': 'description,author_info,author_works,thread_set'},
+                "card list": {'ordering': '-pub_date'},
+                "card page": {'ordering': '-pub_date', 'page_size': options['page_size']},
+            }
+
+            self.stdout.write(f"{'case':>10} | {'bytes':>12} {'queries':>8} | {'p50':>9} {'p95':>9}")
+            for name, params in cases.items():
+                samples = []
+                for _ in range(options['repeat']):
+                    with CaptureQueriesContext(connection) as queries:
+                        started = time.perf_counter()
+                        response = client.get('/api/books/', params, HTTP_HOST='localhost')
+                        samples.append(time.perf_counter() - started)
+                p50, p95 = summarize(samples)
+                self.stdout.write(
+                    f"{name:>10} | {len(response.content):>12,} {len(queries):>8} | {p50:>7.1f}ms {p95:>7.1f}ms"
+                )
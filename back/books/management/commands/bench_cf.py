@@ -0,0 +1,101 @@
+# books/management/commands/bench_cf.py
+
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from scipy import sparse
+
+from books.cf_model import CFModel
+from ._synthetic import synthetic_interactions, summarize
+
+
+# 사용자별 상호작용 중 holdout 비율만큼을 평가용으로 떼어냄 (상호작용이 min_items 미만인 사용자는 전부 학습용)
+def split_holdout(pairs, holdout, min_items, rng):
+    train, test = [], {}
+    order = np.argsort(pairs[:, 0], kind='stable')
+    users, starts = np.unique(pairs[order, 0], return_index=True)
+    for user, items in zip(users, np.split(pairs[order, 1], starts[1:])):
+        items = rng.permutation(items)
+        n_test = int(len(items) * holdout) if len(items) >= min_items else 0
+        if n_test:
+            test[int(user)] = set(items[:n_test].tolist())
+        train.extend((int(user), int(item)) for item in items[n_test:])
+    return np.array(train, dtype=np.int64), test
+
+
+# 떼어낸 상호작용을 상위 k개 추천이 얼마나 맞혔는지: (precision@k, recall@k) 평균
+def evaluate(recommend, train_items, test, k):
+    precisions, recalls = [], []
+    for user, expected in test.items():
+        found = set(recommend(train_items[user])[:k])
+        hits = len(found & expected)
+        precisions.append(hits / k)
+        recalls.append(hits / len(expected))
+    return float(np.mean(precisions)), float(np.mean(recalls))
+
+
+# 가상 상호작용에서 협업 필터링(ALS)과 인기 도서 기준선의 정확도, 학습 시간, 추천 지연 시간 비교
+class Command(BaseCommand):
+    help = "협업 필터링 추천(ALS)을 가상 상호작용 데이터로 오프라인 평가합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20000)
+        parser.add_argument('--books', type=int, default=10000)
+        parser.add_argument('--per-user', type=int, default=20, help="사용자당 상호작용 수")
+        parser.add_argument('--clusters', type=int, default=20, help="취향 군집 수")
+        parser.add_argument('--holdout', type=float, default=0.2, help="사용자별 평가용 상호작용 비율")
+        parser.add_argument('--factors', type=int, default=32)
+        parser.add_argument('--iterations', type=int, default=10)
+        parser.add_argument('--queries', type=int, default=500, help="지연 시간을 측정할 사용자 수")
+        parser.add_argument('-k', type=int, default=10)
+
+    def handle(self, *args, **options):
+        k = options['k']
+        rng = np.random.default_rng(0)
+        pairs = synthetic_interactions(
+            options['users'], options['books'], per_user=options['per_user'], n_clusters=options['clusters'],
+        )
+        train, test = split_holdout(pairs, options['holdout'], min_items=5, rng=rng)
+
+        train_items = {}
+        for user, item in train:
+            train_items.setdefault(int(user), {})[int(item)] = 1.0
+        matrix = sparse.csr_matrix(
+            (np.ones(len(train), dtype=np.float32), (train[:, 0], train[:, 1])),
+            shape=(options['users'], options['books']),
+        )
+        self.stdout.write(
+            f"users={options['users']} books={options['books']} train={matrix.nnz} "
+            f"test={sum(map(len, test.values()))} ({len(test)} users)"
+        )
+
+        started = time.perf_counter()
+        model = CFModel.fit(
+            matrix, np.arange(options['books']), factors=options['factors'], iterations=options['iterations'],
+        )
+        train_seconds = time.perf_counter() - started
+
+        # 기준선: 학습 데이터에서 상호작용이 많은 순 (이미 본 도서 제외)
+        ranked = np.argsort(-np.asarray(matrix.sum(axis=0)).ravel(), kind='stable')
+
+        def popular(items):
+            return [int(book) for book in ranked[:k + len(items)] if int(book) not in items][:k]
+
+        results = {
+            'popular': evaluate(popular, train_items, test, k),
+            'als': evaluate(lambda items: model.recommend(items, k) or [], train_items, test, k),
+        }
+        self.stdout.write(f"{'model':>8} | {'precision@' + str(k):>12} {'recall@' + str(k):>10}")
+        for name, (precision, recall) in results.items():
+            self.stdout.write(f"{name:>8} | {precision:>12.3f} {recall:>10.3f}")
+
+        # 서빙 경로: 요청마다 현재 상호작용으로 fold-in + 전체 도서 내적 상위 k
+        users = rng.choice(list(train_items), size=min(options['queries'], len(train_items)), replace=False)
+        samples = []
+        for user in users:
+            started = time.perf_counter()
+            model.recommend(train_items[int(user)], k)
+            samples.append(time.perf_counter() - started)
+        p50, p95 = summarize(samples)
+        self.stdout.write(f"train {train_seconds:.2f}s | fold-in + top-{k} p50 {p50:.2f}ms p95 {p95:.2f}ms")
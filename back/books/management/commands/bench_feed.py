@@ -0,0 +1,168 @@
+# books/management/commands/bench_feed.py
+
+import datetime
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from blookin import counters
+from books.models import Book, Category
+from threads import feed
+from threads.models import FeedEntry, Thread
+from ._synthetic import summarize, temporary_database
+
+
+# 대량 데이터를 ORM 객체 없이 executemany로 INSERT (데이터 준비 시간 단축)
+def insert_rows(model, columns, rows):
+    table = connection.ops.quote_name(model._meta.db_table)
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(sql, list(rows))
+
+
+# 팔로잉 피드 조회 비교: 매 요청 IN 서브쿼리 + OFFSET(기존 방식) vs 미리 기록한 피드 + keyset 페이지
+# 사용자·감상글 수가 많아 임시 DB를 파일로 만들어 사용
+# 피드 항목은 측정 대상 사용자(--viewers)의 것만 기록 (다른 사용자의 항목은 조회 범위에 영향 없음)
+class Command(BaseCommand):
+    help = "가상 팔로우 관계와 감상글로 팔로잉 피드 조회 방식별 지연 시간을 비교합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10000)
+        parser.add_argument('--threads', type=int, default=1000000)
+        parser.add_argument('--follows', type=int, default=50, help="사용자당 팔로우 수")
+        parser.add_argument('--celebrities', type=int, default=5, help="팔로워가 많은 작성자 수")
+        parser.add_argument('--viewers', type=int, default=20, help="측정할 사용자 수")
+        parser.add_argument('--pages', type=int, default=50, help="따라갈 페이지 수")
+        parser.add_argument('--page-size', type=int, default=20)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(11)
+        n_users, n_threads = options['users'], options['threads']
+
+        with tempfile.TemporaryDirectory() as tmp, temporary_database(Path(tmp) / 'bench_feed.sqlite3'):
+            started = time.perf_counter()
+            User = get_user_model()
+            user_ids = [user.pk for user in User.objects.bulk_create(
+                [User(username=f"bench{i}") for i in range(n_users)], batch_size=2000,
+            )]
+            celebrity_ids = user_ids[:options['celebrities']]
+
+            # 일반 사용자는 무작위로 follows명, 그와 별도로 30%가 팔로워 많은 작성자를 모두 팔로우
+            Follow = User.followings.through
+            follows = set()
+            for follower in user_ids:
+                for followee in rng.choice(user_ids, size=options['follows'], replace=False):
+                    if followee != follower:
+                        follows.add((follower, int(followee)))
+                if rng.random() < 0.3:
+                    follows.update((follower, celebrity) for celebrity in celebrity_ids if celebrity != follower)
+            insert_rows(Follow, ['from_customuser_id', 'to_customuser_id'], follows)
+            counters.reconcile()
+
+            category = Category.objects.create(name="벤치마크")
+            book = Book.objects.create(
+                category=category, title="도서", description="", isbn="bench", cover="https://example.com/c.jpg",
+                publisher="출판사", pub_date=datetime.date(2024, 1, 1), author="저자", customer_review_rank=0,
+                subTitle="",
+            )
+            # 작성자는 Zipf 분포 (일부 사용자가 글을 많이 씀), 작성 시각은 ID 순서대로 1초씩 증가
+            base = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+            for start in range(0, n_threads, 50000):
+                size = min(50000, n_threads - start)
+                authors = (rng.zipf(1.3, size=size) - 1) % n_users
+                insert_rows(
+                    Thread,
+                    ['title', 'content', 'reading_date', 'cover_img', 'cover_status', 'likes_count',
+                     'created_at', 'updated_at', 'book_id', 'user_id'],
+                    (
+                        (f"감상 {start + i}", "내용", base.date(), "", Thread.COVER_READY, 0,
+                         base + datetime.timedelta(seconds=start + i), base, book.pk, user_ids[author])
+                        for i, author in enumerate(authors)
+                    ),
+                )
+            self.stdout.write(
+                f"사용자 {n_users}명, 팔로우 {len(follows)}개, 감상글 {n_threads}개 생성: "
+                f"{time.perf_counter() - started:.1f}s"
+            )
+
+            viewers = [int(user_id) for user_id in rng.choice(user_ids[options['celebrities']:], size=options['viewers'], replace=False)]
+            viewer_users = list(User.objects.filter(pk__in=viewers))
+
+            # 측정 대상 사용자의 피드 기록 (팔로워 많은 작성자의 글은 제외, 읽을 때 조회)
+            started = time.perf_counter()
+            celebrities = set(
+                User.objects.filter(followers_count__gte=settings.FEED_CELEBRITY_FOLLOWERS).values_list('id', flat=True)
+            )
+            for viewer in viewer_users:
+                followee_ids = set(viewer.followings.values_list('id', flat=True)) - celebrities
+                insert_rows(FeedEntry, ['user_id', 'thread_id', 'author_id'], (
+                    (viewer.pk, thread_id, author_id)
+                    for thread_id, author_id in Thread.objects.filter(user_id__in=followee_ids).values_list('id', 'user_id')
+                ))
+            self.stdout.write(
+                f"피드 항목 {FeedEntry.objects.count()}개 기록: {time.perf_counter() - started:.1f}s, "
+                f"팔로워 {settings.FEED_CELEBRITY_FOLLOWERS}명 이상 작성자 {len(celebrities)}명"
+            )
+
+            self.bench_fan_out(user_ids, celebrities, book)
+            self.bench_reads(viewer_users, options['pages'], options['page_size'])
+
+    # 감상글 한 건의 fan-out 비용 (일반 작성자 / 팔로워 많은 작성자)
+    def bench_fan_out(self, user_ids, celebrities, book):
+        User = get_user_model()
+        by_followers = User.objects.exclude(pk__in=celebrities).order_by('-followers_count').first()
+        for name, author_id in (("fan-out", by_followers.pk), ("celebrity", next(iter(celebrities), None))):
+            if author_id is None:
+                continue
+            thread = Thread.objects.create(title="새 감상", content="내용", book=book, user_id=author_id)
+            started = time.perf_counter()
+            written = feed.fan_out(thread.pk)
+            self.stdout.write(
+                f"{name:>10}: 팔로워 {User.objects.get(pk=author_id).followers_count}명, "
+                f"피드 항목 {written}개 기록, {(time.perf_counter() - started) * 1000:.1f}ms"
+            )
+
+    # 사용자마다 첫 페이지부터 pages 페이지까지 따라가며 페이지별 지연 시간 측정
+    def bench_reads(self, viewers, pages, page_size):
+        self.stdout.write(f"{'mode':>10} | {'first p50':>9} {'p95':>8} | {f'page {pages} p50':>12} {'p95':>8} | {'queries':>7}")
+
+        def report(name, first, last, queries):
+            first_p50, first_p95 = summarize(first)
+            last_p50, last_p95 = summarize(last)
+            self.stdout.write(
+                f"{name:>10} | {first_p50:>7.2f}ms {first_p95:>6.2f}ms | {last_p50:>10.2f}ms {last_p95:>6.2f}ms | {queries:>7}"
+            )
+
+        first, last = [], []
+        for viewer in viewers:
+            for page in range(pages):
+                started = time.perf_counter()
+                with CaptureQueriesContext(connection) as queries:
+                    list(
+                        Thread.objects.filter(user__in=viewer.followings.all())
+                        .order_by('-created_at')
+                        .values_list('id', flat=True)[page * page_size:(page + 1) * page_size]
+                    )
+                elapsed = time.perf_counter() - started
+                (first if page == 0 else last if page == pages - 1 else []).append(elapsed)
+        report("pull", first, last, len(queries))
+
+        first, last = [], []
+        for viewer in viewers:
+            cursor = None
+            for page in range(pages):
+                started = time.perf_counter()
+                with CaptureQueriesContext(connection) as queries:
+                    _, cursor = feed.feed_page(viewer, cursor, page_size)
+                elapsed = time.perf_counter() - started
+                (first if page == 0 else last if page == pages - 1 else []).append(elapsed)
+                if cursor is None:
+                    break
+        report("feed", first, last or first, len(queries))
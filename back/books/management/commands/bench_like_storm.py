@@ -0,0 +1,108 @@
+# books/management/commands/bench_like_storm.py
+
+import datetime
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+
+from blookin import counters, like_buffer
+from books.models import Book, Category
+from ._synthetic import summarize, temporary_database
+
+
+# 인기 도서 하나에 좋아요 토글이 몰릴 때 바로 반영(counters.toggle)과 쓰기 지연 버퍼의 처리량 비교
+# 여러 스레드가 같은 SQLite 파일 DB에 동시에 요청하므로 임시 DB를 파일로 만들어 사용
+class Command(BaseCommand):
+    help = "동시 좋아요 토글 폭주에서 바로 반영과 좋아요 버퍼의 처리량·지연 시간을 비교합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=16)
+        parser.add_argument('--toggles', type=int, default=200, help="스레드당 토글 수")
+        parser.add_argument('--users', type=int, default=500)
+        parser.add_argument('--flush-interval', type=float, default=0.2, help="버퍼 반영 주기(초)")
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as tmp, temporary_database(Path(tmp) / 'bench_like_storm.sqlite3'):
+            category = Category.objects.create(name="벤치마크")
+            User = get_user_model()
+            users = list(User.objects.bulk_create([User(username=f"bench{i}") for i in range(options['users'])]))
+            book = Book.objects.create(
+                category=category, title="인기 도서", description="", isbn="bench", cover="https://example.com/c.jpg",
+                publisher="출판사", pub_date=datetime.date(2024, 1, 1), author="저자", customer_review_rank=0, subTitle="",
+            )
+
+            self.stdout.write(
+                f"스레드 {options['threads']}개 × 토글 {options['toggles']}회, 사용자 {len(users)}명, 도서 1권"
+            )
+            self.stdout.write(
+                f"{'mode':>10} | {'toggles/s':>10} | {'p50':>9} {'p95':>9} | {'errors':>6} | {'flushes':>7} {'avg flush':>10} | {'drift':>5}"
+            )
+
+            with override_settings(LIKE_BUFFER_ENABLED=False):
+                self.report("direct", self.storm(book, users, options), {}, book)
+
+            buffer = like_buffer.LikeBuffer()
+            # 실행 중인 개발 서버와 잠금 파일이 겹치지 않도록 임시 경로 사용
+            with override_settings(
+                LIKE_BUFFER_ENABLED=True, LIKE_BUFFER_FLUSH_INTERVAL=options['flush_interval'],
+                LIKE_BUFFER_LOCK_PATH=Path(tmp) / 'like_buffer.lock',
+            ), mock.patch.object(like_buffer, 'buffer', buffer):
+                result = self.storm(book, users, options)
+                buffer.flush()
+                self.report("buffered", result, buffer.stats(), book)
+
+    # 스레드마다 무작위 사용자로 같은 도서에 토글, 반환값: (처리량, 토글별 지연 시간, 오류 수)
+    def storm(self, book, users, options):
+        samples, errors = [], []
+        barrier = threading.Barrier(options['threads'] + 1)
+
+        def worker(seed):
+            rng = np.random.default_rng(seed)
+            local_samples, local_errors = [], 0
+            instance = Book.objects.get(pk=book.pk)
+            barrier.wait()
+            try:
+                for index in rng.integers(0, len(users), size=options['toggles']):
+                    started = time.perf_counter()
+                    try:
+                        like_buffer.toggle(instance, users[index].pk)
+                    except Exception:
+                        local_errors += 1
+                    local_samples.append(time.perf_counter() - started)
+            finally:
+                connection.close()
+            samples.extend(local_samples)
+            errors.append(local_errors)
+
+        threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(options['threads'])]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        started = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        return len(samples) / elapsed, samples, sum(errors)
+
+    # 결과 한 줄 출력, drift는 카운터와 실제 좋아요 행 수가 어긋난 객체 수 (0이어야 함)
+    def report(self, name, result, stats, book):
+        throughput, samples, errors = result
+        p50, p95 = summarize(samples)
+        drift = sum(counters.reconcile(dry_run=True).values())
+        flushes = stats.get('flushes', '-')
+        avg_flush = f"{stats['avg_flush_ms']:.1f}ms" if stats else '-'
+        self.stdout.write(
+            f"{name:>10} | {throughput:>10.0f} | {p50:>7.2f}ms {p95:>7.2f}ms | {errors:>6} | {flushes:>7} {avg_flush:>10} | {drift:>5}"
+        )
+        if drift:
+            self.stdout.write(self.style.WARNING(f"{name}: 카운터 불일치 {drift}건"))
+        liked = Book.liked_users.through.objects.filter(book=book).count()
+        self.stdout.write(f"{'':>10}   좋아요 {liked}개, likes_count {Book.objects.get(pk=book.pk).likes_count}")
@@ -0,0 +1,74 @@
+# books/management/commands/bench_recommender.py
+
+import tempfile
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from books.recommender_index import RecommenderIndex
+from ._synthetic import synthetic_descriptions, summarize
+
+
+# 요청마다 TF-IDF를 다시 학습하던 기존 방식 (비교 기준)
+def legacy_recommend(descriptions, book_ids, liked_ids):
+    vectorizer = TfidfVectorizer(stop_words='english')
+    tfidf_matrix = vectorizer.fit_transform(descriptions)
+    liked_indices = [book_ids.index(book_id) for book_id in liked_ids]
+    sim_scores = cosine_similarity(tfidf_matrix, tfidf_matrix[liked_indices]).mean(axis=1)
+    sorted_indices = np.argsort(sim_scores)[::-1]
+    return [book_ids[i] for i in sorted_indices if book_ids[i] not in liked_ids][:10]
+
+
+# 가상 도서 수에 따른 개인화 추천 지연 시간 비교 (기존 재학습 vs 저장된 인덱스)
+class Command(BaseCommand):
+    help = "가상 도서 데이터로 추천 요청 지연 시간을 측정합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='200,10000,100000', help="쉼표로 구분한 도서 수 목록")
+        parser.add_argument('--repeat', type=int, default=20, help="인덱스 방식 반복 측정 횟수")
+        parser.add_argument('--legacy-repeat', type=int, default=3, help="기존 방식 반복 측정 횟수")
+        parser.add_argument('--liked', type=int, default=5, help="사용자가 좋아요한 도서 수")
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        rng = np.random.default_rng(0)
+
+        self.stdout.write(f"{'books':>8} | {'legacy p50':>11} {'legacy p95':>11} | "
+                          f"{'index p50':>10} {'index p95':>10} | {'build':>8} | speedup")
+        for n_books in sizes:
+            descriptions = synthetic_descriptions(n_books)
+            book_ids = list(range(1, n_books + 1))
+
+            legacy_samples = []
+            for _ in range(options['legacy_repeat']):
+                liked_ids = [int(i) for i in rng.choice(book_ids, options['liked'], replace=False)]
+                started = time.perf_counter()
+                legacy_recommend(descriptions, book_ids, liked_ids)
+                legacy_samples.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            index = RecommenderIndex.fit(list(zip(book_ids, descriptions)))
+            build_seconds = time.perf_counter() - started
+
+            with tempfile.TemporaryDirectory() as directory:
+                index.save(directory)
+                index = RecommenderIndex.load(directory)
+
+                index_samples = []
+                for _ in range(options['repeat']):
+                    liked_ids = [int(i) for i in rng.choice(book_ids, options['liked'], replace=False)]
+                    started = time.perf_counter()
+                    index.top_k(liked_ids, exclude_ids=liked_ids, k=10)
+                    index_samples.append(time.perf_counter() - started)
+                del index
+
+            legacy_p50, legacy_p95 = summarize(legacy_samples)
+            index_p50, index_p95 = summarize(index_samples)
+            self.stdout.write(
+                f"{n_books:>8} | {legacy_p50:>9.1f}ms {legacy_p95:>9.1f}ms | "
+                f"{index_p50:>8.2f}ms {index_p95:>8.2f}ms | {build_seconds:>7.2f}s | "
+                f"x{legacy_p50 / max(index_p50, 1e-6):.0f}"
+            )
@@ -0,0 +1,72 @@
+# books/management/commands/bench_search.py
+
+import datetime
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from books.models import Book, Category
+from search import engine
+from ._synthetic import synthetic_korean_texts, summarize, temporary_database
+
+
+# 기존 icontains 검색과 검색 인덱스(BM25) 검색의 지연 시간 비교 (임시 DB 사용)
+class Command(BaseCommand):
+    help = "가상 도서 데이터로 icontains 검색과 검색 인덱스의 지연 시간을 비교합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--books', type=int, default=20000)
+        parser.add_argument('--queries', type=int, default=20, help="빈도 구간별 질의 수")
+        parser.add_argument('--page-size', type=int, default=20)
+
+    def handle(self, *args, **options):
+        n_books = options['books']
+        page_size = options['page_size']
+        vocab, descriptions = synthetic_korean_texts(n_books)
+        rng = np.random.default_rng(1)
+
+        with temporary_database():
+            category = Category.objects.create(name="벤치마크")
+            # 시그널 없이 한 번에 저장한 뒤 검색 인덱스를 일괄 생성
+            Book.objects.bulk_create([
+                Book(
+                    category=category, title=" ".join(rng.choice(vocab, 3)), description=description,
+                    isbn=str(i), cover="", publisher="", pub_date=datetime.date(2024, 1, 1),
+                    author=" ".join(rng.choice(vocab, 1)), author_info="", customer_review_rank=0, subTitle="",
+                )
+                for i, description in enumerate(descriptions)
+            ], batch_size=2000)
+
+            started = time.perf_counter()
+            engine.rebuild('books')
+            self.stdout.write(f"{n_books}권 색인 ({engine.get_backend().name}): {time.perf_counter() - started:.2f}s")
+
+            # 등장 빈도 구간별로 질의 단어 선택 (Zipf 순위 기준)
+            bands = {"common": (0, 10), "mid": (100, 1000), "rare": (1000, len(vocab))}
+            self.stdout.write(f"{'band':>7} | {'icontains p50':>13} {'p95':>9} | {'index p50':>10} {'p95':>9}")
+            for band, (low, high) in bands.items():
+                icontains, indexed = [], []
+                for rank in rng.integers(low, high, options['queries']):
+                    query = str(vocab[rank])
+
+                    # 기존 동작: 일치하는 도서 전체를 id 순으로 조회
+                    started = time.perf_counter()
+                    list(
+                        Book.objects.filter(Q(title__icontains=query) | Q(author__icontains=query) | Q(description__icontains=query))
+                        .order_by('id').values_list('id', flat=True)
+                    )
+                    icontains.append(time.perf_counter() - started)
+
+                    # 검색 인덱스: BM25 상위 한 페이지와 전체 일치 수
+                    started = time.perf_counter()
+                    engine.search('books', query, limit=page_size)
+                    indexed.append(time.perf_counter() - started)
+
+                icontains_p50, icontains_p95 = summarize(icontains)
+                index_p50, index_p95 = summarize(indexed)
+                self.stdout.write(
+                    f"{band:>7} | {icontains_p50:>11.1f}ms {icontains_p95:>7.1f}ms | "
+                    f"{index_p50:>8.1f}ms {index_p95:>7.1f}ms"
+                )
@@ -0,0 +1,83 @@
+# books/management/commands/bench_similarity.py
+
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from sklearn.metrics.pairwise import cosine_similarity
+
+from books.recommender_index import RecommenderIndex
+from books.similarity import BACKENDS
+from ._synthetic import synthetic_descriptions, summarize
+
+
+# 기존 방식: 좋아요한 도서 각각과의 코사인 유사도 평균 → 전체 argsort
+def argsort_search(index, liked_rows, k, excluded):
+    sim_scores = cosine_similarity(index.matrix, index.matrix[liked_rows]).mean(axis=1)
+    recommended_ids = []
+    for i in np.argsort(sim_scores)[::-1]:
+        book_id = int(index.book_ids[i])
+        if book_id not in excluded:
+            recommended_ids.append(book_id)
+        if len(recommended_ids) >= k:
+            break
+    return recommended_ids
+
+
+# 유사도 백엔드별 지연 시간과 정확 검색 대비 recall@k 측정
+class Command(BaseCommand):
+    help = "유사도 검색 백엔드(exact, ivf)의 recall과 지연 시간을 측정합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10000,100000', help="쉼표로 구분한 도서 수 목록")
+        parser.add_argument('--queries', type=int, default=50, help="측정할 질의 수")
+        parser.add_argument('--liked', type=int, default=5, help="질의마다 좋아요한 도서 수")
+        parser.add_argument('-k', type=int, default=10)
+
+    def handle(self, *args, **options):
+        k = options['k']
+        rng = np.random.default_rng(0)
+
+        self.stdout.write(f"{'books':>8} | {'backend':>8} | {'p50':>9} {'p95':>9} | {'recall@' + str(k):>9} | build")
+        for n_books in [int(size) for size in options['sizes'].split(',')]:
+            index = RecommenderIndex.fit(list(zip(range(1, n_books + 1), synthetic_descriptions(n_books))))
+            queries = [rng.choice(n_books, options['liked'], replace=False) for _ in range(options['queries'])]
+
+            backends = {}
+            for name, backend_class in BACKENDS.items():
+                started = time.perf_counter()
+                backend = backend_class(index)
+                if hasattr(backend, 'ready'):
+                    backend.ready.wait()
+                backends[name] = (backend, time.perf_counter() - started)
+
+            # 정답 집합은 정확 검색 결과
+            truth = []
+            for rows in queries:
+                excluded = frozenset(int(book_id) for book_id in index.book_ids[rows])
+                centroid = index.centroid(index.book_ids[rows])
+                truth.append(set(backends['exact'][0].search(centroid, k, excluded)))
+
+            samples = []
+            for rows in queries:
+                excluded = frozenset(int(book_id) for book_id in index.book_ids[rows])
+                started = time.perf_counter()
+                argsort_search(index, rows, k, excluded)
+                samples.append(time.perf_counter() - started)
+            p50, p95 = summarize(samples)
+            self.stdout.write(f"{n_books:>8} | {'argsort':>8} | {p50:>7.2f}ms {p95:>7.2f}ms | {1.0:>9.3f} | -")
+
+            for name, (backend, build_seconds) in backends.items():
+                samples, recalls = [], []
+                for rows, expected in zip(queries, truth):
+                    excluded = frozenset(int(book_id) for book_id in index.book_ids[rows])
+                    started = time.perf_counter()
+                    centroid = index.centroid(index.book_ids[rows])
+                    found = backend.search(centroid, k, excluded)
+                    samples.append(time.perf_counter() - started)
+                    recalls.append(len(expected & set(found)) / max(len(expected), 1))
+                p50, p95 = summarize(samples)
+                self.stdout.write(
+                    f"{n_books:>8} | {name:>8} | {p50:>7.2f}ms {p95:>7.2f}ms | "
+                    f"{np.mean(recalls):>9.3f} | {build_seconds:.2f}s"
+                )
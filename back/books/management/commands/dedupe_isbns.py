@@ -0,0 +1,66 @@
+# books/management/commands/dedupe_isbns.py
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.db.models import Count
+
+# ISBN unique 제약(books.0005) 직전의 모델 상태
+# 이 명령은 0005를 적용하기 전에 실행하므로, 그 뒤에 추가된 컬럼이 없는 마이그레이션 상태의 모델을 사용
+STATE_BEFORE_UNIQUE = [('books', '0004_author'), ('threads', '0001_initial')]
+
+
+def duplicate_isbns(Book):
+    return list(
+        Book.objects.values('isbn')
+        .annotate(count=Count('pk'))
+        .filter(count__gt=1)
+        .values_list('isbn', flat=True)
+    )
+
+
+# ISBN unique 제약을 걸 수 있도록 기존 데이터 정리, 반환값: (빈 ISBN을 채운 도서 수, 삭제한 중복 도서 ID 목록)
+# - 빈 ISBN: 'noisbn-<ID>'로 채움 (서로 다른 도서이므로 합치지 않음)
+# - 같은 ISBN의 도서가 여러 권: 가장 먼저 등록된 도서 하나로 합침 (감상글과 좋아요를 옮긴 뒤 나머지 삭제)
+def dedupe(apps, dry_run=False):
+    Book = apps.get_model('books', 'Book')
+    Thread = apps.get_model('threads', 'Thread')
+    Likes = Book.liked_users.through
+
+    blank = list(Book.objects.filter(isbn='').values_list('pk', flat=True))
+    removed = []
+    with transaction.atomic():
+        for book_id in blank:
+            Book.objects.filter(pk=book_id).update(isbn=f'noisbn-{book_id}')
+
+        for isbn in duplicate_isbns(Book):
+            keep, *others = Book.objects.filter(isbn=isbn).order_by('pk').values_list('pk', flat=True)
+            removed.extend(others)
+            Thread.objects.filter(book_id__in=others).update(book_id=keep)
+            liked = set(Likes.objects.filter(book_id=keep).values_list('customuser_id', flat=True))
+            Likes.objects.bulk_create([
+                Likes(book_id=keep, customuser_id=user_id)
+                for user_id in set(Likes.objects.filter(book_id__in=others).values_list('customuser_id', flat=True)) - liked
+            ])
+            Book.objects.filter(pk__in=others).delete()
+
+        if dry_run:
+            transaction.set_rollback(True)
+    return len(blank), removed
+
+
+# books.0005(ISBN unique) 마이그레이션 전에 운영자가 직접 실행하는 중복 ISBN 정리
+# 중복 도서는 삭제되고 되돌릴 수 없으므로 --dry-run으로 먼저 확인하고 DB를 백업한 뒤 실행
+class Command(BaseCommand):
+    help = "ISBN unique 제약 적용 전에 빈 ISBN을 채우고 같은 ISBN의 도서를 하나로 합칩니다 (중복 도서는 삭제됨)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="합칠 도서만 출력하고 변경하지 않음")
+
+    def handle(self, *args, **options):
+        apps = MigrationExecutor(connection).loader.project_state(STATE_BEFORE_UNIQUE).apps
+        filled, removed = dedupe(apps, dry_run=options['dry_run'])
+        action = '삭제 예정' if options['dry_run'] else '삭제'
+        self.stdout.write(f"  빈 ISBN 채움: {filled}권")
+        self.stdout.write(f"  중복 도서 {action}: {len(removed)}권 {removed}")
+        self.stdout.write(self.style.SUCCESS("완료 (이제 python manage.py migrate 실행)"))
@@ -0,0 +1,169 @@
+# books/management/commands/enrich_catalog.py
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from books import author_cache, tts
+from books.models import Book
+from books.rate_limit import RateLimits
+
+PROFILE_FIELDS = ['author_info', 'author_works', 'author_photo', 'author_enriched_at']
+
+
+# 작가 정보(소개, 대표작, 사진) 또는 TTS 음성이 비어 있는 도서
+# 작가 정보는 보완을 마친 적이 없는 도서만 (위키백과에 사진이 없는 작가는 비어 있는 채로 둠)
+def missing_enrichment(include_tts=True):
+    missing = Q(author_enriched_at__isnull=True) & (
+        Q(author_info='')
+        | Q(author_works__isnull=True) | Q(author_works='')
+        | Q(author_photo__isnull=True) | Q(author_photo='')
+    )
+    if include_tts:
+        missing |= Q(tts_audio__isnull=True) | Q(tts_audio='')
+    return Book.objects.filter(missing)
+
+
+def needs_profile(book):
+    if book.author_enriched_at is not None:
+        return False
+    return not book.author_info or not book.author_works or not book.author_photo
+
+
+# 작가 정보 또는 TTS 음성이 비어 있는 도서 전체를 일괄 보완
+# 작가는 작가 캐시(books.author_cache)를 거쳐 한 번씩만 조회하고, 외부 서비스별로 초당 요청 수를 제한
+class Command(BaseCommand):
+    help = "작가 정보 또는 TTS 음성이 비어 있는 도서 전체를 외부 서비스 호출 속도를 제한하며 일괄 보완합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=settings.AUTHOR_FETCH_CONCURRENCY, help="동시 작업 수 (1이면 현재 스레드에서 실행)")
+        parser.add_argument('--batch-size', type=int, default=50, help="한 번에 처리하고 저장할 도서 수")
+        parser.add_argument('--limit', type=int, help="처리할 최대 도서 수")
+        parser.add_argument('--skip-tts', action='store_true', help="TTS 음성은 생성하지 않음")
+        parser.add_argument('--restart', action='store_true', help="체크포인트를 무시하고 처음부터 다시 처리")
+
+    def handle(self, *args, **options):
+        checkpoint_path = settings.ENRICH_CHECKPOINT_PATH
+        last_pk = 0
+        if checkpoint_path.exists() and not options['restart']:
+            last_pk = json.loads(checkpoint_path.read_text())['last_pk']
+
+        books = missing_enrichment(include_tts=not options['skip_tts']).filter(pk__gt=last_pk).order_by('pk')
+        remaining = books.count()
+        total = remaining if options['limit'] is None else min(remaining, options['limit'])
+        resumed = f" (체크포인트: 도서 ID {last_pk} 이후부터)" if last_pk else ""
+        self.stdout.write(f"보완할 도서 {total}권{resumed}")
+
+        self.limits = RateLimits()
+        self.errors = 0
+        self.failed = set()
+        self.executor = ThreadPoolExecutor(max_workers=options['workers']) if options['workers'] > 1 else None
+        started = time.perf_counter()
+        processed = 0
+        try:
+            while processed < total:
+                batch = list(books.filter(pk__gt=last_pk)[:min(options['batch_size'], total - processed)])
+                if not batch:
+                    break
+                self._enrich_batch(batch, options['skip_tts'])
+                processed += len(batch)
+                last_pk = batch[-1].pk
+                # 실패한 도서가 있으면 그 앞까지만 체크포인트를 전진 (이어서 실행할 때 다시 시도,
+                # 그 뒤에 성공한 도서는 보완 대상에서 빠지므로 다시 처리하지 않음)
+                resume_pk = min(self.failed) - 1 if self.failed else last_pk
+                checkpoint_path.write_text(json.dumps({'last_pk': resume_pk}))
+
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"  {processed}/{total}권 ({processed / max(elapsed, 1e-9):.1f} books/sec, 실패 {self.errors})"
+                )
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown(wait=True)
+
+        elapsed = time.perf_counter() - started
+        # 남은 도서를 모두 처리했으면 체크포인트 삭제 (--limit으로 끊은 경우 다음 실행에서 이어서 처리)
+        if processed >= remaining:
+            checkpoint_path.unlink(missing_ok=True)
+        waited = ", ".join(f"{name} {seconds:.1f}s" for name, seconds in self.limits.waited.items())
+        self.stdout.write(self.style.SUCCESS(
+            f"완료: {processed}권, {elapsed:.2f}s ({processed / max(elapsed, 1e-9):.1f} books/sec), "
+            f"실패 {self.errors}, 속도 제한 대기 ({waited})"
+        ))
+
+    # 작업들을 워커 풀(또는 현재 스레드)에서 실행하고 {키: 결과 또는 예외} 반환
+    def _run(self, tasks):
+        def call(fn, *args):
+            try:
+                return fn(*args)
+            except Exception as e:
+                return e
+            finally:
+                # 워커 스레드가 연 DB 연결 정리
+                if self.executor is not None:
+                    connection.close()
+
+        if self.executor is None:
+            return {key: call(fn, *args) for key, (fn, *args) in tasks.items()}
+        futures = {key: self.executor.submit(call, fn, *args) for key, (fn, *args) in tasks.items()}
+        return {key: future.result() for key, future in futures.items()}
+
+    def _report(self, label, book, name, error):
+        self.errors += 1
+        self.failed.add(book.pk)
+        self.stderr.write(f"  [{label} 실패] {name}: {error}")
+
+    # 도서 묶음 하나: 작가별 정보 조회 → 도서에 반영 → TTS 생성 → 변경된 필드 일괄 저장
+    def _enrich_batch(self, batch, skip_tts):
+        changed = set()
+
+        titles = {}
+        for book in batch:
+            if needs_profile(book):
+                titles.setdefault(author_cache.normalize_name(book.author), (book.author, book.title))
+        profiles = self._run({
+            key: (author_cache.author_profile, name, title, self.limits)
+            for key, (name, title) in titles.items()
+        })
+        for book in batch:
+            if not needs_profile(book):
+                continue
+            author = profiles[author_cache.normalize_name(book.author)]
+            if isinstance(author, Exception):
+                self._report('작가 정보', book, book.author, author)
+                continue
+            book.author_info = author.author_info
+            book.author_works = author.author_works
+            book.author_enriched_at = timezone.now()
+            if not book.author_photo and author.photo_url:
+                book.author_photo = author.photo_url
+            changed.update(PROFILE_FIELDS)
+
+        if not skip_tts:
+            audio = self._run({
+                book.pk: (self._tts, book)
+                for book in batch
+                if not book.tts_audio and book.author_info
+            })
+            for book in batch:
+                if book.pk not in audio:
+                    continue
+                if isinstance(audio[book.pk], Exception):
+                    self._report('TTS', book, book.title, audio[book.pk])
+                    continue
+                book.tts_audio.name = audio[book.pk]
+                changed.add('tts_audio')
+
+        if changed:
+            with transaction.atomic():
+                Book.objects.bulk_update(batch, sorted(changed), batch_size=len(batch))
+
+    # 조각마다 'gtts' 토큰을 얻으며 합성 (같은 텍스트의 음성 파일이 있으면 합성하지 않음)
+    def _tts(self, book):
+        return tts.render(tts.book_text(book), limits=self.limits)
@@ -0,0 +1,168 @@
+# books/management/commands/ingest_bestsellers.py
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from books import aladin, recommender_index
+from books.jobs import enrich_books
+from books.models import Book, Category
+from search import engine
+from threads.models import Thread
+
+
+# 알라딘 목록(베스트셀러 등)을 페이지 단위로 동시에 받아 ISBN 기준으로 Book에 바로 upsert
+# 도서마다 post_save 시그널을 보내지 않도록 bulk_create로 저장하고,
+# 검색 색인과 작가 정보 보완은 묶음마다 한 번에 처리
+class Command(BaseCommand):
+    help = "알라딘 베스트셀러 목록을 동시에 가져와 ISBN 기준으로 도서를 추가·갱신합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=4, help=f"목록별로 가져올 페이지 수 (페이지당 {aladin.PAGE_SIZE}권)")
+        parser.add_argument(
+            '--query-type', action='append', dest='query_types',
+            help="알라딘 목록 종류 (Bestseller, ItemNewAll, ItemNewSpecial, BlogBest, 여러 번 지정 가능, 기본 Bestseller)",
+        )
+        parser.add_argument('--workers', type=int, default=settings.ALADIN_FETCH_CONCURRENCY, help="동시 요청 수")
+        parser.add_argument('--batch-size', type=int, default=500, help="한 번에 저장할 도서 수")
+        parser.add_argument('--skip-enrich', action='store_true', help="작가 정보 보완 작업을 등록하지 않음")
+        parser.add_argument('--restart', action='store_true', help="체크포인트를 무시하고 처음부터 다시 가져옴")
+
+    def handle(self, *args, **options):
+        checkpoint_path = settings.INGEST_CHECKPOINT_PATH
+        done = set()
+        if checkpoint_path.exists() and not options['restart']:
+            done = set(json.loads(checkpoint_path.read_text())['done'])
+
+        query_types = options['query_types'] or ['Bestseller']
+        pages = [
+            (query_type, page)
+            for query_type in query_types
+            for page in range(1, options['pages'] + 1)
+            if f'{query_type}:{page}' not in done
+        ]
+        resumed = f" (체크포인트: {len(done)}페이지 완료)" if done else ""
+        self.stdout.write(f"가져올 페이지 {len(pages)}개{resumed}")
+
+        self.categories = set(Category.objects.values_list('pk', flat=True))
+        self.counts = dict.fromkeys(['created', 'updated', 'skipped', 'duplicates', 'filled', 'enqueued', 'errors'], 0)
+        self.skip_enrich = options['skip_enrich']
+        seen = set()
+        rows, fetched = [], []
+        started = time.perf_counter()
+
+        client = aladin.AladinClient(max_workers=options['workers'])
+        executor = ThreadPoolExecutor(max_workers=options['workers'], thread_name_prefix='aladin')
+        try:
+            futures = {executor.submit(client.items, page, query_type): (query_type, page) for query_type, page in pages}
+            # 먼저 도착한 페이지부터 변환해 묶음에 담고, 묶음이 차면 저장 후 체크포인트 기록
+            for future in as_completed(futures):
+                query_type, page = futures[future]
+                try:
+                    items = future.result()
+                except Exception as e:
+                    self.counts['errors'] += 1
+                    self.stderr.write(f"  [페이지 실패] {query_type} {page}: {e}")
+                    continue
+
+                for item in items:
+                    fields = aladin.to_book_fields(item)
+                    if fields is None or fields['category_id'] not in self.categories:
+                        self.counts['skipped'] += 1
+                    elif fields['isbn'] in seen:
+                        self.counts['duplicates'] += 1
+                    else:
+                        seen.add(fields['isbn'])
+                        rows.append(fields)
+                fetched.append(f'{query_type}:{page}')
+
+                if len(rows) >= options['batch_size']:
+                    self._save(rows)
+                    done.update(fetched)
+                    checkpoint_path.write_text(json.dumps({'done': sorted(done)}))
+                    rows, fetched = [], []
+                    self._progress(started)
+            if rows:
+                self._save(rows)
+            done.update(fetched)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            client.close()
+
+        # 모든 페이지를 가져왔으면 체크포인트 삭제 (실패한 페이지가 있으면 다음 실행에서 그 페이지만 다시 요청)
+        if self.counts['errors']:
+            checkpoint_path.write_text(json.dumps({'done': sorted(done)}))
+        else:
+            checkpoint_path.unlink(missing_ok=True)
+
+        elapsed = time.perf_counter() - started
+        counts = self.counts
+        self.stdout.write(self.style.SUCCESS(
+            f"완료: 추가 {counts['created']}권, 갱신 {counts['updated']}권, {elapsed:.2f}s "
+            f"(건너뜀 {counts['skipped']}, 중복 {counts['duplicates']}, 페이지 실패 {counts['errors']}, "
+            f"작가 캐시로 채움 {counts['filled']}, 보완 작업 등록 {counts['enqueued']})"
+        ))
+
+    def _progress(self, started):
+        saved = self.counts['created'] + self.counts['updated']
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"  {saved}권 저장 ({saved / max(elapsed, 1e-9):.1f} books/sec)")
+
+    # 묶음 하나를 ISBN 기준 upsert (알라딘 필드만 갱신하고 작가 정보·TTS 음성은 유지)
+    # bulk_create는 시그널을 보내지 않으므로 시그널 수신자가 하던 일을 여기서 묶음 단위로 처리
+    # - 검색 색인: 도서 전체, 제목·저자가 바뀐 도서의 감상글
+    # - 추천 인덱스: 새 도서와 설명이 바뀐 도서 (커밋 후 변경 로그에 한 번에 기록)
+    # - 작가 정보 보완
+    def _save(self, rows):
+        isbns = [fields['isbn'] for fields in rows]
+        existing = {
+            isbn: (title, author, description)
+            for isbn, title, author, description in
+            Book.objects.filter(isbn__in=isbns).values_list('isbn', 'title', 'author', 'description')
+        }
+        with transaction.atomic():
+            Book.objects.bulk_create(
+                [Book(author_info='', **fields) for fields in rows],
+                update_conflicts=True,
+                unique_fields=['isbn'],
+                update_fields=aladin.CATALOG_FIELDS,
+            )
+            # SQLite에서는 upsert한 행의 ID가 채워지지 않으므로 ISBN으로 다시 조회
+            books = list(
+                Book.objects.filter(isbn__in=isbns)
+                .only('isbn', 'title', 'author', 'description', 'author_info', 'author_works', 'author_photo')
+            )
+            engine.update('books', [book.pk for book in books])
+
+            renamed = [
+                book.pk for book in books
+                if book.isbn in existing and existing[book.isbn][:2] != (book.title, book.author)
+            ]
+            if renamed:
+                engine.update('threads', list(Thread.objects.filter(book_id__in=renamed).values_list('pk', flat=True)))
+
+            described = [
+                (book.pk, book.description) for book in books
+                if book.isbn not in existing or existing[book.isbn][2] != book.description
+            ]
+            transaction.on_commit(lambda: self._update_recommender_index(described))
+        self.counts['created'] += len(rows) - len(existing)
+        self.counts['updated'] += len(existing)
+
+        if not self.skip_enrich:
+            filled, enqueued = enrich_books(books)
+            self.counts['filled'] += filled
+            self.counts['enqueued'] += enqueued
+
+    # 추천 인덱스가 있으면 변경분만 반영 (없으면 첫 추천 요청 때 전체로 생성됨)
+    @staticmethod
+    def _update_recommender_index(documents):
+        index = recommender_index.get_index(build=False)
+        if index is None or not documents:
+            return
+        index.upsert_many(documents)
+        recommender_index.refit_if_drifted(index)
@@ -0,0 +1,152 @@
+# books/management/commands/precompute_recommendations.py
+
+import json
+import multiprocessing
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+
+from books.models import Book, UserRecommendation
+from books.recommender import similar_book_ids
+from books.recommender_index import RecommenderIndex, get_index
+from threads.models import Thread
+
+# 워커 프로세스마다 한 번 로드하는 인덱스 (배열은 메모리 매핑되어 프로세스 간 페이지를 공유)
+_worker_index = None
+
+
+def _init_worker(directory):
+    global _worker_index
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+    _worker_index = RecommenderIndex.load(directory, mmap=True)
+
+
+# 샤드 하나의 사용자들에 대해 유형별 추천 계산 (DB 접근 없이 인덱스만 사용)
+# 계산에 사용한 인덱스 버전(변경분 포함)을 함께 반환
+def _compute_shard(shard_no, interactions, top_n):
+    results = []
+    for user_id, seeds_by_type in interactions.items():
+        for rec_type, seed_ids in seeds_by_type.items():
+            if seed_ids:
+                results.append((user_id, rec_type, similar_book_ids(_worker_index, seed_ids, k=top_n)))
+    return shard_no, len(interactions), _worker_index.version, results
+
+
+# 좋아요 또는 감상글이 있는 모든 사용자의 개인화 추천을 미리 계산해 UserRecommendation에 저장
+class Command(BaseCommand):
+    help = "좋아요/감상글이 있는 사용자 전체의 개인화 추천을 미리 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count(), help="워커 프로세스 수 (1이면 현재 프로세스에서 실행)")
+        parser.add_argument('--shard-size', type=int, default=500, help="샤드당 사용자 수")
+        parser.add_argument('--top-n', type=int, default=10, help="사용자별 저장할 추천 도서 수")
+        parser.add_argument('--restart', action='store_true', help="체크포인트를 무시하고 처음부터 다시 계산")
+
+    def handle(self, *args, **options):
+        index = get_index()
+        if index is None:
+            self.stdout.write(self.style.WARNING("추천 인덱스가 없어 계산을 건너뜁니다."))
+            return
+
+        directory = Path(settings.RECOMMENDER_INDEX_DIR)
+        checkpoint_path = directory / "precompute_checkpoint.json"
+        shard_size = options['shard_size']
+
+        liked = defaultdict(list)
+        for user_id, book_id in Book.liked_users.through.objects.values_list('customuser_id', 'book_id'):
+            liked[user_id].append(book_id)
+        threaded = defaultdict(list)
+        for user_id, book_id in Thread.objects.values_list('user_id', 'book_id'):
+            threaded[user_id].append(book_id)
+
+        # 같은 인덱스 버전으로 중단된 작업이 있으면 마지막으로 완료한 사용자 ID 다음부터 계산
+        # (샤드 번호가 아니라 사용자 ID로 기록하므로 그사이 사용자가 늘거나 줄어도 건너뛰는 사용자가 없음)
+        last_user_id = None
+        if checkpoint_path.exists() and not options['restart']:
+            checkpoint = json.loads(checkpoint_path.read_text())
+            if checkpoint.get('index_version') == index.version:
+                last_user_id = checkpoint['last_user_id']
+
+        user_ids = sorted(
+            user_id for user_id in set(liked) | set(threaded)
+            if last_user_id is None or user_id > last_user_id
+        )
+        shards = [user_ids[i:i + shard_size] for i in range(0, len(user_ids), shard_size)]
+        resumed = f" (사용자 ID {last_user_id}까지 완료)" if last_user_id is not None else ""
+        self.stdout.write(f"남은 사용자 {len(user_ids)}명, 샤드 {len(shards)}개{resumed}")
+
+        def tasks():
+            for n, shard in enumerate(shards):
+                interactions = {
+                    user_id: {'likes': liked.get(user_id, []), 'threads': threaded.get(user_id, [])}
+                    for user_id in shard
+                }
+                yield n, interactions
+
+        started = time.perf_counter()
+        processed = 0
+        # 샤드는 끝나는 순서가 섞이므로 앞에서부터 연속으로 완료된 샤드까지만 체크포인트를 전진
+        done = set()
+        next_shard = 0
+        for shard_no, n_users, index_version, results in self._run(tasks(), options, directory):
+            self._write(results, index_version)
+            done.add(shard_no)
+            while next_shard in done:
+                last_user_id = shards[next_shard][-1]
+                next_shard += 1
+            checkpoint_path.write_text(json.dumps({
+                'index_version': index.version,
+                'last_user_id': last_user_id,
+            }))
+            processed += n_users
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"  샤드 {shard_no} 완료 ({len(done)}/{len(shards)}) - {processed / max(elapsed, 1e-9):.1f} users/sec")
+
+        elapsed = time.perf_counter() - started
+        checkpoint_path.unlink(missing_ok=True)
+        self.stdout.write(self.style.SUCCESS(
+            f"완료: 사용자 {processed}명, {elapsed:.2f}s ({processed / max(elapsed, 1e-9):.1f} users/sec)"
+        ))
+
+    # 워커 풀에 샤드를 나눠 주고 끝나는 순서대로 결과를 돌려받음
+    def _run(self, tasks, options, directory):
+        top_n = options['top_n']
+        if options['workers'] <= 1:
+            _init_worker(directory)
+            for shard_no, interactions in tasks:
+                yield _compute_shard(shard_no, interactions, top_n)
+            return
+
+        # 포크 전에 DB 연결을 닫아 자식 프로세스와 공유되지 않도록 함
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=options['workers'],
+            initializer=_init_worker,
+            initargs=(str(directory),),
+        ) as pool:
+            futures = [pool.submit(_compute_shard, n, interactions, top_n) for n, interactions in tasks]
+            for future in as_completed(futures):
+                yield future.result()
+
+    # 샤드 결과를 한 트랜잭션에서 일괄 upsert
+    def _write(self, results, index_version):
+        rows = [
+            UserRecommendation(user_id=user_id, rec_type=rec_type, book_ids=book_ids, index_version=index_version)
+            for user_id, rec_type, book_ids in results
+        ]
+        with transaction.atomic():
+            UserRecommendation.objects.bulk_create(
+                rows,
+                batch_size=500,
+                update_conflicts=True,
+                unique_fields=['user', 'rec_type'],
+                update_fields=['book_ids', 'index_version', 'computed_at'],
+            )
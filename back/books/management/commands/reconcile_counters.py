@@ -0,0 +1,20 @@
+# books/management/commands/reconcile_counters.py
+
+from django.core.management.base import BaseCommand
+
+from blookin import counters
+
+
+# 비정규화한 좋아요·팔로워·팔로잉 수를 관계 테이블의 실제 행 수와 비교해 바로잡음
+# (loaddata, 관리자 화면, shell에서 관계를 직접 바꾼 경우 등 카운터가 어긋났을 때 실행)
+class Command(BaseCommand):
+    help = "좋아요·팔로워·팔로잉 수 카운터를 실제 관계 수와 맞춥니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="어긋난 행 수만 출력하고 고치지 않음")
+
+    def handle(self, *args, **options):
+        drift = counters.reconcile(dry_run=options['dry_run'])
+        for name, count in drift.items():
+            self.stdout.write(f"  {name}: {count}건 {'어긋남' if options['dry_run'] else '수정'}")
+        self.stdout.write(self.style.SUCCESS(f"완료: 총 {sum(drift.values())}건"))
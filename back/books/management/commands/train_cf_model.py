@@ -0,0 +1,35 @@
+# books/management/commands/train_cf_model.py
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from books.cf_model import train_model
+
+
+# 좋아요·감상글 상호작용 전체로 협업 필터링(ALS) 모델을 학습해 디스크에 저장
+# (주기적으로 실행, 저장하면 각 워커가 다음 요청부터 새 모델 사용)
+class Command(BaseCommand):
+    help = "좋아요·감상글 상호작용으로 협업 필터링 추천 모델을 학습합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--factors', type=int, default=settings.CF_FACTORS)
+        parser.add_argument('--iterations', type=int, default=settings.CF_ITERATIONS)
+        parser.add_argument('--regularization', type=float, default=settings.CF_REGULARIZATION)
+        parser.add_argument('--alpha', type=float, default=settings.CF_ALPHA)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        model = train_model(
+            factors=options['factors'], iterations=options['iterations'],
+            regularization=options['regularization'], alpha=options['alpha'],
+        )
+        if model is None:
+            self.stdout.write(self.style.WARNING("좋아요·감상글이 없어 모델을 만들지 않았습니다."))
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f"학습 완료: 도서 {len(model)}권, 요인 {model.item_factors.shape[1]}개, "
+            f"버전 {model.version} ({time.perf_counter() - started:.2f}s)"
+        ))
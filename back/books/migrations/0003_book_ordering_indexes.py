@@ -0,0 +1,21 @@
+# Generated by Django 4.2.16 on 2026-10-18 13:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0002_userrecommendation'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['pub_date', 'id'], name='book_pub_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['customer_review_rank', 'id'], name='book_review_rank_id_idx'),
+        ),
+    ]
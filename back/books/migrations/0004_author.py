@@ -0,0 +1,30 @@
+# Generated by Django 4.2.16 on 2026-10-18 13:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0003_book_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Author',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('normalized_name', models.CharField(max_length=200, unique=True)),
+                ('summary', models.TextField(blank=True)),
+                ('photo_url', models.URLField(blank=True, max_length=500, null=True)),
+                ('major_works', models.JSONField(blank=True, default=list)),
+                ('author_info', models.TextField(blank=True)),
+                ('author_works', models.TextField(blank=True)),
+                ('fetched_at', models.DateTimeField(blank=True, null=True)),
+                ('hits', models.PositiveIntegerField(default=0)),
+                ('fetches', models.PositiveIntegerField(default=0)),
+                ('external_calls', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
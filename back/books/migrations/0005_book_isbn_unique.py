@@ -0,0 +1,36 @@
+# Generated by Django 4.2.16 on 2026-10-18 14:15
+
+from django.db import migrations, models
+
+
+# 중복되거나 비어 있는 ISBN이 있으면 unique 제약을 걸지 않고 중단
+# (중복 도서를 합치면 도서가 삭제되므로 마이그레이션에서 자동으로 하지 않고, 운영자가 dedupe_isbns 명령으로 직접 정리)
+def check_isbns(apps, schema_editor):
+    Book = apps.get_model('books', 'Book')
+    duplicates = (
+        Book.objects.values('isbn')
+        .annotate(count=models.Count('pk'))
+        .filter(count__gt=1)
+        .count()
+    )
+    if duplicates:
+        raise RuntimeError(
+            f"ISBN이 중복되거나 비어 있는 도서 묶음이 {duplicates}개 있습니다. "
+            "python manage.py dedupe_isbns --dry-run 으로 확인한 뒤 dedupe_isbns를 실행하고 다시 migrate 하세요."
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0004_author'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_isbns, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='book',
+            name='isbn',
+            field=models.CharField(max_length=20, unique=True),
+        ),
+    ]
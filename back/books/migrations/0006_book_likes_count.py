@@ -0,0 +1,32 @@
+# Generated by Django 4.2.16 on 2026-10-18 14:22
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+# 기존 좋아요 수로 채움
+def count_likes(apps, schema_editor):
+    Book = apps.get_model('books', 'Book')
+    through = Book.liked_users.through
+    likes = (
+        through.objects.filter(book_id=OuterRef('pk')).order_by()
+        .values('book_id').annotate(count=Count('*')).values('count')
+    )
+    Book.objects.update(likes_count=Coalesce(Subquery(likes), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0005_book_isbn_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_likes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-18 15:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0006_book_likes_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='author_enriched_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -27,8 +27,8 @@ class Book(models.Model):
     # 도서 설명 또는 줄거리
     description = models.TextField()
 
-    # ISBN 번호 (일반적으로 13자리 문자열)
-    isbn = models.CharField(max_length=20)
+    # ISBN 번호 (일반적으로 13자리 문자열), 알라딘 수집 시 같은 ISBN이면 기존 도서를 갱신
+    isbn = models.CharField(max_length=20, unique=True)
 
     # 도서 표지 이미지 URL
     cover = models.URLField()
@@ -54,6 +54,9 @@ class Book(models.Model):
     # 저자의 대표작 목록 (쉼표 구분 문자열 또는 JSON 문자열, 선택 입력)
     author_works = models.TextField(null=True, blank=True)
 
+    # 작가 정보 보완을 마친 시각 (사진이 없는 작가도 enrich_catalog가 매번 다시 조회하지 않도록 기록)
+    author_enriched_at = models.DateTimeField(null=True, blank=True)
+
     # 도서 설명을 TTS로 생성한 음성 파일 (선택 입력)
     tts_audio = models.FileField(upload_to="tts/", null=True, blank=True)
 
@@ -70,6 +73,76 @@ class Book(models.Model):
         blank=True
     )
 
+    # 좋아요 수 (liked_users 행 수를 비정규화, blookin.counters.toggle이 F()로 갱신)
+    likes_count = models.PositiveIntegerField(default=0, editable=False)
+
     # 관리자 페이지 등에서 도서 제목이 출력되도록 설정
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.title
+
+    # 목록 cursor 페이지네이션에서 자주 쓰는 정렬 기준의 (정렬 필드, id) 복합 인덱스
+    class Meta:
+        indexes = [
+            models.Index(fields=['pub_date', 'id'], name='book_pub_date_id_idx'),
+            models.Index(fields=['customer_review_rank', 'id'], name='book_review_rank_id_idx'),
+        ]
+
+# 배치 작업(precompute_recommendations)으로 미리 계산해 둔 사용자별 개인화 추천 결과
+class UserRecommendation(models.Model):
+    # 추천 대상 사용자
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='recommendations'
+    )
+
+    # 추천 유형 ('likes' 또는 'threads')
+    rec_type = models.CharField(max_length=20)
+
+    # 유사도 순으로 정렬된 추천 도서 ID 목록
+    book_ids = models.JSONField(default=list)
+
+    # 계산에 사용한 추천 인덱스 버전 (현재 인덱스와 다르면 사용하지 않음)
+    index_version = models.CharField(max_length=64)
+
+    # 계산 시각
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'rec_type'], name='unique_user_recommendation'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} / {self.rec_type}"
+
+
+# 작가별 외부 정보(위키백과, GPT) 캐시, 같은 작가의 도서들이 함께 사용
+class Author(models.Model):
+    # 도서에 표기된 작가 이름
+    name = models.CharField(max_length=200)
+
+    # 정규화한 이름 (조회 키, books.author_cache.normalize_name)
+    normalized_name = models.CharField(max_length=200, unique=True)
+
+    # 위키백과 문서 요약 (문서가 없으면 빈 문자열)
+    summary = models.TextField(blank=True)
+
+    # 위키백과 대표 이미지 URL
+    photo_url = models.URLField(max_length=500, null=True, blank=True)
+
+    # 위키백과에서 추출한 대표작 목록
+    major_works = models.JSONField(default=list, blank=True)
+
+    # GPT로 정리한 작가 소개와 대표작 (쉼표 구분 문자열)
+    author_info = models.TextField(blank=True)
+    author_works = models.TextField(blank=True)
+
+    # 외부 정보를 가져온 시각 (settings.AUTHOR_CACHE_TTL이 지나면 다시 조회)
+    fetched_at = models.DateTimeField(null=True, blank=True)
+
+    # 캐시 통계: 캐시로 응답한 횟수, 외부 조회가 필요했던 횟수, 외부 호출(HTTP/GPT) 총 횟수
+    hits = models.PositiveIntegerField(default=0)
+    fetches = models.PositiveIntegerField(default=0)
+    external_calls = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return self.name
@@ -0,0 +1,94 @@
+# books/pagination.py
+
+import base64
+import binascii
+import json
+
+from django.db.models import Q
+
+from .models import Book
+
+# 커서 페이지네이션에서 정렬 기준으로 허용하는 필드 (NULL이 없는 필드만)
+CURSOR_ORDERING_FIELDS = {'id', 'title', 'author', 'publisher', 'pub_date', 'customer_review_rank'}
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+# 정렬 문자열('-pub_date' 등)을 (필드명, 내림차순 여부)로 분리, 허용되지 않은 필드면 ValueError
+def parse_ordering(ordering):
+    ordering = ordering or 'id'
+    descending = ordering.startswith('-')
+    field = ordering.lstrip('-')
+    if field not in CURSOR_ORDERING_FIELDS:
+        raise ValueError(f"정렬 기준은 {', '.join(sorted(CURSOR_ORDERING_FIELDS))} 중 하나여야 합니다.")
+    return field, descending
+
+
+# 마지막 항목의 (정렬 값, id)를 불투명한 문자열로 인코딩
+def encode_cursor(ordering, value, pk):
+    payload = json.dumps([ordering, value, pk], ensure_ascii=False).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def decode_cursor(cursor, ordering):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        cursor_ordering, value, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, TypeError):
+        raise ValueError("cursor 값이 올바르지 않습니다.")
+    if cursor_ordering != ordering:
+        raise ValueError("cursor와 ordering이 일치하지 않습니다.")
+    return value, pk
+
+
+# 요청의 page_size (없으면 기본값, 최대 MAX_PAGE_SIZE)
+def cursor_page_size(request):
+    page_size = int(request.GET.get('page_size') or DEFAULT_PAGE_SIZE)
+    return min(max(page_size, 1), MAX_PAGE_SIZE)
+
+
+# (정렬 필드, id) 기준 keyset 페이지네이션
+# OFFSET 없이 인덱스 범위 조건으로 다음 페이지를 찾으므로 뒤 페이지로 가도 비용이 일정함
+# 반환값: (이번 페이지 객체 목록, 다음 페이지 cursor 또는 None)
+def keyset_page(queryset, ordering, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    field, descending = parse_ordering(ordering)
+    ordering = ('-' if descending else '') + field
+    if field == 'id':
+        queryset = queryset.order_by(ordering)
+    else:
+        queryset = queryset.order_by(ordering, '-id' if descending else 'id')
+
+    if cursor:
+        value, pk = decode_cursor(cursor, ordering)
+        lookup = 'lt' if descending else 'gt'
+        if field == 'id':
+            queryset = queryset.filter(**{f'id__{lookup}': pk})
+        else:
+            queryset = queryset.filter(
+                Q(**{f'{field}__{lookup}': value}) | Q(**{field: value, f'id__{lookup}': pk})
+            )
+
+    # 한 건 더 조회해서 다음 페이지가 있는지 판단
+    items = list(queryset[:page_size + 1])
+    if len(items) <= page_size:
+        return items, None
+
+    items = items[:page_size]
+    last = items[-1]
+    value = Book._meta.get_field(field).value_to_string(last)
+    return items, encode_cursor(ordering, value, last.pk)
+
+
+# 검색 관련도 순처럼 이미 순위가 정해진 ID 목록의 페이지 (cursor에는 정렬 기준과 다음 페이지 시작 위치를 기록)
+# 반환값: (이번 페이지 ID 목록, 다음 페이지 cursor 또는 None)
+def ranked_page(ids, cursor=None, page_size=DEFAULT_PAGE_SIZE, ordering='relevance'):
+    start = 0
+    if cursor:
+        start, _ = decode_cursor(cursor, ordering)
+        if not isinstance(start, int) or start < 0:
+            raise ValueError("cursor 값이 올바르지 않습니다.")
+    page_ids = ids[start:start + page_size]
+    if start + page_size >= len(ids):
+        return page_ids, None
+    return page_ids, encode_cursor(ordering, start + page_size, page_ids[-1])
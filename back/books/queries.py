@@ -0,0 +1,22 @@
+# books/queries.py
+
+from django.db.models import Prefetch
+
+from threads.models import Thread
+from threads.queries import plan_threads
+
+
+# 도서의 감상글 목록(thread_set)을 ThreadSerializer용 쿼리 계획과 함께 한 번에 조회
+def thread_set_prefetch():
+    return Prefetch('thread_set', queryset=plan_threads(Thread.objects.all()))
+
+
+# BookSerializer가 출력할 필드에 맞춰 연관 데이터를 미리 조회하는 쿼리 계획
+# fields가 None이면 전체 필드 기준, 도서 수와 무관하게 쿼리 수가 일정함
+# (좋아요 수는 비정규화한 likes_count 컬럼이므로 집계하지 않음)
+def plan_books(books, fields=None):
+    if fields is None or 'category' in fields:
+        books = books.select_related('category')
+    if fields is None or 'thread_set' in fields:
+        books = books.prefetch_related(thread_set_prefetch())
+    return books
@@ -0,0 +1,58 @@
+# books/rate_limit.py
+
+import threading
+import time
+
+from django.conf import settings
+
+
+# 토큰 버킷: 초당 rate개씩 토큰이 채워지고(최대 capacity개), 요청마다 토큰을 소비
+# 토큰이 부족하면 채워질 때까지 대기하므로 평균 요청 속도가 rate를 넘지 않음
+class TokenBucket:
+    def __init__(self, rate, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1)
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    # 토큰 tokens개를 얻을 때까지 대기하고 대기한 시간(초) 반환
+    def acquire(self, tokens=1):
+        if tokens > self.capacity:
+            raise ValueError(f"한 번에 요청한 토큰({tokens})이 버킷 크기({self.capacity})보다 큽니다.")
+        waited = 0.0
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                wait = (tokens - self.tokens) / self.rate
+            self.sleep(wait)
+            waited += wait
+
+
+# 외부 서비스별 토큰 버킷 모음 (settings.ENRICH_RATE_LIMITS: {서비스: 초당 요청 수})
+# 설정에 없는 서비스는 제한하지 않음
+class RateLimits:
+    def __init__(self, limits=None):
+        limits = settings.ENRICH_RATE_LIMITS if limits is None else limits
+        self.buckets = {name: TokenBucket(rate) for name, rate in limits.items()}
+        self.waited = {name: 0.0 for name in limits}
+        self.lock = threading.Lock()
+
+    def acquire(self, upstream, tokens=1):
+        bucket = self.buckets.get(upstream)
+        if bucket is None:
+            return
+        # 버킷 크기보다 많은 토큰도 받을 수 있도록 하나씩 획득
+        waited = sum(bucket.acquire() for _ in range(tokens))
+        with self.lock:
+            self.waited[upstream] += waited
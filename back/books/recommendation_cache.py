@@ -0,0 +1,119 @@
+# books/recommendation_cache.py
+
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .cf_model import get_model
+from .recommender_index import get_index
+
+# 추천 결과 전용 캐시 (settings.CACHES['recommendations'], 기본은 LRU 방식의 로컬 메모리 캐시)
+CACHE_ALIAS = 'recommendations'
+
+# 추천 유형 (books.recommender.RECOMMENDERS)
+REC_TYPES = ['likes', 'threads', 'cf']
+
+HITS_KEY = 'rec:stats:hits'
+MISSES_KEY = 'rec:stats:misses'
+
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+
+# (사용자, 추천 유형)별 세대 값, 무효화할 때마다 새 값으로 교체
+# 세대 키가 LRU로 밀려나도 새 값이 만들어지므로 예전 결과가 다시 보이지 않음
+def _generation(user_id, rec_type):
+    cache = _cache()
+    key = f'rec:gen:{user_id}:{rec_type}'
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def _count(key):
+    cache = _cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+# 캐시 키: (사용자, 추천 유형, 사용자별 세대, 추천 인덱스 버전)
+# 협업 필터링은 콘텐츠 기반으로 대체될 수 있으므로 CF 모델 버전도 함께 사용
+def cache_key(user_id, rec_type):
+    index = get_index()
+    version = index.version if index is not None else 'none'
+    if rec_type == 'cf':
+        model = get_model()
+        version += f':{model.version if model is not None else "none"}'
+    return f'rec:{user_id}:{rec_type}:{_generation(user_id, rec_type)}:{version}'
+
+
+# 캐시에 있으면 그대로, 없으면 compute()로 계산한 추천 도서 ID 목록을 저장 후 반환
+def get_or_compute(user_id, rec_type, compute):
+    cache = _cache()
+    key = cache_key(user_id, rec_type)
+    book_ids = cache.get(key)
+    if book_ids is not None:
+        _count(HITS_KEY)
+        return book_ids
+
+    _count(MISSES_KEY)
+    book_ids = list(compute())
+    cache.set(key, book_ids)
+    return book_ids
+
+
+# 특정 사용자의 추천 결과 무효화 (rec_types가 None이면 모든 유형)
+# 배치 작업으로 미리 계산된 결과도 더 이상 맞지 않으므로 함께 삭제
+def invalidate(user_id, rec_types=None):
+    from .models import UserRecommendation
+
+    cache = _cache()
+    rec_types = rec_types or REC_TYPES
+    cache.set_many({f'rec:gen:{user_id}:{t}': time.time_ns() for t in rec_types}, timeout=None)
+    UserRecommendation.objects.filter(user_id=user_id, rec_type__in=rec_types).delete()
+
+
+# 캐시 적중/실패 횟수와 적중률
+def stats():
+    cache = _cache()
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits / total, 4) if total else 0.0,
+        'max_entries': settings.CACHES[CACHE_ALIAS].get('OPTIONS', {}).get('MAX_ENTRIES'),
+    }
+
+
+# 도서 좋아요 추가/취소 시 해당 사용자의 '좋아요 기반'·협업 필터링 추천 무효화
+def on_likes_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear' and not reverse:
+        # 도서 쪽에서 전체 삭제하는 경우 삭제 전에 사용자 목록을 기억해 둠
+        instance._rec_cleared_user_ids = list(instance.liked_users.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if reverse:
+        user_ids = [instance.pk]
+    elif action == 'post_clear':
+        user_ids = getattr(instance, '_rec_cleared_user_ids', [])
+    else:
+        user_ids = pk_set or []
+
+    for user_id in user_ids:
+        invalidate(user_id, ['likes', 'cf'])
+
+
+# 감상글 작성/수정/삭제 시 작성자의 '감상글 기반'·협업 필터링 추천 무효화
+def on_thread_changed(sender, instance, **kwargs):
+    invalidate(instance.user_id, ['threads', 'cf'])
@@ -1,93 +1,114 @@
 # books/recommender.py
 
-from threads.models import Thread
-from books.models import Book
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
+from collections import defaultdict
 
+from django.conf import settings
 
-# 사용자가 좋아요한 도서를 기반으로 설명(description)의 유사도를 계산하여 추천
-def recommend_by_description_similarity(user):
-    # 사용자가 좋아요한 도서 목록 조회
-    liked_books = user.liked_books.all()
+from threads.models import Thread
+from books.models import Book, UserRecommendation
+from books.cf_model import get_model
+from books.recommender_index import get_index
+from books import recommendation_cache
 
-    # 좋아요한 도서가 없다면 추천 불가
-    if not liked_books.exists():
-        return Book.objects.none()
 
-    # description 필드가 존재하는 도서만 필터링
-    books_with_desc = Book.objects.exclude(description__isnull=True).exclude(description__exact='')
+# 기준 도서(좋아요/감상글 도서)들과 설명이 유사한 도서 ID 목록, 기준 도서 자체는 제외
+def similar_book_ids(index, seed_ids, k=10):
+    return index.top_k(seed_ids, exclude_ids=seed_ids, k=k)
 
-    # 비교할 도서가 2권 미만이면 추천할 수 없음
-    if books_with_desc.count() < 2:
-        return Book.objects.none()
 
-    # 도서 설명과 도서 ID 리스트 구성
-    descriptions = [book.description for book in books_with_desc]
-    book_ids = [book.id for book in books_with_desc]
+# 사용자가 좋아요한 도서를 기반으로 설명(description)의 유사도가 높은 도서 ID 목록 계산
+def recommend_ids_by_description_similarity(user):
+    # 사용자가 좋아요한 도서 ID 목록 조회
+    liked_ids = list(user.liked_books.values_list('id', flat=True))
 
-    # 설명 벡터화 (TF-IDF)
-    vectorizer = TfidfVectorizer(stop_words='english')
-    tfidf_matrix = vectorizer.fit_transform(descriptions)
+    # 좋아요한 도서가 없다면 추천 불가
+    if not liked_ids:
+        return []
 
-    # 좋아요한 책의 인덱스를 기준으로 유사도 계산
-    liked_indices = [book_ids.index(book.id) for book in liked_books if book.id in book_ids]
+    # 미리 생성된 TF-IDF 인덱스 사용 (description이 있는 도서가 2권 미만이면 None)
+    index = get_index()
+    if index is None:
+        return []
 
-    if not liked_indices:
-        return Book.objects.none()
+    # 좋아요한 도서들의 평균 벡터와 전체 도서 간 유사도 계산, 이미 좋아요한 도서는 제외
+    return similar_book_ids(index, liked_ids)
 
-    # 전체 도서와 좋아요한 도서 간 유사도 평균 계산
-    sim_scores = cosine_similarity(tfidf_matrix, tfidf_matrix[liked_indices]).mean(axis=1)
 
-    # 유사도가 높은 순으로 정렬, 이미 좋아요한 도서는 제외
-    sorted_indices = np.argsort(sim_scores)[::-1]
-    recommended_ids = [
-        book_ids[i] for i in sorted_indices
-        if book_ids[i] not in [b.id for b in liked_books]
-    ][:10]
+# 사용자가 작성한 감상글(Thread)의 도서를 기반으로 유사한 도서 ID 목록 계산
+def recommend_ids_by_threads_similarity(user):
+    if not user.is_authenticated:
+        return []
 
-    # 추천 도서 반환
-    return Book.objects.filter(id__in=recommended_ids)
+    # 사용자가 작성한 감상글의 도서 ID 목록 추출
+    thread_book_ids = list(Thread.objects.filter(user=user).values_list('book_id', flat=True))
 
+    if not thread_book_ids:
+        return []
 
-# 사용자가 작성한 감상글(Thread)에 기반한 도서 추천 함수
-def recommend_by_threads_similarity(user):
-    if not user.is_authenticated:
-        return Book.objects.none()
+    index = get_index()
+    if index is None:
+        return []
 
-    # 사용자가 작성한 감상글의 도서 ID 목록 추출
-    thread_book_ids = Thread.objects.filter(user=user).values_list('book_id', flat=True)
+    # 유사도 순으로 정렬 후 추천 (이미 작성한 도서 제외)
+    return similar_book_ids(index, thread_book_ids)
 
-    # description이 있는 도서만 대상으로 필터링
-    books_with_desc = Book.objects.exclude(description__isnull=True).exclude(description__exact='')
 
-    if books_with_desc.count() < 2:
-        return Book.objects.none()
+# 좋아요·감상글 상호작용으로 협업 필터링(ALS) 추천 도서 ID 목록 계산
+# 학습된 모델이 없거나 모델에 있는 도서와의 상호작용이 없으면(콜드 스타트) 콘텐츠 기반 추천으로 대체
+def recommend_ids_by_collaborative_filtering(user):
+    weights = settings.CF_INTERACTION_WEIGHTS
+    interactions = defaultdict(float)
+    for book_id in user.liked_books.values_list('id', flat=True):
+        interactions[book_id] += weights['likes']
+    for book_id in Thread.objects.filter(user=user).values_list('book_id', flat=True):
+        interactions[book_id] += weights['threads']
 
-    # 설명과 도서 ID 리스트 구성
-    descriptions = [book.description for book in books_with_desc]
-    book_ids = [book.id for book in books_with_desc]
+    model = get_model()
+    book_ids = model.recommend(interactions) if model is not None and interactions else None
+    if book_ids is None:
+        return recommend_ids_by_description_similarity(user) or recommend_ids_by_threads_similarity(user)
+    return book_ids
 
-    # TF-IDF 벡터화
-    vectorizer = TfidfVectorizer(stop_words='english')
-    tfidf_matrix = vectorizer.fit_transform(descriptions)
 
-    # 사용자가 작성한 감상글의 도서 인덱스 추출
-    thread_indices = [book_ids.index(book_id) for book_id in thread_book_ids if book_id in book_ids]
+# 추천 유형별 계산 함수
+RECOMMENDERS = {
+    'likes': recommend_ids_by_description_similarity,
+    'threads': recommend_ids_by_threads_similarity,
+    'cf': recommend_ids_by_collaborative_filtering,
+}
 
-    if not thread_indices:
-        return Book.objects.none()
 
-    # 유사도 계산 (전체 vs 감상글 작성 도서)
-    sim_scores = cosine_similarity(tfidf_matrix, tfidf_matrix[thread_indices]).mean(axis=1)
+# 사용자가 좋아요한 도서를 기반으로 설명(description)의 유사도를 계산하여 추천
+def recommend_by_description_similarity(user):
+    return Book.objects.filter(id__in=recommend_ids_by_description_similarity(user))
 
-    # 유사도 순으로 정렬 후 추천 (이미 작성한 도서 제외)
-    sorted_indices = np.argsort(sim_scores)[::-1]
-    recommended_ids = [
-        book_ids[i] for i in sorted_indices
-        if book_ids[i] not in thread_book_ids
-    ][:10]
-
-    # 추천 도서 반환
-    return Book.objects.filter(id__in=recommended_ids)
+
+# 사용자가 작성한 감상글(Thread)에 기반한 도서 추천 함수
+def recommend_by_threads_similarity(user):
+    return Book.objects.filter(id__in=recommend_ids_by_threads_similarity(user))
+
+
+# 배치 작업으로 미리 계산된 추천 결과 (현재 인덱스 버전으로 계산된 경우에만 사용)
+# 추천 캐시 키와 같은 버전(변경분 포함)을 비교하므로 도서가 추가·수정된 뒤에는 다시 계산
+def precomputed_recommendation_ids(user, rec_type):
+    index = get_index()
+    if index is None:
+        return None
+    return (
+        UserRecommendation.objects
+        .filter(user=user, rec_type=rec_type, index_version=index.version)
+        .values_list('book_ids', flat=True)
+        .first()
+    )
+
+
+# 캐시 → 미리 계산된 결과 → 실시간 계산 순으로 개인화 추천 도서 반환
+def personal_recommendations(user, rec_type):
+    def compute():
+        book_ids = precomputed_recommendation_ids(user, rec_type)
+        if book_ids is None:
+            book_ids = RECOMMENDERS[rec_type](user)
+        return book_ids
+
+    book_ids = recommendation_cache.get_or_compute(user.pk, rec_type, compute)
+    return Book.objects.filter(id__in=book_ids)
@@ -0,0 +1,438 @@
+# books/recommender_index.py
+
+import hashlib
+import json
+import logging
+import shutil
+import threading
+import uuid
+from pathlib import Path
+
+import joblib
+import numpy as np
+from django.conf import settings
+from django.db import connection, transaction
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from .similarity import get_backend
+
+logger = logging.getLogger(__name__)
+
+# 인덱스 디렉터리 안에서 현재 사용 중인 버전을 가리키는 포인터 파일
+CURRENT_FILE = "CURRENT"
+
+# 인덱스 생성 이후의 도서 추가/수정/삭제를 한 줄씩 기록하는 로그 파일
+JOURNAL_FILE = "journal.jsonl"
+
+
+# 설명 원문의 64비트 요약값 (설명이 바뀌었는지 비교용)
+def text_digest(text):
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), 'little')
+
+
+# 미리 학습된 TF-IDF 벡터라이저, 희소 행렬, 도서 ID ↔ 행 번호 매핑을 묶은 추천 인덱스
+class RecommenderIndex:
+    def __init__(self, vectorizer, matrix, book_ids, version, total_tokens=0, directory=None, digests=None):
+        self.vectorizer = vectorizer
+        # 각 행은 TF-IDF 기본값(norm='l2')으로 정규화되어 있어 내적이 곧 코사인 유사도
+        self.matrix = matrix
+        self.book_ids = np.asarray(book_ids, dtype=np.int64)
+        self.row_of = {int(book_id): row for row, book_id in enumerate(self.book_ids)}
+        self.base_version = version
+        self.total_tokens = total_tokens
+        self.directory = Path(directory) if directory else None
+        # 행별 설명 요약값 (이전 버전에서 만든 인덱스에는 없을 수 있음)
+        self.digests = digests
+
+        # 생성 이후 변경분: 새로 추가/수정된 도서의 벡터·설명 요약값·어휘 밖 토큰 수와 무효화된 기존 행
+        self.delta_rows = {}
+        self.delta_digests = {}
+        self.removed_rows = set()
+        self.oov_by_book = {}
+        self.applied = 0
+        self._journal_offset = 0
+        self._delta_cache = None
+        self._backend = None
+        self._lock = threading.RLock()
+        self._analyzer = vectorizer.build_analyzer()
+
+    def __len__(self):
+        return len(self.book_ids) - len(self.removed_rows) + len(self.delta_rows)
+
+    # 캐시 키 등에 사용하는 버전 (생성 버전 + 적용된 변경 수)
+    @property
+    def version(self):
+        return f"{self.base_version}.{self.applied}"
+
+    # 변경분 도서들의 현재 설명에 있는 어휘 밖 토큰 수 (같은 도서를 다시 반영하면 이전 값을 대체)
+    @property
+    def oov_tokens(self):
+        return sum(self.oov_by_book.values())
+
+    # 생성 이후 어휘 밖 토큰이 전체 말뭉치 토큰에서 차지하는 비율
+    @property
+    def drift(self):
+        return self.oov_tokens / max(self.total_tokens, 1)
+
+    # (도서 ID, 설명) 목록으로 벡터라이저를 학습해 새 인덱스 생성
+    @classmethod
+    def fit(cls, documents):
+        book_ids = [book_id for book_id, _ in documents]
+        descriptions = [description for _, description in documents]
+
+        vectorizer = TfidfVectorizer(stop_words='english')
+        matrix = vectorizer.fit_transform(descriptions).tocsr()
+        matrix.sort_indices()
+
+        analyzer = vectorizer.build_analyzer()
+        total_tokens = sum(len(analyzer(description)) for description in descriptions)
+        digests = np.fromiter(map(text_digest, descriptions), dtype=np.uint64, count=len(descriptions))
+        return cls(vectorizer, matrix, book_ids, uuid.uuid4().hex, total_tokens=total_tokens, digests=digests)
+
+    # description이 있는 도서 전체로 인덱스 생성 (비교할 도서가 2권 미만이면 None)
+    @classmethod
+    def build_from_db(cls):
+        from .models import Book
+
+        documents = list(
+            Book.objects.exclude(description__isnull=True)
+            .exclude(description__exact='')
+            .order_by('id')
+            .values_list('id', 'description')
+        )
+        if len(documents) < 2:
+            return None
+        return cls.fit(documents)
+
+    # 버전별 하위 디렉터리에 저장한 뒤 CURRENT 포인터를 원자적으로 교체
+    def save(self, directory):
+        directory = Path(directory)
+        target = directory / self.base_version
+        target.mkdir(parents=True, exist_ok=True)
+
+        matrix = self.matrix.tocsr()
+        np.save(target / "data.npy", matrix.data.astype(np.float32))
+        np.save(target / "indices.npy", matrix.indices.astype(np.int32))
+        np.save(target / "indptr.npy", matrix.indptr.astype(np.int64))
+        np.save(target / "book_ids.npy", self.book_ids)
+        if self.digests is not None:
+            np.save(target / "digests.npy", self.digests)
+        joblib.dump(self.vectorizer, target / "vectorizer.joblib")
+        (target / "manifest.json").write_text(json.dumps({
+            "version": self.base_version,
+            "shape": list(matrix.shape),
+            "nnz": int(matrix.nnz),
+            "total_tokens": int(self.total_tokens),
+        }))
+        (target / JOURNAL_FILE).touch()
+        self.directory = target
+
+        pointer = directory / f"{CURRENT_FILE}.{self.base_version}"
+        pointer.write_text(self.base_version)
+        pointer.replace(directory / CURRENT_FILE)
+
+        # 직전 버전 하나만 남기고 오래된 버전 정리 (다른 워커가 읽는 중일 수 있음)
+        versions = sorted(
+            (p for p in directory.iterdir() if p.is_dir()),
+            key=lambda p: p.stat().st_mtime,
+        )
+        for old in versions[:-2]:
+            shutil.rmtree(old, ignore_errors=True)
+
+    # CURRENT가 가리키는 버전을 로드, 배열은 가능한 경우 메모리 매핑
+    @classmethod
+    def load(cls, directory, mmap=True):
+        directory = Path(directory)
+        pointer = directory / CURRENT_FILE
+        if not pointer.exists():
+            return None
+
+        version = pointer.read_text().strip()
+        source = directory / version
+        manifest = json.loads((source / "manifest.json").read_text())
+        mmap_mode = 'r' if mmap else None
+
+        matrix = sparse.csr_matrix(
+            (
+                np.load(source / "data.npy", mmap_mode=mmap_mode),
+                np.load(source / "indices.npy", mmap_mode=mmap_mode),
+                np.load(source / "indptr.npy", mmap_mode=mmap_mode),
+            ),
+            shape=tuple(manifest["shape"]),
+            copy=False,
+        )
+        book_ids = np.load(source / "book_ids.npy")
+        digests = np.load(source / "digests.npy") if (source / "digests.npy").exists() else None
+        vectorizer = joblib.load(source / "vectorizer.joblib")
+        index = cls(
+            vectorizer, matrix, book_ids, manifest["version"],
+            total_tokens=manifest.get("total_tokens", 0), directory=source, digests=digests,
+        )
+        index.sync()
+        return index
+
+    # 변경 로그에 추가 (설명 원문을 기록하므로 재학습 이후에도 다시 적용 가능)
+    def _append(self, *entries):
+        if not entries:
+            return
+        if self.directory is None:
+            for entry in entries:
+                self._apply(entry)
+            return
+        with open(self.directory / JOURNAL_FILE, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries))
+        self.sync()
+
+    # 도서 한 권의 설명을 기존 어휘로 변환하여 반영 (O(1 book))
+    def upsert(self, book_id, description):
+        self.upsert_many([(book_id, description)])
+
+    # 여러 도서의 (ID, 설명)을 한 번에 반영 (설명이 비어 있으면 제외, 일괄 수집 등 시그널 없이 저장한 경우)
+    # 인덱스에 있는 설명과 같으면 기록하지 않음 (버전이 바뀌지 않으므로 추천 캐시도 유지)
+    def upsert_many(self, documents):
+        self._append(*(
+            {"op": "upsert", "id": int(book_id), "text": description} if description
+            else {"op": "remove", "id": int(book_id)}
+            for book_id, description in documents
+            if not self.unchanged(int(book_id), description)
+        ))
+
+    # 도서의 설명이 인덱스에 반영된 것과 같은지 (요약값이 없는 예전 인덱스면 False)
+    def unchanged(self, book_id, description):
+        if not description:
+            return self.vector(book_id) is None
+        digest = text_digest(description)
+        if book_id in self.delta_digests:
+            return self.delta_digests[book_id] == digest
+        row = self.row_of.get(book_id)
+        if row is None or row in self.removed_rows or self.digests is None:
+            return False
+        return int(self.digests[row]) == digest
+
+    # 도서 한 권을 인덱스에서 제외 (인덱스에 없으면 기록하지 않음)
+    def remove(self, book_id):
+        if self.vector(book_id) is not None:
+            self._append({"op": "remove", "id": int(book_id)})
+
+    # 다른 워커가 기록한 변경분까지 로그에서 읽어와 적용
+    def sync(self):
+        if self.directory is None:
+            return
+        journal = self.directory / JOURNAL_FILE
+        try:
+            size = journal.stat().st_size
+        except FileNotFoundError:
+            return
+        if size <= self._journal_offset:
+            return
+
+        with self._lock:
+            with open(journal, "rb") as f:
+                f.seek(self._journal_offset)
+                chunk = f.read()
+            # 아직 쓰는 중인 마지막 줄은 다음 동기화 때 처리
+            complete = chunk[:chunk.rfind(b"\n") + 1]
+            for line in complete.splitlines():
+                if line.strip():
+                    self._apply(json.loads(line))
+            self._journal_offset += len(complete)
+
+    def _apply(self, entry):
+        book_id = entry["id"]
+        with self._lock:
+            row = self.row_of.get(book_id)
+            if row is not None:
+                self.removed_rows.add(row)
+            self.delta_rows.pop(book_id, None)
+            self.delta_digests.pop(book_id, None)
+            self.oov_by_book.pop(book_id, None)
+
+            if entry["op"] == "upsert":
+                tokens = self._analyzer(entry["text"])
+                vocabulary = self.vectorizer.vocabulary_
+                oov = sum(1 for token in tokens if token not in vocabulary)
+                if oov:
+                    self.oov_by_book[book_id] = oov
+                self.delta_rows[book_id] = self.vectorizer.transform([entry["text"]]).tocsr()
+                self.delta_digests[book_id] = text_digest(entry["text"])
+
+            self.applied += 1
+            self._delta_cache = None
+
+    # 변경분 벡터들을 하나의 희소 행렬로 묶어 캐시
+    def _delta(self):
+        with self._lock:
+            if self._delta_cache is None:
+                ids = np.fromiter(self.delta_rows.keys(), dtype=np.int64, count=len(self.delta_rows))
+                if len(ids):
+                    matrix = sparse.vstack(list(self.delta_rows.values())).tocsr()
+                else:
+                    matrix = sparse.csr_matrix((0, self.matrix.shape[1]), dtype=self.matrix.dtype)
+                removed = np.fromiter(self.removed_rows, dtype=np.int64, count=len(self.removed_rows))
+                self._delta_cache = (ids, matrix, removed)
+            return self._delta_cache
+
+    # 도서 한 권의 현재 벡터 (변경분 우선, 삭제된 도서는 None)
+    def vector(self, book_id):
+        book_id = int(book_id)
+        if book_id in self.delta_rows:
+            return self.delta_rows[book_id]
+        row = self.row_of.get(book_id)
+        if row is None or row in self.removed_rows:
+            return None
+        return self.matrix[row]
+
+    # 기준 도서들의 평균 벡터(centroid) 계산, 인덱스에 없는 도서는 무시
+    def centroid(self, seed_ids):
+        vectors = [v for v in (self.vector(book_id) for book_id in seed_ids) if v is not None]
+        if not vectors:
+            return None
+        return np.asarray(sparse.vstack(vectors).mean(axis=0)).ravel()
+
+    # centroid와 기존 행 및 변경분 행의 유사도, 각 점수에 대응하는 도서 ID
+    def score_centroid(self, centroid):
+        delta_ids, delta_matrix, removed = self._delta()
+        base_scores = self.matrix @ centroid
+        if not len(delta_ids) and not len(removed):
+            return base_scores, self.book_ids
+        base_scores = np.asarray(base_scores, dtype=np.float64)
+        base_scores[removed] = -np.inf
+        return (
+            np.concatenate([base_scores, delta_matrix @ centroid]),
+            np.concatenate([self.book_ids, delta_ids]),
+        )
+
+    # 설정된 유사도 백엔드 (인덱스 버전마다 한 번 생성)
+    @property
+    def backend(self):
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    self._backend = get_backend(self)
+        return self._backend
+
+    # 유사도가 높은 순으로 k권의 도서 ID 반환, exclude_ids에 있는 도서는 제외
+    def top_k(self, seed_ids, exclude_ids=(), k=10):
+        centroid = self.centroid(seed_ids)
+        if centroid is None:
+            return []
+        excluded = frozenset(int(book_id) for book_id in exclude_ids)
+        return self.backend.search(centroid, k, excluded)
+
+
+_index = None
+_index_lock = threading.Lock()
+_current_mtime = None
+_refitting = threading.Event()
+
+
+def _pointer_mtime(directory):
+    try:
+        return (Path(directory) / CURRENT_FILE).stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+# 워커 프로세스당 한 번만 인덱스를 로드하고, 이후에는 변경 로그와 새 버전만 확인
+# build=False이면 디스크에 인덱스가 없을 때 새로 만들지 않고 None 반환
+def get_index(build=True):
+    global _index, _current_mtime
+    directory = settings.RECOMMENDER_INDEX_DIR
+    mtime = _pointer_mtime(directory)
+
+    if _index is not None and mtime == _current_mtime:
+        _index.sync()
+        return _index
+
+    with _index_lock:
+        if _index is None or mtime != _current_mtime:
+            index = RecommenderIndex.load(directory)
+            if index is None and build:
+                index = RecommenderIndex.build_from_db()
+                if index is not None:
+                    index.save(directory)
+                    mtime = _pointer_mtime(directory)
+            _index = index
+            _current_mtime = mtime
+    return _index
+
+
+# 메모리에 올라간 인덱스를 버려 다음 요청에서 다시 로드하도록 함
+def reset_index():
+    global _index, _current_mtime
+    with _index_lock:
+        _index = None
+        _current_mtime = None
+
+
+# 전체 재학습 후 저장, 재학습 도중 기록된 변경분은 새 버전의 로그로 옮김
+def rebuild_index():
+    directory = settings.RECOMMENDER_INDEX_DIR
+    previous = RecommenderIndex.load(directory, mmap=True)
+    previous_offset = previous._journal_offset if previous else 0
+
+    index = RecommenderIndex.build_from_db()
+    if index is None:
+        return None
+    index.save(directory)
+
+    if previous is not None and (previous.directory / JOURNAL_FILE).exists():
+        with open(previous.directory / JOURNAL_FILE, "rb") as f:
+            f.seek(previous_offset)
+            pending = f.read()
+        if pending:
+            with open(index.directory / JOURNAL_FILE, "ab") as f:
+                f.write(pending[:pending.rfind(b"\n") + 1])
+
+    reset_index()
+    return index
+
+
+# 어휘 변화량이 임계값을 넘으면 요청을 막지 않도록 백그라운드에서 전체 재학습
+def refit_if_drifted(index):
+    threshold = getattr(settings, 'RECOMMENDER_REFIT_DRIFT', 0.05)
+    if index.drift <= threshold or _refitting.is_set():
+        return False
+
+    def run():
+        try:
+            logger.info("추천 인덱스 재학습 시작 (drift=%.3f)", index.drift)
+            rebuild_index()
+        except Exception as e:
+            logger.error(f"추천 인덱스 재학습 실패: {e}")
+        finally:
+            connection.close()
+            _refitting.clear()
+
+    _refitting.set()
+    threading.Thread(target=run, name="recommender-refit", daemon=True).start()
+    return True
+
+
+# Book 저장 시 해당 도서 한 권만 인덱스에 반영
+def on_book_saved(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and 'description' not in update_fields:
+        return
+    book_id, description = instance.pk, instance.description
+
+    def apply():
+        index = get_index(build=False)
+        if index is None:
+            return
+        index.upsert(book_id, description)
+        refit_if_drifted(index)
+
+    transaction.on_commit(apply)
+
+
+# Book 삭제 시 해당 도서 한 권만 인덱스에서 제외
+def on_book_deleted(sender, instance, **kwargs):
+    book_id = instance.pk
+
+    def apply():
+        index = get_index(build=False)
+        if index is not None:
+            index.remove(book_id)
+
+    transaction.on_commit(apply)
@@ -0,0 +1,20 @@
+# books/search_indexes.py
+
+from search.registry import SearchIndex, register
+from .models import Book
+
+
+# 도서 검색 인덱스: 제목, 저자, 부제목, 설명 (제목·저자 일치에 더 높은 가중치)
+@register
+class BookIndex(SearchIndex):
+    name = 'books'
+    model = Book
+    fields = {
+        'title': 5.0,
+        'author': 3.0,
+        'subTitle': 2.0,
+        'description': 1.0,
+    }
+
+    def get_queryset(self):
+        return Book.objects.only(*self.fields)
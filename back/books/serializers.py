@@ -1,6 +1,7 @@
 # books/serializers.py
 
 from rest_framework import serializers
+from blookin import like_buffer
 from .models import Book, Category
 from threads.models import Thread
 from threads.serializers import ThreadSerializer
@@ -13,8 +14,24 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ['id', 'name']
 
 
+# 목록 화면용 카드 표현에 포함되는 필드 (긴 텍스트와 감상글 목록 제외)
+BOOK_CARD_FIELDS = [
+    'id', 'title', 'subTitle', 'author', 'publisher', 'pub_date', 'cover',
+    'customer_review_rank', 'category', 'is_liked', 'likes_count',
+]
+
+
+# fields 인자로 출력할 필드를 제한할 수 있는 시리얼라이저 믹스인
+class DynamicFieldsMixin:
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
 # 도서 정보를 직렬화하는 시리얼라이저
-class BookSerializer(serializers.ModelSerializer):
+class BookSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     # category 필드를 읽기 전용으로 표시하며, CategorySerializer로 중첩 직렬화
     category = CategorySerializer(read_only=True)
 
@@ -31,7 +48,7 @@ class BookSerializer(serializers.ModelSerializer):
     # 현재 요청한 사용자가 이 도서를 좋아요했는지 여부
     is_liked = serializers.SerializerMethodField()
 
-    # 이 도서를 좋아요한 전체 사용자 수
+    # 이 도서를 좋아요한 전체 사용자 수 (비정규화 컬럼 + 좋아요 버퍼에서 아직 반영되지 않은 변화)
     likes_count = serializers.SerializerMethodField()
 
     class Meta:
@@ -60,12 +77,32 @@ class BookSerializer(serializers.ModelSerializer):
         ]
 
     # 현재 요청 유저가 이 도서를 좋아요했는지 확인
+    # 사용자가 좋아요한 도서 ID 집합을 요청당 한 번만 조회해 context에 보관
     def get_is_liked(self, obj):
-        user = self.context.get('request').user
-        if user and user.is_authenticated:
-            return obj.liked_users.filter(pk=user.pk).exists()
-        return False
+        return obj.pk in self.liked_book_ids()
+
+    def liked_book_ids(self):
+        if 'liked_book_ids' not in self.context:
+            request = self.context.get('request')
+            user = request.user if request else None
+            if user and user.is_authenticated:
+                liked_ids = user.liked_books.values_list('id', flat=True)
+                self.context['liked_book_ids'] = like_buffer.apply_pending(Book, user.pk, liked_ids)
+            else:
+                self.context['liked_book_ids'] = set()
+        return self.context['liked_book_ids']
 
-    # 좋아요한 사용자 수 반환
     def get_likes_count(self, obj):
-        return obj.liked_users.count()
+        return max(obj.likes_count + like_buffer.pending_delta(obj), 0)
+
+
+# 요청의 fields/expand 파라미터로 목록에 출력할 필드 결정
+# fields가 있으면 그 필드만, 없으면 카드 필드에 expand로 지정한 필드를 추가 (알 수 없는 이름은 무시)
+def book_list_fields(request):
+    readable = [name for name, field in BookSerializer().fields.items() if not field.write_only]
+    requested = [name.strip() for name in request.GET.get('fields', '').split(',') if name.strip()]
+    expand = [name.strip() for name in request.GET.get('expand', '').split(',') if name.strip()]
+
+    fields = [name for name in requested if name in readable] or list(BOOK_CARD_FIELDS)
+    fields += [name for name in expand if name in readable and name not in fields]
+    return fields
@@ -1,42 +1,28 @@
 # books/signals.py
 
+from django.db import transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from .models import Book
-from .utils import (
-    process_wikipedia_info,
-    generate_author_gpt_info,
-    generate_audio_script,
-    create_tts_audio
-)
 import logging
 
 logger = logging.getLogger(__name__)
 
-@receiver(post_save, sender=Book)
+
+# 새 도서가 등록되면 작가 캐시로 작가 정보를 채우고, 캐시에 없으면 보완 작업을 백그라운드 큐에 등록
+# (커밋 후, 요청 처리와 분리)
+@receiver(post_save, sender=Book, dispatch_uid='books_enrich_book_data')
 def enrich_book_data(sender, instance, created, **kwargs):
-    if not created:
+    if not created or (instance.author_info and instance.author_works):
         return
 
-    try:
-        wiki_summary = process_wikipedia_info(instance)
-        if not wiki_summary:
-            wiki_summary = "위키피디아 정보 없음"
-
-        author_info, author_works = generate_author_gpt_info(instance, wiki_summary)
-
-        instance.author_info = author_info or "작가 정보를 가져오지 못했습니다."
-        instance.author_works = author_works or ""
+    from .jobs import enqueue_author_enrichment, fill_author_from_cache
 
+    def enqueue():
         try:
-            script = generate_audio_script(instance, wiki_summary)
-            audio_path = create_tts_audio(instance, script)
-            instance.tts_audio = audio_path
-        except Exception as audio_err:
-            logger.warning(f"TTS 생성 중 오류 발생: {audio_err}")
-            instance.tts_audio = None
-
-        instance.save()
+            if not fill_author_from_cache(instance):
+                enqueue_author_enrichment(instance)
+        except Exception as e:
+            logger.error(f"도서 enrichment 작업 등록 실패 (Book ID: {instance.pk}): {e}")
 
-    except Exception as e:
-        logger.error(f"도서 enrichment 실패 (Book ID: {instance.pk}): {e}")
+    transaction.on_commit(enqueue)
@@ -0,0 +1,195 @@
+# books/similarity.py
+
+import logging
+import threading
+import time
+
+import numpy as np
+from scipy import sparse
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+# 점수 배열에서 상위 k개만 부분 정렬로 골라 도서 ID 목록으로 반환
+# (제외 도서 수만큼 여유를 두고 argpartition → 후보만 정렬)
+def select_top_k(scores, book_ids, k, excluded=frozenset()):
+    n = len(scores)
+    if n == 0 or k <= 0:
+        return []
+
+    m = min(n, k + len(excluded))
+    if m < n:
+        candidates = np.argpartition(-scores, m - 1)[:m]
+    else:
+        candidates = np.arange(n)
+    ordered = candidates[np.argsort(-scores[candidates], kind='stable')]
+
+    recommended_ids = []
+    for i in ordered:
+        if scores[i] == -np.inf:
+            break
+        book_id = int(book_ids[i])
+        if book_id in excluded:
+            continue
+        recommended_ids.append(book_id)
+        if len(recommended_ids) >= k:
+            break
+    return recommended_ids
+
+
+# 전체 도서를 정확히 채점한 뒤 argpartition으로 상위 k권 선택
+class ExactBackend:
+    name = 'exact'
+
+    def __init__(self, index):
+        self.index = index
+
+    def search(self, centroid, k, excluded=frozenset()):
+        scores, book_ids = self.index.score_centroid(centroid)
+        return select_top_k(scores, book_ids, k, excluded)
+
+
+# IVF(inverted file) 근사 검색: 구형 k-means로 도서를 군집화해 두고,
+# 질의와 가까운 군집(nprobe개)에 속한 도서만 정확히 재채점
+# 군집화는 백그라운드 스레드에서 수행하며, 끝나기 전까지는 정확 검색으로 응답
+# 군집화가 실패하면 RETRY_INTERVAL초 뒤의 검색에서 다시 시도
+class IVFBackend:
+    name = 'ivf'
+    RETRY_INTERVAL = 60
+
+    def __init__(self, index, n_lists=None, n_probe=None, n_iter=6, train_per_list=64, seed=0, background=True):
+        self.index = index
+        self.exact = ExactBackend(index)
+        n_rows = index.matrix.shape[0]
+
+        self.n_lists = min(n_rows, n_lists or getattr(settings, 'RECOMMENDER_IVF_LISTS', None) or max(1, int(np.sqrt(n_rows))))
+        self.n_probe = min(self.n_lists, n_probe or getattr(settings, 'RECOMMENDER_IVF_PROBES', 16))
+        self.n_iter = n_iter
+        self.train_per_list = train_per_list
+        self.seed = seed
+        self.lists = None
+        self.ready = threading.Event()
+        self.failed_at = None
+        self._building = False
+        self._lock = threading.Lock()
+
+        if background:
+            self.build_in_background()
+        else:
+            self.build()
+
+    # 백그라운드 스레드에서 군집화 시작 (이미 진행 중이면 무시)
+    def build_in_background(self):
+        with self._lock:
+            if self._building or self.ready.is_set():
+                return
+            self._building = True
+        threading.Thread(target=self._build_worker, name="recommender-ivf", daemon=True).start()
+
+    def _build_worker(self):
+        try:
+            self.build()
+            self.failed_at = None
+        except Exception:
+            logger.exception("[IVF] 군집화 실패, 정확 검색으로 응답하고 %d초 뒤 다시 시도", self.RETRY_INTERVAL)
+            self.failed_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._building = False
+
+    # 표본으로 군집 중심을 학습한 뒤 전체 도서를 군집별 희소 행렬로 나눠 보관
+    def build(self):
+        matrix = self.index.matrix.tocsr()
+        n_rows = matrix.shape[0]
+        rng = np.random.default_rng(self.seed)
+
+        sample_size = min(n_rows, self.n_lists * self.train_per_list)
+        sample = matrix[np.sort(rng.choice(n_rows, sample_size, replace=False))]
+        centers = sample[rng.choice(sample_size, self.n_lists, replace=False)].toarray().astype(np.float32)
+        for _ in range(self.n_iter):
+            centers = self._update(sample, self._assign(sample, centers), centers)
+
+        assignment = self._assign(matrix, centers)
+        order = np.argsort(assignment, kind='stable')
+        offsets = np.searchsorted(assignment[order], np.arange(self.n_lists + 1))
+        sorted_matrix = matrix[order]
+
+        self.centers = centers
+        self.lists = [
+            (order[start:end], sorted_matrix[start:end])
+            for start, end in zip(offsets[:-1], offsets[1:])
+        ]
+        self.ready.set()
+
+    # 각 행을 내적(코사인)이 가장 큰 중심에 할당 (메모리 절약을 위해 구간별로 계산)
+    @staticmethod
+    def _assign(matrix, centers, chunk=8192):
+        assignment = np.empty(matrix.shape[0], dtype=np.int64)
+        for start in range(0, matrix.shape[0], chunk):
+            assignment[start:start + chunk] = np.asarray(matrix[start:start + chunk] @ centers.T).argmax(axis=1)
+        return assignment
+
+    # 군집별 벡터 합을 L2 정규화해 새 중심으로 사용 (빈 군집은 이전 중심 유지)
+    @staticmethod
+    def _update(matrix, assignment, centers):
+        membership = sparse.csr_matrix(
+            (np.ones(len(assignment), dtype=np.float32), (assignment, np.arange(len(assignment)))),
+            shape=(centers.shape[0], matrix.shape[0]),
+        )
+        sums = np.asarray((membership @ matrix).todense(), dtype=np.float32)
+        norms = np.linalg.norm(sums, axis=1)
+        empty = norms == 0
+        sums[~empty] /= norms[~empty, np.newaxis]
+        sums[empty] = centers[empty]
+        return sums
+
+    # 질의와 가까운 nprobe개 군집 번호
+    def probes(self, centroid):
+        center_scores = self.centers @ centroid
+        if self.n_probe < self.n_lists:
+            return np.argpartition(-center_scores, self.n_probe - 1)[:self.n_probe]
+        return np.arange(self.n_lists)
+
+    def search(self, centroid, k, excluded=frozenset()):
+        if not self.ready.is_set():
+            if self.failed_at is not None and time.monotonic() - self.failed_at >= self.RETRY_INTERVAL:
+                self.build_in_background()
+            return self.exact.search(centroid, k, excluded)
+
+        centroid = centroid.astype(np.float32)
+        rows, scores = [], []
+        for probe in self.probes(centroid):
+            list_rows, list_matrix = self.lists[probe]
+            if len(list_rows):
+                rows.append(list_rows)
+                scores.append(list_matrix @ centroid)
+        if sum(len(r) for r in rows) < k + len(excluded):
+            return self.exact.search(centroid, k, excluded)
+
+        rows = np.concatenate(rows)
+        scores = np.concatenate(scores).astype(np.float64)
+        delta_ids, delta_matrix, removed = self.index._delta()
+        if len(removed):
+            scores[np.isin(rows, removed)] = -np.inf
+
+        return select_top_k(
+            np.concatenate([scores, delta_matrix @ centroid]),
+            np.concatenate([self.index.book_ids[rows], delta_ids]),
+            k, excluded,
+        )
+
+
+BACKENDS = {
+    'exact': ExactBackend,
+    'ivf': IVFBackend,
+}
+
+
+# 설정값(RECOMMENDER_SIMILARITY_BACKEND)에 따라 인덱스용 유사도 백엔드 생성
+# 'exact', 'ivf' 또는 백엔드 클래스의 import 경로를 지정할 수 있음
+def get_backend(index, name=None):
+    name = name or getattr(settings, 'RECOMMENDER_SIMILARITY_BACKEND', 'exact')
+    backend_class = BACKENDS.get(name) or import_string(name)
+    return backend_class(index)
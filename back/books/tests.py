@@ -1,3 +1,1241 @@
-from django.test import TestCase
+import datetime
+import json
+import tempfile
+import threading
+import time
+from collections import Counter
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+import requests
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from scipy import sparse
+
+from blookin import counters
+from jobs import queue
+from jobs.models import Job
+from search import engine
+from threads.models import Comment, Thread
+from . import aladin, author_cache, cf_model, recommendation_cache, tts
+from .author_fetcher import AuthorFetcher
+from .cf_model import CFModel, get_model
+from .management.commands._stub_aladin import stub_aladin_server, stub_item
+from .management.commands._stub_wiki import stub_wiki_server
+from .models import Author, Book, Category, UserRecommendation
+from .management.commands._synthetic import synthetic_descriptions
+from .rate_limit import TokenBucket
+from .recommender import RECOMMENDERS, personal_recommendations, precomputed_recommendation_ids, similar_book_ids
+from .similarity import ExactBackend, IVFBackend
+from .tts import StubBackend
+from .recommender_index import RecommenderIndex, get_index, rebuild_index, reset_index
+from .serializers import BOOK_CARD_FIELDS
+
+
+# 테스트마다 빈 임시 디렉터리를 추천 인덱스 경로로 사용 (실제 인덱스를 건드리지 않음)
+class BookTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(id=4, name='인문·사회')
+        cls.user = get_user_model().objects.create_user(username='reader', password='pw')
+        cls.writer = get_user_model().objects.create_user(username='writer', password='pw')
+
+    def setUp(self):
+        index_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(index_dir.cleanup)
+        settings_override = self.settings(RECOMMENDER_INDEX_DIR=index_dir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        reset_index()
+        self.addCleanup(reset_index)
+
+    def create_books(self, count):
+        start = Book.objects.count()
+        books = Book.objects.bulk_create([
+            Book(
+                category=self.category,
+                title=f'도서 {i}',
+                description='긴 설명 ' * 50,
+                isbn=f'978{start + i:010d}',
+                cover='https://example.com/cover.jpg',
+                publisher='출판사',
+                pub_date=datetime.date(2020, 1, 1) + datetime.timedelta(days=i % 7),
+                author='저자',
+                author_info='저자 소개',
+                customer_review_rank=float(i % 3),
+                subTitle='',
+            )
+            for i in range(count)
+        ])
+        for book in books[::2]:
+            book.liked_users.add(self.user)
+        # 관계를 직접 추가했으므로 비정규화 카운터를 맞춤
+        counters.reconcile()
+        return books
+
+    def get(self, params, url='/api/books/', user=None):
+        client = APIClient()
+        client.force_authenticate(user or self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json(), len(queries)
+
+
+class BookListTestCase(BookTestCase):
+
+    # 도서 수가 늘어나도 목록 조회 쿼리 수는 일정해야 함
+    def test_query_count_is_bounded(self):
+        self.create_books(5)
+        _, small = self.get({'page_size': 50})
+        self.create_books(45)
+        data, large = self.get({'page_size': 50})
+
+        self.assertEqual(len(data['results']), 50)
+        self.assertEqual(small, large)
+        self.assertLessEqual(large, 4)
+
+    # 동일한 정렬 값이 많아도 cursor를 따라가면 모든 도서를 중복 없이 한 번씩 조회
+    def test_cursor_walks_every_book_once(self):
+        books = self.create_books(23)
+        for ordering in ['-customer_review_rank', 'pub_date', 'title', '-id']:
+            seen, params = [], {'page_size': 5, 'ordering': ordering}
+            while True:
+                data, _ = self.get(params)
+                seen += [book['id'] for book in data['results']]
+                if not data['next']:
+                    break
+                params['cursor'] = data['next']
+            self.assertEqual(sorted(seen), sorted(book.id for book in books))
+            self.assertEqual(len(seen), len(set(seen)))
+
+    # 목록은 카드 필드만, fields/expand로 출력 필드 조절
+    def test_sparse_fields(self):
+        book = self.create_books(1)[0]
+        data, _ = self.get({'page_size': 10})
+        self.assertEqual(list(data['results'][0]), BOOK_CARD_FIELDS)
+        self.assertTrue(data['results'][0]['is_liked'])
+        self.assertEqual(data['results'][0]['likes_count'], 1)
+
+        data, _ = self.get({'page_size': 10, 'fields': 'id,title'})
+        self.assertEqual(data['results'][0], {'id': book.id, 'title': book.title})
+
+        data, _ = self.get({'page_size': 10, 'expand': 'description,thread_set'})
+        self.assertIn('description', data['results'][0])
+        self.assertEqual(data['results'][0]['thread_set'], [])
+
+    def test_invalid_cursor(self):
+        client = APIClient()
+        response = client.get('/api/books/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+        response = client.get('/api/books/', {'page_size': 10, 'ordering': 'description'})
+        self.assertEqual(response.status_code, 400)
+
+    # 검색(q=)도 허용되지 않은 정렬 기준이면 400
+    def test_search_invalid_ordering(self):
+        self.create_books(3)
+        client = APIClient()
+        for params in [{'q': '도서', 'ordering': 'bogus'}, {'q': '도서', 'ordering': '-description'}, {'ordering': 'bogus'}]:
+            response = client.get('/api/books/', params)
+            self.assertEqual(response.status_code, 400, params)
+
+    # 검색 결과도 전체 목록과 같은 {next, results} 형태, cursor를 따라가면 관련도/정렬 순으로 한 번씩 조회
+    def test_search_cursor_pages(self):
+        books = self.create_books(12)
+        engine.rebuild('books')
+        expected = engine.search('books', '도서').ids
+        self.assertEqual(sorted(expected), sorted(book.id for book in books))
+
+        for ordering, order in [(None, expected), ('-id', sorted(expected, reverse=True))]:
+            seen, params = [], {'q': '도서', 'page_size': 5}
+            if ordering:
+                params['ordering'] = ordering
+            while True:
+                data, _ = self.get(params)
+                self.assertEqual(set(data), {'next', 'results'})
+                seen += [book['id'] for book in data['results']]
+                if not data['next']:
+                    break
+                params['cursor'] = data['next']
+            self.assertEqual(seen, order)
+
+        # 페이지 파라미터가 없으면 목록 그대로
+        data, _ = self.get({'q': '도서'})
+        self.assertEqual([book['id'] for book in data], expected)
+
+        client = APIClient()
+        response = client.get('/api/books/', {'q': '도서', 'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+
+# 도서 API의 쿼리 수가 도서·감상글 수와 무관하게 일정한지 확인 (N+1 회귀 방지)
+class BookQueryCountTestCase(BookTestCase):
+    def create_catalog(self, count):
+        books = self.create_books(count)
+        for book in books:
+            thread = Thread.objects.create(title='감상', content='내용', book=book, user=self.writer)
+            thread.likes.add(self.user)
+            Comment.objects.create(content='댓글', thread=thread, user=self.user)
+        counters.reconcile()
+        return books
+
+    def request(self, url, params=None, user=None):
+        client = APIClient()
+        if user:
+            client.force_authenticate(user)
+        response = client.get(url, params or {})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_book_list(self):
+        self.create_catalog(3)
+        client = APIClient()
+        client.force_authenticate(self.user)
+        for _ in range(2):
+            # 로그인 사용자의 좋아요 도서 ID 1 + 도서 목록 1
+            with self.assertNumQueries(2):
+                client.get('/api/books/')
+            with self.assertNumQueries(2):
+                client.get('/api/books/', {'page_size': 20})
+            # 도서 1 + 좋아요 도서 ID 1 + 감상글 계획 5 (감상글, 작성자, 작성자 관심 장르, 댓글, 도서 좋아요) + 팔로잉 ID 1
+            with self.assertNumQueries(8):
+                client.get('/api/books/', {'expand': 'thread_set'})
+            self.create_catalog(5)
+
+    def test_book_detail(self):
+        book = self.create_catalog(1)[0]
+        Book.objects.filter(pk=book.pk).update(author_works='대표작')
+        with self.assertNumQueries(6):
+            self.request(f'/api/books/{book.pk}/')
+
+    def test_mbti_recommendation(self):
+        for count in (2, 6):
+            self.create_catalog(count)
+            with self.assertNumQueries(6):
+                data = self.request('/api/books/recommend/mbti/', {'mbti': 'INTJ'})
+            self.assertEqual(len(data['books']), min(Book.objects.count(), 6))
+
+    def test_personal_recommendation(self):
+        for count in (4, 10):
+            books = self.create_books(count)
+            rebuild_index()
+            self.writer.liked_books.add(*books[:2])
+            # 첫 요청에서 추천 계산, 이후 요청은 캐시된 추천 결과 사용
+            self.request('/api/books/recommend/personal/', {'type': 'likes'}, user=self.writer)
+            # 추천 도서 1 + 감상글 prefetch 1 + 좋아요 도서 ID 1
+            with self.assertNumQueries(3):
+                data = self.request('/api/books/recommend/personal/', {'type': 'likes'}, user=self.writer)
+            self.assertEqual(len(data), min(Book.objects.count() - self.writer.liked_books.count(), 10))
+
+    def test_user_profile_liked_books(self):
+        for count in (2, 7):
+            self.create_catalog(count)
+            liked = self.user.liked_books.count()
+            data = self.request(f'/api/accounts/{self.user.username}/')
+            self.assertEqual(len(data['liked_books']), liked)
+            with CaptureQueriesContext(connection) as queries:
+                self.request(f'/api/accounts/{self.user.username}/')
+            if count == 2:
+                baseline = len(queries)
+            else:
+                self.assertEqual(len(queries), baseline)
+
+
+# 추천 인덱스: 디스크에 저장한 TF-IDF 인덱스를 다시 학습하지 않고 로드해 사용
+class RecommenderIndexTestCase(BookTestCase):
+    DOCUMENTS = [
+        (1, 'apple banana cherry'),
+        (2, 'apple banana cherry durian'),
+        (3, 'apple grape'),
+        (4, 'kiwi lemon'),
+    ]
+
+    def test_top_k_order(self):
+        index = RecommenderIndex.fit(self.DOCUMENTS)
+        self.assertEqual(index.top_k([1], exclude_ids=[1], k=2), [2, 3])
+        self.assertEqual(index.top_k([1], exclude_ids=[1, 2], k=3), [3, 4])
+        # 여러 기준 도서는 평균 벡터로 검색, 인덱스에 없는 도서는 무시
+        self.assertEqual(index.top_k([3, 4, 99], exclude_ids=[3, 4], k=2)[0], 1)
+        self.assertEqual(index.top_k([99]), [])
+
+    def test_save_load_round_trip(self):
+        index = RecommenderIndex.fit(self.DOCUMENTS)
+        index.save(settings.RECOMMENDER_INDEX_DIR)
+        loaded = RecommenderIndex.load(settings.RECOMMENDER_INDEX_DIR)
+
+        self.assertEqual(loaded.base_version, index.base_version)
+        self.assertEqual(loaded.book_ids.tolist(), [1, 2, 3, 4])
+        # 행렬 값은 float32로 저장
+        np.testing.assert_allclose(loaded.matrix.toarray(), index.matrix.toarray(), rtol=1e-6)
+        self.assertEqual(loaded.total_tokens, index.total_tokens)
+        self.assertEqual(loaded.top_k([1], exclude_ids=[1], k=3), index.top_k([1], exclude_ids=[1], k=3))
+        self.assertIsNone(RecommenderIndex.load(Path(settings.RECOMMENDER_INDEX_DIR) / 'missing'))
+
+    # 첫 요청에서 한 번 만들어 저장하고, 워커가 다시 시작해도 같은 버전을 로드
+    def test_get_index_builds_once(self):
+        self.create_books(3)
+        with mock.patch.object(RecommenderIndex, 'fit', wraps=RecommenderIndex.fit) as fit:
+            version = get_index().version
+            reset_index()
+            self.assertEqual(get_index().version, version)
+        fit.assert_called_once()
+        self.assertEqual(len(get_index()), 3)
+
+
+# 도서 저장/삭제 시그널이 추천 인덱스 변경 로그에 한 권씩 반영
+class RecommenderJournalTestCase(BookTestCase):
+    def setUp(self):
+        super().setUp()
+        self.create_books(3)
+        self.index = get_index()
+
+    def save(self, book, **fields):
+        for name, value in fields.items():
+            setattr(book, name, value)
+        with self.captureOnCommitCallbacks(execute=True):
+            book.save()
+
+    def test_upsert_and_remove(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            book = Book.objects.create(
+                category=self.category, title='새 도서', description='우주 탐사 설명', isbn='new',
+                cover='https://example.com/c.jpg', publisher='출판사', pub_date=datetime.date(2024, 1, 1),
+                author='저자', author_info='', customer_review_rank=0, subTitle='',
+            )
+        self.assertEqual(self.index.applied, 1)
+        self.assertEqual(len(self.index), 4)
+        # 다른 워커도 변경 로그에서 같은 변경분을 읽음
+        other = RecommenderIndex.load(settings.RECOMMENDER_INDEX_DIR)
+        self.assertIsNotNone(other.vector(book.pk))
+        self.assertEqual(other.version, self.index.version)
+
+        book_id = book.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            book.delete()
+        self.assertIsNone(get_index().vector(book_id))
+        self.assertEqual(len(self.index), 3)
+
+    # 설명이 그대로인 저장은 기록하지 않아 인덱스 버전(추천 캐시 키)이 바뀌지 않음
+    def test_unchanged_description_is_not_journaled(self):
+        book = Book.objects.first()
+        version = self.index.version
+        self.save(book, title='바뀐 제목')
+        self.save(book)
+        self.assertEqual(get_index().version, version)
+
+        self.save(book, description='새로운 어휘 우주')
+        self.save(book)
+        self.assertEqual(self.index.applied, 1)
+
+    # 같은 도서를 다시 반영하면 어휘 밖 토큰 수를 더하지 않고 대체
+    def test_oov_tokens_are_counted_per_book(self):
+        book = Book.objects.first()
+        self.save(book, description='우주 탐사 항해')
+        self.assertEqual(self.index.oov_tokens, 3)
+        self.save(book, description='우주 탐사')
+        self.assertEqual(self.index.oov_tokens, 2)
+        self.save(book, description='설명 설명')
+        self.assertEqual(self.index.oov_tokens, 0)
+
+    # 어휘 밖 토큰 비율이 임계값을 넘으면 백그라운드에서 전체 재학습
+    @override_settings(RECOMMENDER_REFIT_DRIFT=0.01)
+    def test_drift_triggers_refit(self):
+        book = Book.objects.first()
+        version = self.index.base_version
+        with mock.patch('books.recommender_index.threading.Thread') as thread:
+            self.save(book, description='우주 탐사 항해 설명')
+        thread.assert_called_once()
+        self.assertGreater(self.index.drift, 0.01)
+
+        with mock.patch('books.recommender_index.connection.close'):
+            thread.call_args.kwargs['target']()
+        index = get_index()
+        self.assertNotEqual(index.base_version, version)
+        self.assertIn('우주', index.vectorizer.vocabulary_)
+        self.assertEqual((index.applied, index.drift), (0, 0))
+
+
+# 유사도 백엔드: IVF 근사 검색은 정확 검색과 거의 같은 결과를 반환
+class SimilarityBackendTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.index = RecommenderIndex.fit(list(enumerate(synthetic_descriptions(2000, n_topics=20), start=1)))
+
+    def queries(self, count=30):
+        rng = np.random.default_rng(0)
+        for _ in range(count):
+            yield self.index.book_ids[rng.choice(len(self.index.book_ids), 3, replace=False)]
+
+    def test_ivf_recall_against_exact(self):
+        exact = ExactBackend(self.index)
+        ivf = IVFBackend(self.index, n_lists=20, n_probe=6, background=False)
+        recalls = []
+        for seed_ids in self.queries():
+            excluded = frozenset(int(book_id) for book_id in seed_ids)
+            centroid = self.index.centroid(seed_ids)
+            expected = exact.search(centroid, 10, excluded)
+            found = ivf.search(centroid, 10, excluded)
+            self.assertEqual(len(found), 10)
+            self.assertFalse(excluded & set(found))
+            recalls.append(len(set(expected) & set(found)) / len(expected))
+        self.assertGreaterEqual(np.mean(recalls), 0.9)
+
+    # 생성 이후 변경분(추가·삭제)도 IVF 결과에 반영
+    def test_ivf_applies_journal_changes(self):
+        index = RecommenderIndex.fit(list(enumerate(synthetic_descriptions(500, n_topics=10), start=1)))
+        ivf = IVFBackend(index, n_lists=10, n_probe=10, background=False)
+        centroid = index.centroid([1])
+        top = ivf.search(centroid, 5, frozenset({1}))
+        index.remove(top[0])
+        index.upsert(9999, synthetic_descriptions(500, n_topics=10)[0])
+        found = ivf.search(centroid, 5, frozenset({1}))
+        self.assertEqual(found[0], 9999)
+        self.assertNotIn(top[0], found)
+
+    # 백그라운드 군집화가 실패하면 로그를 남기고 정확 검색으로 응답, 재시도 간격이 지나면 다시 군집화
+    def test_failed_background_build_is_retried(self):
+        exact = ExactBackend(self.index)
+        centroid = self.index.centroid(next(self.queries()))
+        with mock.patch.object(IVFBackend, 'build', side_effect=MemoryError), \
+                self.assertLogs('books.similarity', 'ERROR'):
+            ivf = IVFBackend(self.index, n_lists=20)
+            for _ in range(100):
+                if ivf.failed_at is not None:
+                    break
+                time.sleep(0.01)
+        self.assertFalse(ivf.ready.is_set())
+        self.assertEqual(ivf.search(centroid, 10), exact.search(centroid, 10))
+
+        ivf.failed_at -= IVFBackend.RETRY_INTERVAL
+        ivf.search(centroid, 10)
+        self.assertTrue(ivf.ready.wait(10))
+        self.assertIsNone(ivf.failed_at)
+
+
+# 개인화 추천 캐시: (사용자, 유형, 세대, 인덱스 버전) 키로 재사용하고 좋아요·감상글·도서 변경 시 무효화
+@override_settings(LIKE_BUFFER_ENABLED=False)
+class RecommendationCacheTestCase(BookTestCase):
+    def setUp(self):
+        super().setUp()
+        caches[recommendation_cache.CACHE_ALIAS].clear()
+        self.books = self.create_books(8)
+        rebuild_index()
+        self.writer.liked_books.add(*self.books[:2])
+        Thread.objects.create(title='감상', content='내용', book=self.books[2], user=self.writer)
+
+        # 유형별 실제 계산 횟수
+        self.computed = Counter()
+
+        def counting(rec_type, compute):
+            def wrapper(user):
+                self.computed[rec_type] += 1
+                return compute(user)
+            return wrapper
+
+        self.enterContext(mock.patch.dict(
+            RECOMMENDERS, {rec_type: counting(rec_type, compute) for rec_type, compute in RECOMMENDERS.items()},
+        ))
+
+    def recommend(self, rec_type='likes', user=None):
+        client = APIClient()
+        client.force_authenticate(user or self.writer)
+        response = client.get('/api/books/recommend/personal/', {'type': rec_type})
+        self.assertEqual(response.status_code, 200)
+        return {book['id'] for book in response.json()}
+
+    def test_hit_and_miss(self):
+        first = self.recommend()
+        self.assertEqual(self.recommend(), first)
+        self.assertEqual(self.computed['likes'], 1)
+        # 사용자마다 따로 저장
+        self.recommend(user=self.user)
+        self.assertEqual(self.computed['likes'], 2)
+        self.assertEqual(recommendation_cache.stats()['hits'], 1)
+        self.assertEqual(recommendation_cache.stats()['misses'], 2)
+
+    def test_like_invalidates_likes_only(self):
+        self.recommend()
+        self.recommend('threads')
+        client = APIClient()
+        client.force_authenticate(self.writer)
+        client.post(f'/api/books/{self.books[3].pk}/like/')
+
+        self.assertNotIn(self.books[3].pk, self.recommend())
+        self.recommend('threads')
+        self.assertEqual((self.computed['likes'], self.computed['threads']), (2, 1))
+
+    def test_thread_invalidates_threads_only(self):
+        self.recommend()
+        self.recommend('threads')
+        Thread.objects.create(title='감상', content='내용', book=self.books[4], user=self.writer)
+
+        self.assertNotIn(self.books[4].pk, self.recommend('threads'))
+        self.recommend()
+        self.assertEqual((self.computed['likes'], self.computed['threads']), (1, 2))
+
+    # 도서 설명이 바뀌면 인덱스 버전이 바뀌어 모든 사용자의 결과를 다시 계산
+    def test_catalog_change_invalidates_everyone(self):
+        self.recommend()
+        self.recommend(user=self.user)
+        book = self.books[5]
+        book.description = '완전히 새로운 설명'
+        with self.captureOnCommitCallbacks(execute=True):
+            book.save()
+
+        self.recommend()
+        self.recommend(user=self.user)
+        self.assertEqual(self.computed['likes'], 4)
+
+
+# 개인화 추천 일괄 계산: 사용자별 결과 저장, 중단 후 마지막으로 완료한 사용자 다음부터 재개
+class PrecomputeRecommendationsTestCase(BookTestCase):
+    def setUp(self):
+        super().setUp()
+        caches[recommendation_cache.CACHE_ALIAS].clear()
+        self.books = self.create_books(8)
+        rebuild_index()
+        User = get_user_model()
+        self.readers = User.objects.bulk_create([User(username=f'reader{i}') for i in range(3)])
+        for reader, book in zip(self.readers, self.books[1::2]):
+            reader.liked_books.add(book)
+        self.writer.liked_books.add(self.books[7])
+        self.checkpoint = Path(settings.RECOMMENDER_INDEX_DIR) / 'precompute_checkpoint.json'
+
+    def precompute(self):
+        call_command('precompute_recommendations', workers=1, shard_size=1, stdout=StringIO())
+
+    def interacting_users(self):
+        return set(Book.liked_users.through.objects.values_list('customuser_id', flat=True))
+
+    def test_writes_recommendations(self):
+        self.precompute()
+        version = get_index().version
+        rows = UserRecommendation.objects.filter(rec_type='likes')
+        self.assertEqual(set(rows.values_list('user_id', flat=True)), self.interacting_users())
+        self.assertEqual(set(rows.values_list('index_version', flat=True)), {version})
+        self.assertFalse(self.checkpoint.exists())
+
+        row = rows.get(user=self.readers[0])
+        self.assertEqual(row.book_ids, similar_book_ids(get_index(), [self.books[1].pk]))
+        # 미리 계산된 결과가 있으면 실시간으로 계산하지 않음
+        with mock.patch.dict(RECOMMENDERS, {'likes': mock.Mock(side_effect=AssertionError)}):
+            books = personal_recommendations(self.readers[0], 'likes')
+        self.assertEqual(set(books.values_list('pk', flat=True)), set(row.book_ids))
+
+    # 도서가 추가·수정되어 인덱스 버전이 바뀌면 미리 계산된 결과는 사용하지 않음
+    def test_stale_rows_are_ignored_after_catalog_change(self):
+        self.precompute()
+        book = self.books[0]
+        book.description = '완전히 새로운 설명'
+        with self.captureOnCommitCallbacks(execute=True):
+            book.save()
+        self.assertIsNone(precomputed_recommendation_ids(self.readers[0], 'likes'))
+
+    # 중단 뒤 그사이 앞쪽 사용자가 좋아요를 모두 취소해도(샤드가 밀려도) 남은 사용자를 빠짐없이 계산
+    def test_resume_after_interruption(self):
+        from books.management.commands.precompute_recommendations import Command
+
+        user_ids = sorted(self.interacting_users())
+        write = Command._write
+        written = []
+        interrupt_after = [2]
+
+        # 샤드 결과를 저장한 사용자 ID를 기록하고, interrupt_after개 저장 후에는 중단
+        def recording_write(command, results, index_version):
+            if len(written) == interrupt_after[0]:
+                raise KeyboardInterrupt
+            written.extend(user_id for user_id, _, _ in results)
+            write(command, results, index_version)
+
+        with mock.patch.object(Command, '_write', recording_write):
+            with self.assertRaises(KeyboardInterrupt):
+                self.precompute()
+            self.assertEqual(json.loads(self.checkpoint.read_text())['last_user_id'], user_ids[1])
+
+            Book.liked_users.through.objects.filter(customuser_id=user_ids[0]).delete()
+            written.clear()
+            interrupt_after[0] = None
+            self.precompute()
+        self.assertEqual(written, user_ids[2:])
+        self.assertEqual(set(UserRecommendation.objects.values_list('user_id', flat=True)), set(user_ids))
+        self.assertFalse(self.checkpoint.exists())
+
+
+# 협업 필터링 추천: 학습한 모델은 테스트마다 빈 임시 디렉터리에 저장
+@override_settings(LIKE_BUFFER_ENABLED=False)
+class CFRecommenderTestCase(BookTestCase):
+    def setUp(self):
+        super().setUp()
+        model_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(model_dir.cleanup)
+        settings_override = self.settings(CF_MODEL_DIR=model_dir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    # 두 취향 군집(도서 0~9, 10~19)의 사용자들이 각자 군집의 도서 5권씩 좋아요
+    def create_clusters(self):
+        books = self.create_books(20)
+        User = get_user_model()
+        readers = User.objects.bulk_create([User(username=f'cf{i}') for i in range(40)])
+        rng = np.random.default_rng(0)
+        Likes = Book.liked_users.through
+        Likes.objects.bulk_create([
+            Likes(customuser_id=reader.pk, book_id=books[(i % 2) * 10 + row].pk)
+            for i, reader in enumerate(readers)
+            for row in rng.choice(10, 5, replace=False)
+        ])
+        return books
+
+    def recommend(self, user, rec_type='cf'):
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.get('/api/books/recommend/personal/', {'type': rec_type})
+        self.assertEqual(response.status_code, 200)
+        return {book['id'] for book in response.json()}
+
+    # 묶음 단위 ALS 단계가 행마다 정규방정식을 직접 푼 결과와 같음 (상호작용 없는 행, 아주 많은 행, 작은 묶음 포함)
+    def test_solve_rows_matches_per_row_solution(self):
+        rng = np.random.default_rng(0)
+        dense = (rng.random((60, 30)) < 0.1) * rng.random((60, 30))
+        dense[3] = 0
+        dense[4] = rng.random(30) + 0.1
+        matrix = sparse.csr_matrix(dense)
+        fixed = rng.normal(size=(30, 4))
+
+        expected = []
+        for row in matrix:
+            factors, weights = fixed[row.indices], row.data * 20.0
+            lhs = fixed.T @ fixed + 0.1 * np.eye(4) + (factors * weights[:, None]).T @ factors
+            expected.append(np.linalg.solve(lhs, factors.T @ (weights + 1)))
+        for chunk_bytes in (64, 1 << 20):
+            with mock.patch.object(cf_model, 'CHUNK_BYTES', chunk_bytes):
+                np.testing.assert_allclose(cf_model.solve_rows(matrix, fixed, 0.1, 20.0), expected, atol=1e-12)
+
+    # 학습한 요인만으로 같은 군집의 도서를 추천
+    def test_als_recovers_clusters(self):
+        rng = np.random.default_rng(1)
+        rows = [(user, (user % 2) * 10 + book) for user in range(40) for book in rng.choice(10, 5, replace=False)]
+        users, items = np.array(rows).T
+        matrix = sparse.csr_matrix((np.ones(len(rows)), (users, items)), shape=(40, 20))
+        model = CFModel.fit(matrix, np.arange(100, 120), factors=2, iterations=10)
+
+        self.assertEqual(set(model.recommend({101: 1.0, 102: 1.0}, k=8)), set(range(100, 110)) - {101, 102})
+        self.assertLessEqual(set(model.recommend({115: 1.0}, k=5)), set(range(110, 120)))
+        self.assertIsNone(model.recommend({999: 1.0}))
+
+    def test_recommendation_api_uses_trained_model(self):
+        books = self.create_clusters()
+        self.writer.liked_books.add(books[11], books[12])
+        self.assertIsNone(get_model())
+        call_command('train_cf_model', factors=2, stdout=StringIO())
+        first = get_model()
+        self.assertEqual(len(first), 20)
+
+        # 추천 10권 중 같은 군집의 나머지 8권이 모두 포함
+        recommended = self.recommend(self.writer)
+        self.assertEqual(len(recommended), 10)
+        self.assertLessEqual({book.pk for book in books[13:20]} | {books[10].pk}, recommended)
+
+        # 학습 이후의 좋아요도 fold-in으로 바로 반영 (추천 캐시 무효화)
+        self.writer.liked_books.add(books[13])
+        self.assertNotIn(books[13].pk, self.recommend(self.writer))
+
+        # 재학습하면 새 버전을 로드하고, 직전 버전 하나만 디스크에 남김
+        for _ in range(2):
+            call_command('train_cf_model', factors=2, stdout=StringIO())
+        self.assertNotEqual(get_model().version, first.version)
+        self.assertEqual(len([p for p in Path(settings.CF_MODEL_DIR).iterdir() if p.is_dir()]), 2)
+
+    # 모델이 없거나 모델에 없는 도서만 좋아요한 사용자는 콘텐츠 기반 추천으로 대체
+    def test_cold_start_falls_back_to_content(self):
+        books = self.create_books(8)
+        rebuild_index()
+        self.writer.liked_books.add(*books[:2])
+        expected = self.recommend(self.writer, 'likes')
+        self.assertTrue(expected)
+        self.assertEqual(self.recommend(self.writer), expected)
+
+        # 학습 데이터에 아무도 좋아요하지 않은 도서만 좋아요한 새 사용자
+        call_command('train_cf_model', factors=2, stdout=StringIO())
+        self.assertNotIn(books[7].pk, get_model().row_of)
+        newcomer = get_user_model().objects.create(username='newcomer')
+        newcomer.liked_books.add(books[7])
+        self.assertEqual(self.recommend(newcomer), self.recommend(newcomer, 'likes'))
+
+    def test_invalid_type(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get('/api/books/recommend/personal/', {'type': 'popular'})
+        self.assertEqual(response.status_code, 400)
+
+
+# 외부 API(위키백과 수집기, GPT)를 스텁으로 대체
+class AuthorStubMixin:
+    def setUp(self):
+        super().setUp()
+        fetcher = mock.Mock()
+        fetcher.fetch.return_value = ('위키 요약', 'https://upload.example/저자.jpg', ['작품1'])
+        self.fetch = fetcher.fetch
+        self.call_openai = mock.Mock(return_value={'author_info': '소개', 'author_works': '작품1, 작품2'})
+        self.fallback = mock.Mock(return_value={'author_info': '대체 소개', 'author_works': '작품3'})
+        for target, stub in [
+            ('books.author_cache.get_fetcher', mock.Mock(return_value=fetcher)),
+            ('books.utils.call_openai', self.call_openai),
+            ('books.utils.get_ai_summary_fallback', self.fallback),
+        ]:
+            patcher = mock.patch(target, stub)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def create_author_book(self, title, author='저자'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Book.objects.create(
+                category=self.category, title=title, description='설명', isbn=title, cover='https://example.com/c.jpg',
+                publisher='출판사', pub_date=datetime.date(2024, 1, 1), author=author, author_info='',
+                customer_review_rank=0, subTitle='',
+            )
+
+
+# 도서 상세 조회 시 작가 정보 보완은 작업 큐로 넘기고 바로 응답
+class BookEnrichmentTestCase(AuthorStubMixin, BookTestCase):
+    def setUp(self):
+        super().setUp()
+        self.book = self.create_books(1)[0]
+        Book.objects.filter(pk=self.book.pk).update(author_info='')
+
+    def test_detail_enqueues_enrichment_once(self):
+        client = APIClient()
+        for _ in range(3):
+            response = client.get(f'/api/books/{self.book.pk}/')
+            self.assertEqual(response.json()['enrichment_status'], 'enriching')
+            self.assertEqual(response.json()['author_info'], '')
+        self.fetch.assert_not_called()
+        self.assertEqual(Job.objects.filter(status=Job.PENDING).count(), 1)
+
+        self.assertEqual(queue.run_pending(), 1)
+        self.fetch.assert_called_once_with('저자')
+        self.call_openai.assert_called_once()
+
+        data = client.get(f'/api/books/{self.book.pk}/').json()
+        self.assertEqual(data['enrichment_status'], 'ready')
+        self.assertEqual(data['author_info'], '소개')
+        self.assertEqual(data['author_works'], '작품1, 작품2')
+        self.assertEqual(data['author_photo'], 'https://upload.example/저자.jpg')
+
+    def test_fallback_without_wikipedia(self):
+        self.fetch.return_value = (None, None, [])
+        APIClient().get(f'/api/books/{self.book.pk}/')
+        queue.run_pending()
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.author_info, '대체 소개')
+        self.call_openai.assert_not_called()
+
+    def test_failed_enrichment_is_not_retried_on_every_request(self):
+        self.fetch.side_effect = RuntimeError('network down')
+        client = APIClient()
+        client.get(f'/api/books/{self.book.pk}/')
+        with self.assertLogs('jobs.queue', 'ERROR'):
+            Job.objects.update(max_attempts=1)
+            queue.run_pending()
+        self.assertEqual(client.get(f'/api/books/{self.book.pk}/').json()['enrichment_status'], 'failed')
+        self.assertEqual(Job.objects.count(), 1)
+
+    # 새 도서 등록 시(커밋 후) 작가 정보 보완 작업 등록
+    def test_new_book_enqueues_enrichment(self):
+        book = self.create_author_book('새 도서', author='새 저자')
+        self.assertTrue(Job.objects.filter(key=f'book:{book.pk}', status=Job.PENDING).exists())
+
+
+# 같은 작가의 도서들은 작가 캐시(Author)를 공유해 외부 호출을 한 번만 수행
+class AuthorCacheTestCase(AuthorStubMixin, BookTestCase):
+    def test_normalize_name(self):
+        self.assertEqual(author_cache.normalize_name(' 한강 (지은이) '), '한강')
+        self.assertEqual(author_cache.normalize_name('한강 지음'), '한강')
+        self.assertEqual(author_cache.normalize_name('Haruki  MURAKAMI'), 'haruki murakami')
+        self.assertEqual(author_cache.normalize_name('김영하,한강'), '김영하, 한강')
+
+    def test_books_by_same_author_share_one_fetch(self):
+        books = [self.create_author_book('도서 0')]
+        queue.run_pending()
+        books += [self.create_author_book(f'도서 {i}', author='저자 (지은이)' if i % 2 else '저자') for i in range(1, 10)]
+
+        self.fetch.assert_called_once_with('저자')
+        self.call_openai.assert_called_once()
+        self.assertEqual(Author.objects.count(), 1)
+        # 첫 도서만 작업으로 보완되고 나머지는 등록 시점에 캐시로 채워짐
+        self.assertEqual(Job.objects.count(), 1)
+        for book in books:
+            book.refresh_from_db()
+            self.assertEqual(book.author_info, '소개')
+
+        stats = author_cache.stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 9)
+        self.assertEqual(stats['hit_ratio'], 0.9)
+        # 도서 한 권당 위키백과 3회 + GPT 1회
+        self.assertEqual(stats['external_calls'], 4)
+        self.assertEqual(stats['external_calls_saved'], 36)
+
+    def test_works_endpoint_uses_cache(self):
+        book = self.create_books(1)[0]
+        for _ in range(3):
+            data = APIClient().get(f'/api/books/{book.pk}/works/').json()
+            self.assertEqual(data['works'], ['작품1'])
+        self.fetch.assert_called_once_with('저자')
+        self.call_openai.assert_not_called()
+
+    # 위키백과 문서가 없으면 GPT를 요청 중에 호출하지 않고 보완 작업으로 넘김
+    def test_works_endpoint_without_wikipedia_enqueues_enrichment(self):
+        self.fetch.return_value = (None, None, [])
+        book = self.create_books(1)[0]
+        for _ in range(2):
+            data = APIClient().get(f'/api/books/{book.pk}/works/').json()
+            self.assertEqual(data['works'], [])
+        self.fallback.assert_not_called()
+        self.assertEqual(Job.objects.filter(key=f'book:{book.pk}', status=Job.PENDING).count(), 1)
+
+        queue.run_pending()
+        self.fallback.assert_called_once_with('저자', refresh=False)
+        data = APIClient().get(f'/api/books/{book.pk}/works/').json()
+        self.assertEqual(data['works'], ['작품3'])
+        self.fetch.assert_called_once_with('저자')
+
+    # 위키백과 오류는 500이 아니라 캐시된(만료되었더라도) 대표작이나 빈 목록으로 응답
+    def test_works_endpoint_survives_wikipedia_errors(self):
+        book = self.create_books(1)[0]
+        self.fetch.side_effect = requests.ConnectionError('timeout')
+        with self.assertLogs('books.author_cache', 'WARNING'):
+            response = APIClient().get(f'/api/books/{book.pk}/works/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['works'], [])
+
+        self.fetch.side_effect = None
+        author_cache.author_data('저자')
+        Author.objects.update(fetched_at=timezone.now() - datetime.timedelta(days=31))
+        self.fetch.side_effect = requests.HTTPError('503')
+        with self.assertLogs('books.author_cache', 'WARNING'):
+            data = APIClient().get(f'/api/books/{book.pk}/works/').json()
+        self.assertEqual(data['works'], ['작품1'])
+
+    def test_expired_entry_is_refetched(self):
+        author_cache.author_data('저자')
+        Author.objects.update(fetched_at=timezone.now() - datetime.timedelta(days=31))
+        author_cache.author_data('저자')
+        self.assertEqual(self.fetch.call_count, 2)
+        self.assertEqual(Author.objects.get().fetches, 2)
+
+    # '정보 없음' 결과는 한 달이 아니라 AUTHOR_CACHE_NEGATIVE_TTL 동안만 캐시하고, 다시 조회할 때는 LLM 캐시를 건너뜀
+    def test_placeholder_profile_expires_early(self):
+        self.call_openai.return_value = {'author_info': '정보 없음', 'author_works': '정보 없음'}
+        author_cache.author_profile('저자', '도서')
+        self.assertEqual(author_cache.cached_profile('저자').author_info, '정보 없음')
+
+        Author.objects.update(fetched_at=timezone.now() - datetime.timedelta(hours=2))
+        self.assertIsNone(author_cache.cached_profile('저자'))
+        self.call_openai.return_value = {'author_info': '소개', 'author_works': '작품1'}
+        self.assertEqual(author_cache.author_profile('저자', '도서').author_info, '소개')
+        self.assertEqual(self.fetch.call_count, 2)
+        self.assertEqual(self.call_openai.call_args.kwargs, {'refresh': True})
+
+        # 정상적인 소개는 전체 유효 기간 동안 유지
+        Author.objects.update(fetched_at=timezone.now() - datetime.timedelta(hours=2))
+        self.assertEqual(author_cache.cached_profile('저자').author_info, '소개')
+
+    def test_stats_requires_admin(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertEqual(client.get('/api/books/authors/stats/').status_code, 403)
+        admin = get_user_model().objects.create_superuser(username='admin', password='pw')
+        client.force_authenticate(admin)
+        self.assertEqual(client.get('/api/books/authors/stats/').json()['authors'], 0)
+
+
+# 작가 정보·TTS가 비어 있는 도서 일괄 보완 (외부 서비스는 스텁, 속도 제한 없음)
+class EnrichCatalogTestCase(AuthorStubMixin, BookTestCase):
+    def setUp(self):
+        super().setUp()
+        self.books = self.create_books(6)
+        self.checkpoint = Path(self.enterContext(tempfile.TemporaryDirectory())) / 'checkpoint.json'
+        self.enterContext(self.settings(
+            ENRICH_CHECKPOINT_PATH=self.checkpoint, ENRICH_RATE_LIMITS={},
+            MEDIA_ROOT=self.checkpoint.parent, TTS_BACKEND='books.tts.StubBackend',
+        ))
+        self.tts = self.enterContext(mock.patch.object(
+            StubBackend, 'synthesize', autospec=True, side_effect=lambda backend, text, lang: text.encode(),
+        ))
+
+    def enrich(self, **options):
+        out, err = StringIO(), StringIO()
+        call_command('enrich_catalog', workers=1, batch_size=4, stdout=out, stderr=err, **options)
+        return out.getvalue(), err.getvalue()
+
+    def test_enriches_all_missing_books(self):
+        out, _ = self.enrich()
+
+        self.fetch.assert_called_once_with('저자')
+        self.call_openai.assert_called_once()
+        self.assertEqual(self.tts.call_count, 6)
+        for book in Book.objects.all():
+            self.assertEqual(book.author_info, '소개')
+            self.assertEqual(book.author_works, '작품1, 작품2')
+            self.assertEqual(book.author_photo, 'https://upload.example/저자.jpg')
+            self.assertEqual(book.tts_audio.name, tts.audio_name(tts.book_text(book)))
+        self.assertIn('6/6권', out)
+        self.assertFalse(self.checkpoint.exists())
+
+        # 다시 실행하면 보완할 도서가 없음
+        self.assertIn('보완할 도서 0권', self.enrich()[0])
+
+    def test_resumes_from_checkpoint(self):
+        self.checkpoint.write_text(json.dumps({'last_pk': self.books[2].pk}))
+        out, _ = self.enrich()
+
+        self.assertIn('보완할 도서 3권', out)
+        self.assertEqual(self.tts.call_count, 3)
+        self.assertFalse(Book.objects.get(pk=self.books[0].pk).tts_audio)
+        self.assertTrue(Book.objects.get(pk=self.books[5].pk).tts_audio)
+
+    def test_failures_are_reported_and_skipped(self):
+        self.tts.side_effect = RuntimeError('quota exceeded')
+        out, err = self.enrich(limit=4)
+
+        self.assertIn('실패 4', out)
+        self.assertIn('quota exceeded', err)
+        # 실패한 첫 도서 앞까지만 체크포인트 전진
+        self.assertEqual(json.loads(self.checkpoint.read_text()), {'last_pk': self.books[0].pk - 1})
+        # 작가 정보는 저장되고 TTS만 비어 있음
+        book = Book.objects.get(pk=self.books[0].pk)
+        self.assertEqual(book.author_info, '소개')
+        self.assertFalse(book.tts_audio)
+
+        # 이어서 실행하면 실패한 도서부터 다시 시도
+        self.tts.side_effect = lambda backend, text, lang: text.encode()
+        out, _ = self.enrich()
+        self.assertIn('보완할 도서 6권', out)
+        self.assertTrue(all(book.tts_audio for book in Book.objects.all()))
+        self.assertFalse(self.checkpoint.exists())
+
+    # 성공한 도서 뒤에 실패한 도서가 있어도 체크포인트는 실패한 도서 앞에 머묾
+    def test_checkpoint_stops_before_failed_book(self):
+        failing = self.books[1]
+
+        def synthesize(backend, text, lang):
+            if failing.title in text:
+                raise RuntimeError('quota exceeded')
+            return text.encode()
+
+        self.tts.side_effect = synthesize
+        out, _ = self.enrich(limit=4)
+        self.assertIn('실패 1', out)
+        self.assertEqual(json.loads(self.checkpoint.read_text()), {'last_pk': failing.pk - 1})
+
+        # 재실행 시 실패한 도서와 아직 처리하지 않은 도서만 대상
+        self.tts.side_effect = lambda backend, text, lang: text.encode()
+        self.assertIn('보완할 도서 3권', self.enrich()[0])
+
+    # 위키백과에 사진이 없는 작가도 한 번 보완한 뒤에는 다시 조회하지 않음
+    def test_author_without_photo_is_not_refetched(self):
+        self.fetch.return_value = ('위키 요약', None, ['작품1'])
+        self.enrich()
+        book = Book.objects.get(pk=self.books[0].pk)
+        self.assertFalse(book.author_photo)
+        self.assertIsNotNone(book.author_enriched_at)
+
+        self.assertIn('보완할 도서 0권', self.enrich()[0])
+        self.fetch.assert_called_once_with('저자')
+
+
+# ISBN unique 제약(books.0005) 전의 중복 정리: 마이그레이션은 중복이 있으면 멈추고, dedupe_isbns 명령으로 합친 뒤 적용
+class DedupeIsbnsTestCase(TransactionTestCase):
+    def migrate(self, *targets):
+        executor = MigrationExecutor(connection)
+        executor.migrate(list(targets))
+        return executor.loader.project_state(list(targets)).apps
+
+    def tearDown(self):
+        self.migrate(*MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_duplicates_block_migration_until_deduped(self):
+        apps = self.migrate(('books', '0004_author'), ('threads', '0001_initial'))
+        OldBook = apps.get_model('books', 'Book')
+        OldThread = apps.get_model('threads', 'Thread')
+        users = [get_user_model().objects.create_user(username=f'user{i}') for i in range(3)]
+        category = apps.get_model('books', 'Category').objects.create(name='문학')
+
+        def create(isbn):
+            return OldBook.objects.create(
+                category=category, title='도서', description='설명', isbn=isbn, cover='https://example.com/c.jpg',
+                publisher='출판사', pub_date=datetime.date(2024, 1, 1), author='저자', author_info='',
+                customer_review_rank=0, subTitle='',
+            )
+
+        keep, duplicate, blank, other_blank = create('111'), create('111'), create(''), create('')
+        keep.liked_users.add(users[0].pk, users[1].pk)
+        duplicate.liked_users.add(users[1].pk, users[2].pk)
+        thread = OldThread.objects.create(title='감상', content='내용', book=duplicate, user_id=users[0].pk)
+
+        with self.assertRaisesMessage(RuntimeError, 'dedupe_isbns'):
+            self.migrate(('books', '0005_book_isbn_unique'))
+
+        # --dry-run은 아무것도 바꾸지 않음
+        out = StringIO()
+        call_command('dedupe_isbns', dry_run=True, stdout=out)
+        self.assertIn(f'[{duplicate.pk}]', out.getvalue())
+        self.assertEqual(OldBook.objects.count(), 4)
+
+        call_command('dedupe_isbns', stdout=StringIO())
+        self.assertEqual(sorted(OldBook.objects.values_list('isbn', flat=True)), sorted([
+            '111', f'noisbn-{blank.pk}', f'noisbn-{other_blank.pk}',
+        ]))
+        self.assertEqual(OldThread.objects.get(pk=thread.pk).book_id, keep.pk)
+        self.assertEqual(set(OldBook.objects.get(pk=keep.pk).liked_users.values_list('pk', flat=True)), {u.pk for u in users})
+
+        self.migrate(('books', '0005_book_isbn_unique'))
+
+
+# 알라딘 베스트셀러 수집: 로컬 스텁 서버에서 페이지를 동시에 받아 ISBN 기준으로 upsert
+class IngestBestsellersTestCase(AuthorStubMixin, BookTestCase):
+    def setUp(self):
+        super().setUp()
+        for pk, name in [(1, '소설/시/희곡'), (2, '경제/경영'), (7, '과학')]:
+            Category.objects.create(id=pk, name=name)
+        self.checkpoint = Path(self.enterContext(tempfile.TemporaryDirectory())) / 'checkpoint.json'
+        self.enterContext(self.settings(INGEST_CHECKPOINT_PATH=self.checkpoint))
+        # 스텁 상품 200개 중 ISBN 중복과 매핑되지 않는 카테고리를 뺀 도서
+        self.expected = {
+            fields['isbn']: fields
+            for fields in map(aladin.to_book_fields, map(stub_item, range(200)))
+            if fields is not None
+        }
+
+    def ingest(self, server, **options):
+        out, err = StringIO(), StringIO()
+        options = {'workers': 4, 'batch_size': 60, **options}
+        with self.settings(ALADIN_API_URL=server.api_url):
+            call_command('ingest_bestsellers', stdout=out, stderr=err, **options)
+        return out.getvalue(), err.getvalue()
+
+    def test_ingests_pages_concurrently(self):
+        with stub_aladin_server(total=200, latency=0.3) as server:
+            started = time.perf_counter()
+            out, _ = self.ingest(server)
+            elapsed = time.perf_counter() - started
+
+        self.assertEqual(server.requests, 4)
+        # 4페이지를 동시에 요청하므로 순차 요청(1.2초)보다 빠름
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(set(Book.objects.values_list('isbn', flat=True)), set(self.expected))
+        self.assertIn(f"추가 {len(self.expected)}권", out)
+        self.assertIn("중복 20", out)
+        self.assertFalse(self.checkpoint.exists())
+
+        book = Book.objects.get(isbn='9790000000012')
+        self.assertEqual((book.title, book.category_id, book.author_info), ('베스트셀러 12', 4, ''))
+        self.assertIn(book.pk, engine.search('books', '베스트셀러 12').ids)
+        # 도서마다 시그널로 등록하지 않고 작가 정보 보완 작업을 한꺼번에 등록
+        self.assertEqual(Job.objects.filter(name='books.enrich_author').count(), len(self.expected))
+        self.fetch.assert_not_called()
+
+    def test_upsert_keeps_enrichment(self):
+        with stub_aladin_server(total=100, latency=0) as server:
+            self.ingest(server, skip_enrich=True)
+            book = Book.objects.get(isbn='9790000000001')
+            Book.objects.filter(pk=book.pk).update(title='예전 제목', author_info='작가 소개', tts_audio='tts/a.mp3')
+            out, _ = self.ingest(server, skip_enrich=True)
+
+        self.assertIn(f"추가 0권, 갱신 {Book.objects.count()}권", out)
+        book.refresh_from_db()
+        self.assertEqual((book.title, book.author_info, book.tts_audio.name), ('베스트셀러 1', '작가 소개', 'tts/a.mp3'))
+        self.assertFalse(Job.objects.exists())
+
+    # 시그널 없이 저장한 도서도 추천 인덱스(새 도서·설명 변경분만)와 감상글 검색 색인에 반영
+    @override_settings(RECOMMENDER_REFIT_DRIFT=float('inf'))
+    def test_updates_recommender_and_thread_indexes(self):
+        self.create_books(2)
+        rebuild_index()
+        with stub_aladin_server(total=100, latency=0) as server:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.ingest(server, skip_enrich=True)
+            index = get_index(build=False)
+            book = Book.objects.get(isbn='9790000000001')
+            self.assertIsNotNone(index.vector(book.pk))
+
+            thread = Thread.objects.create(title='감상', content='내용', book=book, user=self.user)
+            Book.objects.filter(pk=book.pk).update(title='예전 제목', description='바뀔 설명')
+            engine.update('threads', [thread.pk])
+            index.upsert(book.pk, '바뀔 설명')
+            self.assertEqual(engine.search('threads', '예전').ids, [thread.pk])
+            applied = index.applied
+
+            with self.captureOnCommitCallbacks(execute=True):
+                self.ingest(server, skip_enrich=True)
+        self.assertEqual(engine.search('threads', '예전').ids, [])
+        self.assertEqual(engine.search('threads', '베스트셀러 1').ids, [thread.pk])
+        # 설명이 바뀐 도서 한 권만 변경 로그에 기록
+        self.assertEqual(index.applied, applied + 1)
+
+    def test_fills_authors_from_cache(self):
+        Author.objects.create(
+            name='작가1', normalized_name=author_cache.normalize_name('작가1'), author_info='캐시된 소개',
+            author_works='대표작', photo_url='https://upload.example/1.jpg', fetched_at=timezone.now(),
+        )
+        with stub_aladin_server(total=100, latency=0) as server:
+            out, _ = self.ingest(server)
+
+        books = Book.objects.filter(author='작가1')
+        self.assertTrue(books.exists())
+        self.assertEqual(set(books.values_list('author_info', flat=True)), {'캐시된 소개'})
+        self.assertIn(f"작가 캐시로 채움 {books.count()}", out)
+        self.assertFalse(Job.objects.filter(key__in=[f'book:{pk}' for pk in books.values_list('pk', flat=True)]).exists())
+
+    def test_resumes_failed_pages(self):
+        with stub_aladin_server(total=200, latency=0, fail_pages={3}) as server:
+            out, err = self.ingest(server, batch_size=1)
+        self.assertIn("페이지 실패 1", out)
+        self.assertIn("Bestseller 3", err)
+        self.assertEqual(
+            json.loads(self.checkpoint.read_text()),
+            {'done': ['Bestseller:1', 'Bestseller:2', 'Bestseller:4']},
+        )
+
+        with stub_aladin_server(total=200, latency=0) as server:
+            out, _ = self.ingest(server)
+        # 실패했던 페이지만 다시 요청
+        self.assertEqual(server.requests, 1)
+        self.assertEqual(Book.objects.count(), len(self.expected))
+        self.assertFalse(self.checkpoint.exists())
+
+
+# 도서 소개 음성: 텍스트 해시로 파일을 정하고 백그라운드에서 합성 (오프라인 스텁 백엔드 사용)
+class BookTTSTestCase(BookTestCase):
+    def setUp(self):
+        super().setUp()
+        media_root = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(self.settings(MEDIA_ROOT=media_root, TTS_BACKEND='books.tts.StubBackend', TTS_CHUNK_CHARS=40))
+        StubBackend.calls.clear()
+        self.addCleanup(StubBackend.calls.clear)
+        self.book = self.create_books(1)[0]
+        self.client = APIClient()
+
+    def test_split_text_keeps_sentences_within_limit(self):
+        text = '첫 문장입니다. 두 번째 문장은 조금 더 깁니다! 세 번째? ' + '아주 긴 단어들이 이어지는 문장 ' * 6
+        chunks = tts.split_text(text, max_chars=40)
+        self.assertTrue(all(len(chunk) <= 40 for chunk in chunks))
+        self.assertEqual(chunks[0], '첫 문장입니다. 두 번째 문장은 조금 더 깁니다! 세 번째?')
+        self.assertEqual(' '.join(chunks).split(), text.split())
+
+    def test_render_skips_existing_audio(self):
+        first = tts.render('같은 텍스트')
+        second = tts.render('같은 텍스트')
+        self.assertEqual(first, second)
+        self.assertEqual(len(StubBackend.calls), 1)
+        self.assertNotEqual(tts.render('같은 텍스트', lang='en'), first)
+
+    # 조각을 동시에 합성하고 원래 순서대로 이어 붙임
+    def test_chunks_are_synthesized_in_parallel(self):
+        text = ' '.join(f'{i}번째 문장은 이렇게 끝납니다.' for i in range(8))
+        chunks = tts.split_text(text)
+        self.enterContext(mock.patch.object(StubBackend, 'delay', 0.1))
+        started = time.perf_counter()
+        audio = tts.synthesize(text)
+        self.assertLess(time.perf_counter() - started, 0.1 * len(chunks) / 2)
+        self.assertEqual(audio, b''.join(f'[ko]{chunk}\n'.encode() for chunk in chunks))
+
+    def test_post_renders_in_background_once(self):
+        url = f'/api/books/{self.book.pk}/tts/'
+        for _ in range(2):
+            response = self.client.post(url)
+            self.assertEqual(response.status_code, 202)
+            self.assertEqual(response.json()['tts_status'], 'rendering')
+        self.assertEqual(StubBackend.calls, [])
+        self.assertEqual(self.client.get(url).json()['tts_status'], 'rendering')
+
+        self.assertEqual(queue.run_pending(), 1)
+        data = self.client.get(url).json()
+        self.assertEqual(data['tts_status'], 'ready')
+        self.assertEqual(data['tts_audio'], f'/media/{tts.audio_name(tts.book_text(self.book))}')
+
+        # 내용이 같으면 다시 합성하지 않음
+        calls = len(StubBackend.calls)
+        self.assertEqual(self.client.post(url).json()['tts_status'], 'ready')
+        self.assertEqual(len(StubBackend.calls), calls)
+        self.assertFalse(Job.objects.filter(status=Job.PENDING).exists())
+
+        # 작가 소개가 바뀌면 새 음성이 필요
+        Book.objects.filter(pk=self.book.pk).update(author_info='새 소개')
+        self.assertEqual(self.client.get(url).json()['tts_status'], 'missing')
+        self.assertEqual(self.client.post(url).status_code, 202)
+
+
+class TokenBucketTestCase(TestCase):
+    def test_waits_for_refill(self):
+        now = [0.0]
+
+        def sleep(seconds):
+            now[0] += seconds
+
+        bucket = TokenBucket(rate=2, clock=lambda: now[0], sleep=sleep)
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertAlmostEqual(bucket.acquire(), 0.5)
+        now[0] += 10
+        # 버킷 크기(2)를 넘게 쌓이지 않음
+        self.assertEqual(bucket.acquire(2), 0.0)
+        self.assertAlmostEqual(bucket.acquire(), 0.5)
+
+
+# 로컬 스텁 위키 서버를 상대로 작가 정보 수집기 동작 확인
+class AuthorFetcherTestCase(TestCase):
+    def setUp(self):
+        server_context = stub_wiki_server(latency=0.05)
+        self.server = server_context.__enter__()
+        self.addCleanup(server_context.__exit__, None, None, None)
+        self.fetcher = AuthorFetcher(self.server.api_url, self.server.page_url, timeout=2, max_workers=6)
+        self.addCleanup(self.fetcher.close)
+
+    # 세 요청이 모두 동시에 도착해야 응답하는 서버로 확인 (순차 실행이면 barrier가 깨져 503)
+    def test_fetch_runs_requests_concurrently(self):
+        with stub_wiki_server(latency=0, barrier=threading.Barrier(3, timeout=5)) as server:
+            fetcher = AuthorFetcher(server.api_url, server.page_url, timeout=10, max_workers=3)
+            self.addCleanup(fetcher.close)
+            summary, img_url, works = fetcher.fetch('한강')
+
+        self.assertEqual(summary, '한강은(는) 대한민국의 작가이다.')
+        self.assertEqual(img_url, 'https://upload.example/한강.jpg')
+        self.assertEqual(sorted(works), ['한강의 둘째 책', '한강의 첫 책'])
+        self.assertEqual(server.max_active, 3)
+
+    def test_missing_author(self):
+        self.assertEqual(self.fetcher.fetch('없는 작가'), (None, None, []))
+
+    def test_fetch_many_reuses_connections(self):
+        authors = [f'작가{i}' for i in range(10)] + ['없는 작가', '작가0']
+        results = self.fetcher.fetch_many(authors)
+
+        self.assertEqual(set(results), set(authors))
+        self.assertEqual(results['없는 작가'], (None, None, []))
+        for i in range(10):
+            self.assertEqual(results[f'작가{i}'][:2], (f'작가{i}은(는) 대한민국의 작가이다.', f'https://upload.example/작가{i}.jpg'))
+        # 없는 작가의 이미지/대표작 요청은 요약 결과에 따라 취소될 수 있으므로 요청 수 대신 연결 수만 확인
+        self.assertLessEqual(self.server.max_active, 6)
+        self.assertLessEqual(self.server.connections, 6)
+
+    def test_summary_timeout_is_reported(self):
+        fetcher = AuthorFetcher(self.server.api_url, self.server.page_url, timeout=0.01, max_workers=2)
+        self.addCleanup(fetcher.close)
+        with self.assertLogs('books.author_fetcher', 'WARNING'):
+            results = fetcher.fetch_many(['한강'])
+            # 요약 요청 실패 후에도 실행 중인 이미지/대표작 요청의 경고까지 기다림
+            fetcher.close()
+        self.assertIsInstance(results['한강'], Exception)
@@ -0,0 +1,124 @@
+# books/tts.py
+
+import hashlib
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+# 문장 경계 (마침표·물음표·느낌표 뒤 공백, 줄바꿈, 도서 정보 구분자 ' / ')
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?。])\s+|\n+|\s+/\s+')
+
+
+# gTTS(구글 번역 TTS)로 mp3 합성
+class GTTSBackend:
+    extension = 'mp3'
+
+    def synthesize(self, text, lang):
+        from gtts import gTTS
+
+        buffer = BytesIO()
+        gTTS(text=text, lang=lang).write_to_fp(buffer)
+        return buffer.getvalue()
+
+
+# 네트워크 없이 입력을 그대로 바이트로 돌려주는 테스트·개발용 백엔드
+# delay초 만큼 지연해 외부 API 응답 시간을 흉내 낼 수 있음
+class StubBackend:
+    extension = 'mp3'
+    delay = 0.0
+    calls = []
+    lock = threading.Lock()
+
+    def synthesize(self, text, lang):
+        with self.lock:
+            self.calls.append((text, lang))
+        time.sleep(self.delay)
+        return f"[{lang}]{text}\n".encode()
+
+
+# settings.TTS_BACKEND에 지정한 합성 백엔드 (synthesize(text, lang) -> bytes)
+def get_backend():
+    return import_string(settings.TTS_BACKEND)()
+
+
+# 도서 소개 음성에 사용하는 텍스트
+def book_text(book):
+    return f"{book.title} / {book.author_info} / {book.author_works}"
+
+
+# 텍스트와 언어의 해시로 정한 음성 파일 경로 (MEDIA_ROOT 기준 상대경로)
+# 같은 내용이면 같은 파일을 가리키므로 이미 있으면 다시 합성하지 않음
+def audio_name(text, lang=None):
+    lang = lang or settings.TTS_LANG
+    digest = hashlib.sha256(f"{lang}\0{text}".encode()).hexdigest()[:32]
+    return f"tts/{digest}.{get_backend().extension}"
+
+
+def exists(name):
+    return bool(name) and (Path(settings.MEDIA_ROOT) / name).exists()
+
+
+# 긴 텍스트를 문장 단위로 max_chars 이하 조각으로 나눔 (한 문장이 더 길면 공백 기준으로 자름)
+def split_text(text, max_chars=None):
+    max_chars = max_chars or settings.TTS_CHUNK_CHARS
+    chunks, current = [], ''
+    for sentence in SENTENCE_BOUNDARY.split(text.strip()):
+        sentence = sentence.strip()
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(' ', 0, max_chars + 1)
+            cut = cut if cut > 0 else max_chars
+            if current:
+                chunks.append(current)
+                current = ''
+            chunks.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if not sentence:
+            continue
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+# 조각별로 동시에 합성한 뒤 순서대로 이어 붙임 (mp3는 프레임 단위라 단순 연결로 재생 가능)
+# limits(books.rate_limit.RateLimits)가 주어지면 조각마다 'gtts' 토큰을 획득
+def synthesize(text, lang=None, limits=None):
+    lang = lang or settings.TTS_LANG
+    backend = get_backend()
+
+    def render_chunk(chunk):
+        if limits is not None:
+            limits.acquire('gtts')
+        return backend.synthesize(chunk, lang)
+
+    chunks = split_text(text)
+    if len(chunks) <= 1:
+        return render_chunk(chunks[0]) if chunks else b''
+    with ThreadPoolExecutor(max_workers=min(settings.TTS_CONCURRENCY, len(chunks))) as pool:
+        return b''.join(pool.map(render_chunk, chunks))
+
+
+# 텍스트 음성 파일을 만들고 상대경로 반환 (같은 텍스트·언어의 파일이 있으면 그대로 반환)
+def render(text, lang=None, limits=None):
+    name = audio_name(text, lang)
+    if exists(name):
+        return name
+
+    audio = synthesize(text, lang, limits)
+    file_path = Path(settings.MEDIA_ROOT) / name
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    # 다른 워커가 같은 파일을 읽는 중일 수 있으므로 임시 파일에 쓴 뒤 교체
+    tmp_path = file_path.with_name(f".{file_path.name}.{threading.get_ident()}.part")
+    tmp_path.write_bytes(audio)
+    tmp_path.replace(file_path)
+    return name
@@ -17,15 +17,27 @@ urlpatterns = [
     # 위키피디아 API를 통한 저자 대표작 및 정보 가져오기
     path('<int:book_id>/works/', views.author_works_from_wiki),
 
+    # 작가 캐시 적중률 확인 (관리자 전용)
+    path('authors/stats/', views.author_cache_stats),
+
     # TTS 음성 파일 재생성 요청
     path('<int:book_id>/tts/', views.regenerate_tts_audio),
 
     # 도서 좋아요/좋아요 취소 토글
     path('<int:book_id>/like/', views.toggle_book_like),
 
+    # 좋아요 버퍼 대기 건수와 반영 지연 시간 확인 (관리자 전용)
+    path('likes/stats/', views.like_buffer_stats),
+
+    # 인기 도서 (시간 감쇠 점수 순)
+    path('trending/', views.trending_books),
+
     # 사용자의 감상글 및 좋아요 기반 개인화 도서 추천
     path('recommend/personal/', views.personal_recommendation),
 
+    # 개인화 추천 캐시 적중률 확인 (관리자 전용)
+    path('recommend/stats/', views.recommendation_cache_stats),
+
     # MBTI를 기반으로 도서 추천
     path('recommend/mbti/', views.mbti_book_recommendation),
 ]
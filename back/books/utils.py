@@ -1,25 +1,15 @@
 # books/utils.py
 
-import requests, json
-from openai import OpenAI
-from gtts import gTTS
-from pathlib import Path
+import json
 from django.conf import settings
-import wikipediaapi
-from bs4 import BeautifulSoup
-import re
-from urllib.parse import quote
-
-# 한국어 위키백과 접근 객체 생성
-wiki = wikipediaapi.Wikipedia(language='ko', user_agent='BookAI/1.0')
+from llm import cache as llm_cache
+from .author_fetcher import get_fetcher
 
 # 작가 이름을 기반으로 작가 정보, 이미지 URL, 대표작 목록을 반환
+# 문서 요약·이미지·대표작 요청은 공유 연결 풀 위에서 동시에 실행 (books.author_fetcher)
 def get_author_data(author):
-    page = wiki.page(author)
-    if page.exists():
-        summary = page.summary
-        img_url = get_wikipedia_image(author)
-        major_works = extract_major_works_from_wikipedia(author)
+    summary, img_url, major_works = get_fetcher().fetch(author)
+    if summary:
         return summary, img_url, major_works
 
     # 위키백과에 정보가 없을 경우 GPT를 통해 정보 생성
@@ -28,40 +18,15 @@ def get_author_data(author):
 
 # 위키백과 API를 사용하여 작가의 대표 이미지 URL을 가져옴
 def get_wikipedia_image(author):
-    URL = "https://ko.wikipedia.org/w/api.php"
-    params = {
-        "action": "query",
-        "titles": author,
-        "prop": "pageimages",
-        "format": "json",
-        "piprop": "original",
-    }
-    response = requests.get(URL, params=params)
-    if response.ok:
-        pages = response.json().get("query", {}).get("pages", {})
-        for p in pages.values():
-            return p.get("original", {}).get("source")
-    return None
+    return get_fetcher().image(author)
 
 # 위키백과 HTML 파싱을 통해 대표작(《작품명》 형태)을 정규식으로 추출
 def extract_major_works_from_wikipedia(author):
-    encoded_author = quote(author)
-    url = f"https://ko.wikipedia.org/wiki/{encoded_author}"
-    try:
-        res = requests.get(url, timeout=5)
-        if not res.ok:
-            return []
-        soup = BeautifulSoup(res.text, "html.parser")
-        target_area = soup.select_one(".infobox, .infobox-full-data") or soup
-        text = target_area.get_text()
-        works = re.findall(r'《(.*?)》', text)
-        return list(set(works))
-    except Exception as e:
-        print(f"[extract_major_works_from_wikipedia 오류] {author}: {e}")
-        return []
+    return get_fetcher().major_works(author)
 
 # GPT에게 직접 작가 정보 요약을 요청 (위키에 없을 경우 fallback)
-def get_ai_summary_fallback(author):
+# 같은 요청의 응답은 LLM 캐시에서 재사용 (refresh=True면 새로 요청)
+def get_ai_summary_fallback(author, refresh=False):
     prompt = f"""
 '{author}'라는 작가에 대해 아래 두 가지 정보를 요약하여 JSON 형식으로 작성하세요.
 
@@ -76,23 +41,24 @@ def get_ai_summary_fallback(author):
   "author_works": "작품1, 작품2, 작품3"
 }}
 """
-    client = OpenAI(api_key=settings.OPENAI_API_KEY)
-    res = client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
-            {"role": "system", "content": "너는 작가 정보를 요약하는 도우미야."},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0.5,
-        max_tokens=1024,
-    )
     try:
-        return json.loads(res.choices[0].message.content)
-    except Exception:
+        return llm_cache.chat_completion(
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": "너는 작가 정보를 요약하는 도우미야."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.5,
+            max_tokens=1024,
+            parse=json.loads,
+            refresh=refresh,
+        )
+    except (ValueError, TypeError):
         return {"author_info": "정보 없음", "author_works": "정보 없음"}
 
 # 책 정보와 작가 정보를 바탕으로 작가 소개 및 대표작 목록을 GPT로부터 생성
-def call_openai(book_title, author, wiki_summary, major_works=None):
+# 같은 요청의 응답은 LLM 캐시에서 재사용 (refresh=True면 새로 요청)
+def call_openai(book_title, author, wiki_summary, major_works=None, refresh=False):
     works_str = ", ".join(major_works) if major_works else "정보 없음"
     prompt = f"""
 아래 도서 정보를 참고하여 작가에 대한 소개와 대표작 목록을 JSON으로 작성하세요.
@@ -112,25 +78,17 @@ def call_openai(book_title, author, wiki_summary, major_works=None):
   "author_works": "작품1, 작품2, 작품3"
 }}
 """
-    client = OpenAI(api_key=settings.OPENAI_API_KEY)
-    res = client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
-            {"role": "system", "content": "너는 작가 정보를 요약하고 대표작을 추천하는 도우미야."},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0.5,
-        max_tokens=1024,
-    )
     try:
-        return json.loads(res.choices[0].message.content)
-    except Exception:
+        return llm_cache.chat_completion(
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": "너는 작가 정보를 요약하고 대표작을 추천하는 도우미야."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.5,
+            max_tokens=1024,
+            parse=json.loads,
+            refresh=refresh,
+        )
+    except (ValueError, TypeError):
         return {"author_info": "정보 없음", "author_works": "정보 없음"}
-
-# 입력된 텍스트를 gTTS로 변환해 mp3 파일로 저장하고 경로 반환
-def generate_tts_audio(book_id, text):
-    path = Path(settings.MEDIA_ROOT) / "tts"
-    path.mkdir(parents=True, exist_ok=True)
-    file_path = path / f"tts_{book_id}.mp3"
-    gTTS(text=text, lang='ko').save(str(file_path))
-    return f"tts/tts_{book_id}.mp3"
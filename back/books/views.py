@@ -3,14 +3,22 @@
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated
-from django.db.models import Q
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from django.conf import settings
 from rest_framework.generics import get_object_or_404
 
 from .models import Book, Category
-from .serializers import BookSerializer, CategorySerializer
-from .utils import get_author_data, call_openai, generate_tts_audio, get_ai_summary_fallback
-from .recommender import recommend_by_description_similarity, recommend_by_threads_similarity
+from .serializers import BookSerializer, CategorySerializer, book_list_fields
+from .pagination import keyset_page, cursor_page_size, parse_ordering, ranked_page
+from .queries import plan_books
+from .jobs import RENDER_TTS, enqueue_author_enrichment, fill_author_from_cache, request_tts
+from .recommender import RECOMMENDERS, personal_recommendations
+from . import author_cache, recommendation_cache, tts
+from blookin import like_buffer
+from jobs.models import Job
+from jobs.queue import ACTIVE_STATUSES
+from search import engine as search_engine
+from trending import engine as trending
 
 
 # 카테고리 전체 목록 조회
@@ -28,20 +36,37 @@ def book_list_create(request):
         # 검색, 필터, 정렬 조건 처리
         query = request.GET.get('q')
         category_id = request.GET.get('category')
-        ordering = request.GET.get('ordering', 'id')
+        ordering = request.GET.get('ordering')
+
+        fields = book_list_fields(request)
+
+        # 정렬 기준은 검색 여부와 관계없이 같은 허용 목록으로 검사
+        if ordering:
+            try:
+                parse_ordering(ordering)
+            except ValueError as e:
+                return Response({"error": str(e)}, status=400)
 
-        books = Book.objects.all()
         if query:
-            books = books.filter(
-                Q(title__icontains=query) |
-                Q(author__icontains=query) |
-                Q(description__icontains=query)
-            )
+            return book_search(request, query, category_id, ordering, fields)
+
+        books = plan_books(Book.objects.all(), fields)
         if category_id:
             books = books.filter(category_id=category_id)
-        books = books.order_by(ordering)
 
-        serializer = BookSerializer(books, many=True, context={'request': request})
+        # cursor 또는 page_size가 주어지면 keyset 페이지 단위로 {next, results} 응답
+        if 'cursor' in request.GET or 'page_size' in request.GET:
+            try:
+                page_books, next_cursor = keyset_page(
+                    books, ordering, request.GET.get('cursor'), cursor_page_size(request)
+                )
+            except ValueError as e:
+                return Response({"error": str(e)}, status=400)
+            data = BookSerializer(page_books, many=True, fields=fields, context={'request': request}).data
+            return Response({"next": next_cursor, "results": data})
+
+        books = books.order_by(ordering or 'id')
+        serializer = BookSerializer(books, many=True, fields=fields, context={'request': request})
         return Response(serializer.data)
 
     elif request.method == 'POST':
@@ -64,31 +89,64 @@ def book_list_create(request):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+# 검색 인덱스(BM25)로 도서 검색, 정렬 조건이 없으면 관련도 순
+# 페이지 응답은 전체 목록과 같은 {next, results} 형태 (정렬 조건이 있으면 keyset, 관련도 순이면 순위 위치 cursor)
+def book_search(request, query, category_id, ordering, fields):
+    result = search_engine.search('books', query, limit=settings.SEARCH_MAX_RESULTS)
+
+    books = Book.objects.filter(id__in=result.ids)
+    if category_id:
+        books = books.filter(category_id=category_id)
+
+    paged = 'cursor' in request.GET or 'page_size' in request.GET
+    if ordering and paged:
+        try:
+            page_books, next_cursor = keyset_page(
+                plan_books(books, fields), ordering, request.GET.get('cursor'), cursor_page_size(request)
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=400)
+        data = BookSerializer(page_books, many=True, fields=fields, context={'request': request}).data
+        return Response({"next": next_cursor, "results": data})
+
+    if ordering:
+        book_ids = list(books.order_by(ordering).values_list('id', flat=True))
+    else:
+        matched = set(books.values_list('id', flat=True))
+        book_ids = [book_id for book_id in result.ids if book_id in matched]
+
+    next_cursor = None
+    if paged:
+        try:
+            book_ids, next_cursor = ranked_page(book_ids, request.GET.get('cursor'), cursor_page_size(request))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=400)
+
+    position = {book_id: i for i, book_id in enumerate(book_ids)}
+    page_books = plan_books(Book.objects.filter(id__in=book_ids), fields)
+    page_books = sorted(page_books, key=lambda book: position[book.id])
+    data = BookSerializer(page_books, many=True, fields=fields, context={'request': request}).data
+    if paged:
+        return Response({"next": next_cursor, "results": data})
+    return Response(data)
+
+
 # 도서 상세 정보 조회, 수정, 삭제 (GET, PUT, DELETE)
 @api_view(['GET', 'PUT', 'DELETE'])
 def book_detail_update_delete(request, book_id):
-    book = get_object_or_404(Book, pk=book_id)
+    books = plan_books(Book.objects.all()) if request.method == 'GET' else Book.objects.all()
+    book = get_object_or_404(books, pk=book_id)
 
     if request.method == 'GET':
-        # 작가 정보가 없을 경우 AI를 통해 보완
-        if not book.author_info or not book.author_works:
-            try:
-                print(f"[AI 처리] {book.title} / {book.author}")
-                summary, _, major_works = get_author_data(book.author)
-                if not summary:
-                    gpt_result = get_ai_summary_fallback(book.author)
-                    book.author_info = gpt_result.get("author_info")
-                    book.author_works = gpt_result.get("author_works")
-                else:
-                    gpt_result = call_openai(book.title, book.author, summary, major_works)
-                    book.author_info = gpt_result.get("author_info")
-                    book.author_works = gpt_result.get("author_works")
-                book.save()
-            except Exception as e:
-                print(f"[GPT 처리 실패] {book.title}: {e}")
+        # 작가 정보가 없을 경우 작가 캐시를 먼저 확인하고, 없으면 백그라운드 작업으로 AI 보완을 요청하고 바로 응답
+        # (enrichment_status가 'enriching'이면 잠시 후 다시 조회)
+        if (not book.author_info or not book.author_works) and not fill_author_from_cache(book):
+            enrichment_status = enqueue_author_enrichment(book)
+        else:
+            enrichment_status = 'ready'
 
         serializer = BookSerializer(book, context={'request': request})
-        return Response(serializer.data)
+        return Response({**serializer.data, 'enrichment_status': enrichment_status})
 
     elif request.method == 'PUT':
         serializer = BookSerializer(book, data=request.data)
@@ -103,29 +161,37 @@ def book_detail_update_delete(request, book_id):
 
 
 # 위키 기반 작가 대표작 추출 API
+# 위키백과 문서가 없거나 조회에 실패하면 캐시된 대표작(없으면 빈 목록)으로 응답하고
+# GPT 정리는 작가 정보 보완 작업으로 넘김
 @api_view(['GET'])
 def author_works_from_wiki(request, book_id):
     book = get_object_or_404(Book, pk=book_id)
-    works = get_author_data(book.author)[2]
+    summary, _, works = author_cache.author_data(book.author)
+    if not summary and not (book.author_info and book.author_works):
+        enqueue_author_enrichment(book)
     return Response({"author": book.author, "works": works})
 
 
-# TTS 오디오 파일 재생성 요청 API
-@api_view(['POST'])
+# 도서 소개 음성 상태 조회(GET) 및 생성 요청(POST)
+# 도서 정보가 바뀌지 않았다면 기존 음성을 그대로 사용하고, 새로 만들어야 하면 백그라운드 작업으로 합성 후 202 응답
+# (tts_status가 'rendering'이면 GET으로 다시 조회)
+@api_view(['GET', 'POST'])
 def regenerate_tts_audio(request, book_id):
     book = get_object_or_404(Book, pk=book_id)
-    text = f"{book.title} / {book.author_info} / {book.author_works}"
-    audio_path = generate_tts_audio(book.pk, text)
 
-    if audio_path:
-        book.tts_audio.name = audio_path
-        book.save()
-        return Response({
-            "message": "TTS 오디오 생성 성공",
-            "tts_audio": book.tts_audio.url
-        }, status=200)
+    if request.method == 'POST':
+        tts_status = request_tts(book)
+    elif tts.exists(book.tts_audio.name) and book.tts_audio.name == tts.audio_name(tts.book_text(book)):
+        tts_status = 'ready'
+    elif Job.objects.filter(name=RENDER_TTS, key=f'book:{book.pk}', status__in=ACTIVE_STATUSES).exists():
+        tts_status = 'rendering'
+    else:
+        tts_status = 'missing'
 
-    return Response({"error": "TTS 생성 실패"}, status=500)
+    return Response({
+        "tts_status": tts_status,
+        "tts_audio": book.tts_audio.url if tts_status == 'ready' else None,
+    }, status=status.HTTP_202_ACCEPTED if tts_status == 'rendering' else status.HTTP_200_OK)
 
 
 # 도서 좋아요 토글 기능 (로그인 필요)
@@ -133,37 +199,69 @@ def regenerate_tts_audio(request, book_id):
 @permission_classes([IsAuthenticated])
 def toggle_book_like(request, book_id):
     book = get_object_or_404(Book, pk=book_id)
-    user = request.user
 
-    if book.liked_users.filter(pk=user.pk).exists():
-        book.liked_users.remove(user)
-        liked = False
-    else:
-        book.liked_users.add(user)
-        liked = True
+    # 좋아요 버퍼에 기록하고 바로 응답 (DB에는 주기적으로 모아서 반영, blookin.like_buffer)
+    liked, likes_count = like_buffer.toggle(book, request.user.pk)
 
     return Response({
         "liked": liked,
-        "likes_count": book.liked_users.count(),
+        "likes_count": likes_count,
     })
 
 
-# 개인화 추천 (좋아요 기반 또는 감상글 기반)
+# 개인화 추천 (좋아요 기반, 감상글 기반 또는 협업 필터링)
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def personal_recommendation(request):
     user = request.user
     rec_type = request.GET.get('type', 'likes')  # 기본값은 'likes'
 
-    if rec_type == 'threads':
-        recommended_books = recommend_by_threads_similarity(user)
-    elif rec_type == 'likes':
-        recommended_books = recommend_by_description_similarity(user)
+    if rec_type not in RECOMMENDERS:
+        return Response({"error": "type은 likes, threads, cf 중 하나여야 합니다."}, status=400)
+
+    recommended_books = plan_books(personal_recommendations(user, rec_type))
 
     serializer = BookSerializer(recommended_books, many=True, context={'request': request})
     return Response(serializer.data)
 
 
+# 인기 도서 (좋아요·감상글 이벤트의 시간 감쇠 점수 순, 미리 계산한 순위 스냅숏에서 조회)
+@api_view(['GET'])
+def trending_books(request):
+    try:
+        limit = min(max(int(request.GET.get('limit', 20)), 1), settings.TRENDING_SIZE)
+    except ValueError:
+        return Response({"error": "limit은 정수여야 합니다."}, status=400)
+
+    book_ids = trending.top('books', limit)
+    fields = book_list_fields(request)
+    position = {book_id: i for i, book_id in enumerate(book_ids)}
+    books = sorted(plan_books(Book.objects.filter(id__in=book_ids), fields), key=lambda book: position[book.id])
+    serializer = BookSerializer(books, many=True, fields=fields, context={'request': request})
+    return Response(serializer.data)
+
+
+# 개인화 추천 캐시 적중/실패 통계 (관리자 전용)
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def recommendation_cache_stats(request):
+    return Response(recommendation_cache.stats())
+
+
+# 작가 캐시 적중률과 절약한 외부 호출 수 (관리자 전용)
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def author_cache_stats(request):
+    return Response(author_cache.stats())
+
+
+# 좋아요 버퍼의 대기 건수와 DB 반영 지연 시간 (관리자 전용)
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def like_buffer_stats(request):
+    return Response(like_buffer.stats())
+
+
 # MBTI 기반 도서 추천
 @api_view(['GET'])
 def mbti_book_recommendation(request):
@@ -259,7 +357,7 @@ def mbti_book_recommendation(request):
     #         return Response(serializer.data)
 
     # 기본: Content-based (카테고리 기반 추천, 랜덤 5권)
-    books = Book.objects.filter(category_id__in=category_ids).order_by('?')[:6]
+    books = plan_books(Book.objects.filter(category_id__in=category_ids)).order_by('?')[:6]
     serializer = BookSerializer(books, many=True, context={"request": request})
 
     return Response({
@@ -0,0 +1,14 @@
+# jobs/apps.py
+
+from django.apps import AppConfig
+
+
+class JobsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'jobs'
+
+    # 각 앱의 jobs 모듈을 불러와 작업 함수를 등록
+    def ready(self):
+        from django.utils.module_loading import autodiscover_modules
+
+        autodiscover_modules('jobs')
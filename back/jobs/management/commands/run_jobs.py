@@ -0,0 +1,88 @@
+# jobs/management/commands/run_jobs.py
+
+import os
+import socket
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+
+from jobs import queue
+
+
+def _init_process():
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+
+# 프로세스 풀 워커: Ctrl+C로 종료되면 그때까지 처리한 수를 반환
+def _process_worker(worker_id, names, burst, poll_interval):
+    try:
+        return queue.work(worker_id, names, burst=burst, poll_interval=poll_interval)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        connection.close()
+
+
+# DB 작업 큐를 처리하는 워커 (스레드 또는 프로세스 풀)
+class Command(BaseCommand):
+    help = "DB 작업 큐의 대기 작업을 처리하는 워커를 실행합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=settings.JOBS_WORKERS, help="동시에 실행할 워커 수")
+        parser.add_argument('--pool', choices=['thread', 'process'], default=settings.JOBS_POOL, help="워커 풀 종류")
+        parser.add_argument('--names', default='', help="처리할 작업 이름 (쉼표 구분, 기본은 전체)")
+        parser.add_argument('--burst', action='store_true', help="대기 작업을 모두 처리하면 종료")
+        parser.add_argument('--poll-interval', type=float, default=settings.JOBS_POLL_INTERVAL, help="대기 작업이 없을 때 확인 간격(초)")
+
+    def handle(self, *args, **options):
+        names = [name.strip() for name in options['names'].split(',') if name.strip()] or None
+        workers = max(options['workers'], 1)
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+
+        requeued = queue.requeue_stale()
+        if requeued:
+            self.stdout.write(f"오래 실행 중이던 작업 {requeued}개를 다시 대기 상태로 변경")
+        self.stdout.write(f"워커 {workers}개 시작 ({options['pool']} 풀)")
+
+        if options['pool'] == 'process':
+            processed = self._run_processes(prefix, workers, names, options)
+        else:
+            processed = self._run_threads(prefix, workers, names, options)
+        self.stdout.write(self.style.SUCCESS(f"처리한 작업 {processed}개"))
+
+    def _run_threads(self, prefix, workers, names, options):
+        stop = threading.Event()
+
+        def worker(n):
+            try:
+                return queue.work(f"{prefix}:t{n}", names, options['burst'], options['poll_interval'], stop)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job-worker') as pool:
+            futures = [pool.submit(worker, n) for n in range(workers)]
+            try:
+                return sum(future.result() for future in futures)
+            except KeyboardInterrupt:
+                # 실행 중인 작업은 마치고 종료
+                stop.set()
+                return sum(future.result() for future in futures)
+
+    def _run_processes(self, prefix, workers, names, options):
+        # 포크 전에 DB 연결을 닫아 자식 프로세스와 공유되지 않도록 함
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_process) as pool:
+            futures = [
+                pool.submit(_process_worker, f"{prefix}:p{n}", names, options['burst'], options['poll_interval'])
+                for n in range(workers)
+            ]
+            try:
+                return sum(future.result() for future in futures)
+            except KeyboardInterrupt:
+                return 0
@@ -0,0 +1,62 @@
+# jobs/models.py
+
+from django.db import models
+from django.utils import timezone
+
+
+# DB 테이블 기반 백그라운드 작업 (manage.py run_jobs 워커가 처리)
+class Job(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, '대기'),
+        (RUNNING, '실행 중'),
+        (DONE, '완료'),
+        (FAILED, '실패'),
+    )
+
+    # 등록된 작업 함수 이름 (예: 'books.enrich_author')
+    name = models.CharField(max_length=100)
+
+    # 중복 방지 키 (예: 'book:12'), 같은 이름·키의 작업은 대기/실행 중인 것이 하나만 존재
+    # 키가 없으면(NULL) 중복 검사를 하지 않음
+    key = models.CharField(max_length=200, null=True, blank=True)
+
+    # 작업 함수에 전달할 인자
+    payload = models.JSONField(default=dict, blank=True)
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+
+    # 실행 횟수와 최대 시도 횟수 (실패 시 지수 백오프 후 재시도)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+
+    # 이 시각 이후에 실행 (재시도 대기)
+    run_after = models.DateTimeField(default=timezone.now)
+
+    # 실행 중인 워커 식별자와 실행 시작/종료 시각
+    locked_by = models.CharField(max_length=100, blank=True, default='')
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    # 마지막 실패 메시지
+    last_error = models.TextField(blank=True, default='')
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='job_status_run_after_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['name', 'key'],
+                condition=models.Q(status__in=['pending', 'running']),
+                name='unique_active_job',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name}({self.key}) [{self.status}]"
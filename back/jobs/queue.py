@@ -0,0 +1,174 @@
+# jobs/queue.py
+
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.lookups import LessThan
+from django.utils import timezone
+
+from .models import Job
+from .registry import FAILURE_HANDLERS, get
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = (Job.PENDING, Job.RUNNING)
+
+
+# 작업 등록, 같은 이름·키의 작업이 이미 대기/실행 중이면 새로 만들지 않고 기존 작업 반환
+# 반환값: (작업, 새로 등록했는지 여부)
+def enqueue(name, key=None, payload=None, max_attempts=None):
+    get(name)
+    for _ in range(3):
+        if key is not None:
+            existing = Job.objects.filter(name=name, key=key, status__in=ACTIVE_STATUSES).first()
+            if existing:
+                return existing, False
+        try:
+            with transaction.atomic():
+                job = Job.objects.create(
+                    name=name, key=key, payload=payload or {},
+                    max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS,
+                )
+            return job, True
+        except IntegrityError:
+            # 동시에 같은 작업을 등록한 요청이 있으면 그 작업을 다시 조회
+            continue
+    return Job.objects.get(name=name, key=key, status__in=ACTIVE_STATUSES), False
+
+
+# 같은 이름의 작업 여러 개를 한 번에 등록 (jobs: (키, payload) 목록)
+# 이미 대기/실행 중인 키는 건너뛰고, 나머지는 bulk_create로 한 번에 INSERT
+# 반환값: 새로 등록한 작업 수
+def enqueue_many(name, jobs, max_attempts=None):
+    get(name)
+    jobs = dict(jobs)
+    if not jobs:
+        return 0
+    active = set(
+        Job.objects.filter(name=name, key__in=list(jobs), status__in=ACTIVE_STATUSES).values_list('key', flat=True)
+    )
+    new_jobs = [
+        Job(name=name, key=key, payload=payload or {}, max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS)
+        for key, payload in jobs.items()
+        if key not in active
+    ]
+    # 조회와 INSERT 사이에 다른 요청이 같은 키를 등록했다면 unique_active_job 제약으로 무시됨
+    Job.objects.bulk_create(new_jobs, batch_size=500, ignore_conflicts=True)
+    return len(new_jobs)
+
+
+# 같은 이름·키의 작업이 최근 seconds초 안에 최종 실패했는지 (실패한 작업을 요청마다 다시 등록하지 않도록)
+def recently_failed(name, key, seconds):
+    since = timezone.now() - timedelta(seconds=seconds)
+    return Job.objects.filter(name=name, key=key, status=Job.FAILED, finished_at__gte=since).exists()
+
+
+# settings.JOBS_CONCURRENCY({작업 이름: 최대 동시 실행 수})에서 이미 한도만큼 실행 중인 작업 이름
+def _saturated_names():
+    limits = settings.JOBS_CONCURRENCY
+    if not limits:
+        return []
+    running = dict(
+        Job.objects.filter(name__in=limits, status=Job.RUNNING)
+        .values('name').annotate(count=Count('*')).values_list('name', 'count')
+    )
+    return [name for name, limit in limits.items() if running.get(name, 0) >= limit]
+
+
+# 선점 UPDATE에 붙이는 조건: 같은 이름의 실행 중인 작업이 한도보다 적을 때만 선점
+def _under_limit(name):
+    limit = settings.JOBS_CONCURRENCY.get(name)
+    if limit is None:
+        return []
+    running = (
+        Job.objects.filter(name=OuterRef('name'), status=Job.RUNNING)
+        .order_by().values('name').annotate(count=Count('*')).values('count')
+    )
+    return [LessThan(Coalesce(Subquery(running), 0), limit)]
+
+
+# 실행할 차례인 대기 작업 하나를 선점 (상태 조건부 UPDATE로 워커 간 중복 실행 방지)
+# 동시 실행 수 한도가 있는 작업은 한도에 도달하면 건너뛰어 다른 작업이 워커를 쓸 수 있게 함
+def claim(worker_id, names=None):
+    now = timezone.now()
+    candidates = Job.objects.filter(status=Job.PENDING, run_after__lte=now)
+    if names:
+        candidates = candidates.filter(name__in=names)
+    saturated = _saturated_names()
+    if saturated:
+        candidates = candidates.exclude(name__in=saturated)
+
+    for job_id, name in candidates.order_by('run_after', 'id').values_list('id', 'name')[:10]:
+        claimed = Job.objects.filter(pk=job_id, status=Job.PENDING).filter(*_under_limit(name)).update(
+            status=Job.RUNNING, locked_by=worker_id, started_at=now, attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return Job.objects.get(pk=job_id)
+    return None
+
+
+# 작업 실행 후 결과 기록, 실패하면 시도 횟수에 따라 지수 백오프로 재시도하거나 실패 처리
+def run(job):
+    try:
+        get(job.name)(job.payload)
+    except Exception as e:
+        logger.exception("작업 실패: %s", job)
+        now = timezone.now()
+        if job.attempts >= job.max_attempts:
+            Job.objects.filter(pk=job.pk).update(status=Job.FAILED, finished_at=now, last_error=repr(e))
+            on_failure = FAILURE_HANDLERS.get(job.name)
+            if on_failure is not None:
+                try:
+                    on_failure(job.payload, e)
+                except Exception:
+                    logger.exception("작업 실패 처리 중 오류: %s", job)
+        else:
+            delay = settings.JOBS_RETRY_BACKOFF * 2 ** (job.attempts - 1)
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.PENDING, run_after=now + timedelta(seconds=delay), locked_by='', last_error=repr(e),
+            )
+        return False
+
+    Job.objects.filter(pk=job.pk).update(status=Job.DONE, finished_at=timezone.now(), last_error='')
+    return True
+
+
+# 워커가 비정상 종료되어 오래 실행 중으로 남은 작업을 다시 대기 상태로 되돌림
+def requeue_stale():
+    since = timezone.now() - timedelta(seconds=settings.JOBS_STALE_AFTER)
+    return Job.objects.filter(status=Job.RUNNING, started_at__lt=since).update(status=Job.PENDING, locked_by='')
+
+
+# 워커 루프: 작업을 하나씩 선점해 실행, burst이면 대기 작업이 없을 때 종료
+# 오래 실행되는 워커이므로 매 작업 전에 끊어졌거나 오래된 DB 연결을 정리
+# 반환값: 처리한 작업 수
+def work(worker_id, names=None, burst=False, poll_interval=None, stop=None):
+    poll_interval = settings.JOBS_POLL_INTERVAL if poll_interval is None else poll_interval
+    processed = 0
+    while stop is None or not stop.is_set():
+        close_old_connections()
+        job = claim(worker_id, names)
+        if job is None:
+            if burst:
+                break
+            time.sleep(poll_interval)
+            continue
+        run(job)
+        processed += 1
+    return processed
+
+
+# 현재 프로세스에서 실행할 차례인 작업을 모두 처리 (테스트, 관리 명령용, DB 연결은 건드리지 않음)
+def run_pending(names=None):
+    processed = 0
+    while True:
+        job = claim('inline', names)
+        if job is None:
+            return processed
+        run(job)
+        processed += 1
@@ -0,0 +1,24 @@
+# jobs/registry.py
+
+# 이름 → 작업 함수 (payload dict를 인자로 받음)
+TASKS = {}
+
+# 이름 → 최종 실패 시 호출할 함수 (payload, 마지막 예외를 인자로 받음)
+FAILURE_HANDLERS = {}
+
+
+# 작업 함수 등록 데코레이터
+# @task('books.enrich_author')
+# def enrich_author(payload): ...
+# on_failure: 재시도를 모두 실패했을 때 호출 (예: 상태 필드를 'failed'로 변경)
+def task(name, on_failure=None):
+    def register(func):
+        TASKS[name] = func
+        if on_failure is not None:
+            FAILURE_HANDLERS[name] = on_failure
+        return func
+    return register
+
+
+def get(name):
+    return TASKS[name]
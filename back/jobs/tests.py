@@ -0,0 +1,116 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from . import queue
+from .models import Job
+from .registry import TASKS, task
+
+CALLS = []
+FAILURES = []
+
+
+@task('tests.record')
+def record(payload):
+    CALLS.append(payload)
+
+
+@task('tests.fail', on_failure=lambda payload, error: FAILURES.append((payload, str(error))))
+def fail(payload):
+    raise RuntimeError('boom')
+
+
+@override_settings(JOBS_MAX_ATTEMPTS=2, JOBS_RETRY_BACKOFF=30)
+class JobQueueTestCase(TestCase):
+    def setUp(self):
+        CALLS.clear()
+        FAILURES.clear()
+
+    def test_enqueue_deduplicates_active_jobs(self):
+        job, created = queue.enqueue('tests.record', key='a', payload={'n': 1})
+        again, created_again = queue.enqueue('tests.record', key='a', payload={'n': 2})
+        self.assertTrue(created)
+        self.assertFalse(created_again)
+        self.assertEqual(job.pk, again.pk)
+
+        # 키가 없는 작업은 중복 검사를 하지 않음
+        queue.enqueue('tests.record')
+        queue.enqueue('tests.record')
+        self.assertEqual(Job.objects.count(), 3)
+
+        self.assertEqual(queue.run_pending(), 3)
+        self.assertEqual(CALLS[0], {'n': 1})
+
+        # 완료된 뒤에는 같은 키로 다시 등록 가능
+        _, created = queue.enqueue('tests.record', key='a')
+        self.assertTrue(created)
+
+    def test_enqueue_many(self):
+        queue.enqueue('tests.record', key='a', payload={'n': 0})
+        created = queue.enqueue_many('tests.record', [('a', {'n': 1}), ('b', {'n': 2}), ('c', None)])
+        self.assertEqual(created, 2)
+        self.assertEqual(Job.objects.filter(name='tests.record').count(), 3)
+        self.assertEqual(queue.enqueue_many('tests.record', []), 0)
+
+        self.assertEqual(queue.run_pending(), 3)
+        self.assertEqual(sorted(call.get('n', -1) for call in CALLS), [-1, 0, 2])
+
+    def test_unknown_task(self):
+        with self.assertRaises(KeyError):
+            queue.enqueue('tests.missing')
+        self.assertNotIn('tests.missing', TASKS)
+
+    def test_retry_with_backoff_then_fail(self):
+        job, _ = queue.enqueue('tests.fail', key='x')
+        with self.assertLogs('jobs.queue', 'ERROR'):
+            self.assertEqual(queue.run_pending(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.PENDING)
+        self.assertEqual(job.attempts, 1)
+        self.assertGreater(job.run_after, timezone.now() + timedelta(seconds=25))
+        self.assertIn('boom', job.last_error)
+
+        # 재시도 시각 전에는 실행되지 않음
+        self.assertEqual(queue.run_pending(), 0)
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        with self.assertLogs('jobs.queue', 'ERROR'):
+            queue.run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.attempts, 2)
+        self.assertTrue(queue.recently_failed('tests.fail', 'x', 60))
+        # 최종 실패 시에만 실패 처리 함수 호출
+        self.assertEqual(FAILURES, [({}, 'boom')])
+
+    def test_claim_is_exclusive(self):
+        queue.enqueue('tests.record', key='only')
+        first = queue.claim('w1')
+        self.assertIsNotNone(first)
+        self.assertIsNone(queue.claim('w2'))
+
+    @override_settings(JOBS_STALE_AFTER=60)
+    def test_requeue_stale(self):
+        queue.enqueue('tests.record', key='stale')
+        job = queue.claim('w1')
+        Job.objects.filter(pk=job.pk).update(started_at=timezone.now() - timedelta(minutes=5))
+        self.assertEqual(queue.requeue_stale(), 1)
+        self.assertEqual(queue.run_pending(), 1)
+        self.assertEqual(len(CALLS), 1)
+
+    # 동시 실행 수 한도에 도달한 작업은 건너뛰고 다른 작업을 선점
+    @override_settings(JOBS_CONCURRENCY={'tests.fail': 1})
+    def test_concurrency_limit(self):
+        queue.enqueue('tests.fail', key='1')
+        queue.enqueue('tests.fail', key='2')
+        queue.enqueue('tests.record', key='3')
+
+        first = queue.claim('w1')
+        self.assertEqual(first.key, '1')
+        self.assertEqual(queue.claim('w2').key, '3')
+        self.assertIsNone(queue.claim('w3'))
+
+        with self.assertLogs('jobs.queue', 'ERROR'):
+            queue.run(first)
+        self.assertEqual(queue.claim('w3').key, '2')
@@ -0,0 +1,8 @@
+# llm/apps.py
+
+from django.apps import AppConfig
+
+
+class LlmConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'llm'
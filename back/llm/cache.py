@@ -0,0 +1,124 @@
+# llm/cache.py
+
+import hashlib
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import F, Sum
+from django.utils import timezone
+from openai import OpenAI
+
+from .models import CachedCompletion
+
+logger = logging.getLogger(__name__)
+
+# 현재 프로세스의 캐시 적중/실패 횟수와 캐시로 아낀 API 호출 시간(ms)
+_stats = {'hits': 0, 'misses': 0, 'saved_ms': 0.0}
+_stats_lock = threading.Lock()
+
+
+# 요청 내용이 같으면 같은 키 (메시지 순서와 내용, 모델, 샘플링 옵션 포함)
+def cache_key(model, messages, temperature, max_tokens):
+    raw = json.dumps(
+        {'model': model, 'messages': messages, 'temperature': temperature, 'max_tokens': max_tokens},
+        ensure_ascii=False, sort_keys=True,
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _record(hit, saved_ms=0.0):
+    with _stats_lock:
+        _stats['hits' if hit else 'misses'] += 1
+        _stats['saved_ms'] += saved_ms
+        total = _stats['hits'] + _stats['misses']
+        return _stats['hits'] / total, _stats['saved_ms']
+
+
+def stats():
+    with _stats_lock:
+        total = _stats['hits'] + _stats['misses']
+        return {
+            **_stats,
+            'hit_rate': round(_stats['hits'] / total, 4) if total else 0.0,
+            'entries': CachedCompletion.objects.count(),
+        }
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.update(hits=0, misses=0, saved_ms=0.0)
+
+
+# 전체 응답 크기가 LLM_CACHE_MAX_BYTES를 넘으면 오래 사용되지 않은 항목부터 삭제 (상한의 90%까지)
+def _evict():
+    limit = settings.LLM_CACHE_MAX_BYTES
+    total = CachedCompletion.objects.aggregate(total=Sum('size'))['total'] or 0
+    if total <= limit:
+        return
+
+    target = total - int(limit * 0.9)
+    evicted = []
+    for pk, size in CachedCompletion.objects.order_by('last_used_at').values_list('pk', 'size').iterator():
+        if target <= 0:
+            break
+        evicted.append(pk)
+        target -= size
+    CachedCompletion.objects.filter(pk__in=evicted).delete()
+    logger.info("[LLM 캐시] 용량 초과로 %d개 항목 삭제", len(evicted))
+
+
+def _store(key, model, content, latency_ms):
+    values = {
+        'model': model, 'response': content, 'size': len(content.encode()),
+        'latency_ms': latency_ms, 'last_used_at': timezone.now(),
+    }
+    try:
+        CachedCompletion.objects.update_or_create(key=key, defaults=values)
+    except IntegrityError:
+        # 같은 요청이 동시에 저장된 경우 먼저 저장된 응답을 사용
+        pass
+    _evict()
+
+
+# chat.completions.create의 캐시 버전, 응답 본문(choices[0].message.content)을 parse로 변환해 반환
+# 같은 (모델, 메시지, temperature, max_tokens) 요청은 API를 다시 호출하지 않음
+# refresh=True면 캐시를 무시하고 새로 호출해 저장, parse가 실패한 응답은 저장하지 않음
+def chat_completion(model, messages, temperature, max_tokens, parse=None, refresh=False):
+    parse = parse or (lambda content: content)
+    if not settings.LLM_CACHE_ENABLED:
+        res = OpenAI(api_key=settings.OPENAI_API_KEY).chat.completions.create(
+            model=model, messages=messages, temperature=temperature, max_tokens=max_tokens,
+        )
+        return parse(res.choices[0].message.content)
+
+    key = cache_key(model, messages, temperature, max_tokens)
+    if not refresh:
+        cached = CachedCompletion.objects.filter(key=key).first()
+        if cached is not None:
+            CachedCompletion.objects.filter(pk=cached.pk).update(hits=F('hits') + 1, last_used_at=timezone.now())
+            hit_rate, saved_ms = _record(True, cached.latency_ms)
+            logger.info(
+                "[LLM 캐시] 적중 %s (%.0fms 절약, 적중률 %.1f%%, 누적 %.1f초 절약)",
+                model, cached.latency_ms, hit_rate * 100, saved_ms / 1000,
+            )
+            return parse(cached.response)
+
+    started = time.perf_counter()
+    res = OpenAI(api_key=settings.OPENAI_API_KEY).chat.completions.create(
+        model=model, messages=messages, temperature=temperature, max_tokens=max_tokens,
+    )
+    latency_ms = (time.perf_counter() - started) * 1000
+    content = res.choices[0].message.content
+    result = parse(content)
+
+    _store(key, model, content, latency_ms)
+    hit_rate, _ = _record(False)
+    logger.info(
+        "[LLM 캐시] %s %s (%.0fms, 적중률 %.1f%%)",
+        '갱신' if refresh else '실패', model, latency_ms, hit_rate * 100,
+    )
+    return result
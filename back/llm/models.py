@@ -0,0 +1,30 @@
+# llm/models.py
+
+from django.db import models
+from django.utils import timezone
+
+
+# GPT 응답 캐시 항목 (요청 내용의 해시로 조회, llm.cache 참고)
+class CachedCompletion(models.Model):
+    # sha256(model, messages, temperature, max_tokens)
+    key = models.CharField(max_length=64, unique=True)
+
+    model = models.CharField(max_length=50)
+
+    # 응답 본문 (choices[0].message.content)
+    response = models.TextField()
+
+    # 응답 크기(바이트), 원래 API 호출에 걸린 시간(ms)
+    size = models.PositiveIntegerField(default=0)
+    latency_ms = models.FloatField(default=0)
+
+    # 캐시로 응답한 횟수
+    hits = models.PositiveIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    # 마지막 사용 시각 (용량 초과 시 오래 사용되지 않은 항목부터 삭제)
+    last_used_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"{self.model} / {self.key[:12]}"
@@ -0,0 +1,82 @@
+import json
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from books.utils import call_openai
+from . import cache
+from .models import CachedCompletion
+
+MESSAGES = [{"role": "user", "content": "안녕"}]
+
+
+def completion(content):
+    res = mock.Mock()
+    res.choices = [mock.Mock(message=mock.Mock(content=content))]
+    return res
+
+
+# OpenAI 클라이언트를 스텁으로 대체하고 요청마다 다른 응답을 반환
+class LLMCacheTestCase(TestCase):
+    def setUp(self):
+        patcher = mock.patch('llm.cache.OpenAI')
+        client_class = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.create = client_class.return_value.chat.completions.create
+        self.create.side_effect = lambda **kwargs: completion(f'응답 {self.create.call_count}')
+        cache.reset_stats()
+
+    def test_identical_request_is_served_from_cache(self):
+        with self.assertLogs('llm.cache', 'INFO') as logs:
+            first = cache.chat_completion('gpt-4o', MESSAGES, 0.5, 100)
+            second = cache.chat_completion('gpt-4o', MESSAGES, 0.5, 100)
+        self.assertIn('적중률 50.0%', logs.output[-1])
+        self.assertEqual(first, '응답 1')
+        self.assertEqual(second, '응답 1')
+        self.assertEqual(self.create.call_count, 1)
+
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['hit_rate']), (1, 1, 0.5))
+        self.assertEqual(CachedCompletion.objects.get().hits, 1)
+
+    def test_key_includes_sampling_options(self):
+        cache.chat_completion('gpt-4o', MESSAGES, 0.5, 100)
+        cache.chat_completion('gpt-4o', MESSAGES, 0.7, 100)
+        cache.chat_completion('gpt-4o', MESSAGES, 0.5, 200)
+        cache.chat_completion('gpt-4o-mini', MESSAGES, 0.5, 100)
+        self.assertEqual(self.create.call_count, 4)
+
+    def test_refresh_bypasses_and_replaces_entry(self):
+        cache.chat_completion('gpt-4o', MESSAGES, 0.5, 100)
+        self.assertEqual(cache.chat_completion('gpt-4o', MESSAGES, 0.5, 100, refresh=True), '응답 2')
+        self.assertEqual(cache.chat_completion('gpt-4o', MESSAGES, 0.5, 100), '응답 2')
+        self.assertEqual(CachedCompletion.objects.count(), 1)
+
+    def test_unparsable_response_is_not_stored(self):
+        with self.assertRaises(ValueError):
+            cache.chat_completion('gpt-4o', MESSAGES, 0.5, 100, parse=json.loads)
+        self.assertFalse(CachedCompletion.objects.exists())
+
+    @override_settings(LLM_CACHE_MAX_BYTES=32)
+    def test_least_recently_used_entries_are_evicted(self):
+        # 응답 하나는 8바이트 ('응답 N'), 다섯 번째 응답 저장 시 가장 오래 사용되지 않은 두 항목 삭제
+        for i in range(4):
+            cache.chat_completion('gpt-4o', [{"role": "user", "content": str(i)}], 0.5, 100)
+        cache.chat_completion('gpt-4o', [{"role": "user", "content": '0'}], 0.5, 100)
+        cache.chat_completion('gpt-4o', [{"role": "user", "content": '4'}], 0.5, 100)
+
+        remaining = set(CachedCompletion.objects.values_list('response', flat=True))
+        self.assertEqual(remaining, {'응답 1', '응답 4', '응답 5'})
+
+    def test_call_openai_reuses_cached_response(self):
+        self.create.side_effect = lambda **kwargs: completion('{"author_info": "소개", "author_works": "작품"}')
+        for _ in range(3):
+            result = call_openai('도서', '저자', '요약', ['작품'])
+        self.assertEqual(result['author_info'], '소개')
+        self.assertEqual(self.create.call_count, 1)
+
+    @override_settings(LLM_CACHE_ENABLED=False)
+    def test_disabled_cache_always_calls_api(self):
+        cache.chat_completion('gpt-4o', MESSAGES, 0.5, 100)
+        cache.chat_completion('gpt-4o', MESSAGES, 0.5, 100)
+        self.assertEqual(self.create.call_count, 2)
@@ -0,0 +1,19 @@
+# search/apps.py
+
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'search'
+
+    # 각 앱의 search_indexes 모듈을 불러와 검색 인덱스를 등록하고 변경 시그널 연결
+    def ready(self):
+        from django.db.models.signals import post_migrate
+        from django.utils.module_loading import autodiscover_modules
+        from .registry import connect_signals
+        from . import engine
+
+        autodiscover_modules('search_indexes')
+        connect_signals()
+        post_migrate.connect(engine.on_post_migrate, sender=self, dispatch_uid='search_post_migrate')
@@ -0,0 +1,252 @@
+# search/engine.py
+
+import math
+from collections import Counter, defaultdict, namedtuple
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from .models import SearchDocument, SearchPosting
+from .registry import INDEXES, get
+from .tokenizer import HANGUL_RUN, TOKEN_RUN, tokenize
+
+# 검색 결과: 순위순 문서 ID, 점수(클수록 관련도 높음), 전체 일치 문서 수
+SearchResult = namedtuple('SearchResult', ['ids', 'scores', 'total'])
+
+
+# 필드별 토큰을 가중치를 곱한 빈도로 합산
+def weighted_terms(index, fields):
+    terms = Counter()
+    for field, weight in index.fields.items():
+        for token in tokenize(fields.get(field, '')):
+            terms[token] += weight
+    return terms
+
+
+# SQLite FTS5 가상 테이블 기반 백엔드 (토큰화는 파이썬에서 하고 공백으로 이어 저장)
+class FTS5Backend:
+    name = 'fts5'
+
+    @staticmethod
+    def table(index):
+        return f'search_fts_{index.name}'
+
+    def ensure_schema(self, index):
+        columns = ', '.join(index.fields)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table(index)} "
+                f"USING fts5({columns}, tokenize='unicode61 remove_diacritics 0')"
+            )
+
+    def count(self, index):
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT count(*) FROM {self.table(index)}")
+            return cursor.fetchone()[0]
+
+    def update(self, index, documents):
+        columns = list(index.fields)
+        placeholders = ', '.join(['%s'] * (len(columns) + 1))
+        rows = [
+            [doc_id] + [' '.join(tokenize(fields.get(column, ''))) for column in columns]
+            for doc_id, fields in documents
+        ]
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT OR REPLACE INTO {self.table(index)} (rowid, {', '.join(columns)}) VALUES ({placeholders})",
+                rows,
+            )
+
+    def remove(self, index, ids):
+        with connection.cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {self.table(index)} WHERE rowid = %s", [[doc_id] for doc_id in ids])
+
+    def clear(self, index):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table(index)}")
+
+    def search(self, index, tokens, prefix=None, limit=None, offset=0):
+        terms = ['"{}"'.format(token.replace('"', '""')) for token in tokens]
+        if prefix:
+            terms.append('"{}"*'.format(prefix.replace('"', '""')))
+        match = ' '.join(terms)
+        weights = ', '.join(str(float(weight)) for weight in index.fields.values())
+        table = self.table(index)
+        with connection.cursor() as cursor:
+            # bm25()는 관련도가 높을수록 작은(음수) 값을 반환
+            cursor.execute(
+                f"SELECT rowid, bm25({table}, {weights}) AS score FROM {table} "
+                f"WHERE {table} MATCH %s ORDER BY score, rowid LIMIT %s OFFSET %s",
+                [match, -1 if limit is None else limit, offset],
+            )
+            rows = cursor.fetchall()
+            cursor.execute(f"SELECT count(*) FROM {table} WHERE {table} MATCH %s", [match])
+            total = cursor.fetchone()[0]
+        return SearchResult([row[0] for row in rows], [-row[1] for row in rows], total)
+
+
+# FTS5가 없는 DB용 이식형 백엔드: 토큰 테이블(SearchPosting)과 파이썬 BM25 계산
+class TableBackend:
+    name = 'table'
+    k1 = 1.2
+    b = 0.75
+
+    def ensure_schema(self, index):
+        pass
+
+    def count(self, index):
+        return SearchDocument.objects.filter(index=index.name).count()
+
+    def update(self, index, documents):
+        documents = list(documents)
+        self.remove(index, [doc_id for doc_id, _ in documents])
+
+        docs, postings = [], []
+        for doc_id, fields in documents:
+            terms = weighted_terms(index, fields)
+            docs.append(SearchDocument(index=index.name, doc_id=doc_id, length=sum(terms.values())))
+            postings.extend(
+                SearchPosting(index=index.name, token=token, doc_id=doc_id, tf=tf)
+                for token, tf in terms.items()
+            )
+        SearchDocument.objects.bulk_create(docs, batch_size=500)
+        SearchPosting.objects.bulk_create(postings, batch_size=2000)
+
+    def remove(self, index, ids):
+        SearchPosting.objects.filter(index=index.name, doc_id__in=ids).delete()
+        SearchDocument.objects.filter(index=index.name, doc_id__in=ids).delete()
+
+    def clear(self, index):
+        SearchPosting.objects.filter(index=index.name).delete()
+        SearchDocument.objects.filter(index=index.name).delete()
+
+    def search(self, index, tokens, prefix=None, limit=None, offset=0):
+        tokens = sorted(set(tokens))
+        postings = defaultdict(dict)
+        for doc_id, token, tf in SearchPosting.objects.filter(index=index.name, token__in=tokens).values_list('doc_id', 'token', 'tf'):
+            postings[token][doc_id] = tf
+        if prefix:
+            # 접두어로 시작하는 모든 토큰을 하나의 질의어처럼 합산
+            key = prefix + '*'
+            for doc_id, tf in SearchPosting.objects.filter(index=index.name, token__startswith=prefix).values_list('doc_id', 'tf'):
+                postings[key][doc_id] = postings[key].get(doc_id, 0) + tf
+            tokens = tokens + [key]
+
+        # 모든 질의 토큰을 포함한 문서만 (FTS5의 기본 AND 검색과 동일)
+        if len(postings) < len(tokens):
+            return SearchResult([], [], 0)
+        matched = set.intersection(*(set(docs) for docs in postings.values()))
+        if not matched:
+            return SearchResult([], [], 0)
+
+        stats = SearchDocument.objects.filter(index=index.name)
+        n_docs = stats.count()
+        avg_length = sum(stats.values_list('length', flat=True)) / max(n_docs, 1)
+        lengths = dict(stats.filter(doc_id__in=matched).values_list('doc_id', 'length'))
+
+        scores = {}
+        for doc_id in matched:
+            norm = self.k1 * (1 - self.b + self.b * lengths.get(doc_id, 0) / max(avg_length, 1e-9))
+            score = 0.0
+            for token, docs in postings.items():
+                idf = math.log((n_docs - len(docs) + 0.5) / (len(docs) + 0.5) + 1)
+                tf = docs[doc_id]
+                score += idf * tf * (self.k1 + 1) / (tf + norm)
+            scores[doc_id] = score
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        end = None if limit is None else offset + limit
+        page = ranked[offset:end]
+        return SearchResult([doc_id for doc_id, _ in page], [score for _, score in page], len(ranked))
+
+
+_fts5_available = None
+
+
+# 현재 DB가 SQLite이고 FTS5 모듈이 있는지 확인 (프로세스당 한 번)
+def fts5_available():
+    global _fts5_available
+    if _fts5_available is None:
+        _fts5_available = False
+        if connection.vendor == 'sqlite':
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute("CREATE VIRTUAL TABLE temp.search_fts5_probe USING fts5(x)")
+                    cursor.execute("DROP TABLE temp.search_fts5_probe")
+                _fts5_available = True
+            except Exception:
+                _fts5_available = False
+    return _fts5_available
+
+
+# settings.SEARCH_BACKEND: 'auto'(FTS5 가능하면 FTS5), 'fts5', 'table'
+def get_backend():
+    name = getattr(settings, 'SEARCH_BACKEND', 'auto')
+    if name == 'fts5' or (name == 'auto' and fts5_available()):
+        return FTS5Backend()
+    return TableBackend()
+
+
+# 질의어를 토큰화하여 BM25 순위로 검색, limit/offset으로 페이지 단위 조회
+# 입력 중인 검색어도 찾을 수 있도록 마지막 단어는 접두어로 검색 (한글 한 글자는 해당 글자로 시작하는 bigram)
+def search(name, query, limit=None, offset=0):
+    tokens = tokenize(query)
+    if not tokens:
+        return SearchResult([], [], 0)
+
+    prefix = None
+    last = TOKEN_RUN.findall(query.lower())[-1]
+    if not HANGUL_RUN.fullmatch(last) or len(last) == 1:
+        prefix = tokens.pop()
+    return get_backend().search(get(name), tokens, prefix=prefix, limit=limit, offset=offset)
+
+
+# 지정한 문서들만 다시 색인 (DB에서 사라진 문서는 색인에서 제거)
+def update(name, ids):
+    index = get(name)
+    backend = get_backend()
+    documents = list(index.documents(ids))
+    missing = set(ids) - {doc_id for doc_id, _ in documents}
+    with transaction.atomic():
+        if missing:
+            backend.remove(index, list(missing))
+        backend.update(index, documents)
+
+
+def remove(name, ids):
+    get_backend().remove(get(name), ids)
+
+
+# 인덱스 전체를 다시 생성
+def rebuild(name, batch_size=2000):
+    index = get(name)
+    backend = get_backend()
+    count = 0
+    with transaction.atomic():
+        backend.ensure_schema(index)
+        backend.clear(index)
+        batch = []
+        for document in index.documents():
+            batch.append(document)
+            if len(batch) >= batch_size:
+                backend.update(index, batch)
+                count += len(batch)
+                batch = []
+        backend.update(index, batch)
+        count += len(batch)
+    return count
+
+
+# migrate 후 FTS5 테이블을 만들고, 비어 있는 인덱스는 기존 데이터로 채움
+# 일부 앱만 migrate해서 모델 테이블이 아직 없으면 해당 인덱스는 건너뜀 (다음 migrate 때 채움)
+def on_post_migrate(sender, using=None, **kwargs):
+    backend = get_backend()
+    tables = set(connection.introspection.table_names())
+    for index in INDEXES.values():
+        if not {index.model._meta.db_table, SearchDocument._meta.db_table} <= tables:
+            continue
+        backend.ensure_schema(index)
+        if backend.count(index) == 0 and index.get_queryset().exists():
+            rebuild(index.name)
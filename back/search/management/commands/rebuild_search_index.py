@@ -0,0 +1,25 @@
+# search/management/commands/rebuild_search_index.py
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from search import engine
+from search.registry import INDEXES
+
+
+# 등록된 검색 인덱스를 DB 데이터로 다시 생성
+class Command(BaseCommand):
+    help = "도서/감상글 검색 인덱스를 다시 생성합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help="인덱스 이름 (생략 시 전체)")
+
+    def handle(self, *args, **options):
+        backend = engine.get_backend()
+        for name in options['names'] or list(INDEXES):
+            started = time.perf_counter()
+            count = engine.rebuild(name)
+            self.stdout.write(self.style.SUCCESS(
+                f"{name}: {count}건 색인 완료 ({backend.name}, {time.perf_counter() - started:.2f}s)"
+            ))
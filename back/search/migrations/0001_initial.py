@@ -0,0 +1,40 @@
+# Generated by Django 4.2.16 on 2026-10-18 13:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.CharField(max_length=50)),
+                ('doc_id', models.BigIntegerField()),
+                ('length', models.FloatField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SearchPosting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.CharField(max_length=50)),
+                ('token', models.CharField(max_length=64)),
+                ('doc_id', models.BigIntegerField()),
+                ('tf', models.FloatField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['index', 'token'], name='search_posting_token'), models.Index(fields=['index', 'doc_id'], name='search_posting_doc')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='searchdocument',
+            constraint=models.UniqueConstraint(fields=('index', 'doc_id'), name='unique_search_document'),
+        ),
+    ]
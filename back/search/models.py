@@ -0,0 +1,36 @@
+# search/models.py
+
+from django.db import models
+
+
+# FTS5를 쓸 수 없는 DB에서 사용하는 이식형 역색인: 문서별 (가중) 길이
+class SearchDocument(models.Model):
+    # 검색 인덱스 이름 (예: 'books')
+    index = models.CharField(max_length=50)
+
+    # 색인된 객체의 기본 키
+    doc_id = models.BigIntegerField()
+
+    # 필드 가중치를 반영한 토큰 수 (BM25 문서 길이 정규화에 사용)
+    length = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['index', 'doc_id'], name='unique_search_document'),
+        ]
+
+
+# 이식형 역색인: 토큰별 문서 목록과 (가중) 출현 빈도
+class SearchPosting(models.Model):
+    index = models.CharField(max_length=50)
+    token = models.CharField(max_length=64)
+    doc_id = models.BigIntegerField()
+
+    # 필드 가중치를 반영한 토큰 출현 빈도
+    tf = models.FloatField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['index', 'token'], name='search_posting_token'),
+            models.Index(fields=['index', 'doc_id'], name='search_posting_doc'),
+        ]
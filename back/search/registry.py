@@ -0,0 +1,74 @@
+# search/registry.py
+
+from django.db.models.signals import post_save, post_delete
+
+# 이름 → 검색 인덱스 인스턴스
+INDEXES = {}
+
+
+# 검색 인덱스 정의의 기본 클래스
+# 하위 클래스는 name, model, fields(필드 이름 → BM25 가중치)와 get_fields()를 정의
+class SearchIndex:
+    name = None
+    model = None
+    fields = {}
+
+    # 색인할 객체 쿼리셋 (select_related 등으로 한 번에 가져오도록 재정의)
+    def get_queryset(self):
+        return self.model._default_manager.all()
+
+    # 객체 하나를 {필드 이름: 텍스트} 로 변환
+    def get_fields(self, obj):
+        return {field: getattr(obj, field) or '' for field in self.fields}
+
+    # (문서 ID, 필드 텍스트) 목록, ids가 주어지면 해당 문서만
+    def documents(self, ids=None):
+        queryset = self.get_queryset()
+        if ids is not None:
+            queryset = queryset.filter(pk__in=ids)
+        for obj in queryset.iterator(chunk_size=2000):
+            yield obj.pk, self.get_fields(obj)
+
+    # 다른 모델이 저장될 때 다시 색인해야 하는 문서를 알려 주는 (모델, 필드 목록, 함수) 목록
+    # update_fields로 저장했는데 필드 목록과 겹치지 않으면 건너뜀
+    # 함수는 저장된 객체를 받아 이 인덱스의 문서 ID 목록을 반환
+    def related_updates(self):
+        return []
+
+
+def register(index_class):
+    index = index_class()
+    INDEXES[index.name] = index
+    return index_class
+
+
+def get(name):
+    return INDEXES[name]
+
+
+# 등록된 인덱스마다 저장/삭제 시그널을 연결 (같은 트랜잭션 안에서 색인을 갱신)
+def connect_signals():
+    from . import engine
+
+    for index in INDEXES.values():
+        def on_saved(sender, instance, index=index, **kwargs):
+            engine.update(index.name, [instance.pk])
+
+        def on_deleted(sender, instance, index=index, **kwargs):
+            engine.remove(index.name, [instance.pk])
+
+        post_save.connect(on_saved, sender=index.model, weak=False, dispatch_uid=f'search_{index.name}_saved')
+        post_delete.connect(on_deleted, sender=index.model, weak=False, dispatch_uid=f'search_{index.name}_deleted')
+
+        for model, fields, resolve in index.related_updates():
+            def on_related_saved(sender, instance, index=index, fields=fields, resolve=resolve, update_fields=None, **kwargs):
+                if update_fields is not None and not set(fields) & set(update_fields):
+                    return
+                ids = list(resolve(instance))
+                if ids:
+                    engine.update(index.name, ids)
+
+            post_save.connect(
+                on_related_saved, sender=model, weak=False,
+                dispatch_uid=f'search_{index.name}_{model._meta.label_lower}_saved',
+            )
@@ -0,0 +1,94 @@
+import datetime
+
+from django.test import TestCase, override_settings
+
+from books.models import Book, Category
+from . import engine
+from .tokenizer import tokenize
+
+
+class TokenizerTestCase(TestCase):
+
+    # 한글은 음절 bigram, 한 글자는 그대로, 그 외 문자는 소문자 단어
+    def test_hangul_bigrams(self):
+        self.assertEqual(tokenize('소년이 온다 Han'), ['소년', '년이', '온다', 'han'])
+        self.assertEqual(tokenize('책'), ['책'])
+        self.assertEqual(tokenize(''), [])
+
+
+# FTS5 백엔드와 이식형(SearchPosting) 백엔드가 같은 결과를 내는지 두 백엔드 모두에서 실행
+class SearchEngineTests:
+    backend = None
+
+    def setUp(self):
+        settings_override = override_settings(SEARCH_BACKEND=self.backend)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.category = Category.objects.create(id=1, name='소설')
+
+    def create_book(self, title, author='저자', description='설명', isbn=None):
+        return Book.objects.create(
+            category=self.category,
+            title=title,
+            author=author,
+            description=description,
+            isbn=isbn or f'978{Book.objects.count():010d}',
+            cover='https://example.com/cover.jpg',
+            publisher='출판사',
+            pub_date=datetime.date(2020, 1, 1),
+            customer_review_rank=0,
+        )
+
+    # 가중치가 높은 제목에서 일치한 도서가 설명에서만 일치한 도서보다 앞에 옴
+    def test_bm25_ranks_title_match_first(self):
+        in_description = self.create_book('바다의 노래', description='채식주의자에 대한 평론')
+        in_title = self.create_book('채식주의자')
+        self.create_book('관련 없는 책')
+
+        result = engine.search('books', '채식주의자')
+        self.assertEqual(result.ids, [in_title.pk, in_description.pk])
+        self.assertEqual(result.total, 2)
+        self.assertGreater(result.scores[0], result.scores[1])
+
+    # 어순이 달라도 bigram이 모두 있으면 일치, 입력 중인 한 글자는 접두어로 검색
+    def test_hangul_partial_match(self):
+        book = self.create_book('소년이 온다', author='한강')
+        self.create_book('작별하지 않는다', author='한강')
+
+        self.assertEqual(engine.search('books', '소년').ids, [book.pk])
+        self.assertEqual(engine.search('books', '온다 소년이').ids, [book.pk])
+        self.assertEqual(engine.search('books', '한강 소').ids, [book.pk])
+        self.assertEqual(engine.search('books', '소녀').ids, [])
+
+    # 저장/수정/삭제 시그널로 색인이 바로 따라감
+    def test_index_follows_save_and_delete(self):
+        book = self.create_book('나미야 잡화점의 기적')
+        self.assertEqual(engine.search('books', '잡화점').ids, [book.pk])
+
+        book.title = '용의자 X의 헌신'
+        book.save()
+        self.assertEqual(engine.search('books', '잡화점').ids, [])
+        self.assertEqual(engine.search('books', '헌신').ids, [book.pk])
+
+        book_id = book.pk
+        book.delete()
+        self.assertEqual(engine.search('books', '헌신').ids, [])
+        self.assertEqual(engine.get_backend().count(engine.get('books')), 0)
+        self.assertNotIn(book_id, engine.search('books', '용의자').ids)
+
+    # 색인이 비어도 rebuild로 DB 내용을 다시 채움
+    def test_rebuild(self):
+        book = self.create_book('파친코')
+        engine.get_backend().clear(engine.get('books'))
+        self.assertEqual(engine.search('books', '파친코').ids, [])
+
+        self.assertEqual(engine.rebuild('books'), 1)
+        self.assertEqual(engine.search('books', '파친코').ids, [book.pk])
+
+
+class FTS5SearchTestCase(SearchEngineTests, TestCase):
+    backend = 'fts5'
+
+
+class TableSearchTestCase(SearchEngineTests, TestCase):
+    backend = 'table'
@@ -0,0 +1,28 @@
+# search/tokenizer.py
+
+import re
+
+# 한글 음절, 그 밖의 문자/숫자 연속 구간
+HANGUL_RUN = re.compile(r'[가-힣]+')
+TOKEN_RUN = re.compile(r'[가-힣]+|[^\W_]+')
+
+# 토큰 최대 길이 (이식형 색인 컬럼 길이와 동일)
+MAX_TOKEN_LENGTH = 64
+
+
+# 한글은 형태소 분석 없이도 부분 일치가 되도록 음절 bigram으로, 그 외는 소문자 단어로 분리
+# 예) "소년이 온다 Han" → ['소년', '년이', '온다', 'han']
+def tokenize(text):
+    if not text:
+        return []
+
+    tokens = []
+    for run in TOKEN_RUN.findall(text.lower()):
+        if HANGUL_RUN.fullmatch(run):
+            if len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run[:MAX_TOKEN_LENGTH])
+    return tokens
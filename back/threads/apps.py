@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class ThreadsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'threads'
+
+    def ready(self):
+        from django.contrib.auth import get_user_model
+        from django.db.models.signals import m2m_changed
+        from . import feed
+
+        # 팔로우/언팔로우 시 팔로잉 피드 갱신
+        m2m_changed.connect(
+            feed.on_followings_changed, sender=get_user_model().followings.through, dispatch_uid='feed_followings',
+        )
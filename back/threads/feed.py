@@ -0,0 +1,124 @@
+# threads/feed.py
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+
+from books.pagination import decode_cursor, encode_cursor
+from .models import FeedEntry, Thread
+
+# 피드 cursor의 정렬 이름 (감상글 ID 내림차순)
+FEED_ORDERING = 'feed'
+
+
+# 팔로워 수가 FEED_CELEBRITY_FOLLOWERS 이상이면 팔로워 피드에 기록하지 않고 읽을 때 조회(pull)
+def is_celebrity(followers_count):
+    return followers_count >= settings.FEED_CELEBRITY_FOLLOWERS
+
+
+def _follows():
+    return get_user_model().followings.through.objects
+
+
+# 감상글 하나를 작성자의 팔로워 피드에 기록 (fan-out on write, 백그라운드 작업에서 실행)
+# 팔로워를 FEED_FANOUT_BATCH_SIZE명씩 나눠 INSERT, 이미 있는 항목은 무시하므로 재시도해도 안전
+# 반환값: 기록한 피드 항목 수 (팔로워가 많은 작성자면 0)
+def fan_out(thread_id):
+    thread = Thread.objects.filter(pk=thread_id).values('id', 'user_id', 'user__followers_count').first()
+    if thread is None or is_celebrity(thread['user__followers_count']):
+        return 0
+
+    follower_ids = (
+        _follows().filter(to_customuser_id=thread['user_id'])
+        .values_list('from_customuser_id', flat=True)
+        .iterator(chunk_size=settings.FEED_FANOUT_BATCH_SIZE)
+    )
+    batch, written = [], 0
+    for follower_id in follower_ids:
+        batch.append(FeedEntry(user_id=follower_id, thread_id=thread['id'], author_id=thread['user_id']))
+        if len(batch) >= settings.FEED_FANOUT_BATCH_SIZE:
+            FeedEntry.objects.bulk_create(batch, ignore_conflicts=True)
+            written, batch = written + len(batch), []
+    FeedEntry.objects.bulk_create(batch, ignore_conflicts=True)
+    return written + len(batch)
+
+
+# 새로 팔로우한 작성자의 최근 감상글(FEED_BACKFILL_LIMIT개)을 팔로워 피드에 채움
+# 작업이 실행되기 전에 언팔로우했거나 팔로워가 많은 작성자면 건너뜀
+def backfill(follower_id, author_id):
+    author = get_user_model().objects.filter(pk=author_id).values('followers_count').first()
+    if author is None or is_celebrity(author['followers_count']):
+        return 0
+    if not _follows().filter(from_customuser_id=follower_id, to_customuser_id=author_id).exists():
+        return 0
+
+    thread_ids = (
+        Thread.objects.filter(user_id=author_id)
+        .order_by('-id')
+        .values_list('id', flat=True)[:settings.FEED_BACKFILL_LIMIT]
+    )
+    entries = [FeedEntry(user_id=follower_id, thread_id=thread_id, author_id=author_id) for thread_id in thread_ids]
+    FeedEntry.objects.bulk_create(entries, ignore_conflicts=True)
+    return len(entries)
+
+
+# 언팔로우한 작성자의 감상글을 피드에서 제거 ((user, author) 인덱스)
+def remove(follower_id, author_ids):
+    return FeedEntry.objects.filter(user_id=follower_id, author_id__in=author_ids).delete()[0]
+
+
+# 팔로잉 피드 한 페이지의 감상글 ID 목록 (최신순)
+# - 미리 기록한 피드 항목: (user, thread) 인덱스에서 cursor 다음 page_size+1개
+# - 팔로워가 많은 작성자의 글: 작성자마다 (user, id) 인덱스에서 page_size+1개
+# 두 목록을 합쳐 ID 내림차순으로 자르므로 피드 길이나 뒤 페이지 위치와 무관하게 페이지 크기만큼만 읽음
+# 작성자가 팔로워 많은 사용자로 바뀌기 전에 기록된 항목이 함께 조회될 수 있어 중복은 제거
+# 반환값: (감상글 ID 목록, 다음 페이지 cursor 또는 None), cursor가 잘못되면 ValueError
+def feed_page(user, cursor=None, page_size=20):
+    before = decode_cursor(cursor, FEED_ORDERING)[1] if cursor else None
+
+    entries = FeedEntry.objects.filter(user=user)
+    if before is not None:
+        entries = entries.filter(thread_id__lt=before)
+    thread_ids = set(entries.order_by('-thread_id').values_list('thread_id', flat=True)[:page_size + 1])
+
+    celebrity_ids = user.followings.filter(
+        followers_count__gte=settings.FEED_CELEBRITY_FOLLOWERS,
+    ).values_list('id', flat=True)
+    for author_id in celebrity_ids:
+        threads = Thread.objects.filter(user_id=author_id)
+        if before is not None:
+            threads = threads.filter(id__lt=before)
+        thread_ids.update(threads.order_by('-id').values_list('id', flat=True)[:page_size + 1])
+
+    thread_ids = sorted(thread_ids, reverse=True)
+    if len(thread_ids) <= page_size:
+        return thread_ids, None
+    thread_ids = thread_ids[:page_size]
+    return thread_ids, encode_cursor(FEED_ORDERING, None, thread_ids[-1])
+
+
+# 팔로우/언팔로우 시 피드 갱신 (CustomUser.followings의 m2m_changed 수신자)
+# 팔로우는 최근 감상글 채우기 작업을 등록하고, 언팔로우는 바로 해당 작성자의 항목을 삭제
+def on_followings_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove') or not pk_set:
+        return
+    pairs = [(pk, instance.pk) for pk in pk_set] if reverse else [(instance.pk, pk) for pk in pk_set]
+
+    if action == 'post_remove':
+        for follower_id, author_id in pairs:
+            remove(follower_id, [author_id])
+        return
+
+    from .jobs import enqueue_feed_backfill
+
+    for follower_id, author_id in pairs:
+        enqueue_feed_backfill(follower_id, author_id)
+
+
+# 모든 사용자의 피드를 현재 팔로우 관계로 다시 만듦 (loaddata 등으로 감상글·팔로우를 직접 넣은 경우)
+# 반환값: 기록한 피드 항목 수
+def rebuild():
+    FeedEntry.objects.all().delete()
+    written = 0
+    for thread_id in Thread.objects.order_by('id').values_list('id', flat=True).iterator(chunk_size=2000):
+        written += fan_out(thread_id)
+    return written
@@ -0,0 +1,70 @@
+# threads/jobs.py
+
+from jobs.queue import enqueue
+from jobs.registry import task
+from . import feed
+from .models import Thread
+from .utils import generate_image_with_openai
+
+GENERATE_COVER = 'threads.generate_cover'
+FAN_OUT_THREAD = 'threads.fan_out_thread'
+BACKFILL_FEED = 'threads.backfill_feed'
+
+
+def mark_cover_failed(payload, error):
+    Thread.objects.filter(pk=payload['thread_id'], cover_status=Thread.COVER_PENDING).update(
+        cover_status=Thread.COVER_FAILED,
+    )
+
+
+# 감상글 AI 커버 이미지 생성 (GPT 프롬프트 → DALL·E → 다운로드)
+# 실패하면 작업 큐가 백오프 후 재시도하고, 모두 실패하면 cover_status를 'failed'로 변경
+@task(GENERATE_COVER, on_failure=mark_cover_failed)
+def generate_cover(payload):
+    thread = Thread.objects.select_related('book').filter(pk=payload['thread_id']).first()
+    if thread is None or thread.cover_status != Thread.COVER_PENDING:
+        return
+
+    book = thread.book
+    image_path = generate_image_with_openai(
+        thread.title, thread.content, book.title, book.author, refresh=payload.get('refresh', False),
+    )
+    if not image_path:
+        raise RuntimeError("커버 이미지 생성 실패")
+
+    # 목록용 축소본까지 만든 뒤 완료 처리
+    # 생성하는 동안 작성자가 글을 수정했을 수 있으므로 커버 필드만 갱신
+    thread.cover_img = image_path
+    thread.generate_cover_renditions()
+    Thread.objects.filter(pk=thread.pk).update(cover_img=image_path, cover_status=Thread.COVER_READY)
+
+
+# 커버 생성 작업 등록 (같은 감상글의 작업은 하나만 대기/실행)
+# refresh=True면 GPT 프롬프트를 캐시에서 재사용하지 않고 새로 생성
+def enqueue_cover_generation(thread, refresh=False):
+    Thread.objects.filter(pk=thread.pk).update(cover_status=Thread.COVER_PENDING)
+    thread.cover_status = Thread.COVER_PENDING
+    enqueue(GENERATE_COVER, key=f'thread:{thread.pk}', payload={'thread_id': thread.pk, 'refresh': refresh})
+
+
+# 새 감상글을 작성자의 팔로워 피드에 기록 (threads.feed.fan_out)
+@task(FAN_OUT_THREAD)
+def fan_out_thread(payload):
+    feed.fan_out(payload['thread_id'])
+
+
+# 새로 팔로우한 작성자의 최근 감상글을 팔로워 피드에 채움 (threads.feed.backfill)
+@task(BACKFILL_FEED)
+def backfill_feed(payload):
+    feed.backfill(payload['follower_id'], payload['author_id'])
+
+
+def enqueue_fan_out(thread):
+    enqueue(FAN_OUT_THREAD, key=f'thread:{thread.pk}', payload={'thread_id': thread.pk})
+
+
+def enqueue_feed_backfill(follower_id, author_id):
+    enqueue(
+        BACKFILL_FEED, key=f'follow:{follower_id}:{author_id}',
+        payload={'follower_id': follower_id, 'author_id': author_id},
+    )
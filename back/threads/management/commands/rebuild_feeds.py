@@ -0,0 +1,15 @@
+# threads/management/commands/rebuild_feeds.py
+
+from django.core.management.base import BaseCommand
+
+from threads import feed
+
+
+# 현재 팔로우 관계와 감상글로 팔로잉 피드를 다시 만듦
+# (loaddata 등으로 감상글·팔로우를 직접 넣어 피드 기록 작업이 실행되지 않은 경우)
+class Command(BaseCommand):
+    help = "모든 사용자의 팔로잉 피드를 다시 만듭니다."
+
+    def handle(self, *args, **options):
+        written = feed.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"완료: 피드 항목 {written}개"))
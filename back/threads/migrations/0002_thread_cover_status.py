@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-18 14:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('threads', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='thread',
+            name='cover_status',
+            field=models.CharField(choices=[('pending', '생성 중'), ('ready', '완료'), ('failed', '실패')], default='ready', max_length=10),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.16 on 2026-10-18 14:22
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+# 기존 좋아요 수로 채움
+def count_likes(apps, schema_editor):
+    Thread = apps.get_model('threads', 'Thread')
+    through = Thread.likes.through
+    likes = (
+        through.objects.filter(thread_id=OuterRef('pk')).order_by()
+        .values('thread_id').annotate(count=Count('*')).values('count')
+    )
+    Thread.objects.update(likes_count=Coalesce(Subquery(likes), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('threads', '0002_thread_cover_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='thread',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_likes, migrations.RunPython.noop),
+    ]
@@ -3,10 +3,22 @@
 import datetime
 from django.db import models
 from django.conf import settings
+from imagekit.cachefiles.strategies import Optimistic
+from imagekit.models import ImageSpecField
+from imagekit.processors import ResizeToFill
 
 
 # 감상글(스레드) 모델 정의
 class Thread(models.Model):
+    COVER_PENDING = 'pending'
+    COVER_READY = 'ready'
+    COVER_FAILED = 'failed'
+    COVER_STATUS_CHOICES = (
+        (COVER_PENDING, '생성 중'),
+        (COVER_READY, '완료'),
+        (COVER_FAILED, '실패'),
+    )
+
     # 글 제목
     title = models.CharField(max_length=100)
 
@@ -19,6 +31,25 @@ class Thread(models.Model):
     # AI로 생성된 썸네일 이미지 (선택 입력)
     cover_img = models.ImageField(upload_to="thread_cover_img/", blank=True)
 
+    # 목록 화면용 커버 축소본 (WebP, 원본을 저장할 때 함께 생성하고 조회 시에는 생성하지 않음)
+    cover_256 = ImageSpecField(
+        source='cover_img',
+        processors=[ResizeToFill(256, 256)],
+        format='WEBP',
+        options={'quality': 80},
+        cachefile_strategy=Optimistic,
+    )
+    cover_512 = ImageSpecField(
+        source='cover_img',
+        processors=[ResizeToFill(512, 512)],
+        format='WEBP',
+        options={'quality': 80},
+        cachefile_strategy=Optimistic,
+    )
+
+    # AI 커버 이미지 생성 상태 (백그라운드 작업으로 생성, threads.jobs 참고)
+    cover_status = models.CharField(max_length=10, choices=COVER_STATUS_CHOICES, default=COVER_READY)
+
     # 생성 시각 (자동 저장)
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -38,10 +69,30 @@ class Thread(models.Model):
         blank=True
     )
 
+    # 좋아요 수 (likes 행 수를 비정규화, blookin.counters.toggle이 F()로 갱신)
+    likes_count = models.PositiveIntegerField(default=0, editable=False)
+
     # 객체 문자열 표현 (작성자 + 제목 + 도서 제목)
     def __str__(self):
         return f"[{self.user.username}] {self.title} ({self.book.title})"
 
+    # 커버 원본과 크기별 축소본 URL (커버가 없으면 None)
+    # 축소본이 생기기 전에 올라간 커버는 파일이 없으므로 해당 크기를 빼서 화면이 원본(cover_img)을 쓰도록 함
+    # (기존 커버의 축소본은 generateimages threads:thread:cover_256 threads:thread:cover_512 로 생성)
+    def cover_urls(self):
+        if not self.cover_img:
+            return None
+        urls = {'original': self.cover_img.url}
+        for size, rendition in (('256', self.cover_256), ('512', self.cover_512)):
+            if rendition.storage.exists(rendition.name):
+                urls[size] = rendition.url
+        return urls
+
+    # 축소본 파일 생성 (save() 없이 cover_img를 바꾼 경우 직접 호출)
+    def generate_cover_renditions(self):
+        self.cover_256.generate()
+        self.cover_512.generate()
+
     # 기본 정렬 기준: 생성일 내림차순 (최신순)
     class Meta:
         ordering = ['-created_at']
@@ -71,3 +122,28 @@ class Comment(models.Model):
     # 기본 정렬 기준: 생성일 내림차순 (최신순)
     class Meta:
         ordering = ['-created_at']
+
+
+# 팔로잉 피드 항목 (감상글 작성 시 작성자의 팔로워마다 한 행씩 미리 기록, threads.feed 참고)
+# 팔로워가 많은 작성자의 글은 기록하지 않고 피드를 읽을 때 직접 조회
+class FeedEntry(models.Model):
+    # 피드 주인 (작성자를 팔로우하는 사용자)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='feed_entries')
+
+    # 피드에 보일 감상글 (감상글 ID 내림차순 = 최신순으로 읽음)
+    thread = models.ForeignKey(Thread, on_delete=models.CASCADE, related_name='+')
+
+    # 감상글 작성자 (언팔로우 시 해당 작성자의 항목만 삭제)
+    author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+
+    class Meta:
+        constraints = [
+            # (user, thread) 인덱스로 피드를 keyset 페이지 단위로 읽음
+            models.UniqueConstraint(fields=['user', 'thread'], name='unique_feed_entry'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'author'], name='feed_user_author_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} ← {self.thread_id}"
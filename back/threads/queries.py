@@ -0,0 +1,21 @@
+# threads/queries.py
+
+from django.contrib.auth import get_user_model
+from django.db.models import Prefetch
+
+from accounts.queries import plan_users
+from .models import Comment
+
+
+# ThreadSerializer가 출력하는 도서(카테고리, 좋아요 사용자), 작성자(관심 장르), 댓글(작성자)을
+# 미리 조회하는 쿼리 계획 (감상글 수와 무관하게 쿼리 수 일정, 좋아요·팔로워 수는 비정규화 컬럼)
+def plan_threads(threads):
+    return (
+        threads
+        .select_related('book__category')
+        .prefetch_related(
+            Prefetch('user', queryset=plan_users(get_user_model().objects.all())),
+            Prefetch('comments', queryset=Comment.objects.select_related('user')),
+            'book__liked_users',
+        )
+    )
@@ -0,0 +1,37 @@
+# threads/search_indexes.py
+
+from books.models import Book
+from search.registry import SearchIndex, register
+from .models import Thread
+
+
+# 감상글 검색 인덱스: 제목, 본문과 함께 도서 제목·저자도 같은 문서에 색인 (검색 시 JOIN 불필요)
+@register
+class ThreadIndex(SearchIndex):
+    name = 'threads'
+    model = Thread
+    fields = {
+        'title': 4.0,
+        'content': 1.0,
+        'book_title': 2.0,
+        'book_author': 2.0,
+    }
+
+    def get_queryset(self):
+        return Thread.objects.select_related('book').only(
+            'title', 'content', 'book__title', 'book__author'
+        )
+
+    def get_fields(self, obj):
+        return {
+            'title': obj.title,
+            'content': obj.content,
+            'book_title': obj.book.title,
+            'book_author': obj.book.author,
+        }
+
+    # 도서 제목/저자가 바뀌면 그 도서의 감상글을 다시 색인 (작가 정보 보완처럼 다른 필드만 저장할 때는 건너뜀)
+    def related_updates(self):
+        return [
+            (Book, ['title', 'author'], lambda book: Thread.objects.filter(book_id=book.pk).values_list('pk', flat=True)),
+        ]
@@ -1,6 +1,7 @@
 # threads/serializers.py
 
 from rest_framework import serializers
+from blookin import like_buffer
 from .models import Thread, Comment
 from books.models import Book, Category
 from accounts.serializers import UserSimpleSerializer
@@ -47,8 +48,11 @@ class ThreadSerializer(serializers.ModelSerializer):
     # 작성자 정보 (UserSimpleSerializer로 중첩 직렬화)
     user_info = UserSimpleSerializer(source='user', read_only=True)
 
-    # 좋아요 수 출력
-    likes_count = serializers.IntegerField(source='likes.count', read_only=True)
+    # 좋아요 수 출력 (비정규화 컬럼 + 좋아요 버퍼에서 아직 반영되지 않은 변화)
+    likes_count = serializers.SerializerMethodField()
+
+    # 커버 원본과 크기별(256, 512) 축소본 URL
+    cover_urls = serializers.SerializerMethodField()
 
     # 연결된 댓글 목록 출력
     comments = CommentSerializer(many=True, read_only=True)
@@ -61,6 +65,8 @@ class ThreadSerializer(serializers.ModelSerializer):
             'content',        # 본문
             'reading_date',   # 독서 날짜
             'cover_img',      # 썸네일 이미지 경로
+            'cover_status',   # AI 커버 생성 상태 (pending, ready, failed)
+            'cover_urls',     # 커버 크기별 URL (목록 화면은 축소본 사용)
             'created_at',     # 생성일
             'updated_at',     # 수정일
             'book',           # 등록용 도서 ID
@@ -69,3 +75,10 @@ class ThreadSerializer(serializers.ModelSerializer):
             'likes_count',    # 좋아요 수
             'comments'        # 댓글 목록
         ]
+        read_only_fields = ['cover_status']
+
+    def get_cover_urls(self, obj):
+        return obj.cover_urls()
+
+    def get_likes_count(self, obj):
+        return max(obj.likes_count + like_buffer.pending_delta(obj), 0)
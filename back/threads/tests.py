@@ -1,3 +1,395 @@
-from django.test import TestCase
+import datetime
+import tempfile
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+from rest_framework.test import APIClient
+
+from blookin import counters
+from books.models import Book, Category
+from jobs import queue
+from jobs.models import Job
+from .jobs import BACKFILL_FEED, FAN_OUT_THREAD, GENERATE_COVER
+from .models import Comment, FeedEntry, Thread
+from .utils import download_image
+
+
+# 감상글 API의 쿼리 수가 감상글·댓글·팔로우 수와 무관하게 일정한지 확인 (N+1 회귀 방지)
+class ThreadQueryCountTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.category = Category.objects.create(name='문학')
+        cls.viewer = User.objects.create_user(username='viewer', password='pw')
+        cls.writers = [User.objects.create_user(username=f'writer{i}', password='pw') for i in range(3)]
+        cls.viewer.followings.add(cls.writers[0])
+        for writer in cls.writers:
+            writer.interested_genres.add(cls.category)
+
+    def create_threads(self, count):
+        threads = []
+        start = Book.objects.count()
+        for i in range(count):
+            book = Book.objects.create(
+                category=self.category, title=f'도서 {i}', description='설명', isbn=str(start + i),
+                cover='https://example.com/cover.jpg', publisher='출판사', pub_date=datetime.date(2020, 1, 1),
+                author='저자', author_info='', customer_review_rank=0, subTitle='',
+            )
+            book.liked_users.add(self.viewer)
+            writer = self.writers[i % len(self.writers)]
+            thread = Thread.objects.create(title=f'감상 {i}', content='내용', book=book, user=writer)
+            thread.likes.add(self.viewer, writer)
+            Comment.objects.create(content='댓글', thread=thread, user=self.viewer)
+            threads.append(thread)
+        # 관계를 직접 추가했으므로 비정규화 카운터를 맞춤
+        counters.reconcile()
+        return threads
+
+    def assertConstantQueries(self, url, expected, sizes=(2, 6)):
+        client = APIClient()
+        client.force_authenticate(self.viewer)
+        for size in sizes:
+            self.create_threads(size)
+            path = url() if callable(url) else url
+            with self.assertNumQueries(expected):
+                response = client.get(path)
+            self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    # 감상글 1 + 작성자 1 + 작성자 관심 장르 1 + 댓글 1 + 도서 좋아요 사용자 1 + 로그인 사용자 팔로잉 ID 1
+    def test_thread_list(self):
+        data = self.assertConstantQueries('/api/threads/', 6)
+        self.assertEqual(len(data), 8)
+        by_writer = {thread['user_info']['username']: thread for thread in data}
+        self.assertTrue(by_writer['writer0']['user_info']['is_following'])
+        self.assertFalse(by_writer['writer1']['user_info']['is_following'])
+        self.assertEqual(by_writer['writer0']['user_info']['followers_count'], 1)
+        self.assertEqual(by_writer['writer0']['likes_count'], 2)
+
+    def test_thread_detail(self):
+        data = self.assertConstantQueries(lambda: f'/api/threads/{Thread.objects.latest("id").pk}/', 6)
+        self.assertEqual(len(data['comments']), 1)
+        self.assertEqual(data['comments'][0]['user'], 'viewer')
+
+    # 프로필 조회 쿼리 수는 작성한 감상글 수와 무관해야 함
+    def test_user_profile(self):
+        client = APIClient()
+        client.force_authenticate(self.viewer)
+        counts = []
+        for size in (1, 5):
+            self.create_threads(size)
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(f'/api/accounts/{self.writers[0].username}/')
+            self.assertEqual(response.status_code, 200)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+
+# 감상글 작성 시 AI 커버는 작업 큐에서 생성하고 작성 요청은 바로 응답 (이미지 생성은 스텁)
+@mock.patch('threads.jobs.generate_image_with_openai', return_value='thread_cover_img/cover.png')
+class ThreadCoverTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.writer = User.objects.create_user(username='writer', password='pw')
+        cls.other = User.objects.create_user(username='other', password='pw')
+        cls.book = Book.objects.create(
+            category=Category.objects.create(name='문학'), title='도서', description='설명', isbn='1',
+            cover='https://example.com/cover.jpg', publisher='출판사', pub_date=datetime.date(2020, 1, 1),
+            author='저자', author_info='', customer_review_rank=0, subTitle='',
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.writer)
+        # 임시 MEDIA_ROOT에 생성된 것으로 칠 1024x1024 원본 이미지 준비
+        self.media_root = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.enterContext(self.settings(MEDIA_ROOT=self.media_root))
+        (self.media_root / 'thread_cover_img').mkdir()
+        for name in ('cover.png', 'new.png'):
+            Image.new('RGB', (1024, 1024), 'orange').save(self.media_root / 'thread_cover_img' / name)
+        # imagekit이 기본 캐시에 기록한 축소본 존재 여부가 이전 테스트의 임시 디렉터리를 가리키지 않도록 초기화
+        cache.clear()
+
+    def create_thread(self):
+        response = self.client.post('/api/threads/', {'title': '감상', 'content': '내용', 'book': self.book.pk})
+        self.assertEqual(response.status_code, 201)
+        return response.json()
+
+    def test_create_returns_pending_and_job_attaches_cover(self, generate):
+        data = self.create_thread()
+        self.assertEqual(data['cover_status'], 'pending')
+        generate.assert_not_called()
+
+        # 커버 생성 + 팔로워 피드 기록
+        self.assertEqual(queue.run_pending(), 2)
+        generate.assert_called_once_with('감상', '내용', '도서', '저자', refresh=False)
+
+        cover = self.client.get(f"/api/threads/{data['id']}/cover/").json()
+        self.assertEqual(cover['cover_status'], 'ready')
+        self.assertEqual(cover['cover_img'], '/media/thread_cover_img/cover.png')
+        detail = self.client.get(f"/api/threads/{data['id']}/").json()
+        self.assertEqual(detail['cover_status'], 'ready')
+        self.assertEqual(detail['cover_urls'], cover['cover_urls'])
+
+        # 작업에서 만든 WebP 축소본
+        for size in (256, 512):
+            url = cover['cover_urls'][str(size)]
+            self.assertTrue(url.endswith('.webp'))
+            with Image.open(self.media_root / url.removeprefix('/media/')) as image:
+                self.assertEqual((image.format, image.size), ('WEBP', (size, size)))
+
+    def test_failed_generation_is_retried_then_marked_failed(self, generate):
+        generate.return_value = None
+        data = self.create_thread()
+        Job.objects.update(max_attempts=2)
+
+        with self.assertLogs('jobs.queue', 'ERROR'):
+            queue.run_pending()
+        self.assertEqual(Thread.objects.get(pk=data['id']).cover_status, 'pending')
+
+        Job.objects.update(run_after=Job.objects.get(name=GENERATE_COVER).created_at)
+        with self.assertLogs('jobs.queue', 'ERROR'):
+            queue.run_pending()
+        self.assertEqual(self.client.get(f"/api/threads/{data['id']}/cover/").json()['cover_status'], 'failed')
+
+        # 작성자만 재생성 요청 가능, 재생성 시 GPT 프롬프트 캐시를 사용하지 않음
+        other = APIClient()
+        other.force_authenticate(self.other)
+        self.assertEqual(other.post(f"/api/threads/{data['id']}/cover/").status_code, 403)
+        response = self.client.post(f"/api/threads/{data['id']}/cover/")
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['cover_status'], 'pending')
+
+        generate.return_value = 'thread_cover_img/new.png'
+        queue.run_pending()
+        generate.assert_called_with('감상', '내용', '도서', '저자', refresh=True)
+        self.assertEqual(Thread.objects.get(pk=data['id']).cover_status, 'ready')
+
+    def test_cover_status_is_read_only(self, generate):
+        data = self.create_thread()
+        queue.run_pending()
+        self.client.put(f"/api/threads/{data['id']}/", {'cover_status': 'failed', 'title': '수정'})
+        thread = Thread.objects.get(pk=data['id'])
+        self.assertEqual((thread.title, thread.cover_status), ('수정', 'ready'))
+
+    # 축소본 없이 저장된 기존 커버는 원본 URL만 내려주고, generateimages로 만든 뒤에는 축소본 URL 포함
+    def test_legacy_cover_without_renditions(self, generate):
+        thread = Thread.objects.create(title='감상', content='내용', book=self.book, user=self.writer)
+        Thread.objects.filter(pk=thread.pk).update(cover_img='thread_cover_img/cover.png')
+
+        data = self.client.get(f'/api/threads/{thread.pk}/').json()
+        self.assertEqual(data['cover_urls'], {'original': '/media/thread_cover_img/cover.png'})
+
+        call_command('generateimages', 'threads:thread:cover_256', 'threads:thread:cover_512', stdout=StringIO())
+        data = self.client.get(f'/api/threads/{thread.pk}/').json()
+        self.assertEqual(set(data['cover_urls']), {'original', '256', '512'})
+        self.assertTrue(data['cover_urls']['256'].endswith('.webp'))
+
+
+FEED_JOBS = [FAN_OUT_THREAD, BACKFILL_FEED]
+
+
+# 팔로잉 피드: 작성 시 팔로워 피드에 기록(fan-out), 팔로워가 많은 작성자의 글은 읽을 때 조회, cursor로 최신순 페이지
+# (커버 생성 작업은 실행하지 않음)
+@override_settings(FEED_CELEBRITY_FOLLOWERS=3)
+class FeedTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.viewer = User.objects.create_user(username='viewer', password='pw')
+        cls.writer = User.objects.create_user(username='writer', password='pw')
+        cls.celebrity = User.objects.create_user(username='celebrity', password='pw')
+        cls.stranger = User.objects.create_user(username='stranger', password='pw')
+        fans = User.objects.bulk_create([User(username=f'fan{i}') for i in range(3)])
+        cls.viewer.followings.add(cls.writer, cls.celebrity)
+        cls.celebrity.followers.add(*fans)
+        counters.reconcile()
+        cls.book = Book.objects.create(
+            category=Category.objects.create(name='문학'), title='도서', description='설명', isbn='1',
+            cover='https://example.com/cover.jpg', publisher='출판사', pub_date=datetime.date(2020, 1, 1),
+            author='저자', author_info='', customer_review_rank=0, subTitle='',
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.viewer)
+
+    def post_thread(self, user, title='감상'):
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.post('/api/threads/', {'title': title, 'content': '내용', 'book': self.book.pk})
+        self.assertEqual(response.status_code, 201)
+        return response.json()['id']
+
+    def feed_ids(self, **params):
+        response = self.client.get('/api/threads/feed/', params)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        return [thread['id'] for thread in data['results']], data['next']
+
+    def test_fan_out_on_write_and_pull_for_celebrities(self):
+        written = self.post_thread(self.writer)
+        famous = self.post_thread(self.celebrity)
+        self.post_thread(self.stranger)
+        # 피드 기록은 백그라운드 작업에서
+        self.assertFalse(FeedEntry.objects.exists())
+        queue.run_pending(FEED_JOBS)
+
+        self.assertEqual(list(FeedEntry.objects.values_list('user__username', 'thread')), [('viewer', written)])
+        self.assertEqual(self.feed_ids(), ([famous, written], None))
+
+    def test_cursor_walks_feed_newest_first(self):
+        ids = [self.post_thread(user, f'감상 {i}') for i, user in enumerate([self.writer, self.celebrity] * 5)]
+        queue.run_pending(FEED_JOBS)
+
+        seen, cursor = [], None
+        for _ in range(5):
+            params = {'page_size': 3, **({'cursor': cursor} if cursor else {})}
+            with self.assertNumQueries(9):
+                page, cursor = self.feed_ids(**params)
+            seen += page
+            if cursor is None:
+                break
+        self.assertEqual(seen, sorted(ids, reverse=True))
+
+    def test_follow_backfills_and_unfollow_removes(self):
+        ids = [self.post_thread(self.stranger) for _ in range(2)]
+        queue.run_pending(FEED_JOBS)
+        self.assertEqual(self.feed_ids()[0], [])
+
+        self.assertTrue(self.client.post(f'/api/accounts/{self.stranger.username}/follow/').json()['followed'])
+        queue.run_pending(FEED_JOBS)
+        self.assertEqual(self.feed_ids()[0], ids[::-1])
+
+        self.assertFalse(self.client.post(f'/api/accounts/{self.stranger.username}/follow/').json()['followed'])
+        self.assertEqual(self.feed_ids()[0], [])
+        self.assertFalse(FeedEntry.objects.filter(author=self.stranger).exists())
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get('/api/threads/feed/', {'cursor': 'abc'}).status_code, 400)
+        self.assertEqual(APIClient().get('/api/threads/feed/').status_code, 401)
+
+
+# 응답을 청크 단위로 흉내 내는 requests 응답 스텁
+def fake_response(body, content_type='image/png', content_length=True):
+    response = mock.MagicMock()
+    response.__enter__.return_value = response
+    response.headers = {'Content-Type': content_type}
+    if content_length:
+        response.headers['Content-Length'] = str(len(body))
+    response.iter_content.side_effect = lambda chunk_size: (
+        body[i:i + chunk_size] for i in range(0, len(body), chunk_size)
+    )
+    return response
+
+
+# 감상글 검색 색인에 함께 들어가는 도서 제목/저자가 바뀌면 감상글도 다시 색인
+class ThreadSearchTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username='reader', password='pw')
+        cls.book = Book.objects.create(
+            category=Category.objects.create(name='문학'), title='구판 제목', description='설명', isbn='1',
+            cover='https://example.com/cover.jpg', publisher='출판사', pub_date=datetime.date(2020, 1, 1),
+            author='저자', author_info='', customer_review_rank=0, subTitle='',
+        )
+        cls.thread = Thread.objects.create(title='감상', content='내용', book=cls.book, user=cls.user)
+
+    def search_ids(self, query):
+        response = APIClient().get('/api/threads/', {'q': query})
+        self.assertEqual(response.status_code, 200)
+        return [thread['id'] for thread in response.json()]
+
+    def test_book_rename_reindexes_threads(self):
+        self.assertEqual(self.search_ids('구판'), [self.thread.pk])
+
+        self.book.title = '개정판 제목'
+        self.book.save()
+        self.assertEqual(self.search_ids('구판'), [])
+        self.assertEqual(self.search_ids('개정판'), [self.thread.pk])
+
+        self.book.author = '새저자'
+        self.book.save(update_fields=['author'])
+        self.assertEqual(self.search_ids('새저자'), [self.thread.pk])
+
+    # 검색 결과도 도서 검색과 같은 {next, results} cursor 페이지, 관련도/정렬 순으로 한 번씩 조회
+    def test_search_cursor_pages(self):
+        threads = [self.thread] + [
+            Thread.objects.create(title=f'감상 {i}', content='내용', book=self.book, user=self.user) for i in range(4)
+        ]
+        client = APIClient()
+        expected = self.search_ids('구판')
+        self.assertEqual(sorted(expected), sorted(thread.pk for thread in threads))
+
+        for ordering, order in [(None, expected), ('-likes', expected), ('created_at', [t.pk for t in threads])]:
+            seen, params = [], {'q': '구판', 'page_size': 2}
+            if ordering:
+                params['ordering'] = ordering
+            while True:
+                response = client.get('/api/threads/', params)
+                self.assertEqual(response.status_code, 200)
+                data = response.json()
+                self.assertEqual(set(data), {'next', 'results'})
+                seen += [thread['id'] for thread in data['results']]
+                if not data['next']:
+                    break
+                params['cursor'] = data['next']
+            if ordering == '-likes':
+                self.assertEqual(sorted(seen), sorted(order))
+            else:
+                self.assertEqual(seen, order)
+
+        # 다른 정렬 기준의 cursor, 잘못된 정렬 기준은 400
+        cursor = client.get('/api/threads/', {'q': '구판', 'page_size': 2}).json()['next']
+        for params in [{'cursor': cursor, 'ordering': 'created_at'}, {'ordering': 'bogus'}, {'cursor': 'not-a-cursor'}]:
+            self.assertEqual(client.get('/api/threads/', {'q': '구판', **params}).status_code, 400, params)
+
+    # 작가 정보 보완처럼 제목/저자가 아닌 필드만 저장하면 감상글을 다시 색인하지 않음
+    def test_other_field_saves_skip_thread_reindex(self):
+        with mock.patch('search.engine.update') as update:
+            self.book.author_info = '저자 소개'
+            self.book.save(update_fields=['author_info', 'author_works'])
+        self.assertEqual([call.args[0] for call in update.call_args_list], ['books'])
+
+
+class DownloadImageTestCase(TestCase):
+    def setUp(self):
+        self.output_dir = Path(self.enterContext(tempfile.TemporaryDirectory())) / 'covers'
+        self.enterContext(self.settings(THREAD_COVER_MAX_BYTES=100 * 1024))
+
+    def download(self, response):
+        with mock.patch('threads.utils.requests.get', return_value=response) as get:
+            try:
+                return download_image('https://images.example/c.png', self.output_dir, 'c.png')
+            finally:
+                self.assertTrue(get.call_args.kwargs['stream'])
+
+    def test_writes_streamed_chunks(self):
+        buffer = BytesIO()
+        Image.new('RGB', (64, 64), 'blue').save(buffer, 'PNG')
+        self.assertEqual(self.download(fake_response(buffer.getvalue())), 'c.png')
+        self.assertEqual((self.output_dir / 'c.png').read_bytes(), buffer.getvalue())
+
+    def test_rejects_declared_oversize(self):
+        with self.assertRaises(ValueError):
+            self.download(fake_response(b'x' * 200 * 1024))
+        self.assertEqual(list(self.output_dir.iterdir()), [])
+
+    # Content-Length 없이 상한을 넘게 보내면 받는 도중 중단하고 임시 파일 삭제
+    def test_aborts_oversize_stream(self):
+        with self.assertRaises(ValueError):
+            self.download(fake_response(b'x' * 200 * 1024, content_length=False))
+        self.assertEqual(list(self.output_dir.iterdir()), [])
+
+    def test_rejects_non_image(self):
+        with self.assertRaises(ValueError):
+            self.download(fake_response(b'<html>', content_type='text/html'))
@@ -2,17 +2,24 @@
 
 from django.urls import path
 from . import views
-from django.conf import settings
-from django.conf.urls.static import static
 
 # threads 앱의 URL 경로 설정
 urlpatterns = [
     # 감상글 목록 조회 및 감상글 작성
     path('', views.thread_list_create, name='thread_list_create'),
 
+    # 팔로우한 사용자의 감상글 피드
+    path('feed/', views.thread_feed, name='thread_feed'),
+
+    # 인기 감상글
+    path('trending/', views.trending_threads, name='thread_trending'),
+
     # 감상글 상세 조회, 수정, 삭제
     path('<int:thread_id>/', views.thread_detail, name='thread_detail'),
 
+    # 감상글 AI 커버 생성 상태 조회(폴링) 및 재생성 요청
+    path('<int:thread_id>/cover/', views.thread_cover, name='thread_cover'),
+
     # 감상글 좋아요 토글
     path('<int:thread_id>/like/', views.thread_like_toggle, name='thread_like_toggle'),
 
@@ -22,6 +29,3 @@ urlpatterns = [
     # 댓글 삭제 (댓글 ID 기준)
     path('comments/<int:comment_id>/', views.comment_delete, name='comment_delete'),
 ]
-
-# 미디어 파일 경로 설정 (커버 이미지 등 제공)
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -6,9 +6,12 @@ from pathlib import Path
 from django.conf import settings
 import uuid
 
+from llm import cache as llm_cache
+
 
 # 감상글 제목, 본문, 도서 정보를 바탕으로 DALL·E 일러스트 이미지를 생성하는 함수
-def generate_image_with_openai(thread_title, thread_content, book_title, book_author):
+# 프롬프트 생성 단계(GPT)는 LLM 캐시를 거치며, refresh=True면 캐시를 무시하고 새로 생성
+def generate_image_with_openai(thread_title, thread_content, book_title, book_author, refresh=False):
     # GPT에게 감성 키워드와 일러스트 스타일 프롬프트를 생성하도록 요청하는 입력 문장 구성
     keyword_extractor_prompt = f"""
     '{book_author}'의 책 '{book_title}'을 읽고 쓴 독서 다이어리의 감정과 분위기를 분석하여 키워드 5개를 추출하시오.
@@ -28,21 +31,21 @@ def generate_image_with_openai(thread_title, thread_content, book_title, book_au
     """
 
     # OpenAI API 클라이언트 초기화
-    client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+    client = openai.OpenAI(api_key=settings.OPENAI_API_KEY, timeout=settings.THREAD_COVER_TIMEOUT)
 
     try:
-        # GPT-4o-mini를 사용하여 프롬프트 생성 요청
-        completion = client.chat.completions.create(
+        # GPT-4o-mini를 사용하여 프롬프트 생성 요청 (같은 감상글이면 캐시된 프롬프트 재사용)
+        keyword_prompt = llm_cache.chat_completion(
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": "당신은 감성 일러스트 AI 프롬프트 생성 전문가입니다."},
                 {"role": "user", "content": keyword_extractor_prompt},
             ],
             max_tokens=2040,
-            temperature=0.6
+            temperature=0.6,
+            parse=str.strip,
+            refresh=refresh,
         )
-        # 생성된 프롬프트 추출
-        keyword_prompt = completion.choices[0].message.content.strip()
     except Exception as e:
         print("GPT 프롬프트 생성 실패:", e)
         return None
@@ -66,17 +69,42 @@ def generate_image_with_openai(thread_title, thread_content, book_title, book_au
         return None
 
     try:
-        # 생성된 이미지 URL에서 실제 이미지 파일 다운로드
-        response_img = requests.get(image_url)
-        if response_img.status_code == 200:
-            output_dir = Path(settings.MEDIA_ROOT) / "thread_cover_img"
-            output_dir.mkdir(parents=True, exist_ok=True)
-            file_name = f"{uuid.uuid4()}.png"
-            file_path = output_dir / file_name
-            file_path.write_bytes(response_img.content)
-            # 저장된 이미지 경로 반환 (MEDIA_URL 하위 상대경로)
-            return str(Path("thread_cover_img") / file_name)
+        # 생성된 이미지 URL에서 실제 이미지 파일을 청크 단위로 다운로드
+        output_dir = Path(settings.MEDIA_ROOT) / "thread_cover_img"
+        file_name = download_image(image_url, output_dir, f"{uuid.uuid4()}.png")
+        # 저장된 이미지 경로 반환 (MEDIA_URL 하위 상대경로)
+        return str(Path("thread_cover_img") / file_name)
     except Exception as e:
         print("이미지 다운로드 실패:", e)
 
     return None
+
+
+# 이미지를 청크 단위로 받아 임시 파일에 쓰고, 다 받으면 output_dir/file_name으로 이동
+# 응답 헤더나 실제 받은 크기가 THREAD_COVER_MAX_BYTES를 넘으면 중단하고 ValueError
+def download_image(url, output_dir, file_name):
+    max_bytes = settings.THREAD_COVER_MAX_BYTES
+    output_dir.mkdir(parents=True, exist_ok=True)
+    file_path = output_dir / file_name
+    tmp_path = output_dir / f".{file_name}.part"
+
+    with requests.get(url, stream=True, timeout=settings.THREAD_COVER_TIMEOUT) as response:
+        response.raise_for_status()
+        content_type = response.headers.get('Content-Type', '')
+        if not content_type.startswith('image/'):
+            raise ValueError(f"이미지가 아닌 응답: {content_type}")
+        if int(response.headers.get('Content-Length') or 0) > max_bytes:
+            raise ValueError(f"이미지 크기 초과: {response.headers['Content-Length']} bytes")
+
+        received = 0
+        try:
+            with open(tmp_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    received += len(chunk)
+                    if received > max_bytes:
+                        raise ValueError(f"이미지 크기 초과: {max_bytes} bytes 이상")
+                    f.write(chunk)
+            tmp_path.replace(file_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+    return file_name
@@ -1,14 +1,21 @@
 # threads/views.py
 
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 from rest_framework import status
-from django.db.models import Q, Count
+from django.conf import settings
+from django.core.exceptions import FieldError
 
 from .models import Thread, Comment
+from .feed import feed_page
+from .jobs import enqueue_cover_generation, enqueue_fan_out
+from .queries import plan_threads
 from .serializers import ThreadSerializer, CommentSerializer
-from .utils import generate_image_with_openai
+from blookin import like_buffer
+from books.pagination import cursor_page_size, ranked_page
+from search import engine as search_engine
+from trending import engine as trending
 
 
 # 감상글(스레드) 목록 조회 및 생성
@@ -19,25 +26,20 @@ def thread_list_create(request):
         # 쿼리 파라미터 수집
         query = request.GET.get('q')
         category_id = request.GET.get('category')
-        ordering = request.GET.get('ordering', '-created_at')
+        ordering = request.GET.get('ordering')
 
-        # 좋아요 수 계산 포함 쿼리셋
-        threads = Thread.objects.all().annotate(likes_count=Count('likes'))
-
-        # 검색어 필터
+        # 검색어가 있으면 검색 인덱스 사용 (JOIN/DISTINCT 없이 관련도 순 검색)
         if query:
-            threads = threads.filter(
-                Q(title__icontains=query) |
-                Q(content__icontains=query) |
-                Q(book__title__icontains=query) |
-                Q(book__author__icontains=query)
-            ).distinct()
+            return thread_search(request, query, category_id, ordering)
+
+        # 좋아요 수, 도서, 작성자, 댓글을 함께 조회하는 쿼리셋
+        threads = plan_threads(Thread.objects.all())
 
         # 카테고리 필터
         if category_id:
             threads = threads.filter(book__category_id=category_id)
 
-        threads = threads.order_by(ordering)
+        threads = threads.order_by(ordering or '-created_at')
 
         # 직렬화 후 응답
         serializer = ThreadSerializer(threads, many=True, context={'request': request})
@@ -47,33 +49,109 @@ def thread_list_create(request):
         # 감상글 작성 요청
         serializer = ThreadSerializer(data=request.data)
         if serializer.is_valid():
-            thread = serializer.save(user=request.user)
+            thread = serializer.save(user=request.user, cover_status=Thread.COVER_PENDING)
 
-            # AI 커버 이미지 생성
-            book = thread.book
-            image_path = generate_image_with_openai(
-                thread.title, thread.content, book.title, book.author
-            )
-            if image_path:
-                thread.cover_img = image_path
-                thread.save()
+            # AI 커버 이미지는 백그라운드 작업으로 생성하고 바로 응답 (cover_status가 'pending'이면 커버 상태를 폴링)
+            enqueue_cover_generation(thread)
+            # 팔로워 피드 기록도 백그라운드 작업으로 처리
+            enqueue_fan_out(thread)
 
             return Response(ThreadSerializer(thread).data, status=status.HTTP_201_CREATED)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+# 팔로우한 사용자의 감상글 피드 (최신순, cursor 기반 페이지 단위로 {next, results} 응답)
+# 미리 기록한 피드 항목과 팔로워가 많은 작성자의 글을 합쳐 페이지 크기만큼만 조회 (threads.feed)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def thread_feed(request):
+    try:
+        thread_ids, next_cursor = feed_page(request.user, request.GET.get('cursor'), cursor_page_size(request))
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    position = {thread_id: i for i, thread_id in enumerate(thread_ids)}
+    threads = sorted(
+        plan_threads(Thread.objects.filter(id__in=thread_ids)),
+        key=lambda thread: position[thread.id],
+    )
+    data = ThreadSerializer(threads, many=True, context={'request': request}).data
+    return Response({'next': next_cursor, 'results': data})
+
+
+# 인기 감상글 (좋아요·댓글 이벤트의 시간 감쇠 점수 순, 미리 계산한 순위 스냅숏에서 조회)
+@api_view(['GET'])
+def trending_threads(request):
+    try:
+        limit = min(max(int(request.GET.get('limit', 20)), 1), settings.TRENDING_SIZE)
+    except ValueError:
+        return Response({'error': 'limit은 정수여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    thread_ids = trending.top('threads', limit)
+    position = {thread_id: i for i, thread_id in enumerate(thread_ids)}
+    threads = sorted(
+        plan_threads(Thread.objects.filter(id__in=thread_ids)),
+        key=lambda thread: position[thread.id],
+    )
+    data = ThreadSerializer(threads, many=True, context={'request': request}).data
+    return Response(data)
+
+
+# 검색 인덱스(BM25)로 감상글 검색, 정렬 조건이 없으면 관련도 순
+# 좋아요 수 정렬은 비정규화한 likes_count 컬럼을 사용
+# cursor 또는 page_size가 주어지면 도서 검색과 같은 {next, results} 형태로 응답 (books.pagination.ranked_page)
+def thread_search(request, query, category_id=None, ordering=None):
+    result = search_engine.search('threads', query, limit=settings.SEARCH_MAX_RESULTS)
+
+    threads = Thread.objects.filter(id__in=result.ids)
+    if category_id:
+        threads = threads.filter(book__category_id=category_id)
+
+    if ordering and ordering.lstrip('-') == 'likes':
+        ordering = ordering.replace('likes', 'likes_count')
+    if ordering:
+        try:
+            thread_ids = list(threads.order_by(ordering).values_list('id', flat=True))
+        except FieldError:
+            return Response({'error': '정렬 기준이 올바르지 않습니다.'}, status=status.HTTP_400_BAD_REQUEST)
+    else:
+        matched = set(threads.values_list('id', flat=True)) if category_id else set(result.ids)
+        thread_ids = [thread_id for thread_id in result.ids if thread_id in matched]
+
+    paged = 'cursor' in request.GET or 'page_size' in request.GET
+    next_cursor = None
+    if paged:
+        try:
+            thread_ids, next_cursor = ranked_page(
+                thread_ids, request.GET.get('cursor'), cursor_page_size(request), ordering or 'relevance',
+            )
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    position = {thread_id: i for i, thread_id in enumerate(thread_ids)}
+    page_threads = sorted(
+        plan_threads(Thread.objects.filter(id__in=thread_ids)),
+        key=lambda thread: position[thread.id],
+    )
+    data = ThreadSerializer(page_threads, many=True, context={'request': request}).data
+    if paged:
+        return Response({'next': next_cursor, 'results': data})
+    return Response(data)
+
+
 # 단일 감상글 조회, 수정, 삭제
 @api_view(['GET', 'PUT', 'DELETE'])
 @permission_classes([IsAuthenticatedOrReadOnly])
 def thread_detail(request, thread_id):
+    threads = plan_threads(Thread.objects.all()) if request.method == 'GET' else Thread.objects.all()
     try:
-        thread = Thread.objects.get(pk=thread_id)
+        thread = threads.get(pk=thread_id)
     except Thread.DoesNotExist:
         return Response({'error': 'Thread not found'}, status=status.HTTP_404_NOT_FOUND)
 
     if request.method == 'GET':
-        serializer = ThreadSerializer(thread)
+        serializer = ThreadSerializer(thread, context={'request': request})
         return Response(serializer.data)
 
     elif request.method == 'PUT':
@@ -94,6 +172,31 @@ def thread_detail(request, thread_id):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+# 감상글 AI 커버 생성 상태 조회(GET, 폴링용) 및 재생성 요청(POST, 작성자만)
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticatedOrReadOnly])
+def thread_cover(request, thread_id):
+    try:
+        thread = Thread.objects.get(pk=thread_id)
+    except Thread.DoesNotExist:
+        return Response({'error': 'Thread not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    response_status = status.HTTP_200_OK
+    if request.method == 'POST':
+        if thread.user != request.user:
+            return Response({'error': '권한이 없습니다'}, status=status.HTTP_403_FORBIDDEN)
+        # 이미 생성 중이면 새로 등록하지 않음
+        if thread.cover_status != Thread.COVER_PENDING:
+            enqueue_cover_generation(thread, refresh=True)
+        response_status = status.HTTP_202_ACCEPTED
+
+    return Response({
+        'cover_status': thread.cover_status,
+        'cover_img': thread.cover_img.url if thread.cover_img else None,
+        'cover_urls': thread.cover_urls(),
+    }, status=response_status)
+
+
 # 감상글 좋아요/취소 토글
 @api_view(['POST'])
 @permission_classes([IsAuthenticatedOrReadOnly])
@@ -103,15 +206,9 @@ def thread_like_toggle(request, thread_id):
     except Thread.DoesNotExist:
         return Response({'error': 'Thread not found'}, status=status.HTTP_404_NOT_FOUND)
 
-    user = request.user
-    if thread.likes.filter(pk=user.pk).exists():
-        thread.likes.remove(user)
-        liked = False
-    else:
-        thread.likes.add(user)
-        liked = True
-
-    return Response({'liked': liked, 'likes_count': thread.likes.count()})
+    # 좋아요 버퍼에 기록하고 바로 응답 (DB에는 주기적으로 모아서 반영, blookin.like_buffer)
+    liked, likes_count = like_buffer.toggle(thread, request.user.pk)
+    return Response({'liked': liked, 'likes_count': likes_count})
 
 
 # 댓글 생성 (해당 감상글에 대해)
@@ -0,0 +1,14 @@
+# trending/apps.py
+
+from django.apps import AppConfig
+
+
+class TrendingConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'trending'
+
+    # 좋아요·감상글·댓글 이벤트를 인기 점수에 반영하는 시그널 연결
+    def ready(self):
+        from .signals import connect_signals
+
+        connect_signals()
@@ -0,0 +1,182 @@
+# trending/engine.py
+
+import logging
+import math
+import threading
+import time
+from collections import defaultdict, namedtuple
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import Greatest, Power
+
+from .models import TrendingLike, TrendingScore
+
+logger = logging.getLogger(__name__)
+
+# 인기 순위 스냅숏: 점수 내림차순 객체 ID, 점수, 계산 시각
+Snapshot = namedtuple('Snapshot', ['ids', 'scores', 'computed_at'])
+
+
+# updated 시점의 점수를 now 시점으로 옮기는 감쇠 배율 2^((updated - now) / 반감기)
+def _decay(now):
+    return Power(
+        Value(2.0),
+        (F('updated') - Value(now)) / Value(float(settings.TRENDING_HALF_LIFE)),
+        output_field=FloatField(),
+    )
+
+
+# 이벤트 하나를 인기 점수에 반영: 기존 점수를 지금 시점으로 감쇠한 뒤 weight를 더함 (0 미만이면 0)
+# 집계 쿼리 없이 행마다 UPDATE 한 번 (없으면 먼저 추가), 같은 weight를 여러 객체에 한 번에 반영 가능
+def record(kind, object_ids, weight, now=None):
+    object_ids = list(object_ids)
+    if not object_ids or not weight:
+        return
+    now = time.time() if now is None else now
+    with transaction.atomic():
+        TrendingScore.objects.bulk_create(
+            [TrendingScore(kind=kind, object_id=object_id, score=0, updated=now) for object_id in object_ids],
+            ignore_conflicts=True,
+        )
+        TrendingScore.objects.filter(kind=kind, object_id__in=object_ids).update(
+            score=Greatest(F('score') * _decay(now) + Value(float(weight)), Value(0.0)),
+            updated=now,
+        )
+
+
+# 객체별 가중치를 같은 가중치끼리 묶어 반영
+def _record_each(kind, weights, now):
+    by_weight = defaultdict(list)
+    for object_id, weight in weights.items():
+        by_weight[weight].append(object_id)
+    for weight, object_ids in by_weight.items():
+        record(kind, object_ids, weight, now)
+
+
+# 좋아요 추가: pairs는 (객체 ID, 사용자 ID) 목록, 좋아요 시각을 남기고 좋아요 가중치를 더함
+def like(kind, pairs, now=None):
+    now = time.time() if now is None else now
+    weights = defaultdict(float)
+    for object_id, _ in pairs:
+        weights[object_id] += settings.TRENDING_WEIGHTS['like']
+    with transaction.atomic():
+        TrendingLike.objects.bulk_create(
+            [TrendingLike(kind=kind, object_id=object_id, user_id=user_id, created=now) for object_id, user_id in pairs],
+            ignore_conflicts=True,
+        )
+        _record_each(kind, weights, now)
+
+
+# 좋아요 취소: 그 좋아요의 가중치를 좋아요 시각부터 지금까지 감쇠시킨 값만큼 뺌
+# (좋아요·취소 한 쌍이 점수에 남기는 몫은 0, 다른 이벤트의 점수는 깎지 않음)
+# 시각 기록이 없는 좋아요(이미 감쇠해 정리되었거나 이 기록 이전의 좋아요)는 빼지 않음
+def unlike(kind, pairs, now=None):
+    now = time.time() if now is None else now
+    pairs = set(pairs)
+    weights = defaultdict(float)
+    with transaction.atomic():
+        likes = TrendingLike.objects.filter(
+            kind=kind,
+            object_id__in={object_id for object_id, _ in pairs},
+            user_id__in={user_id for _, user_id in pairs},
+        )
+        removed = []
+        for entry in likes:
+            if (entry.object_id, entry.user_id) not in pairs:
+                continue
+            decay = 2.0 ** ((entry.created - now) / settings.TRENDING_HALF_LIFE)
+            weights[entry.object_id] -= settings.TRENDING_WEIGHTS['like'] * decay
+            removed.append(entry.pk)
+        TrendingLike.objects.filter(pk__in=removed).delete()
+        _record_each(kind, weights, now)
+
+
+# 객체 삭제 시 점수와 좋아요 기록 삭제
+def forget(kind, object_id):
+    TrendingScore.objects.filter(kind=kind, object_id=object_id).delete()
+    TrendingLike.objects.filter(kind=kind, object_id=object_id).delete()
+
+
+# 현재 점수가 TRENDING_MIN_SCORE 아래로 감쇠한 행 삭제 (순위 계산 대상을 최근 활동한 객체로 유지)
+# 가중치가 TRENDING_MIN_SCORE 아래로 감쇠한 좋아요 기록도 함께 삭제
+def prune(kind, now=None):
+    now = time.time() if now is None else now
+    weight = settings.TRENDING_WEIGHTS['like']
+    if weight > settings.TRENDING_MIN_SCORE:
+        cutoff = now - settings.TRENDING_HALF_LIFE * math.log2(weight / settings.TRENDING_MIN_SCORE)
+        TrendingLike.objects.filter(kind=kind, created__lt=cutoff).delete()
+    return (
+        TrendingScore.objects.filter(kind=kind)
+        .alias(current=F('score') * _decay(now))
+        .filter(current__lt=settings.TRENDING_MIN_SCORE)
+        .delete()[0]
+    )
+
+
+# 현재 점수 상위 TRENDING_SIZE개 계산
+def compute(kind, now=None):
+    now = time.time() if now is None else now
+    rows = list(
+        TrendingScore.objects.filter(kind=kind)
+        .annotate(current=F('score') * _decay(now))
+        .filter(current__gte=settings.TRENDING_MIN_SCORE)
+        .order_by('-current', '-object_id')
+        .values_list('object_id', 'current')[:settings.TRENDING_SIZE]
+    )
+    return Snapshot([object_id for object_id, _ in rows], [score for _, score in rows], now)
+
+
+# 종류별 인기 순위 스냅숏을 프로세스 메모리에 두고 요청은 스냅숏만 읽음
+# TRENDING_REFRESH_INTERVAL초가 지나면 백그라운드 스레드에서 새로 계산해 통째로 교체
+# (계산하는 동안 요청은 이전 스냅숏으로 바로 응답, 종류별로 한 번에 하나만 계산)
+class TrendingBoard:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.snapshots = {}
+        self.refreshing = set()
+
+    # 인기 순위 상위 limit개 객체 ID (스냅숏이 없는 첫 요청만 바로 계산)
+    def top(self, kind, limit):
+        snapshot = self.snapshots.get(kind)
+        if snapshot is None:
+            snapshot = self.refresh(kind)
+        elif time.time() - snapshot.computed_at >= settings.TRENDING_REFRESH_INTERVAL:
+            self._refresh_later(kind)
+        return snapshot.ids[:limit]
+
+    # 오래된 점수를 정리하고 스냅숏을 새로 계산해 교체
+    def refresh(self, kind):
+        prune(kind)
+        snapshot = compute(kind)
+        self.snapshots[kind] = snapshot
+        return snapshot
+
+    def _refresh_later(self, kind):
+        if not settings.TRENDING_REFRESH_IN_BACKGROUND:
+            self.refresh(kind)
+            return
+        with self.lock:
+            if kind in self.refreshing:
+                return
+            self.refreshing.add(kind)
+        threading.Thread(target=self._refresh_worker, args=(kind,), name=f'trending-{kind}', daemon=True).start()
+
+    def _refresh_worker(self, kind):
+        try:
+            self.refresh(kind)
+        except Exception:
+            logger.exception("[인기 순위] %s 갱신 실패, 이전 스냅숏 유지", kind)
+        finally:
+            with self.lock:
+                self.refreshing.discard(kind)
+            # 백그라운드 스레드가 연 DB 연결 정리
+            connection.close()
+
+
+board = TrendingBoard()
+
+
+def top(kind, limit):
+    return board.top(kind, limit)
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.16 on 2026-10-18 15:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trending', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingLike',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('user_id', models.BigIntegerField()),
+                ('created', models.FloatField()),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='trendinglike',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id', 'user_id'), name='unique_trending_like'),
+        ),
+    ]
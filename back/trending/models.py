@@ -0,0 +1,48 @@
+# trending/models.py
+
+from django.db import models
+
+
+# 도서·감상글의 시간 감쇠 인기 점수 (trending.engine 참고)
+# score는 updated 시점의 값이며, 현재 점수는 score × 2^(-(지금 - updated) / 반감기)
+class TrendingScore(models.Model):
+    # 대상 종류 ('books', 'threads')
+    kind = models.CharField(max_length=20)
+
+    # 대상 객체의 기본 키
+    object_id = models.BigIntegerField()
+
+    score = models.FloatField(default=0)
+
+    # 마지막 이벤트 시각 (유닉스 시간, 초)
+    updated = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='unique_trending_score'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id} ({self.score:.2f})"
+
+
+# 인기 점수에 반영된 좋아요의 시각 (좋아요 취소 시 그 좋아요가 지금까지 감쇠한 만큼만 빼기 위해 보관)
+# 가중치가 TRENDING_MIN_SCORE 아래로 감쇠한 기록은 trending.engine.prune이 삭제
+class TrendingLike(models.Model):
+    # 대상 종류 ('books', 'threads')
+    kind = models.CharField(max_length=20)
+
+    # 대상 객체와 좋아요한 사용자의 기본 키
+    object_id = models.BigIntegerField()
+    user_id = models.BigIntegerField()
+
+    # 좋아요가 점수에 반영된 시각 (유닉스 시간, 초)
+    created = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id', 'user_id'], name='unique_trending_like'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id} ← {self.user_id}"
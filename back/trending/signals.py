@@ -0,0 +1,56 @@
+# trending/signals.py
+
+from django.conf import settings
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from . import engine
+
+
+# 좋아요 추가/취소를 해당 종류의 인기 점수에 반영하는 m2m_changed 수신자
+# (좋아요 버퍼 반영, blookin.counters.toggle 모두 post_add/post_remove를 보냄)
+def likes_receiver(kind):
+    def on_likes_changed(sender, instance, action, reverse, pk_set, **kwargs):
+        if action not in ('post_add', 'post_remove') or not pk_set:
+            return
+        if reverse:
+            pairs = [(object_id, instance.pk) for object_id in pk_set]
+        else:
+            pairs = [(instance.pk, user_id) for user_id in pk_set]
+        if action == 'post_add':
+            engine.like(kind, pairs)
+        else:
+            engine.unlike(kind, pairs)
+    return on_likes_changed
+
+
+# 새 감상글: 감상글 자체와 대상 도서의 점수에 반영
+def on_thread_saved(sender, instance, created, raw=False, **kwargs):
+    if not created or raw:
+        return
+    weight = settings.TRENDING_WEIGHTS['thread']
+    engine.record('threads', [instance.pk], weight)
+    engine.record('books', [instance.book_id], weight)
+
+
+# 새 댓글: 감상글 점수에 반영
+def on_comment_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        engine.record('threads', [instance.thread_id], settings.TRENDING_WEIGHTS['comment'])
+
+
+def forget_receiver(kind):
+    def on_deleted(sender, instance, **kwargs):
+        engine.forget(kind, instance.pk)
+    return on_deleted
+
+
+def connect_signals():
+    from books.models import Book
+    from threads.models import Comment, Thread
+
+    m2m_changed.connect(likes_receiver('books'), sender=Book.liked_users.through, weak=False, dispatch_uid='trending_book_likes')
+    m2m_changed.connect(likes_receiver('threads'), sender=Thread.likes.through, weak=False, dispatch_uid='trending_thread_likes')
+    post_save.connect(on_thread_saved, sender=Thread, dispatch_uid='trending_thread_saved')
+    post_save.connect(on_comment_saved, sender=Comment, dispatch_uid='trending_comment_saved')
+    post_delete.connect(forget_receiver('books'), sender=Book, weak=False, dispatch_uid='trending_book_deleted')
+    post_delete.connect(forget_receiver('threads'), sender=Thread, weak=False, dispatch_uid='trending_thread_deleted')
@@ -0,0 +1,145 @@
+import datetime
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from books.models import Book, Category
+from threads.models import Comment, Thread
+from . import engine
+from .models import TrendingLike, TrendingScore
+
+HOUR = 60 * 60
+
+
+@override_settings(TRENDING_HALF_LIFE=HOUR, TRENDING_MIN_SCORE=0.1)
+class TrendingScoreTestCase(TestCase):
+    # 반감기마다 절반으로 줄고, 새 이벤트는 감쇠한 점수에 더해짐
+    def test_exponential_decay(self):
+        engine.record('books', [1], 4, now=0)
+        engine.record('books', [2], 0.5, now=2 * HOUR)
+        snapshot = engine.compute('books', now=HOUR)
+        self.assertEqual(snapshot.ids, [1, 2])
+        self.assertAlmostEqual(snapshot.scores[0], 2.0)
+
+        engine.record('books', [1], 1, now=HOUR)
+        self.assertAlmostEqual(TrendingScore.objects.get(object_id=1).score, 3.0)
+        # 두 반감기 뒤: 1번은 0.75, 2번(1시간 전 0.5점)은 0.25
+        snapshot = engine.compute('books', now=3 * HOUR)
+        self.assertEqual(snapshot.ids, [1, 2])
+        self.assertEqual([round(score, 6) for score in snapshot.scores], [0.75, 0.25])
+
+    def test_score_never_goes_negative(self):
+        engine.record('threads', [1], 1, now=0)
+        engine.record('threads', [1], -1, now=HOUR)
+        self.assertEqual(TrendingScore.objects.get().score, 0)
+
+    # 좋아요 취소는 그 좋아요가 감쇠한 만큼만 빼므로 다른 이벤트의 점수는 그대로 남음
+    def test_unlike_removes_decayed_like_weight(self):
+        engine.record('books', [1], 3, now=0)
+        engine.like('books', [(1, 10), (1, 11)], now=0)
+        engine.unlike('books', [(1, 10)], now=HOUR)
+        self.assertAlmostEqual(engine.compute('books', now=HOUR).scores[0], 2.0)
+
+        engine.unlike('books', [(1, 11)], now=2 * HOUR)
+        self.assertAlmostEqual(engine.compute('books', now=2 * HOUR).scores[0], 0.75)
+        self.assertFalse(TrendingLike.objects.exists())
+
+        # 좋아요·취소 한 쌍만 있으면 0점, 기록이 없는 좋아요 취소는 점수를 바꾸지 않음
+        engine.like('books', [(2, 10)], now=0)
+        engine.unlike('books', [(2, 10)], now=3 * HOUR)
+        self.assertAlmostEqual(TrendingScore.objects.get(object_id=2).score, 0.0)
+        engine.unlike('books', [(1, 12)], now=2 * HOUR)
+        self.assertAlmostEqual(engine.compute('books', now=2 * HOUR).scores[0], 0.75)
+
+    def test_prune_removes_decayed_scores(self):
+        engine.record('books', [1], 1, now=0)
+        engine.record('books', [2], 1, now=5 * HOUR)
+        self.assertEqual(engine.prune('books', now=5 * HOUR), 1)
+        self.assertEqual(list(TrendingScore.objects.values_list('object_id', flat=True)), [2])
+
+    # 가중치 1인 좋아요는 log2(1 / 0.1) ≈ 3.3 반감기 뒤에 기록 삭제
+    def test_prune_removes_decayed_likes(self):
+        engine.like('books', [(1, 10)], now=0)
+        engine.like('books', [(1, 11)], now=3 * HOUR)
+        engine.prune('books', now=4 * HOUR)
+        self.assertEqual(list(TrendingLike.objects.values_list('user_id', flat=True)), [11])
+
+
+# 좋아요·감상글·댓글 작성 API가 인기 점수를 갱신하고, 인기 API는 순위 스냅숏을 읽음
+@override_settings(LIKE_BUFFER_ENABLED=False, TRENDING_REFRESH_INTERVAL=60)
+class TrendingApiTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.users = User.objects.bulk_create([User(username=f'user{i}') for i in range(3)])
+        category = Category.objects.create(name='문학')
+        cls.books = [
+            Book.objects.create(
+                category=category, title=f'도서 {i}', description='설명', isbn=str(i),
+                cover='https://example.com/c.jpg', publisher='출판사', pub_date=datetime.date(2024, 1, 1),
+                author='저자', author_info='', customer_review_rank=0, subTitle='',
+            )
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        self.board = engine.TrendingBoard()
+        self.enterContext(mock.patch.object(engine, 'board', self.board))
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def ids(self, url, **params):
+        response = APIClient().get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return [item['id'] for item in response.json()]
+
+    def test_scores_follow_events(self):
+        first, second, third = self.books
+        for user in self.users:
+            self.client_for(user).post(f'/api/books/{second.pk}/like/')
+        self.client_for(self.users[0]).post(f'/api/books/{first.pk}/like/')
+
+        # 감상글 3점, 좋아요 1점: first 4점, 같은 3점이면 ID가 큰 third가 앞
+        thread = Thread.objects.create(title='감상', content='내용', book=third, user=self.users[0])
+        other = Thread.objects.create(title='감상', content='내용', book=first, user=self.users[1])
+        self.assertEqual(self.ids('/api/books/trending/'), [first.pk, third.pk, second.pk])
+
+        self.client_for(self.users[2]).post(f'/api/threads/{other.pk}/like/')
+        Comment.objects.create(content='댓글', thread=other, user=self.users[2])
+        self.board.refresh('threads')
+        self.assertEqual(self.ids('/api/threads/trending/', limit=1), [other.pk])
+
+        # 좋아요 취소는 점수를 줄이고, 삭제한 감상글은 순위에서 빠짐
+        for user in self.users:
+            self.client_for(user).post(f'/api/books/{second.pk}/like/')
+        self.board.refresh('books')
+        self.assertEqual(self.ids('/api/books/trending/'), [first.pk, third.pk])
+        other.delete()
+        self.assertFalse(TrendingScore.objects.filter(kind='threads', object_id=other.pk).exists())
+        self.assertEqual(self.ids('/api/threads/trending/'), [thread.pk])
+
+    # 갱신 주기가 지나면 이전 스냅숏으로 바로 응답하고 새 순위는 백그라운드에서 계산
+    def test_stale_snapshot_is_served_while_refreshing(self):
+        first, second, _ = self.books
+        self.client_for(self.users[0]).post(f'/api/books/{first.pk}/like/')
+        self.assertEqual(self.ids('/api/books/trending/'), [first.pk])
+
+        Thread.objects.create(title='감상', content='내용', book=second, user=self.users[0])
+        self.assertEqual(self.ids('/api/books/trending/'), [first.pk])
+
+        with self.settings(TRENDING_REFRESH_INTERVAL=0), mock.patch('trending.engine.threading.Thread') as thread:
+            self.assertEqual(self.ids('/api/books/trending/'), [first.pk])
+            self.assertEqual(self.ids('/api/books/trending/'), [first.pk])
+        # 갱신 중에는 새 갱신을 시작하지 않음
+        thread.assert_called_once()
+        with mock.patch('trending.engine.connection.close'):
+            self.board._refresh_worker(*thread.call_args.kwargs['args'])
+        self.assertEqual(self.ids('/api/books/trending/'), [second.pk, first.pk])
+
+    def test_invalid_limit(self):
+        self.assertEqual(APIClient().get('/api/books/trending/', {'limit': 'x'}).status_code, 400)
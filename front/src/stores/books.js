@@ -35,7 +35,7 @@ export const useBookStore = defineStore('books', () => {
 
   // 도서 상세 정보 가져오기 (+ 작가 AI 정보, 이미지, TTS 포함)
 
-  const fetchBookDetail = (bookId) => {
+  const fetchBookDetail = (bookId, retries = 10) => {
     console.log('[fetchBookDetail] 호출됨 with bookId:', bookId)
     return axios.get(`${BOOK_API_URL}/${bookId}/`)
       .then((res) => {
@@ -46,6 +46,12 @@ export const useBookStore = defineStore('books', () => {
           author_profile_img_url: res.data.author_profile_img ? `/media/${res.data.author_profile_img}` : null,
           tts_audio_url: res.data.tts_audio ? `/media/${res.data.tts_audio}` : null,
         }
+        // 작가 정보를 백그라운드에서 보완 중이면 잠시 후 다시 조회
+        if (res.data.enrichment_status === 'enriching' && retries > 0) {
+          setTimeout(() => {
+            if (selectedBook.value?.id === res.data.id) fetchBookDetail(bookId, retries - 1)
+          }, 3000)
+        }
       })
       .catch((err) => {
         console.error('[fetchBookDetail] 실패:', err)
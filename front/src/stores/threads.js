@@ -25,7 +25,8 @@ export const useThreadStore = defineStore('thread', () => {
     })
       .then((res) => {
         console.log('[fetchThreads] 성공:', res.data)
-        threads.value = res.data
+        // page_size/cursor로 요청하면 {next, results} 형태 (도서 목록·검색과 같은 cursor 페이지)
+        threads.value = Array.isArray(res.data) ? res.data : res.data.results
       })
       .catch((err) => {
         console.error('[fetchThreads] 실패:', err)
@@ -73,6 +74,9 @@ export const useThreadStore = defineStore('thread', () => {
         .forEach(k => localStorage.removeItem(k))
 
         console.log('[createThread] 성공:', newThread)
+
+        // AI 커버는 백그라운드에서 생성되므로 완료될 때까지 상태를 폴링
+        if (newThread.cover_status === 'pending') pollCover(newThread.id)
         return newThread               // 필요하면 라우터에서 await
       })
 
@@ -82,6 +86,22 @@ export const useThreadStore = defineStore('thread', () => {
       })
   }
 
+  // AI 커버 생성 상태 폴링 (3초 간격), 완료되면 목록과 상세 화면의 감상글에 반영
+  const pollCover = (threadId, retries = 20) => {
+    return axios.get(`${THREAD_API_URL}/${threadId}/cover/`)
+      .then(res => {
+        if (res.data.cover_status === 'pending' && retries > 0) {
+          setTimeout(() => pollCover(threadId, retries - 1), 3000)
+          return
+        }
+        const targets = [...threads.value, selectedThread.value].filter(t => t?.id === threadId)
+        targets.forEach(t => Object.assign(t, res.data))
+      })
+      .catch(err => {
+        console.error('[pollCover] 실패:', err)
+      })
+  }
+
   // 감상글 상세 정보
   const fetchThreadDetail = (threadId) => {
     console.log('[fetchThreadDetail] threadId:', threadId)
@@ -89,6 +109,7 @@ export const useThreadStore = defineStore('thread', () => {
       .then(res => {
         console.log('[fetchThreadDetail] 성공:', res.data)
         selectedThread.value = res.data
+        if (res.data.cover_status === 'pending') pollCover(res.data.id)
       })
       .catch(err => {
         console.error('[fetchThreadDetail] 실패:', err)
@@ -158,6 +179,7 @@ export const useThreadStore = defineStore('thread', () => {
     fetchCategories,
     fetchThreads,
     createThread,
+    pollCover,
     fetchThreadDetail,
     toggleLike,
     createComment,